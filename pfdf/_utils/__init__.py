@@ -13,13 +13,22 @@ IO Functions:
 Misc Functions:
     clean_dims  - Optionally removes trailing singleton dimensions from an array
     limits      - Trims index limits to valid indices
-    rowcol      - Converts spatial coordinates to pixel indices
+
+Pixel indices:
+    pixels          - Converts arrays of spatial coordinates to pixel index arrays
+    rowcol          - Converts spatial coordinates to pixel indices
+    pixel_windows   - Converts arrays of bounding box edges to pixel index limits
+    pixel_limits    - Converts a bounding box to pixel index limits
 
 Modules:
     buffers     - Function to standardize buffer units
+    chunks      - Functions that support chunked evaluation into preallocated outputs
     classify    - Function for classifying arrays using thresholds
+    d8          - Numba-compiled kernel that derives flow directions, slopes, and relief
+    flood       - Numba-compiled priority-flood algorithms for conditioning DEMs
     merror      - Functions to supplement memory-related error messages
     nodata      - Utilities for working with NoData values
+    normal      - Closed-form quantile function of the standard normal distribution
     patches     - Context managers for patching pysheds
     slug        - Functions to generate anchor link slugs for the docs
     units       - Functions to facilitate unit conversion
@@ -30,17 +39,17 @@ from __future__ import annotations
 import typing
 
 import numpy as np
-import rasterio.transform
 
 if typing.TYPE_CHECKING:
     from typing import Any, Callable
 
     from affine import Affine
 
-    from pfdf.typing.core import RealArray, vector
+    from pfdf.typing.core import MatrixArray, RealArray, VectorArray, vector
 
     indices = list[int]
     start_stop = tuple[int, int]
+    index_arrays = tuple[VectorArray, VectorArray]
 
 # Combination numpy dtype for real-valued data
 real = [np.integer, np.floating, np.bool_]
@@ -123,20 +132,45 @@ def limits(start: int, stop: int, length: int) -> start_stop:
 #####
 
 
+def pixels(
+    affine: Affine, xs: vector, ys: vector, op: Callable = np.floor
+) -> index_arrays:
+    """Converts arrays of spatial coordinates to arrays of pixel indices. Applies
+    the inverse affine matrix to every coordinate at once, and then uses a numpy
+    rounding function (np.floor or np.round) to convert fractional pixels to indices"""
+
+    a, b, c, d, e, f, _, _, _ = ~affine
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    cols = op(a * xs + b * ys + c).astype(int)
+    rows = op(d * xs + e * ys + f).astype(int)
+    return rows, cols
+
+
 def rowcol(
-    affine: Affine, xs: vector, ys: vector, op: Callable
+    affine: Affine, xs: vector, ys: vector, op: Callable = np.floor
 ) -> tuple[indices, indices]:
     "Converts spatial coordinates to pixel indices"
+    rows, cols = pixels(affine, xs, ys, op)
+    return rows.tolist(), cols.tolist()
 
-    rows, cols = rasterio.transform.rowcol(affine, xs, ys, op=op)
-    rows = np.array(rows).astype(int).tolist()
-    cols = np.array(cols).astype(int).tolist()
-    return rows, cols
 
+def pixel_windows(
+    affine: Affine, lefts: vector, bottoms: vector, rights: vector, tops: vector
+) -> tuple[MatrixArray, MatrixArray]:
+    """Converts the edges of N bounding boxes to pixel index limits. Returns the
+    (start, stop) row limits and (start, stop) column limits of each box as two
+    Nx2 arrays"""
 
-def pixel_limits(affine: Affine, bounds) -> tuple[start_stop, start_stop]:
+    xs = np.stack(np.broadcast_arrays(lefts, rights), axis=-1)
+    ys = np.stack(np.broadcast_arrays(bottoms, tops), axis=-1)
+    rows, cols = pixels(affine, xs, ys, op=np.round)
+    rows = np.stack((rows.min(axis=-1), rows.max(axis=-1)), axis=-1)
+    cols = np.stack((cols.min(axis=-1), cols.max(axis=-1)), axis=-1)
+    return rows.reshape(-1, 2), cols.reshape(-1, 2)
 
-    rows, cols = rowcol(affine, bounds.xs, bounds.ys, op=round)
-    rows = (min(rows), max(rows))
-    cols = (min(cols), max(cols))
-    return rows, cols
+
+def pixel_limits(affine: Affine, bounds) -> tuple[start_stop, start_stop]:
+    "Converts a bounding box to (start, stop) row and column limits"
+    rows, cols = pixel_windows(affine, *bounds.bounds)
+    return tuple(rows[0].tolist()), tuple(cols[0].tolist())
@@ -0,0 +1,135 @@
+"""
+Functions that support chunked evaluation into preallocated or memory-mapped outputs
+----------
+Some model functions can produce outputs too large to hold in memory, or too large
+to hold alongside the temporary arrays used to compute them. These functions support
+a chunked evaluation mode, in which a compiled kernel writes results directly into a
+preallocated output array, one block of rows at a time. The output may be an
+existing numpy array (including a numpy memmap), or a path to a new memory-mapped
+.npy file. Memory-mapped outputs are flushed to disk after each block, so the
+memory budget also bounds the amount of unwritten output held in memory.
+----------
+Functions:
+    dtype       - Validates a floating-point output dtype
+    astype      - Casts solver inputs to an output precision
+    output      - Returns a validated preallocated output array, or opens a memory-mapped .npy file
+    array       - Checks that a preallocated output array is valid
+    blocks      - Validates a memory budget and returns the row blocks of a chunked evaluation
+    flush       - Flushes an output array to disk if it is memory-mapped
+"""
+
+from __future__ import annotations
+
+import typing
+from pathlib import Path
+
+import numpy as np
+
+import pfdf._validate.core as validate
+from pfdf._utils import real
+from pfdf.errors import ShapeError
+
+if typing.TYPE_CHECKING:
+    from typing import Any
+
+    from pfdf.typing.core import shape
+
+# Supported output dtypes
+_DTYPES = (np.dtype("float32"), np.dtype("float64"))
+
+
+def dtype(dtype: Any) -> np.dtype | None:
+    """Validates a floating-point output dtype. Returns None if dtype is None,
+    otherwise returns the float32 or float64 numpy dtype"""
+
+    if dtype is None:
+        return None
+    try:
+        dtype = np.dtype(dtype)
+    except TypeError:
+        raise TypeError(
+            f"dtype must be a numpy float32 or float64 dtype, but it is a "
+            f"{type(dtype).__name__} instead."
+        )
+    if dtype not in _DTYPES:
+        raise ValueError(f"dtype must be float32 or float64, but it is {dtype}.")
+    return dtype
+
+
+def astype(dtype: np.dtype | None, *arrays: np.ndarray) -> list[np.ndarray]:
+    "Casts solver inputs to an output precision. Uses float64 if dtype is None"
+    if dtype is None:
+        dtype = np.dtype(float)
+    return [array.astype(dtype, copy=False) for array in arrays]
+
+
+def output(
+    out: Any, shape: shape, dtype: np.dtype | None, overwrite: bool
+) -> np.ndarray:
+    """Returns a validated preallocated output array. If "out" is None, allocates a
+    new array. If a path, opens a new memory-mapped .npy file. Allocated arrays
+    are float64 if dtype is None"""
+
+    # Allocate new arrays as needed
+    if out is None or isinstance(out, (str, Path)):
+        if dtype is None:
+            dtype = np.dtype(float)
+        if out is None:
+            return np.empty(shape, dtype)
+        path = validate.output_file(out, overwrite)
+        if path.suffix.lower() != ".npy":
+            raise ValueError(
+                f'The output file must have a ".npy" extension, but it does not.\n'
+                f"\tFile: {path}"
+            )
+        return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=shape)
+
+    # Otherwise, validate the preallocated array
+    elif not isinstance(out, np.ndarray):
+        raise TypeError(
+            "out must be a numpy array or a path to a .npy file, "
+            f"but it is a {type(out).__name__} instead."
+        )
+    return array(out, "out", shape, dtype)
+
+
+def array(out: Any, name: str, shape: shape, dtype: np.dtype | None) -> np.ndarray:
+    """Checks that a preallocated output is a writeable float32 or float64 array with
+    the full output shape. If dtype is not None, the array must have that dtype"""
+
+    if not isinstance(out, np.ndarray):
+        raise TypeError(
+            f"{name} must be a numpy array, but it is a {type(out).__name__} instead."
+        )
+    elif out.dtype not in _DTYPES:
+        raise TypeError(
+            f"{name} must have a float32 or float64 dtype, but it has a {out.dtype} "
+            "dtype instead."
+        )
+    elif dtype is not None and out.dtype != dtype:
+        raise TypeError(
+            f"{name} must have a {dtype} dtype, but it has a {out.dtype} dtype instead."
+        )
+    elif out.shape != tuple(shape):
+        raise ShapeError(
+            f"{name} must have shape {tuple(shape)}, but it has shape {out.shape} instead."
+        )
+    elif not out.flags.writeable:
+        raise ValueError(f"{name} must be a writeable array, but it is read-only.")
+    return out
+
+
+def blocks(nrows: int, rowsize: int, memory: Any) -> list[tuple[int, int]]:
+    """Validates a memory budget (in MB) and returns the (start, stop) indices of
+    row blocks whose output fits within the budget. Every block has at least one row"""
+
+    memory = validate.scalar(memory, "memory", dtype=real)
+    validate.positive(memory, "memory")
+    step = max(1, int(memory * 1024 * 1024 // max(rowsize, 1)))
+    return [(start, min(start + step, nrows)) for start in range(0, nrows, step)]
+
+
+def flush(array: np.ndarray) -> None:
+    "Flushes an output array to disk if it is memory-mapped"
+    if isinstance(array, np.memmap):
+        array.flush()
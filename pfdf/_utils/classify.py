@@ -1,27 +1,50 @@
 """
 classify  A function for classifying an array using thresholds
 ----------
+Classification uses a numba-compiled kernel that classifies the array in blocks,
+in parallel, and writes the classes directly into the output array. NoData values
+are handled inline, so the only allocation is the output array itself. Use a
+compact integer dtype (such as uint8) for outputs that do not require NaN.
+----------
 Functions:
     classify    - Classify array values based on thresholds
+
+Kernels:
+    _classify       - Classifies a flattened array in parallel blocks
+    _classify_block - Classifies a block of a flattened array without holding the GIL
 """
 
 from __future__ import annotations
 
 import typing
+from math import ceil
 
-from numpy import digitize, inf, nan
-
-from pfdf._utils.nodata import NodataMask
+import numpy as np
+from numba import njit, prange
+from numpy import inf, isnan, nan
 
 if typing.TYPE_CHECKING:
+    from typing import Optional
+
     from pfdf.typing.core import RealArray, VectorArray, scalar
 
+# Number of elements classified by each parallel task
+_BLOCK = 2**16
+
+# NoData modes for the kernel
+_NO_NODATA = 0
+_NAN_NODATA = 1
+_VALUE_NODATA = 2
+
 
 def classify(
     array: RealArray,
     thresholds: VectorArray,
     nodata: scalar = nan,
     nodata_to: scalar = nan,
+    dtype: Optional[str | type] = None,
+    out: Optional[RealArray] = None,
+    parallel: bool = True,
 ) -> RealArray:
     """
     classify  Classifies an array using thresholds while optionally preserving NoData
@@ -38,18 +61,110 @@ def classify(
 
     classify(..., nodata, nodata_to)
     Specify the value that NoData elements should be classified as. Defaults to NaN.
+
+    classify(..., dtype)
+    classify(..., out)
+    Specifies the dtype of the output array, or a preallocated output array with
+    the shape of the input array. By default, returns float64 classes if nodata_to
+    is NaN (or not an integer), and otherwise uses the smallest integer dtype that
+    holds the classes and nodata_to (usually uint8). Integer outputs require a
+    numeric nodata_to value.
+
+    classify(..., parallel=False)
+    Classifies the array in the calling thread, without holding the GIL. Use this
+    option when classifying blocks of a larger array from multiple threads.
     ----------
     Inputs:
         array: The array whose elements are being classified
         thresholds: The thresholds used to classify the array
         nodata: The Nodata value for the array
         nodata_to: The value that NoData elements should be classified as
+        dtype: The dtype of the output array
+        out: A preallocated output array
+        parallel: True (default) to classify blocks of the array in parallel
 
     Outputs:
         numpy array: The classification values for the array
     """
 
-    bins = [-inf] + list(thresholds) + [inf]
-    classes = digitize(array, bins, right=True)
-    nodatas = NodataMask(array, nodata)
-    return nodatas.fill(classes, nodata_to)
+    # Get the output array. By default, use the smallest dtype that holds the classes
+    array = np.asarray(array)
+    thresholds = np.asarray(thresholds, dtype=float).reshape(-1)
+    if out is None:
+        if dtype is None and (isnan(nodata_to) or nodata_to != int(nodata_to)):
+            dtype = float
+        elif dtype is None:
+            nclasses = np.min_scalar_type(thresholds.size + 2)
+            dtype = np.result_type(nclasses, np.min_scalar_type(int(nodata_to)))
+        out = np.empty(array.shape, dtype)
+
+    # Get the NoData mode. NaN NoData classes require a floating-point output
+    if nodata is None:
+        mode, nodata, nodata_to = _NO_NODATA, 0, 0
+    elif isnan(nodata):
+        mode, nodata = _NAN_NODATA, 0
+    else:
+        mode = _VALUE_NODATA
+    if isnan(nodata_to) and not np.issubdtype(out.dtype, np.floating):
+        raise ValueError("Cannot classify NoData as NaN in an integer output array")
+
+    # Classify flattened views. (Copies if the arrays are not contiguous)
+    if array.dtype == bool:
+        array = array.view(np.uint8)
+    values = array.reshape(-1)
+    nodata, nodata_to = float(nodata), float(nodata_to)
+    if out.flags.c_contiguous:
+        classes = out.reshape(-1)
+    else:
+        classes = np.empty(out.size, out.dtype)
+    if parallel:
+        _classify(values, thresholds, mode, nodata, nodata_to, classes)
+    else:
+        _classify_block(
+            values, thresholds, mode, nodata, nodata_to, classes, 0, values.size
+        )
+    if not out.flags.c_contiguous:
+        out[...] = classes.reshape(out.shape)
+    return out
+
+
+@njit(cache=True, parallel=True)
+def _classify(values, thresholds, mode, nodata, nodata_to, out):  # pragma: no cover
+    "Classifies a flattened array in parallel blocks of elements"
+
+    nblocks = ceil(values.size / _BLOCK)
+    for block in prange(nblocks):
+        start = block * _BLOCK
+        stop = min(start + _BLOCK, values.size)
+        _classify_block(values, thresholds, mode, nodata, nodata_to, out, start, stop)
+
+
+@njit(cache=True, nogil=True)
+def _classify_block(
+    values, thresholds, mode, nodata, nodata_to, out, start, stop
+):  # pragma: no cover
+    "Classifies a block of a flattened array. Releases the GIL"
+
+    nthresholds = thresholds.size
+    for k in range(start, stop):
+        value = values[k]
+
+        # NoData
+        if (mode == _NAN_NODATA and value != value) or (
+            mode == _VALUE_NODATA and value == nodata
+        ):
+            out[k] = nodata_to
+
+        # Unmasked NaN and negative infinity match the edge bins of np.digitize
+        elif value != value:
+            out[k] = nthresholds + 2
+        elif value == -inf:
+            out[k] = 0
+
+        # Count the thresholds below the value. (Branchless, as classes are
+        # usually unpredictable from one pixel to the next)
+        else:
+            c = 1
+            for t in range(nthresholds):
+                c += value > thresholds[t]
+            out[k] = c
@@ -0,0 +1,103 @@
+"""
+Numba-compiled kernel that derives flow directions, slopes, and relief from a DEM
+----------
+The kernel in this module computes TauDEM-style D8 flow directions, flow slopes, and
+vertical relief in a single traversal of a conditioned DEM. As each cell's neighbors
+are scanned for the steepest descent, the elevation of the chosen neighbor is reused
+to compute the cell's vertical drop and flow slope, and the flow graph's in-degrees
+are tallied. Relief is then propagated down the flow graph from the ridge cells.
+
+The outputs match those of the pysheds routines used by watershed.flow,
+watershed.slopes, and watershed.relief, including their treatment of edge cells.
+----------
+Functions:
+    derive      - Computes flow directions, slopes, and relief for a DEM
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from numba import njit
+
+# D8 neighbor offsets in pysheds order (N, NE, E, SE, S, SW, W, NW), and the
+# associated TauDEM-style flow directions
+_DROWS = np.array([-1, -1, 0, 1, 1, 1, 0, -1])
+_DCOLS = np.array([0, 1, 1, 1, 0, -1, -1, -1])
+_TAUDEM = np.array([3, 2, 1, 8, 7, 6, 5, 4], dtype=np.int8)
+
+
+@njit(cache=True)
+def derive(dem, nodata, dx, dy):
+    """
+    Computes flow directions, slopes, and relief for a DEM. Cells marked as True in
+    the "nodata" mask are excluded. Returns the TauDEM-style flow directions (int8,
+    with 0 for NoData, pits, and flats), the flow slopes (unscaled rise over run), and
+    the vertical relief (NaN for cells without a flow direction)
+    """
+
+    nrows, ncols = dem.shape
+    dd = np.sqrt(dx**2 + dy**2)
+    distances = np.array([dy, dd, dx, dd, dy, dd, dx, dd])
+
+    # Initialize outputs. Track the flat index of each cell's downstream neighbor
+    flow = np.zeros(dem.shape, dtype=np.int8)
+    slopes = np.zeros(dem.shape, dtype=np.float64)
+    drops = np.zeros(dem.shape, dtype=np.float64)
+    downstream = np.full(dem.size, -1, dtype=np.int64)
+    indegree = np.zeros(dem.size, dtype=np.int64)
+
+    # Scan each cell's neighbors for the steepest descent
+    for row in range(nrows):
+        for col in range(ncols):
+            if nodata[row, col]:
+                continue
+            elevation = dem[row, col]
+            steepest = -np.inf
+            direction = -1
+            below = 0.0
+            for k in range(8):
+                nrow, ncol = row + _DROWS[k], col + _DCOLS[k]
+                if nrow < 0 or ncol < 0 or nrow >= nrows or ncol >= ncols:
+                    continue
+                elif nodata[nrow, ncol]:
+                    continue
+                neighbor = dem[nrow, ncol]
+                slope = (elevation - neighbor) / distances[k]
+                if slope > steepest:
+                    steepest = slope
+                    direction = k
+                    below = neighbor
+
+            # Pits and flats do not have a flow direction
+            if steepest <= 0:
+                continue
+            nrow, ncol = row + _DROWS[direction], col + _DCOLS[direction]
+            flow[row, col] = _TAUDEM[direction]
+            downstream[row * ncols + col] = nrow * ncols + ncol
+            indegree[nrow * ncols + ncol] += 1
+
+            # Edge cells have no drop or slope (pysheds pops the raster rim)
+            if row == 0 or col == 0 or row == nrows - 1 or col == ncols - 1:
+                continue
+            drops[row, col] = elevation - below
+            slopes[row, col] = (elevation - below) / distances[direction]
+
+    # Propagate relief down the flow graph from the ridge cells. Each cell's relief
+    # is its own drop plus the largest relief of any upstream neighbor
+    relief = np.zeros(dem.size, dtype=np.float64)
+    dh = drops.ravel()
+    ridges = np.flatnonzero((indegree == 0) & (downstream != -1))
+    for cell in ridges:
+        while indegree[cell] == 0 and downstream[cell] != -1:
+            down = downstream[cell]
+            relief[down] = max(relief[down], relief[cell] + dh[down])
+            indegree[down] -= 1
+            cell = down
+
+    # Cells without flow directions have no relief
+    relief = relief.reshape(dem.shape)
+    for row in range(nrows):
+        for col in range(ncols):
+            if flow[row, col] == 0:
+                relief[row, col] = np.nan
+    return flow, slopes, relief
@@ -0,0 +1,533 @@
+"""
+Numba-compiled priority-flood algorithms used to condition DEMs
+----------
+This module implements the Priority-Flood algorithms of Barnes et al. (2014) to fill
+depressions in a DEM, and the epsilon variant of the algorithm, which also imposes a
+minimal gradient on flats so that every flat drains to an outlet. The algorithms
+modify a floating-point DEM array in place. NaN and -inf elements are treated as NoData.
+NoData is handled as in pysheds, which floods NoData as terrain with an elevation of
+-inf. Valid cells on the edge of the DEM, and valid cells that are 8-adjacent to NoData
+regions that reach the edge of the DEM, are outlets, so the DEM drains into those
+regions. NoData regions enclosed by valid data do not drain. Instead, they are flooded
+(so water may spill through them) and are restored to NoData afterwards.
+
+The module also implements the tiled algorithm of Barnes (2016), which fills
+depressions one tile at a time. The tiled algorithm first floods each tile
+independently, and records the elevations at which the watersheds of the tile's
+perimeter cells spill into one another. It then solves the resulting spill graph for
+the elevation at which each perimeter watershed drains out of the DEM, and finally
+re-floods each tile from its (now-final) perimeter. Perimeter watersheds with no path
+to an outlet are never flooded, as in the untiled algorithm. The flood queues and
+labels only ever span a single tile. However, this is not an out-of-core algorithm:
+the DEM is held in memory, and the spill graph records the spill elevations of every
+tile's perimeter cells.
+
+References:
+Barnes, R., Lehman, C., & Mulla, D. (2014). Priority-flood: An optimal
+    depression-filling and watershed-labeling algorithm for digital elevation models.
+    Computers & Geosciences, 62, 117-127.
+
+Barnes, R. (2016). Parallel priority-flood depression filling for trillion cell
+    digital elevation models on desktops or clusters. Computers & Geosciences, 96,
+    56-68.
+----------
+User functions:
+    fill            - Fills depressions, optionally imposing epsilon gradients on flats
+    fill_tiled      - Fills depressions one tile at a time
+
+Queues:
+    _heap_push      - Adds a cell to a binary min-heap of elevations
+    _heap_pop       - Removes the lowest cell from a binary min-heap
+    _fifo_push      - Adds a cell to a first-in-first-out queue
+
+Flooding:
+    _isvalid        - True if an elevation is not NoData
+    _drained        - Locates the NoData cells connected to the edge of the DEM
+    _outlets        - Locates the cells that drain out of the DEM
+    _enclose        - Converts enclosed NoData cells to terrain
+    _restore        - Restores enclosed NoData cells to NoData
+    _flood          - Runs a priority-flood over a window of the DEM
+
+Tiled filling:
+    _tile_edges     - Floods a tile and records the spill elevations between watersheds
+    _cross_edges    - Records the spill elevations between watersheds in adjacent tiles
+    _water_levels   - Solves a spill graph for the water level of each watershed
+    _perimeter      - Returns the perimeter labels of a tile
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from numba import njit, types
+from numba.typed import Dict
+
+# D8 neighbor offsets
+_DROWS = np.array([-1, -1, -1, 0, 0, 1, 1, 1])
+_DCOLS = np.array([-1, 0, 1, -1, 1, -1, 0, 1])
+
+# Label of the watershed that drains out of the DEM
+_OCEAN = 0
+
+# Elevation used to flood enclosed NoData cells as terrain
+_LOWEST = np.finfo(np.float64).min
+
+# Numba type of the label pairs in a spill graph
+_EDGE = types.UniTuple(types.int64, 2)
+
+
+#####
+# Queues
+#####
+
+
+@njit(cache=True)
+def _heap_push(keys, cells, size, key, cell):
+    "Adds a cell to a binary min-heap. Returns the (possibly grown) heap arrays"
+
+    # Grow the heap as needed
+    if size == keys.size:
+        keys = np.concatenate((keys, np.empty_like(keys)))
+        cells = np.concatenate((cells, np.empty_like(cells)))
+
+    # Sift the new cell up the heap
+    k = size
+    while k > 0:
+        parent = (k - 1) // 2
+        if keys[parent] <= key:
+            break
+        keys[k] = keys[parent]
+        cells[k] = cells[parent]
+        k = parent
+    keys[k] = key
+    cells[k] = cell
+    return keys, cells
+
+
+@njit(cache=True)
+def _heap_pop(keys, cells, size):
+    "Removes the lowest cell from a binary min-heap. Returns the cell"
+
+    # Get the lowest cell and the last cell
+    cell = cells[0]
+    size = size - 1
+    key = keys[size]
+    last = cells[size]
+
+    # Sift the last cell down from the top of the heap
+    k = 0
+    while True:
+        child = 2 * k + 1
+        if child >= size:
+            break
+        if child + 1 < size and keys[child + 1] < keys[child]:
+            child += 1
+        if key <= keys[child]:
+            break
+        keys[k] = keys[child]
+        cells[k] = cells[child]
+        k = child
+    keys[k] = key
+    cells[k] = last
+    return cell
+
+
+@njit(cache=True)
+def _fifo_push(queue, head, tail, cell):
+    "Adds a cell to a FIFO queue. Returns the (possibly compacted or grown) queue"
+
+    if tail == queue.size:
+        count = tail - head
+        if head > queue.size // 2:
+            queue[:count] = queue[head:tail]
+        else:
+            queue = np.concatenate((queue[head:tail], np.empty_like(queue)))
+        head = 0
+        tail = count
+    queue[tail] = cell
+    return queue, head, tail + 1
+
+
+#####
+# Flooding
+#####
+
+
+@njit(cache=True)
+def _isvalid(elevation):
+    "True if an elevation is not NoData (NaN or -inf)"
+    return elevation > -np.inf
+
+
+@njit(cache=True)
+def _drained(dem):
+    """Returns a boolean array indicating the NoData cells that are 8-connected to the
+    edge of the DEM through other NoData cells"""
+
+    nrows, ncols = dem.shape
+    drained = np.zeros(dem.shape, dtype=np.bool_)
+    stack = np.empty(dem.size, dtype=np.int64)
+    count = 0
+
+    # Start from the NoData cells on the edge of the DEM
+    for row in range(nrows):
+        for col in range(ncols):
+            edge = row == 0 or col == 0 or row == nrows - 1 or col == ncols - 1
+            if edge and not _isvalid(dem[row, col]):
+                drained[row, col] = True
+                stack[count] = row * ncols + col
+                count += 1
+
+    # Search the connected NoData cells depth-first
+    while count > 0:
+        count -= 1
+        row, col = stack[count] // ncols, stack[count] % ncols
+        for k in range(8):
+            nrow, ncol = row + _DROWS[k], col + _DCOLS[k]
+            if nrow < 0 or ncol < 0 or nrow >= nrows or ncol >= ncols:
+                continue
+            if drained[nrow, ncol] or _isvalid(dem[nrow, ncol]):
+                continue
+            drained[nrow, ncol] = True
+            stack[count] = nrow * ncols + ncol
+            count += 1
+    return drained
+
+
+@njit(cache=True)
+def _outlets(dem, drained):
+    """Returns a boolean array indicating the cells that drain out of the DEM. These
+    are the valid cells on the edge of the DEM, and the valid cells that are
+    8-adjacent to drained NoData cells"""
+
+    nrows, ncols = dem.shape
+    outlets = np.zeros(dem.shape, dtype=np.bool_)
+    for row in range(nrows):
+        for col in range(ncols):
+            if not _isvalid(dem[row, col]):
+                continue
+            if row == 0 or col == 0 or row == nrows - 1 or col == ncols - 1:
+                outlets[row, col] = True
+                continue
+            for k in range(8):
+                if drained[row + _DROWS[k], col + _DCOLS[k]]:
+                    outlets[row, col] = True
+                    break
+    return outlets
+
+
+@njit(cache=True)
+def _enclose(dem, drained):
+    """Sets the enclosed NoData cells (NoData cells that are not drained) to the lowest
+    finite elevation, so they are flooded as terrain. Returns a mask of these cells"""
+
+    enclosed = np.zeros(dem.shape, dtype=np.bool_)
+    for row in range(dem.shape[0]):
+        for col in range(dem.shape[1]):
+            if not _isvalid(dem[row, col]) and not drained[row, col]:
+                enclosed[row, col] = True
+                dem[row, col] = _LOWEST
+    return enclosed
+
+
+@njit(cache=True)
+def _restore(dem, enclosed):
+    "Restores enclosed NoData cells to NoData"
+    for row in range(dem.shape[0]):
+        for col in range(dem.shape[1]):
+            if enclosed[row, col]:
+                dem[row, col] = -np.inf
+
+
+@njit(cache=True)
+def _flood(dem, seeds, r0, r1, c0, c1, epsilon, labels, edges):
+    """
+    Runs a priority-flood over the window dem[r0:r1, c0:c1], modifying the DEM in
+    place. Seeds are the cells in the window whose elements in "seeds" are True.
+    Seeds are never modified. If epsilon=True, raises flooded cells by the smallest
+    representable increment so that flats drain.
+
+    If "labels" has elements, it should have the shape of the window and hold the
+    labels of the seed cells. The flood then propagates labels from the seeds, and
+    records the lowest spill elevation between each pair of labels in "edges".
+    """
+
+    # Initialize the queues and closed cells
+    ncols = c1 - c0
+    closed = np.zeros((r1 - r0, ncols), dtype=np.bool_)
+    keys = np.empty(max(16, 2 * (r1 - r0 + ncols)), dtype=dem.dtype)
+    cells = np.empty(keys.size, dtype=np.int64)
+    size = 0
+    pit = np.empty(keys.size, dtype=np.int64)
+    head = 0
+    tail = 0
+    track = labels.size > 0
+
+    # Add the seeds to the open queue. NoData cells are always closed
+    for row in range(r0, r1):
+        for col in range(c0, c1):
+            i, j = row - r0, col - c0
+            if not _isvalid(dem[row, col]):
+                closed[i, j] = True
+            elif seeds[i, j]:
+                closed[i, j] = True
+                keys, cells = _heap_push(
+                    keys, cells, size, dem[row, col], i * ncols + j
+                )
+                size += 1
+
+    # Process cells from the pit queue first, then the open queue. If the tops of
+    # both queues have the same elevation, prefer the open queue (Barnes, 2014)
+    while size > 0 or head < tail:
+        if (
+            head < tail
+            and size > 0
+            and keys[0] == dem[pit[head] // ncols + r0, pit[head] % ncols + c0]
+        ):
+            cell = _heap_pop(keys, cells, size)
+            size -= 1
+        elif head < tail:
+            cell = pit[head]
+            head += 1
+        else:
+            cell = _heap_pop(keys, cells, size)
+            size -= 1
+
+        # Get the elevation that flooded neighbors should be raised to
+        i, j = cell // ncols, cell % ncols
+        elevation = dem[i + r0, j + c0]
+        if epsilon:
+            level = np.nextafter(elevation, np.inf)
+        else:
+            level = elevation
+
+        # Scan neighbors within the window
+        for k in range(8):
+            ni, nj = i + _DROWS[k], j + _DCOLS[k]
+            if ni < 0 or nj < 0 or ni >= r1 - r0 or nj >= ncols:
+                continue
+
+            # Optionally record spills between labeled watersheds
+            if closed[ni, nj]:
+                if track and labels[ni, nj] != labels[i, j]:
+                    other = dem[ni + r0, nj + c0]
+                    if _isvalid(other):
+                        a = min(labels[i, j], labels[ni, nj])
+                        b = max(labels[i, j], labels[ni, nj])
+                        spill = max(elevation, other)
+                        if (a, b) not in edges or spill < edges[(a, b)]:
+                            edges[(a, b)] = spill
+                continue
+
+            # Close the neighbor and propagate the label
+            closed[ni, nj] = True
+            if track:
+                labels[ni, nj] = labels[i, j]
+
+            # Raise cells in depressions and add them to the pit queue. Otherwise,
+            # add the neighbor to the open queue
+            neighbor = ni * ncols + nj
+            if dem[ni + r0, nj + c0] <= level:
+                dem[ni + r0, nj + c0] = level
+                pit, head, tail = _fifo_push(pit, head, tail, neighbor)
+            else:
+                keys, cells = _heap_push(
+                    keys, cells, size, dem[ni + r0, nj + c0], neighbor
+                )
+                size += 1
+
+
+@njit(cache=True)
+def fill(dem, epsilon):
+    """Fills the depressions in a DEM in place. If epsilon=True, also imposes
+    minimal gradients on flats so that every flat drains to an outlet"""
+
+    nrows, ncols = dem.shape
+    drained = _drained(dem)
+    enclosed = _enclose(dem, drained)
+    seeds = _outlets(dem, drained)
+    labels = np.empty((0, 0), dtype=np.int64)
+    edges = Dict.empty(_EDGE, types.float64)
+    _flood(dem, seeds, 0, nrows, 0, ncols, epsilon, labels, edges)
+    _restore(dem, enclosed)
+
+
+#####
+# Tiled filling
+#####
+
+
+@njit(cache=True)
+def _perimeter(dem, outlets, r0, r1, c0, c1):
+    """Returns the seeds and labels for a tile. Seeds are the tile's perimeter cells
+    and any outlets in the tile. Outlets have the ocean label, and other perimeter
+    cells are labeled by their flat index + 1"""
+
+    ncols = dem.shape[1]
+    seeds = np.zeros((r1 - r0, c1 - c0), dtype=np.bool_)
+    labels = np.full(seeds.shape, -1, dtype=np.int64)
+    for row in range(r0, r1):
+        for col in range(c0, c1):
+            if not _isvalid(dem[row, col]):
+                continue
+            i, j = row - r0, col - c0
+            if outlets[row, col]:
+                seeds[i, j] = True
+                labels[i, j] = _OCEAN
+            elif row == r0 or col == c0 or row == r1 - 1 or col == c1 - 1:
+                seeds[i, j] = True
+                labels[i, j] = row * ncols + col + 1
+    return seeds, labels
+
+
+@njit(cache=True)
+def _tile_edges(dem, outlets, r0, r1, c0, c1, edges):
+    """Floods a copy of a tile and records the lowest spill elevation between each
+    pair of perimeter watersheds in the tile"""
+
+    tile = dem[r0:r1, c0:c1].copy()
+    seeds, labels = _perimeter(dem, outlets, r0, r1, c0, c1)
+    _flood(tile, seeds, 0, r1 - r0, 0, c1 - c0, False, labels, edges)
+
+
+@njit(cache=True)
+def _cross_edges(dem, outlets, rows, cols, edges):
+    """Records the spill elevations between the perimeter watersheds of adjacent
+    tiles. rows and cols hold the tile index of each DEM row and column"""
+
+    nrows, ncols = dem.shape
+    for row in range(nrows):
+        for col in range(ncols):
+            if not _isvalid(dem[row, col]):
+                continue
+            for k in range(8):
+                nrow, ncol = row + _DROWS[k], col + _DCOLS[k]
+                if nrow < 0 or ncol < 0 or nrow >= nrows or ncol >= ncols:
+                    continue
+                if rows[nrow] == rows[row] and cols[ncol] == cols[col]:
+                    continue
+                if not _isvalid(dem[nrow, ncol]):
+                    continue
+
+                # Cells on tile edges are labeled by their flat index, unless they
+                # drain out of the DEM
+                a = _OCEAN
+                if not outlets[row, col]:
+                    a = row * ncols + col + 1
+                b = _OCEAN
+                if not outlets[nrow, ncol]:
+                    b = nrow * ncols + ncol + 1
+                if a == b:
+                    continue
+                key = (min(a, b), max(a, b))
+                spill = max(dem[row, col], dem[nrow, ncol])
+                if key not in edges or spill < edges[key]:
+                    edges[key] = spill
+
+
+@njit(cache=True)
+def _water_levels(edges):
+    """Solves a spill graph for the lowest elevation at which each watershed
+    drains to the ocean. Returns a dict mapping labels to water levels"""
+
+    # Build an adjacency list of compact node indices
+    nodes = Dict.empty(types.int64, types.int64)
+    nodes[_OCEAN] = 0
+    for a, b in edges:
+        if a not in nodes:
+            nodes[a] = len(nodes)
+        if b not in nodes:
+            nodes[b] = len(nodes)
+    nnodes = len(nodes)
+    degree = np.zeros(nnodes + 1, dtype=np.int64)
+    for a, b in edges:
+        degree[nodes[a] + 1] += 1
+        degree[nodes[b] + 1] += 1
+    offsets = np.cumsum(degree)
+    neighbors = np.empty(offsets[-1], dtype=np.int64)
+    weights = np.empty(offsets[-1], dtype=np.float64)
+    fill = offsets[:-1].copy()
+    for (a, b), spill in edges.items():
+        a, b = nodes[a], nodes[b]
+        neighbors[fill[a]] = b
+        weights[fill[a]] = spill
+        fill[a] += 1
+        neighbors[fill[b]] = a
+        weights[fill[b]] = spill
+        fill[b] += 1
+
+    # Priority-flood the graph from the ocean. Each node's level is the lowest
+    # possible maximum spill elevation along a path to the ocean
+    levels = np.full(nnodes, np.inf)
+    done = np.zeros(nnodes, dtype=np.bool_)
+    keys = np.empty(16, dtype=np.float64)
+    cells = np.empty(16, dtype=np.int64)
+    keys, cells = _heap_push(keys, cells, 0, -np.inf, 0)
+    size = 1
+    levels[0] = -np.inf
+    while size > 0:
+        node = _heap_pop(keys, cells, size)
+        size -= 1
+        if done[node]:
+            continue
+        done[node] = True
+        for k in range(offsets[node], offsets[node + 1]):
+            neighbor = neighbors[k]
+            level = max(levels[node], weights[k])
+            if not done[neighbor] and level < levels[neighbor]:
+                levels[neighbor] = level
+                keys, cells = _heap_push(keys, cells, size, level, neighbor)
+                size += 1
+
+    # Map labels to water levels
+    output = Dict.empty(types.int64, types.float64)
+    for label, node in nodes.items():
+        output[label] = levels[node]
+    return output
+
+
+@njit(cache=True)
+def fill_tiled(dem, nrows, ncols):
+    """Fills the depressions in a DEM in place, processing the DEM in tiles with
+    (at most) the indicated number of rows and columns"""
+
+    # Get the tile index of each row and column
+    rows = np.arange(dem.shape[0]) // nrows
+    cols = np.arange(dem.shape[1]) // ncols
+    row_starts = np.arange(0, dem.shape[0], nrows)
+    col_starts = np.arange(0, dem.shape[1], ncols)
+
+    # Flood enclosed NoData as terrain, and locate the outlets
+    drained = _drained(dem)
+    enclosed = _enclose(dem, drained)
+    outlets = _outlets(dem, drained)
+
+    # Build the spill graph from the tiles and the tile boundaries
+    edges = Dict.empty(_EDGE, types.float64)
+    for r0 in row_starts:
+        r1 = min(r0 + nrows, dem.shape[0])
+        for c0 in col_starts:
+            c1 = min(c0 + ncols, dem.shape[1])
+            _tile_edges(dem, outlets, r0, r1, c0, c1, edges)
+    _cross_edges(dem, outlets, rows, cols, edges)
+    levels = _water_levels(edges)
+
+    # Raise each tile's perimeter to its water level and re-flood the tile.
+    # Watersheds that never drain out of the DEM are not flooded
+    empty = np.empty((0, 0), dtype=np.int64)
+    for r0 in row_starts:
+        r1 = min(r0 + nrows, dem.shape[0])
+        for c0 in col_starts:
+            c1 = min(c0 + ncols, dem.shape[1])
+            seeds, labels = _perimeter(dem, outlets, r0, r1, c0, c1)
+            for i in range(r1 - r0):
+                for j in range(c1 - c0):
+                    label = labels[i, j]
+                    if not seeds[i, j] or label not in levels:
+                        continue
+                    level = levels[label]
+                    if level == np.inf:
+                        seeds[i, j] = False
+                    else:
+                        dem[r0 + i, c0 + j] = max(dem[r0 + i, c0 + j], level)
+            _flood(dem, seeds, r0, r1, c0, c1, False, empty, edges)
+    _restore(dem, enclosed)
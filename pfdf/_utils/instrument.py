@@ -0,0 +1,175 @@
+"""
+instrument  Records the timings of instrumented pfdf routines
+----------
+This module implements the decorator used to instrument the major public entry
+points of pfdf. When no profile is active, an instrumented routine checks a single
+module variable and calls the wrapped function directly. When a profile is active
+(see pfdf.utils.profiling), each call is recorded as an event with its start time,
+duration, thread, the shapes of any array-like inputs, and optionally the peak
+number of bytes allocated during the call.
+
+Setting the PFDF_PROFILE environment variable to a file path activates a profile
+when pfdf is imported, and saves it as a Chrome trace when the interpreter exits.
+----------
+Decorator:
+    traced          - Records calls to a function in the active profile
+
+State:
+    activate        - Sets the active profile
+    deactivate      - Clears the active profile
+
+Internal:
+    _name           - Returns the event name for a function
+    _shapes         - Returns the shapes of array-like inputs
+    _record         - Calls a function and records the event
+    _from_environment - Activates a profile from the PFDF_PROFILE environment variable
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+import tracemalloc
+import typing
+from functools import wraps
+
+if typing.TYPE_CHECKING:
+    from typing import Any, Callable, Optional
+
+    from pfdf.utils.profiling import Profile
+
+# The active profile. None when profiling is disabled
+_active: Optional[Profile] = None
+
+# Per-thread stacks of the peak memory of nested calls
+_stacks = threading.local()
+
+
+#####
+# Decorator
+#####
+
+
+def traced(function: Callable) -> Callable:
+    "Records calls to a function in the active profile"
+
+    name = _name(function)
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        if _active is None:
+            return function(*args, **kwargs)
+        return _record(_active, name, function, args, kwargs)
+
+    return wrapper
+
+
+#####
+# State
+#####
+
+
+def activate(profile: Profile) -> None:
+    "Sets the active profile. Starts tracing memory if requested"
+    global _active
+    if _active is not None:
+        raise RuntimeError("Cannot start a pfdf profile while another is active")
+    if profile.memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        profile._stop_tracing = True
+    _active = profile
+
+
+def deactivate() -> None:
+    "Clears the active profile. Stops tracing memory if the profile started it"
+    global _active
+    profile, _active = _active, None
+    if profile is not None and profile._stop_tracing:
+        tracemalloc.stop()
+        profile._stop_tracing = False
+
+
+#####
+# Internal
+#####
+
+
+def _name(function: Callable) -> str:
+    "Returns the event name for a function, such as watershed.flow or Raster.save"
+    name = function.__qualname__
+    if "." not in name:
+        module = function.__module__.rsplit(".", 1)[-1]
+        name = f"{module}.{name}"
+    return name
+
+
+def _shapes(args: tuple, kwargs: dict) -> list[tuple[int, ...]]:
+    "Returns the shapes of array-like inputs"
+    shapes = []
+    for value in (*args, *kwargs.values()):
+        shape = getattr(value, "shape", None)
+        if isinstance(shape, tuple):
+            shapes.append(shape)
+    return shapes
+
+
+def _record(
+    profile: Profile, name: str, function: Callable, args: tuple, kwargs: dict
+) -> Any:
+    "Calls a function and records the event in a profile"
+
+    # Start tracking the peak memory of this call. Nested calls reset the peak, so
+    # first fold the enclosing call's peak so far into its frame. Each call also
+    # tracks the largest peak of its children
+    memory = profile.memory and tracemalloc.is_tracing()
+    if memory:
+        stack = getattr(_stacks, "peaks", None)
+        if stack is None:
+            stack = _stacks.peaks = []
+        initial, peak = tracemalloc.get_traced_memory()
+        if stack:
+            stack[-1] = max(stack[-1], peak)
+        tracemalloc.reset_peak()
+        stack.append(0)
+
+    # Time the call
+    start = time.perf_counter()
+    try:
+        return function(*args, **kwargs)
+    finally:
+        stop = time.perf_counter()
+        event = {
+            "name": name,
+            "start": start,
+            "duration": stop - start,
+            "thread": threading.get_ident(),
+            "shapes": _shapes(args, kwargs),
+        }
+
+        # Record the bytes allocated at the peak of the call
+        if memory:
+            peak = max(tracemalloc.get_traced_memory()[1], stack.pop())
+            event["bytes"] = max(peak - initial, 0)
+            if stack:
+                stack[-1] = max(stack[-1], peak)
+        profile._events.append(event)
+
+
+def _from_environment() -> None:
+    "Activates a profile if the PFDF_PROFILE environment variable is a file path"
+
+    path = os.environ.get("PFDF_PROFILE")
+    if not path:
+        return
+
+    import atexit
+
+    from pfdf.utils.profiling import Profile
+
+    profile = Profile()
+    activate(profile)
+    atexit.register(profile.save, path, overwrite=True)
+
+
+_from_environment()
@@ -5,6 +5,8 @@ When numpy updated to 2.0, it changed the API for the `can_cast` function. This
 broke the NoData dtype checks in pysheds 0.4. This module provides a context manager
 that swaps out the affected pysheds function with a patched version until a fix can be
 released by pysheds.
+
+pysheds is slow to import, so it is only imported when a patch is created.
 ----------
 Contents:
     Patch   - A context manager that patches the broken pysheds function
@@ -12,9 +14,6 @@ Contents:
 """
 
 import numpy as np
-from pysheds import _sgrid as _self
-from pysheds.sgrid import sGrid
-from pysheds.sview import Raster, ViewFinder
 
 
 class NodataPatch:
@@ -30,19 +29,24 @@ class NodataPatch:
 
     def __init__(self):
         "Stores a reference to the original (buggy) function"
+        from pysheds.sview import Raster
+
+        self.raster = Raster
         self.initial = Raster.__new__
 
     def __enter__(self):
         "Replaces the affected function with the patched code"
-        Raster.__new__ = self.patch
+        self.raster.__new__ = self.patch
 
     def __exit__(self, *args, **kwargs) -> None:
         "Restores the original function"
-        Raster.__new__ = self.initial
+        self.raster.__new__ = self.initial
 
     @staticmethod  # pragma: no cover
     def patch(cls, input_array, viewfinder=None, metadata={}):
         "A patched version of pysheds.sview.Raster.__new__"
+        from pysheds.sview import Raster, ViewFinder
+
         try:
             # MultiRaster must be subclass of ndarray
             assert isinstance(input_array, np.ndarray)
@@ -110,15 +114,18 @@ class RidgePatch:
 
     def __init__(self):
         "Stores a reference to the original (buggy) function"
+        from pysheds.sgrid import sGrid
+
+        self.sgrid = sGrid
         self.initial = sGrid._d8_distance_to_ridge
 
     def __enter__(self):
         "Replaces the affected function with the patched code"
-        sGrid._d8_distance_to_ridge = self.patch
+        self.sgrid._d8_distance_to_ridge = self.patch
 
     def __exit__(self, *args, **kwargs) -> None:
         "Restores the original function"
-        sGrid._d8_distance_to_ridge = self.initial
+        self.sgrid._d8_distance_to_ridge = self.initial
 
     @staticmethod  # pragma: no cover
     def patch(
@@ -131,6 +138,8 @@ class RidgePatch:
         **kwargs,
     ):
         "A patched version of pysheds.sgrid.sGrid._d8_distance_to_ridge"
+        from pysheds import _sgrid as _self
+
         # Find nodata cells and invalid cells
         nodata_cells = self._get_nodata_cells(fdir)
         invalid_cells = ~np.isin(fdir.ravel(), dirmap).reshape(fdir.shape)
@@ -12,29 +12,42 @@ Elements:
     flow        - Checks elements represents TauDEM-style flow directions (integers 1 to 8)
 
 Utilities:
-    _get_data       - Returns the data elements and data mask for an array
-    _check_integers - Checks that elements are integers
-    _check_bound    - Checks that elements have a comparison relationship with a bound
+    _scan           - Applies element checks in a single pass over an array
+    _values         - Returns the flattened array values in a dtype supported by the kernel
+    _ignored        - Returns the ignored data values that can occur in an array
     _check          - Checks that elements passed a validation check
-    _first_failure  - Returns the index and value of the first failed element
+    _failure        - Returns the index and value of a failed element
+
+Kernels:
+    _count          - Counts the failed data elements in a single vectorized pass
+    _bounds         - Counts the data elements outside of bounds
+    _integers       - Counts the data elements outside of bounds or that are not integers
+    _binary         - Counts the data elements that are not 0 or 1
+    _defined        - Counts the NaN elements
+    _finite         - Counts the infinite and NaN elements
+    _locate         - Records the first failure of each requested check
 """
 
 from __future__ import annotations
 
 import typing
+from math import inf
 
 import numpy as np
+from numba import njit
 from numpy import integer, issubdtype, unsignedinteger
 
-from pfdf._utils.nodata import NodataMask
+from pfdf._utils import aslist
 
 if typing.TYPE_CHECKING:
     from typing import Optional
 
-    from pfdf.typing.core import BooleanArray, RealArray, ignore, scalar
+    from pfdf.typing.core import BooleanArray, RealArray, VectorArray, ignore, scalar
 
-    index = tuple[int, ...]
-    DataMask = NodataMask  # More clear for when invert=True
+    index = list[int]
+
+# Element checks, in the order that failures are reported
+_LOWER, _UPPER, _INTEGERS, _BINARY, _DEFINED, _FINITE = range(6)
 
 
 #####
@@ -58,18 +71,23 @@ def defined(array: RealArray, name: str) -> None:
         ValueError: If the array's data elements contains NaN values
     """
 
-    defined = ~np.isnan(array)
-    if not np.all(defined):
-        index, _ = _first_failure(defined, array)
+    # Integer and boolean dtypes cannot hold NaN
+    if issubdtype(array.dtype, integer) or array.dtype == bool:
+        return
+    failed = _scan(array, defined=True)[_DEFINED]
+    if failed != -1:
+        index, _ = _failure(array, failed)
         raise ValueError(
             f"{name} cannot contain NaN elements, but element {index} is NaN."
         )
 
 
 def finite(array, name):
-    finite = np.isfinite(array)
-    if not np.all(finite):
-        index, value = _first_failure(finite, array)
+    if issubdtype(array.dtype, integer) or array.dtype == bool:
+        return
+    failed = _scan(array, finite=True)[_FINITE]
+    if failed != -1:
+        index, value = _failure(array, failed)
         raise ValueError(
             f"{name} can only contain finite elements, "
             f"but element {index} (value={value}) is not finite."
@@ -105,16 +123,15 @@ def boolean(
         ValueError: If the array's data elements have values that are neither 0 nor 1
     """
 
-    # Boolean dtype is always valid. Otherwise, test the valid data elements.
-    if array.dtype != bool:
-        data, mask = _get_data(array, ignore)
-        valid = np.isin(data, [0, 1])
-        _check(valid, "0 or 1", array, name, mask)
+    # Boolean dtype is always valid
+    if array.dtype == bool:
+        return array.astype(bool, copy=True)
 
-    # Return boolean copy in which NoData values are False
-    output = array.astype(bool, copy=True)
-    if array.dtype != bool:
-        mask.fill(output, False, invert=True)
+    # Otherwise, test the valid data elements while building the boolean copy in
+    # which NoData values are False
+    output = np.empty(array.shape, bool)
+    failures = _scan(array, ignore, binary=True, output=output.reshape(-1))
+    _check(failures, _BINARY, "0 or 1", array, name)
     return output
 
 
@@ -143,8 +160,8 @@ def integers(array: RealArray, name: str, ignore: Optional[ignore] = None) -> No
 
     # Integer and boolean dtype always pass. If not one of these, test the data elements
     if not issubdtype(array.dtype, integer) and array.dtype != bool:
-        data, mask = _get_data(array, ignore)
-        _check_integers(data, name, array, mask)
+        failures = _scan(array, ignore, integers=True)
+        _check(failures, _INTEGERS, "integers", array, name)
 
 
 def positive(
@@ -183,15 +200,15 @@ def positive(
     dtype = array.dtype
     always_valid = allow_zero and (issubdtype(dtype, unsignedinteger) or dtype == bool)
     if not always_valid:
-        # Otherwise, get the appropriate operator
+        # Otherwise, get the appropriate comparison
         if allow_zero:
-            operator = ">="
+            description = "greater than or equal to 0"
         else:
-            operator = ">"
+            description = "greater than 0"
 
         # Validate the data elements
-        data, mask = _get_data(array, ignore)
-        _check_bound(data, name, operator, 0, array, mask)
+        failures = _scan(array, ignore, lower=0, exclusive=not allow_zero)
+        _check(failures, _LOWER, description, array, name)
 
 
 def inrange(
@@ -226,9 +243,9 @@ def inrange(
         ValueError: If the array's data elements contain values not within the bounds
     """
 
-    data, mask = _get_data(array, ignore)
-    _check_bound(data, name, ">=", min, array, mask)
-    _check_bound(data, name, "<=", max, array, mask)
+    failures = _scan(array, ignore, lower=min, upper=max)
+    _check(failures, _LOWER, f"greater than or equal to {min}", array, name)
+    _check(failures, _UPPER, f"less than or equal to {max}", array, name)
 
 
 def sorted(array: RealArray, name: str) -> None:
@@ -275,10 +292,11 @@ def flow(array: RealArray, name: str, ignore: Optional[ignore] = None) -> None:
             integer from 1 to 8
     """
 
-    data, mask = _get_data(array, ignore)
-    _check_bound(data, name, ">=", 1, array, mask)
-    _check_bound(data, name, "<=", 8, array, mask)
-    _check_integers(data, name, array, mask)
+    integers = not issubdtype(array.dtype, integer)
+    failures = _scan(array, ignore, lower=1, upper=8, integers=integers)
+    _check(failures, _LOWER, "greater than or equal to 1", array, name)
+    _check(failures, _UPPER, "less than or equal to 8", array, name)
+    _check(failures, _INTEGERS, "integers", array, name)
 
 
 #####
@@ -286,108 +304,316 @@ def flow(array: RealArray, name: str, ignore: Optional[ignore] = None) -> None:
 #####
 
 
-def _get_data(array: RealArray, ignore: ignore) -> tuple[RealArray, DataMask]:
-    "Returns the data values and valid data mask for an array"
-    mask = NodataMask(array, ignore, invert=True)
-    values = mask.values(array)
-    return values, mask
-
-
-def _check_integers(
-    data: RealArray, name: str, array: RealArray, mask: DataMask
-) -> None:
-    "Checks that elements are integers"
-    isinteger = np.mod(data, 1) == 0
-    _check(isinteger, "integers", array, name, mask)
-
-
-def _check_bound(
-    data: RealArray,
-    name: str,
-    operator: str,
-    bound: scalar,
+def _scan(
     array: RealArray,
-    mask: DataMask,
-) -> None:
+    ignore: Optional[ignore] = None,
+    *,
+    lower: Optional[scalar] = None,
+    exclusive: bool = False,
+    upper: Optional[scalar] = None,
+    integers: bool = False,
+    binary: bool = False,
+    defined: bool = False,
+    finite: bool = False,
+    output: Optional[BooleanArray] = None,
+) -> VectorArray:
     """
-    _check_bound  Checks that elements of a numpy array are valid relative to a bound
+    _scan  Applies element checks in a single pass over an array
     ----------
-    _check_bound(data, name, operator, bound, array, mask)
-    Checks that the elements of the input numpy array are valid relative to a
-    bound. Valid comparisons are >, <, >=, and <=. Raises a ValueError if the
-    criterion is not met.
+    _scan(array, ignore, *, lower, exclusive, upper, integers)
+    _scan(array, ignore, *, binary=True, output)
+    _scan(array, *, defined=True)
+    _scan(array, *, finite=True)
+    Applies element checks to the data elements of an array, skipping any elements
+    that match the ignored values. Bounds may be combined with the integer check,
+    but the binary, defined, and finite checks are applied alone. Lower bounds are
+    inclusive unless exclusive=True, and upper bounds are inclusive. Bounds that
+    are None are not checked. The binary check also fills a flat boolean output
+    vector with whether each element is a non-zero data element (ignored elements
+    are False).
+
+    Passing arrays are swept once. If any element fails, locates the first failed
+    element of each check. Returns the flat (C-order) index of the first element
+    that fails each check, or -1 if every element passes. The returned vector is
+    ordered as the _LOWER, _UPPER, _INTEGERS, _BINARY, _DEFINED, and _FINITE checks.
+    Locating stops once the first requested check in this order fails.
     ----------
     Inputs:
-        data: The data values being checked
-        name: A name for the input for use in error messages
-        operator: The comparison operator to apply. Options are '<', '>', '<=',
-            and '>='. Elements must satisfy: (input operator bound) to be valid.
-            For example, input < bound.
-        bound: The bound being compared to the elements of the array.
-        array: The complete array that the data values were extracted from
-        mask: The valid data mask for the complete array.
+        array: The array being checked
+        ignore: A value or list of data values to ignore in the array
+        lower: An optional lower bound
+        exclusive: True to require elements strictly greater than the lower bound
+        upper: An optional upper bound (inclusive)
+        integers: True to check elements are integers
+        binary: True to check elements are 0 or 1
+        defined: True to check elements are not NaN
+        finite: True to check elements are neither infinite nor NaN
+        output: A flat boolean vector to fill for the binary check
 
-    Raises:
-        ValueError: If any element fails the comparison
+    Outputs:
+        int 1D numpy array: The index of the first failed element for each check
     """
 
-    # Only compare if bounds were specified. Get the comparison operator
-    if bound is not None:
-        if operator == "<":
-            description = "less than"
-            operator = np.less
-        elif operator == "<=":
-            description = "less than or equal to"
-            operator = np.less_equal
-        elif operator == ">=":
-            description = "greater than or equal to"
-            operator = np.greater_equal
-        elif operator == ">":
-            description = "greater than"
-            operator = np.greater
-
-        # Test the valid data elements.
-        passed = operator(data, bound)
-        _check(passed, f"{description} {bound}", array, name, mask)
+    # Skip the sweep if nothing is requested
+    failures = np.full(6, -1, np.int64)
+    requested = (
+        lower is not None,
+        upper is not None,
+        integers,
+        binary,
+        defined,
+        finite,
+    )
+    if not any(requested):
+        return failures
+
+    # Get the kernel inputs. Missing bounds are unbounded
+    values = _values(array)
+    ignore, skipnan = _ignored(ignore, values.dtype)
+    low = -inf if lower is None else float(lower)
+    high = inf if upper is None else float(upper)
+    exclusive = bool(exclusive)
+
+    # Count the failed elements
+    if binary:
+        nfailed = _binary(values, ignore, skipnan, output)
+    elif defined:
+        nfailed = _defined(values)
+    elif finite:
+        nfailed = _finite(values)
+    elif integers:
+        nfailed = _integers(values, ignore, skipnan, low, exclusive, high)
+    else:
+        nfailed = _bounds(values, ignore, skipnan, low, exclusive, high)
+
+    # Locate the failures
+    if nfailed > 0:
+        requested = np.array(requested)
+        _locate(values, ignore, skipnan, low, exclusive, high, requested, failures)
+    return failures
+
+
+def _values(array: RealArray) -> VectorArray:
+    "Returns the flattened array values in a dtype supported by the kernel"
+
+    values = np.ravel(array)
+    dtype = values.dtype
+    if dtype == bool:
+        return values.view(np.uint8)
+    elif dtype.kind not in "iuf" or dtype == np.float16:
+        return values.astype(float)
+    elif not dtype.isnative:
+        return values.astype(dtype.newbyteorder("="))
+    return values
+
+
+def _ignored(ignore: ignore, dtype: np.dtype) -> tuple[VectorArray, bool]:
+    """Returns the ignored data values that can occur in an array of the given
+    dtype, and whether NaN values are ignored"""
+
+    values = []
+    skipnan = False
+    for value in aslist(ignore):
+        if value is None:
+            continue
+        elif np.isnan(value):
+            skipnan = True
+            continue
+
+        # Only keep values that are exactly representable in the array dtype
+        with np.errstate(invalid="ignore", over="ignore"):
+            cast = np.array(value).astype(dtype)
+        if cast == value:
+            values.append(cast)
+    return np.array(values, dtype=dtype), skipnan
 
 
 def _check(
-    passed: BooleanArray,
+    failures: VectorArray,
+    check: int,
     description: str,
     array: RealArray,
     name: str,
-    mask: DataMask,
 ) -> None:
     """Checks that all data elements passed a validation check. Raises a
     ValueError indicating the first failed element if not."""
 
-    if not np.all(passed):
-        index, value = _first_failure(passed, array, mask)
+    if failures[check] != -1:
+        index, value = _failure(array, failures[check])
         raise ValueError(
             f"The data elements of {name} must be {description}, "
             f"but element {index} (value={value}) is not."
         )
 
 
-def _first_failure(
-    passed: BooleanArray,
-    array: RealArray = None,
-    mask: Optional[DataMask] = None,
-) -> tuple[index, str]:
-    "Returns the index and data value of the first failed element"
+def _failure(array: RealArray, failed: int) -> tuple[index, str]:
+    "Returns the index and data value of a failed element"
+    index = np.unravel_index(failed, array.shape)
+    value = str(array[index])
+    index = list(int(k) for k in index)
+    return index, value
 
-    # Get data indices
-    if mask is None:
-        indices = np.arange(array.size)
-    else:
-        indices = mask.indices()
 
-    # Locate the index of the first failed element
-    first = np.argmin(passed)
-    first = indices[first]
-    first = np.unravel_index(first, array.shape)
+#####
+# Kernels
+#####
+
 
-    # Return indices and associated value
-    value = str(array[first])
-    first = list(int(index) for index in first)
-    return first, value
+@njit(cache=True)
+def _count(
+    values,
+    ignore,
+    skipnan,
+    lower,
+    exclusive,
+    upper,
+    integers,
+    binary,
+    defined,
+    finite,
+    output,
+):  # pragma: no cover
+    """Counts the failed data elements in a single pass. Uses branch-free tests
+    so that the loop vectorizes. The check options are constants in the calling
+    kernels, so each caller compiles a specialized loop"""
+
+    # Extra ignored values are rare, so are tested separately
+    hasignore = ignore.size > 0
+    extra = ignore.size > 1
+    ignore0 = ignore[0] if hasignore else values.dtype.type(0)
+    inclusive = not exclusive
+    fill = output.size > 0
+
+    nfailed = 0
+    for i in range(values.size):
+        x = values[i]
+        ignored = (skipnan & (x != x)) | (hasignore & (x == ignore0))
+        if extra:
+            for k in range(1, ignore.size):
+                ignored |= x == ignore[k]
+
+        passed = ((x > lower) | (inclusive & (x == lower))) & (x <= upper)
+        if integers:
+            passed &= x - np.floor(x) == 0
+        if binary:
+            passed &= (x == 0) | (x == 1)
+        if defined:
+            passed &= x == x
+        if finite:
+            passed &= x - x == 0
+        nfailed += (not passed) & (not ignored)
+        if fill:
+            output[i] = (x != 0) & (not ignored)
+    return nfailed
+
+
+@njit(cache=True)
+def _bounds(values, ignore, skipnan, lower, exclusive, upper):  # pragma: no cover
+    "Counts the data elements outside of bounds"
+    output = np.empty(0, np.bool_)
+    return _count(
+        values,
+        ignore,
+        skipnan,
+        lower,
+        exclusive,
+        upper,
+        False,
+        False,
+        False,
+        False,
+        output,
+    )
+
+
+@njit(cache=True)
+def _integers(values, ignore, skipnan, lower, exclusive, upper):  # pragma: no cover
+    "Counts the data elements outside of bounds or that are not integers"
+    output = np.empty(0, np.bool_)
+    return _count(
+        values,
+        ignore,
+        skipnan,
+        lower,
+        exclusive,
+        upper,
+        True,
+        False,
+        False,
+        False,
+        output,
+    )
+
+
+@njit(cache=True)
+def _binary(values, ignore, skipnan, output):  # pragma: no cover
+    "Counts the data elements that are not 0 or 1, and fills the boolean output"
+    return _count(
+        values,
+        ignore,
+        skipnan,
+        -np.inf,
+        False,
+        np.inf,
+        False,
+        True,
+        False,
+        False,
+        output,
+    )
+
+
+@njit(cache=True)
+def _defined(values):  # pragma: no cover
+    "Counts the NaN elements"
+    ignore = np.empty(0, values.dtype)
+    output = np.empty(0, np.bool_)
+    return _count(
+        values, ignore, False, -np.inf, False, np.inf, False, False, True, False, output
+    )
+
+
+@njit(cache=True)
+def _finite(values):  # pragma: no cover
+    "Counts the infinite and NaN elements"
+    ignore = np.empty(0, values.dtype)
+    output = np.empty(0, np.bool_)
+    return _count(
+        values, ignore, False, -np.inf, False, np.inf, False, False, False, True, output
+    )
+
+
+@njit(cache=True)
+def _locate(
+    values, ignore, skipnan, lower, exclusive, upper, requested, failures
+):  # pragma: no cover
+    "Records the first failure of each requested check"
+
+    # Once the first requested check fails, the remaining elements are not needed
+    first = np.argmax(requested)
+    for i in range(values.size):
+        x = values[i]
+
+        # Skip ignored elements
+        ignored = skipnan and x != x
+        for k in range(ignore.size):
+            ignored = ignored or x == ignore[k]
+        if ignored:
+            continue
+
+        # Test each check. (Comparisons with NaN fail)
+        if exclusive:
+            failed = (not x > lower, not x <= upper)
+        else:
+            failed = (not x >= lower, not x <= upper)
+        failed = failed + (
+            x - np.floor(x) != 0,
+            not (x == 0 or x == 1),
+            x != x,
+            x - x != 0,
+        )
+        for k in range(6):
+            if requested[k] and failed[k] and failures[k] == -1:
+                failures[k] = i
+        if failures[first] != -1:
+            break
@@ -35,6 +35,25 @@ Subpackages:
 
 Internal:
     _utils      - Utility modules used throughout the package
+
+Subpackages are imported when first accessed, so importing this package does not
+load every data provider.
 """
 
-from pfdf.data import landfire, noaa, retainments, usgs
+import importlib
+
+# Lazily imported subpackages
+_subpackages = ["landfire", "noaa", "retainments", "usgs"]
+
+
+def __getattr__(name: str):
+    "Imports subpackages when first accessed"
+    if name not in _subpackages:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f"{__name__}.{name}")
+    globals()[name] = module
+    return module
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + _subpackages)
@@ -6,6 +6,7 @@ Functions:
 
 Modules:
     _unzip      - Implements the "unzip" function
+    remote      - Tunes GDAL for windowed reads of remote cloud-optimized rasters
     requests    - Handles interactions with the `requests` library
     validate    - Validation functions used throughout the package
 """
@@ -0,0 +1,136 @@
+"""
+Utility module to tune GDAL for windowed reads of remote cloud-optimized rasters
+----------
+When rasterio opens an http(s) URL, GDAL reads the file via its /vsicurl/ virtual
+file system using HTTP range requests. The efficiency of these reads depends on a
+number of GDAL configuration options, including whether consecutive ranges are
+merged, the size of the block cache, and whether HTTP/2 multiplexing is used. This
+module provides a context manager that applies options tuned for reading small
+windows from large cloud-optimized GeoTIFFs (COGs), and that optionally counts the
+number of bytes fetched from the remote server.
+----------
+Functions:
+    options         - Returns GDAL config options tuned for remote windowed reads
+    env             - Context manager that applies tuned options and counts fetched bytes
+
+Utilities:
+    _ranges         - Returns the byte ranges reported by a vsicurl debug message
+    _ByteCounter    - Logging handler that sums the bytes fetched by vsicurl
+"""
+
+from __future__ import annotations
+
+import logging
+import typing
+from contextlib import contextmanager
+
+import rasterio
+
+if typing.TYPE_CHECKING:
+    from typing import Iterator
+
+    from pfdf.typing.core import scalar
+
+# Logger that receives the GDAL debug messages forwarded by rasterio
+_LOGGER = "rasterio"
+
+
+#####
+# Config options
+#####
+
+
+def options(cache: scalar) -> dict[str, str | int]:
+    "Returns GDAL config options tuned for windowed reads of remote COGs"
+
+    nbytes = int(cache * 1024 * 1024)
+    return {
+        # Don't list the remote "directory" or probe for sidecar files on open
+        "GDAL_DISABLE_READDIR_ON_OPEN": "EMPTY_DIR",
+        "CPL_VSIL_CURL_ALLOWED_EXTENSIONS": ".tif,.tiff",
+        # Merge requests for adjacent blocks into a single range request
+        "GDAL_HTTP_MERGE_CONSECUTIVE_RANGES": "YES",
+        # Multiplex parallel range requests over a single HTTP/2 connection
+        "GDAL_HTTP_VERSION": "2TLS",
+        "GDAL_HTTP_MULTIPLEX": "YES",
+        # Block caches (the raster block cache uses MB, the vsicurl cache uses bytes)
+        "GDAL_CACHEMAX": max(1, int(cache)),
+        "CPL_VSIL_CURL_CACHE_SIZE": nbytes,
+        "VSI_CACHE": "TRUE",
+        "VSI_CACHE_SIZE": nbytes,
+    }
+
+
+@contextmanager
+def env(cache: scalar, count: bool) -> Iterator[_ByteCounter | None]:
+    """
+    Context manager that applies tuned GDAL options for remote reads. If count=True,
+    yields a _ByteCounter that records the bytes fetched within the context.
+    Otherwise, yields None
+    """
+
+    config = options(cache)
+    if not count:
+        with rasterio.Env(**config):
+            yield None
+        return
+
+    # Enable GDAL debug messages and capture them from the rasterio logger
+    counter = _ByteCounter()
+    logger = logging.getLogger(_LOGGER)
+    level = logger.level
+    logger.addHandler(counter)
+    logger.setLevel(logging.DEBUG)
+    try:
+        with rasterio.Env(CPL_DEBUG="ON", **config):
+            yield counter
+
+    # Restore the logger
+    finally:
+        logger.removeHandler(counter)
+        logger.setLevel(level)
+
+
+#####
+# Byte counts
+#####
+
+
+def _ranges(message: str) -> list[tuple[int, int]]:
+    """Returns the (inclusive) byte ranges reported by a vsicurl debug message.
+    Returns an empty list if the message does not report a download"""
+
+    # Locate the range list. Single ranges are followed by the URL, and merged
+    # ranges are followed by a description of the original ranges
+    key = "Downloading "
+    if key not in message:
+        return []
+    ranges = message.split(key, 1)[1].split(" ", 1)[0].rstrip(".")
+
+    # Parse each "start-stop" range. Ignore anything that is not a range
+    output = []
+    for span in ranges.split(","):
+        bounds = span.split("-")
+        if len(bounds) == 2 and bounds[0].isdigit() and bounds[1].isdigit():
+            output.append((int(bounds[0]), int(bounds[1])))
+    return output
+
+
+class _ByteCounter(logging.Handler):
+    """
+    _ByteCounter  Logging handler that sums the bytes fetched by vsicurl
+    ----------
+    Attributes:
+        nbytes      - The total number of bytes fetched from the remote server
+        nrequests   - The number of range requests made to the remote server
+    """
+
+    def __init__(self) -> None:
+        super().__init__(logging.DEBUG)
+        self.nbytes = 0
+        self.nrequests = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        for start, stop in _ranges(record.getMessage()):
+            self.nbytes += stop - start + 1
+            self.nrequests += 1
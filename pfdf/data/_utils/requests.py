@@ -10,6 +10,10 @@ Main functions:
     content             - Validates and returns HTTP response content (as bytes)
     json                - Validates and returns an HTTP response as a JSON dict
 
+Batched requests:
+    contents            - Returns the content of multiple throttled, concurrent requests
+    _Throttle           - Limits the rate at which requests are started
+
 Utilities:
     _validate           - Parses timeout and error info for an HTTP request
     _connect_timeout    - Builds an informative error for a connection timeout
@@ -20,6 +24,9 @@ Utilities:
 from __future__ import annotations
 
 import typing
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import monotonic, sleep
 
 import requests
 from requests.exceptions import ConnectTimeout, HTTPError, JSONDecodeError, ReadTimeout
@@ -34,7 +41,7 @@ if typing.TYPE_CHECKING:
 
     from requests import Response
 
-    from pfdf.typing.core import strs, timeout
+    from pfdf.typing.core import scalar, strs, timeout
 
     servers = list[str]
     outages = list[str | None]
@@ -141,6 +148,60 @@ def download(
     return path
 
 
+#####
+# Batched requests
+#####
+
+
+class _Throttle:
+    "Limits the rate at which requests are started across multiple threads"
+
+    def __init__(self, rate: scalar | None) -> None:
+        if rate is None:
+            self.interval = 0
+        else:
+            self.interval = 1 / rate
+        self.next = monotonic()
+        self.lock = Lock()
+
+    def wait(self) -> None:
+        "Blocks until the next request may be started"
+        with self.lock:
+            now = monotonic()
+            start = max(now, self.next)
+            self.next = start + self.interval
+        if start > now:
+            sleep(start - now)
+
+
+def contents(
+    url: str,
+    params: list[dict[str, Any]],
+    timeout: Any,
+    servers: strs,
+    outages: Optional[strs] = None,
+    workers: int = 1,
+    rate: Optional[scalar] = None,
+) -> list[bytes]:
+    """Makes a validated HTTP request for each set of query parameters and returns
+    the content of each response as bytes. Requests are issued concurrently by a pool
+    of worker threads, and no more than `rate` requests are started per second"""
+
+    # Validate the error info once for the full batch
+    timeout, servers, outages = _validate(timeout, servers, outages)
+    throttle = _Throttle(rate)
+
+    def content_(params: dict[str, Any]) -> bytes:
+        throttle.wait()
+        return content(url, params, timeout, servers, outages)
+
+    # Run the queries. Return content in the same order as the parameters
+    if workers == 1 or len(params) < 2:
+        return [content_(query) for query in params]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(content_, params))
+
+
 #####
 # Timeout errors
 #####
@@ -3,11 +3,15 @@ Acquire data from NOAA Atlas 14
 ----------
 This module provides functions to access precipitation frequency estimates (PFEs) from
 NOAA Atlas 14. Most users will want to use the `download` command, which returns a .csv
-file with PFEs at a given lat-lon coordinate. This module also provides commands that
-return API URLs, which advanced users may find useful for generating custom queries.
+file with PFEs at a given lat-lon coordinate. Users who need PFEs at many points (for
+example, at the outlets of a stream segment network) should use the `read` command,
+which queries PFEs for arrays of coordinates concurrently and returns them as a
+pandas.DataFrame. This module also provides commands that return API URLs, which
+advanced users may find useful for generating custom queries.
 ----------
 Data:
     download    - Downloads a .csv file of precipitation frequency estimates for a coordinate
+    read        - Reads precipitation frequency estimates for multiple points into a DataFrame
 
 URLs:
     base_url    - Returns the base URL for the NOAA Atlas 14 data API
@@ -15,7 +19,10 @@ URLs:
 
 Internal:
     _validate_statistic - Checks a PFE statistic is valid
-
+    _validate_query     - Checks the data, series, and units options of a query
+    _params             - Returns the query parameters for a coordinate
+    _cells              - Groups points that share a query
+    _parse              - Parses a PFE csv response as a DataFrame
 """
 
 from __future__ import annotations
@@ -23,20 +30,28 @@ from __future__ import annotations
 import typing
 from pathlib import Path
 
+import numpy as np
+from pandas import DataFrame, concat
+
 import pfdf._validate.core as validate
 from pfdf._utils import real
 from pfdf.data._utils import requests
+from pfdf.errors import DataAPIError
 
 if typing.TYPE_CHECKING:
     from typing import Any, Literal, Optional
 
-    from pfdf.typing.core import Pathlike, scalar, timeout
+    from pfdf.typing.core import Pathlike, scalar, timeout, vector
 
     Statistic = Literal["mean", "upper", "lower", "all"]
     Data = Literal["depth", "intensity"]
     Series = Literal["pds", "ams"]
     Units = Literal["metric", "english"]
 
+# The Atlas 14 PFE grids have a resolution of 30 arc-seconds. Cell deduplication
+# assumes that cell edges fall on multiples of this resolution from (-90, -180)
+_RESOLUTION = 1 / 120
+
 
 def base_url() -> str:
     """
@@ -197,9 +212,7 @@ def download(
     validate.inrange(lat, "lat", -90, 90)
     lon = validate.scalar(lon, "lon", dtype=real)
     validate.inrange(lon, "lon", -180, 180)
-    data = validate.option(data, "data", allowed=["depth", "intensity"])
-    series = validate.option(series, "series", allowed=["pds", "ams"])
-    units = validate.option(units, "units", allowed=["metric", "english"])
+    data, series, units = _validate_query(data, series, units)
 
     # Validate the output path
     path = validate.download_path(
@@ -210,11 +223,266 @@ def download(
     )
 
     # Download the dataset
-    params = {
+    params = _params(lat, lon, data, series, units)
+    return requests.download(path, query_url(statistic), params, timeout, "NOAA PFDS")
+
+
+def read(
+    lats: vector,
+    lons: vector,
+    *,
+    # Data
+    statistic: Statistic = "mean",
+    data: Data = "intensity",
+    series: Series = "pds",
+    units: Units = "metric",
+    # Queries
+    deduplicate: bool = False,
+    timeout: Optional[timeout] = 10,
+    workers: int = 8,
+    rate: Optional[scalar] = 10,
+) -> DataFrame:
+    """
+    Reads precipitation frequency estimates for multiple points into a DataFrame
+    ----------
+    read(lats, lons)
+    Reads precipitation frequency estimates (PFEs) for multiple points and returns
+    them as a pandas.DataFrame. The `lats` and `lons` inputs should be vectors with one
+    element per query point, with coordinates in decimal degrees. The `lons` should
+    be on the interval [-180, 180]. By default, reads mean PFEs of precipitation
+    intensity for partial duration time series. See below for alternative options.
+
+    This command queries the Atlas 14 server once for each unique coordinate, and
+    query points with identical coordinates share the returned PFEs. Queries are
+    issued concurrently, and the PFEs are parsed in memory, so no data files are
+    written to disk.
+
+    Returns a "tidy" DataFrame with one row per combination of query point, PFE
+    statistic, rainfall duration, and recurrence interval. The DataFrame has the
+    following columns:
+
+    point: The index of the query point in the input coordinate arrays
+    lat: The latitude of the query point
+    lon: The longitude of the query point
+    statistic: The PFE statistic ("mean", "upper", or "lower")
+    duration: The rainfall duration (for example, "15-min" or "2-hr")
+    interval: The recurrence interval in years. For annual maximum series, this is
+        the N in the 1-in-N annual exceedance probability
+    value: The precipitation frequency estimate
+
+    You can use the pandas.DataFrame.pivot method to reshape the table as needed.
+    For example, to get a table of 15-minute intensities with one row per point and
+    one column per recurrence interval:
+
+        >>> pfes = read(lats, lons)
+        >>> pfes = pfes[pfes["duration"] == "15-min"]
+        >>> pfes.pivot(index="point", columns="interval", values="value")
+
+    read(..., *, statistic)
+    read(..., *, data)
+    read(..., *, series)
+    read(..., *, units)
+    Specify the type of data that should be read. Please see the documentation of
+    the `download` command for a description of the supported options. If
+    statistic="all", then the returned DataFrame includes rows for the mean, upper,
+    and lower PFEs.
+
+    read(..., *, deduplicate=True)
+    Only queries the Atlas 14 server once for each 30 arc-second grid cell that
+    contains query points, and assigns the PFEs of the first point in the cell to
+    every query point in the cell. This can greatly reduce the number of queries for
+    dense sets of points, but assumes that the edges of the Atlas 14 grid cells fall
+    on integer multiples of 30 arc-seconds (and so on whole degrees). This alignment
+    is not guaranteed by the PFDS API, so you should confirm it against the grid
+    metadata for your project area before using this option. If the grid is instead
+    centered on these multiples, then points in adjacent cells may be merged.
+
+    read(..., *, workers)
+    read(..., *, rate)
+    Options for the concurrent queries. The `workers` input sets the number of
+    queries that may be run in parallel, and defaults to 8. The `rate` input sets the
+    maximum number of queries that may be started per second, and defaults to 10.
+    Set rate=None to disable the rate limit, but please be considerate of the NOAA
+    data server when doing so.
+
+    read(..., *, timeout)
+    Specifies a maximum time in seconds for connecting to the NOAA Atlas 14 data
+    server. This option is typically a scalar, but may also use a vector with
+    two elements. In this case, the first value is the timeout to connect with the
+    server, and the second value is the time for the server to return the first byte.
+    You can also set timeout to None, in which case API queries will never time out.
+    This may be useful for some slow connections, but is generally not recommended as
+    your code may hang indefinitely if the server fails to respond.
+    ----------
+    Inputs:
+        lats: The latitudes of the query points in decimal degrees
+        lons: The longitudes of the query points in decimal degrees on the
+            interval [-180, 180]
+        statistic: The type of PFE statistic to read. Options are "mean", "upper",
+            "lower", and "all"
+        data: The type of PFE values to read. Options are "intensity" and "depth"
+        series: The type of time series to derive PFE values from. Options are
+            "pds" (partial duration), and "ams" (annual maximum).
+        units: The units that PFE values should use. Options are "metric" and "english"
+        deduplicate: True to query once per 30 arc-second grid cell. False (default)
+            to query once per unique coordinate
+        timeout: The maximum number of seconds to connect with the data server
+        workers: The maximum number of concurrent queries. Defaults to 8
+        rate: The maximum number of queries started per second. Defaults to 10
+
+    Outputs:
+        pandas.DataFrame: The PFEs for each query point
+    """
+
+    # Validate coordinates
+    lats = validate.vector(lats, "lats", dtype=real)
+    validate.inrange(lats, "lats", -90, 90)
+    lons = validate.vector(lons, "lons", dtype=real, length=lats.size)
+    validate.inrange(lons, "lons", -180, 180)
+
+    # Validate query parameters and concurrency options
+    statistic = _validate_statistic(statistic)
+    data, series, units = _validate_query(data, series, units)
+    validate.type(deduplicate, "deduplicate", bool, "bool")
+    workers = validate.scalar(workers, "workers", dtype=real)
+    validate.positive(workers, "workers")
+    validate.integers(workers, "workers")
+    if rate is not None:
+        rate = validate.scalar(rate, "rate", dtype=real)
+        validate.positive(rate, "rate")
+
+    # Query each unique coordinate, or each grid cell that contains a point
+    first, cells = _cells(lats, lons, deduplicate)
+    params = [_params(lats[k], lons[k], data, series, units) for k in first]
+    responses = requests.contents(
+        query_url(statistic),
+        params,
+        timeout,
+        "NOAA PFDS",
+        workers=int(workers),
+        rate=rate,
+    )
+
+    # Parse the PFEs for each cell and assign them to the points in the cell
+    tables = []
+    for cell, response in enumerate(responses):
+        table = _parse(response.decode(), statistic)
+        table.insert(0, "cell", cell)
+        tables.append(table)
+    pfes = concat(tables, ignore_index=True)
+    points = DataFrame(
+        {
+            "point": np.arange(lats.size),
+            "lat": lats,
+            "lon": lons,
+            "cell": cells,
+        }
+    )
+    output = points.merge(pfes, on="cell", sort=False).drop(columns="cell")
+    return output.sort_values("point", kind="stable", ignore_index=True)
+
+
+#####
+# Batched read utilities
+#####
+
+
+def _validate_query(data: Any, series: Any, units: Any) -> tuple[str, str, str]:
+    "Checks the data, series, and units options of a query"
+    data = validate.option(data, "data", allowed=["depth", "intensity"])
+    series = validate.option(series, "series", allowed=["pds", "ams"])
+    units = validate.option(units, "units", allowed=["metric", "english"])
+    return data, series, units
+
+
+def _params(lat: scalar, lon: scalar, data: str, series: str, units: str) -> dict:
+    "Returns the query parameters for a coordinate"
+    return {
         "lat": float(lat),
         "lon": float(lon),
         "data": data,
         "series": series,
         "units": units,
     }
-    return requests.download(path, query_url(statistic), params, timeout, "NOAA PFDS")
+
+
+def _cells(
+    lats: np.ndarray, lons: np.ndarray, deduplicate: bool
+) -> tuple[np.ndarray, np.ndarray]:
+    """Groups points that share a query. If deduplicate=True, groups points by the
+    Atlas 14 grid cell that contains them. Otherwise, only groups points with
+    identical coordinates. Returns the index of the first point in each group, and
+    the group index of each point"""
+
+    if deduplicate:
+        rows = np.floor((lats + 90) / _RESOLUTION).astype(int)
+        cols = np.floor((lons + 180) / _RESOLUTION).astype(int)
+        cells = np.stack((rows, cols), axis=1)
+    else:
+        cells = np.stack((lats, lons), axis=1)
+    _, first, cells = np.unique(cells, axis=0, return_index=True, return_inverse=True)
+    return first, cells.reshape(-1)
+
+
+def _parse(text: str, statistic: str) -> DataFrame:
+    """Parses the PFE tables in an Atlas 14 csv response. Returns a DataFrame with
+    statistic, duration, interval, and value columns"""
+
+    # Initialize the table columns
+    statistics, durations, intervals, values = [], [], [], []
+    section = statistic
+    header = None
+    previous = ""
+
+    # Scan the response for table headers and rows
+    for line in text.splitlines():
+        line = line.strip()
+        if ":," not in line:
+            header = None
+            if line != "":
+                previous = line
+            continue
+        label, row = line.split(":,", 1)
+        row = [float(value) for value in row.split(",")]
+
+        # Each table begins with a header of recurrence intervals. If reading all
+        # statistics, use the section title to determine the table's statistic
+        if label.startswith("by duration"):
+            header = row
+            if statistic == "all":
+                title = previous.upper()
+                if "UPPER" in title:
+                    section = "upper"
+                elif "LOWER" in title:
+                    section = "lower"
+                else:
+                    section = "mean"
+            continue
+
+        # Record the PFEs for each duration
+        elif header is not None:
+            statistics += [section] * len(row)
+            durations += [label] * len(row)
+            intervals += header
+            values += row
+
+    # Require at least one PFE
+    if len(values) == 0:
+        raise DataAPIError(
+            "The NOAA Atlas 14 response did not contain any precipitation "
+            "frequency estimates. The query point may be outside of the "
+            "Atlas 14 project areas."
+        )
+
+    # Use integer recurrence intervals when possible
+    intervals = np.array(intervals)
+    if np.all(intervals % 1 == 0):
+        intervals = intervals.astype(int)
+    return DataFrame(
+        {
+            "statistic": statistics,
+            "duration": durations,
+            "interval": intervals,
+            "value": values,
+        }
+    )
@@ -47,10 +47,10 @@ from __future__ import annotations
 
 import typing
 
-from pfdf._utils import dataframe
+from pfdf._utils import dataframe, real
 from pfdf._validate import core as cvalidate
 from pfdf._validate import projection as pvalidate
-from pfdf.data._utils import requests
+from pfdf.data._utils import remote, requests
 from pfdf.errors import DataAPIError, MissingAPIFieldError
 from pfdf.raster import Raster
 
@@ -60,7 +60,7 @@ if typing.TYPE_CHECKING:
 
     from pandas import DataFrame
 
-    from pfdf.typing.core import Pathlike, timeout
+    from pfdf.typing.core import Pathlike, scalar, timeout
     from pfdf.typing.raster import BoundsInput
 
     Field = Literal["KFFACT", "THICK"]
@@ -267,8 +267,13 @@ def download(
 
 
 def read(
-    field: Field, bounds: BoundsInput, *, timeout: Optional[timeout] = 60
-) -> Raster:
+    field: Field,
+    bounds: BoundsInput,
+    *,
+    timeout: Optional[timeout] = 60,
+    cache: scalar = 64,
+    return_nbytes: bool = False,
+) -> Raster | tuple[Raster, int]:
     """
     Reads data from a STATSGO field into memory as a Raster object
     ----------
@@ -285,23 +290,51 @@ def read(
     You can also set timeout to None, in which case API queries will never time out.
     This may be useful for some slow connections, but is generally not recommended as
     your code may hang indefinitely if the server fails to respond.
+
+    read(..., *, cache)
+    Sets the size of the GDAL block caches (in MB) used while reading the dataset.
+    The STATSGO datasets are cloud-optimized GeoTiffs (COGs) that span the
+    continental US, so the dataset is read using HTTP range requests that only fetch
+    the COG blocks that intersect the bounding box. When reading, GDAL is configured
+    to merge requests for consecutive blocks into a single range request, to multiplex
+    parallel requests over HTTP/2 connections, and to not probe the server for
+    sidecar files. The default cache size is 64 MB.
+
+    read(..., *, return_nbytes=True)
+    Also returns the number of bytes fetched from the remote server while reading the
+    dataset. This can be useful for checking that a read only fetched the blocks
+    needed for the bounding box.
     ----------
     Inputs:
         field: The name of the STATSGO data field from which to load data
         timeout: The maximum number of seconds to connect with the ScienceBase server
+        cache: The size of the GDAL block caches in MB. Defaults to 64
+        return_nbytes: True to also return the number of bytes fetched from the
+            remote server. False (default) to only return the Raster
 
     Outputs:
         Raster: The data read from the STATSGO archive
+        int: The number of bytes fetched from the remote data server
     """
 
-    # Validate field and bounding box
+    # Validate field, bounding box, and cache size
     field = _validate_field(field)
     bounds = pvalidate.bounds(bounds, require_crs=True)
+    cache = cvalidate.scalar(cache, "cache", real)
+    cvalidate.positive(cache, "cache")
 
-    # Get the S3 URI and load the dataset
+    # Get the S3 URI and load the dataset using the tuned remote-read options
     item = query(field, timeout=timeout)
     url = _s3_url(item, field)
-    return Raster.from_url(url, bounds=bounds, check_status=False, timeout=timeout)
+    with remote.env(cache, count=return_nbytes) as counter:
+        raster = Raster.from_url(
+            url, bounds=bounds, check_status=False, timeout=timeout
+        )
+
+    # Optionally return the number of fetched bytes
+    if return_nbytes:
+        return raster, counter.nbytes
+    return raster
 
 
 def _s3_url(item: dict, field: str) -> str:
@@ -5,13 +5,41 @@ Modules:
     staley2017  - Debris flow likelihood and rainfall accumulation thresholds
     gartner2014 - Potential sediment volumes
     cannon2010  - Combined hazard classification scheme
+    ensemble    - Monte-Carlo uncertainty propagation for the Staley and Gartner models
+    table       - Batched rainfall threshold and hazard tables
 
 Aliases:
     s17         - Alias of the staley2017 module
     g14         - Alias of the gartner2014 module
     c10         - Alias of the cannon2010 module
+
+Modules are imported when first accessed, so importing this package does not
+load the numerical dependencies of every model.
 """
 
-import pfdf.models.cannon2010 as c10
-import pfdf.models.gartner2014 as g14
-import pfdf.models.staley2017 as s17
+import importlib
+
+# Lazily imported modules, and the names of aliased modules
+_modules = {
+    "staley2017": "staley2017",
+    "gartner2014": "gartner2014",
+    "cannon2010": "cannon2010",
+    "ensemble": "ensemble",
+    "table": "table",
+    "s17": "staley2017",
+    "g14": "gartner2014",
+    "c10": "cannon2010",
+}
+
+
+def __getattr__(name: str):
+    "Imports modules and aliases when first accessed"
+    if name not in _modules:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f"{__name__}.{_modules[name]}")
+    globals()[name] = module
+    return module
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + list(_modules))
@@ -22,6 +22,9 @@ User Functions:
     vscore  - Returns the classification score for debris flow sediment volumes
     hscore  - Returns the combined hazard class given combined hazard scores
 
+Internal:
+    _hazard                 - Computes combined hazard classes for validated inputs
+
 Internal validaters:
     _validate_likelihoods   - Checks that input likelihoods are valid
     _validate_thresholds    - Checks that input class thresholds are valid
@@ -35,11 +38,12 @@ import typing
 import numpy as np
 
 import pfdf._validate.core as validate
-from pfdf._utils import real
+from pfdf._utils import chunks, real
 from pfdf._utils.classify import classify
+from pfdf._utils.instrument import traced
 
 if typing.TYPE_CHECKING:
-    from typing import Any, Tuple
+    from typing import Any, Optional, Tuple
 
     from pfdf.typing.core import RealArray, VectorArray, scalar, vector
 
@@ -48,6 +52,7 @@ if typing.TYPE_CHECKING:
 #####
 
 
+@traced
 def hazard(
     likelihoods: RealArray,
     volumes: RealArray,
@@ -55,6 +60,8 @@ def hazard(
     p_thresholds: vector = [0.25, 0.5, 0.75],
     v_thresholds: vector = [1e3, 1e4, 1e5],
     h_thresholds: vector = [3, 6],
+    dtype: Optional[str | type] = None,
+    out: Optional[RealArray] = None,
 ) -> RealArray:
     """
     hazard  Computes the combined relative hazard scores for a set of debris flows
@@ -77,6 +84,19 @@ def hazard(
     Specifying v_thresholds relaxes the unit requirements for the input sediment
     volumes. When this is the case, v_thresholds and volumes must use the same
     units, but any units are permitted.
+
+    hazard(..., *, dtype)
+    Specifies the floating-point dtype of the output hazard classes. Supported
+    values are "float64" (default) and "float32". Hazard classes are small integers
+    (or NaN), so float32 outputs are exact, and the returned array is half the size.
+    The intermediate likelihood and volume scores are compact integers, so the
+    output array dominates the memory used to compute the hazard classes.
+
+    hazard(..., *, out)
+    Writes the hazard classes into a preallocated float array, rather than
+    allocating a new array. The array must have the broadcasted shape of the
+    likelihoods and volumes. The dtype of "out" sets the output precision, and
+    dtype must either be None or match that dtype. Returns the "out" array.
     ----------
     Inputs:
         likelihoods: An array of debris flow likelihoods. Values should be
@@ -91,6 +111,8 @@ def hazard(
             positive values, in ascending order.
         h_thresholds: Custom thresholds for the combined hazard classification.
             Elements must be positive integers, in ascending order.
+        dtype: The floating-point dtype of the output (float32 or float64)
+        out: A preallocated output array
 
     Outputs:
         numpy array: The combined relative hazard classifications for the debris
@@ -106,13 +128,13 @@ def hazard(
     # Validate arrays
     p = _validate_likelihoods(likelihoods)
     v = _validate_volumes(volumes)
-    validate.broadcastable(p.shape, "likelihoods", v.shape, "volumes")
+    shape = validate.broadcastable(p.shape, "likelihoods", v.shape, "volumes")
 
-    # Compute combined hazard score and classify
-    pscore = classify(p, Tp)
-    vscore = classify(v, Tv)
-    combined = pscore + vscore
-    return classify(combined, Th)
+    # Validate the output options
+    dtype = chunks.dtype(dtype)
+    if out is not None:
+        out = chunks.array(out, "out", shape, dtype)
+    return _hazard(p, v, Tp, Tv, Th, dtype, out)
 
 
 def pscore(likelihoods: RealArray, thresholds: vector = [0.25, 0.5, 0.75]) -> RealArray:
@@ -277,6 +299,33 @@ def hscore(combined: RealArray, thresholds: vector = [3, 6]) -> RealArray:
 #####
 
 
+def _hazard(
+    p: RealArray,
+    v: RealArray,
+    Tp: VectorArray,
+    Tv: VectorArray,
+    Th: VectorArray,
+    dtype: np.dtype | None,
+    out: RealArray | None,
+) -> RealArray:
+    """Computes combined hazard classes for validated inputs. Scores are compact
+    integers (0 for NaN), and hazard classes are written directly into the output"""
+
+    # Score likelihoods and volumes. Use a dtype that can hold the combined score
+    scores = np.min_scalar_type(Tp.size + Tv.size + 2)
+    pscore = classify(p, Tp, nodata_to=0, dtype=scores)
+    vscore = classify(v, Tv, nodata_to=0, dtype=scores)
+
+    # Combine scores. A NaN likelihood or volume has a NaN combined score
+    combined = pscore + vscore
+    combined[(pscore == 0) | (vscore == 0)] = 0
+
+    # Classify directly into the output precision
+    if out is None and dtype is None:
+        dtype = np.dtype(float)
+    return classify(combined, Th, nodata=0, dtype=dtype, out=out)
+
+
 def _validate_likelihoods(p: Any) -> RealArray:
     "Checks that input debris flow likelihoods are valid"
     name = "likelihoods"
@@ -0,0 +1,851 @@
+"""
+ensemble  Monte-Carlo uncertainty propagation for the Staley and Gartner models
+----------
+This module runs Monte-Carlo ensembles of the staley2017 likelihood models and the
+gartner2014 volume models. Each ensemble member solves a model using a random
+perturbation of the model parameters, drawn from independent normal distributions
+centered on the model's parameter values. Volume ensembles also add a residual
+error to each predicted ln(V), drawn using the model's residual standard error.
+
+Ensembles are solved in batches of samples, and each batch is summarized by a set
+of streaming accumulators that track the mean, variance, and quantiles of each
+output element. Only these summaries are retained, so memory use scales with the
+size of the model output and the batch size, rather than the number of samples.
+Quantiles are estimated using the P-square algorithm (Jain and Chlamtac, 1985),
+which tracks 5 markers per quantile and does not store the samples.
+
+Each batch draws its random numbers from an independent child of a single seed,
+so ensembles are reproducible and do not depend on whether they are solved
+sequentially or in parallel. When running in parallel, batches are evaluated
+in a process pool, and at most 2 batches per process are held in memory at once.
+
+CITATION:
+Jain, R., & Chlamtac, I. (1985). The P2 algorithm for dynamic calculation of
+quantiles and histograms without storing observations. Communications of the ACM,
+28(10), 1076-1085. https://doi.org/10.1145/4372.4378
+----------
+User Functions:
+    likelihood      - Runs a Monte-Carlo ensemble of a Staley 2017 likelihood model
+    emergency       - Runs a Monte-Carlo ensemble of the Gartner 2014 emergency model
+    longterm        - Runs a Monte-Carlo ensemble of the Gartner 2014 long-term model
+
+Summaries:
+    Summary         - Streaming summary statistics of a Monte-Carlo ensemble
+
+Samplers:
+    _Likelihoods    - Draws batches of likelihoods from a Staley 2017 model
+    _Volumes        - Draws batches of volumes from a Gartner 2014 model
+    _perturb        - Returns parameter samples drawn about their model values
+
+Runner:
+    _run            - Solves an ensemble in batches and returns its summary
+    _initialize     - Initializes a parallel process with an ensemble sampler
+    _sample         - Draws a batch of samples in a parallel process
+
+Validation:
+    _validate_sd            - Checks that parameter standard deviations are valid
+    _validate_probabilities - Checks that quantile probabilities are valid
+    _validate_options       - Checks that ensemble size and parallelization options are valid
+
+Kernels:
+    _update         - Updates streaming statistics with a batch of samples
+    _p2             - Updates the P-square markers of a quantile with a new sample
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import typing
+from collections import deque
+
+import numpy as np
+from numba import njit
+
+import pfdf._validate.core as validate
+from pfdf._utils import real
+from pfdf.errors import ShapeError
+from pfdf.models import gartner2014, staley2017
+from pfdf.segments._validate import nprocess as validate_nprocess
+
+if typing.TYPE_CHECKING:
+    from typing import Any, Optional
+
+    from pfdf.typing.core import RealArray, VectorArray, scalar, shape, vector
+    from pfdf.typing.models import Parameter
+
+    SD = scalar | dict[str, scalar]
+
+# Default ensemble options
+_PROBABILITIES = (0.05, 0.5, 0.95)
+
+# The sampler used by each parallel process
+_sampler = None
+
+
+#####
+# Summaries
+#####
+
+
+class Summary:
+    """
+    Summary  Streaming summary statistics of a Monte-Carlo ensemble
+    ----------
+    The Summary class tracks the sample count, mean, variance, and a set of
+    quantiles for each element of a model output, as batches of ensemble samples
+    are added. Samples are never stored. Means and variances are updated using
+    Welford's algorithm, and quantiles are estimated using the P-square algorithm.
+    NaN samples are ignored, so the count of each element is the number of valid
+    samples used to compute its statistics.
+    ----------
+    Properties:
+        shape           - The shape of the summarized model output
+        probabilities   - The probabilities of the estimated quantiles
+        count           - The number of valid samples for each output element
+        mean            - The mean of each output element
+        variance        - The sample variance of each output element
+        std             - The sample standard deviation of each output element
+        quantiles       - The estimated quantiles of each output element
+
+    Methods:
+        __init__        - Creates a new Summary for an output shape
+        update          - Updates the statistics with a batch of samples
+    """
+
+    def __init__(self, shape: shape, probabilities: vector = _PROBABILITIES) -> None:
+        """
+        Creates a new Summary for an output shape
+        ----------
+        Summary(shape)
+        Creates an empty Summary for model outputs with the indicated shape. By
+        default, estimates the 5th, 50th, and 95th percentiles of each element.
+
+        Summary(shape, probabilities)
+        Specifies the probabilities of the quantiles that should be estimated.
+        Probabilities must be on the open interval from 0 to 1.
+        ----------
+        Inputs:
+            shape: The shape of the summarized model output
+            probabilities: The probabilities of the quantiles to estimate
+
+        Outputs:
+            Summary: An empty Summary object
+        """
+
+        probabilities = _validate_probabilities(probabilities)
+        self._shape = tuple(int(length) for length in shape)
+        self._probabilities = probabilities
+
+        # Initialize the statistics for each output element
+        size = int(np.prod(self._shape))
+        nquantiles = probabilities.size
+        self._count = np.zeros(size, dtype=np.int64)
+        self._mean = np.zeros(size)
+        self._m2 = np.zeros(size)
+        self._heights = np.zeros((nquantiles, size, 5))
+        self._positions = np.zeros((nquantiles, size, 5))
+
+        # The desired marker positions only depend on the count and probability,
+        # so each quantile stores the growth of its desired positions per sample
+        p = probabilities.reshape(-1, 1)
+        self._desired = np.hstack(
+            (np.zeros_like(p), p / 2, p, (1 + p) / 2, np.ones_like(p))
+        )
+
+    @property
+    def shape(self) -> shape:
+        "The shape of the summarized model output"
+        return self._shape
+
+    @property
+    def probabilities(self) -> VectorArray:
+        "The probabilities of the estimated quantiles"
+        return self._probabilities.copy()
+
+    @property
+    def count(self) -> RealArray:
+        "The number of valid samples for each output element"
+        return self._count.reshape(self._shape).copy()
+
+    @property
+    def mean(self) -> RealArray:
+        "The mean of each output element. NaN if there are no valid samples"
+        mean = np.where(self._count > 0, self._mean, np.nan)
+        return mean.reshape(self._shape)
+
+    @property
+    def variance(self) -> RealArray:
+        "The sample variance of each output element. NaN if fewer than 2 samples"
+        with np.errstate(divide="ignore", invalid="ignore"):
+            variance = self._m2 / (self._count - 1)
+        variance[self._count < 2] = np.nan
+        return variance.reshape(self._shape)
+
+    @property
+    def std(self) -> RealArray:
+        "The sample standard deviation of each output element"
+        return np.sqrt(self.variance)
+
+    @property
+    def quantiles(self) -> RealArray:
+        """The estimated quantiles of each output element. The final dimension of
+        the array holds the quantiles, in the order of the probabilities"""
+
+        quantiles = self._heights[:, :, 2].T.copy()
+        quantiles[self._count == 0] = np.nan
+
+        # Elements with fewer than 5 samples use the exact sample quantiles
+        for k in np.flatnonzero((self._count > 0) & (self._count < 5)):
+            samples = self._heights[0, k, : self._count[k]]
+            quantiles[k] = np.quantile(samples, self._probabilities)
+        return quantiles.reshape(*self._shape, -1)
+
+    def update(self, samples: RealArray) -> None:
+        """
+        Updates the statistics with a batch of samples
+        ----------
+        self.update(samples)
+        Updates the summary statistics with a batch of ensemble samples. The first
+        dimension of the input array should be the samples, and the remaining
+        dimensions should match the shape of the summarized output. NaN samples
+        are ignored.
+        ----------
+        Inputs:
+            samples: A batch of samples with shape (Samples x *Summary shape)
+        """
+
+        samples = validate.array(samples, "samples", dtype=real)
+        if samples.shape[1:] != self._shape:
+            raise ShapeError(
+                f"samples must have shape (Samples x {self._shape}), "
+                f"but it has shape {samples.shape} instead."
+            )
+        samples = np.ascontiguousarray(samples.reshape(samples.shape[0], -1).T)
+        _update(
+            samples.astype(float, copy=False),
+            self._probabilities,
+            self._count,
+            self._mean,
+            self._m2,
+            self._heights,
+            self._positions,
+            self._desired,
+        )
+
+
+#####
+# User Functions
+#####
+
+
+def likelihood(
+    model: type[staley2017.Model],
+    R: vector,
+    T: vector,
+    F: vector,
+    S: vector,
+    *,
+    sd: SD,
+    durations: vector = [15, 30, 60],
+    nsamples: scalar = 1000,
+    batch: scalar = 100,
+    probabilities: vector = _PROBABILITIES,
+    seed: Optional[int] = None,
+    parallel: bool = False,
+    nprocess: Optional[scalar] = None,
+) -> Summary:
+    """
+    Runs a Monte-Carlo ensemble of a Staley 2017 likelihood model
+    ----------
+    likelihood(model, R, T, F, S, *, sd)
+    Runs a Monte-Carlo ensemble of the indicated Staley 2017 model (M1, M2, M3, or
+    M4) and returns a Summary of the debris-flow likelihoods. The R values are the
+    rainfall accumulations for which to solve the model, and T, F, and S are the
+    model's terrain, fire, and soil variables (as returned by model.variables).
+    Each variable should be a vector with one element per stream segment.
+
+    Each ensemble member solves the model using parameters drawn from independent
+    normal distributions centered on the model's parameters at each rainfall
+    duration. The sd input sets the standard deviations of these distributions. Use
+    a scalar to apply the same standard deviation to every parameter, or a dict
+    whose keys are parameter names (B, Ct, Cf, Cs). Parameters missing from the
+    dict are not perturbed. By default, solves the model for the 15, 30, and 60
+    minute rainfall durations, and the summarized output has shape
+    (Segments x R values x Durations).
+
+    likelihood(..., *, durations)
+    Specifies the rainfall durations for which to run the model.
+
+    likelihood(..., *, nsamples)
+    likelihood(..., *, batch)
+    Specify the number of ensemble samples (default 1000), and the number of
+    samples solved at once (default 100). Larger batches are faster, but use
+    more memory.
+
+    likelihood(..., *, probabilities)
+    Specifies the probabilities of the quantiles that should be estimated. By
+    default, estimates the 5th, 50th, and 95th percentiles.
+
+    likelihood(..., *, seed)
+    Seeds the random number generator so that the ensemble is reproducible.
+
+    likelihood(..., *, parallel=True)
+    likelihood(..., *, parallel=True, nprocess)
+    Solves batches of samples in parallel, using a pool of processes. By default,
+    uses one fewer process than the number of available CPUs. Use nprocess to
+    set the number of processes. Parallel processing imposes restrictions on user
+    code (notably, a "__main__" guard), so is disabled by default.
+    ----------
+    Inputs:
+        model: One of the Staley 2017 model classes (M1, M2, M3, or M4)
+        R: The rainfall accumulations for which to solve the model
+        T: The terrain variable for each stream segment
+        F: The fire variable for each stream segment
+        S: The soil variable for each stream segment
+        sd: The standard deviations of the parameter distributions
+        durations: The rainfall durations for which to run the model
+        nsamples: The number of ensemble samples
+        batch: The number of samples solved at once
+        probabilities: The probabilities of the quantiles to estimate
+        seed: A seed for the random number generator
+        parallel: True to solve batches of samples in parallel. False (default)
+            to solve them sequentially
+        nprocess: The number of parallel processes
+
+    Outputs:
+        Summary: The summary statistics of the likelihoods. The summarized
+            output has shape (Segments x R values x Durations)
+    """
+
+    # Validate the model and get its parameters
+    if not isinstance(model, type) or not issubclass(model, staley2017.Model):
+        raise TypeError(
+            "model must be one of the staley2017 model classes (M1, M2, M3, or M4)."
+        )
+    parameters = dict(zip(["B", "Ct", "Cf", "Cs"], model.parameters(durations)))
+
+    # Validate rainfall and variables
+    R = validate.vector(R, "R", dtype=real)
+    validate.positive(R, "R", allow_zero=True, ignore=np.nan)
+    variables = {"T": T, "F": F, "S": S}
+    for name, variable in variables.items():
+        variables[name] = validate.vector(variable, name, dtype=real)
+    nsegments = max(variable.size for variable in variables.values())
+    for name, variable in variables.items():
+        if variable.size not in [1, nsegments]:
+            raise ShapeError(
+                f"Each variable must have either 1 or {nsegments} elements, "
+                f"but {name} has {variable.size} elements instead."
+            )
+
+    # Build the sampler and run the ensemble
+    sd = _validate_sd(sd, parameters)
+    sampler = _Likelihoods(R, parameters, sd, variables)
+    shape = (nsegments, R.size, parameters["B"].size)
+    return _run(
+        sampler, shape, nsamples, batch, probabilities, seed, parallel, nprocess
+    )
+
+
+def emergency(
+    i15: vector,
+    Bmh: vector,
+    R: vector,
+    *,
+    B: Parameter = 4.22,
+    Ci: Parameter = 0.39,
+    Cb: Parameter = 0.36,
+    Cr: Parameter = 0.13,
+    RSE: scalar = 1.04,
+    sd: SD = 0,
+    nsamples: scalar = 1000,
+    batch: scalar = 100,
+    probabilities: vector = _PROBABILITIES,
+    seed: Optional[int] = None,
+    parallel: bool = False,
+    nprocess: Optional[scalar] = None,
+) -> Summary:
+    """
+    Runs a Monte-Carlo ensemble of the Gartner 2014 emergency assessment model
+    ----------
+    emergency(i15, Bmh, R)
+    Runs a Monte-Carlo ensemble of the Gartner 2014 emergency assessment model and
+    returns a Summary of the predicted sediment volumes (in m^3). Inputs are the
+    peak 15-minute rainfall intensities in mm/h (i15), and the catchment area
+    burned at moderate-or-high intensity in km^2 (Bmh) and the watershed relief
+    in meters (R) for each stream segment. The summarized output has shape
+    (Segments x i15).
+
+    Each ensemble member adds a residual error to the predicted ln(V). Errors are
+    drawn from a normal distribution with a mean of 0 and a standard deviation of
+    RSE, the residual standard error of the model (default 1.04). Set RSE=0 to
+    disable the residual errors.
+
+    emergency(..., *, B, Ci, Cb, Cr)
+    emergency(..., *, sd)
+    Specify the model parameters, and the standard deviations used to perturb
+    them. Each parameter should be a scalar. Each ensemble member solves the model
+    using parameters drawn from independent normal distributions centered on the
+    parameter values. Use a scalar sd to apply the same standard deviation to
+    every parameter, or a dict whose keys are parameter names. Parameters missing
+    from the dict are not perturbed. By default, parameters are not perturbed.
+
+    emergency(..., *, nsamples, batch, probabilities, seed, parallel, nprocess)
+    Specify options for the size, quantiles, seed, and parallelization of the
+    ensemble. See the likelihood function for details of these options.
+    ----------
+    Inputs:
+        i15: Peak 15-minute rainfall intensities in mm/hour
+        Bmh: Catchment area burned at moderate or high intensity in km^2
+        R: Watershed relief in meters
+        B: The model intercept
+        Ci: The coefficient of the i15 rainfall intensity term
+        Cb: The coefficient of the Bmh burned area term
+        Cr: The coefficient of the R watershed relief term
+        RSE: The residual standard error of the model
+        sd: The standard deviations of the parameter distributions
+        nsamples: The number of ensemble samples
+        batch: The number of samples solved at once
+        probabilities: The probabilities of the quantiles to estimate
+        seed: A seed for the random number generator
+        parallel: True to solve batches of samples in parallel
+        nprocess: The number of parallel processes
+
+    Outputs:
+        Summary: The summary statistics of the volumes. The summarized output has
+            shape (Segments x i15)
+    """
+
+    parameters = {"B": B, "Ci": Ci, "Cb": Cb, "Cr": Cr}
+    variables = {"Bmh": Bmh, "R": R}
+    return _volumes(
+        "emergency",
+        i15,
+        "i15",
+        parameters,
+        variables,
+        RSE,
+        sd,
+        nsamples,
+        batch,
+        probabilities,
+        seed,
+        parallel,
+        nprocess,
+    )
+
+
+def longterm(
+    i60: vector,
+    Bt: vector,
+    T: vector,
+    A: vector,
+    R: vector,
+    *,
+    B: Parameter = 6.07,
+    Ci: Parameter = 0.71,
+    Cb: Parameter = 0.22,
+    Ct: Parameter = -0.24,
+    Ca: Parameter = 0.49,
+    Cr: Parameter = 0.03,
+    RSE: scalar = 1.25,
+    sd: SD = 0,
+    nsamples: scalar = 1000,
+    batch: scalar = 100,
+    probabilities: vector = _PROBABILITIES,
+    seed: Optional[int] = None,
+    parallel: bool = False,
+    nprocess: Optional[scalar] = None,
+) -> Summary:
+    """
+    Runs a Monte-Carlo ensemble of the Gartner 2014 long-term model
+    ----------
+    longterm(i60, Bt, T, A, R)
+    Runs a Monte-Carlo ensemble of the Gartner 2014 long-term model and returns a
+    Summary of the predicted sediment volumes (in m^3). Inputs are the peak
+    60-minute rainfall intensities in mm/h (i60), and the total burned area in
+    km^2 (Bt), time since fire in years (T), total area in km^2 (A), and watershed
+    relief in meters (R) for each stream segment. The summarized output has
+    shape (Segments x i60).
+
+    As in gartner2014.longterm, a vector T is interpreted as one value per
+    parameter run. Ensemble samples replace parameter runs, so T should be a
+    scalar, or a column vector (Segments x 1) with one value per stream segment.
+
+    Each ensemble member adds a residual error to the predicted ln(V). Errors are
+    drawn from a normal distribution with a mean of 0 and a standard deviation of
+    RSE, the residual standard error of the model (default 1.25). Set RSE=0 to
+    disable the residual errors.
+
+    longterm(..., *, B, Ci, Cb, Ct, Ca, Cr)
+    longterm(..., *, sd)
+    Specify the model parameters, and the standard deviations used to perturb
+    them. See the emergency function for details.
+
+    longterm(..., *, nsamples, batch, probabilities, seed, parallel, nprocess)
+    Specify options for the size, quantiles, seed, and parallelization of the
+    ensemble. See the likelihood function for details of these options.
+    ----------
+    Inputs:
+        i60: Peak 60-minute rainfall intensities in mm/hour
+        Bt: Total burned catchment area in km^2
+        T: Time elapsed since fire in years. A scalar or (Segments x 1) column vector
+        A: Total catchment area in km^2
+        R: Watershed relief in meters
+        B: The model intercept
+        Ci: The coefficient of the i60 rainfall intensity term
+        Cb: The coefficient of the Bt burned area term
+        Ct: The coefficient of the T elapsed time term
+        Ca: The coefficient of the A total area term
+        Cr: The coefficient of the R watershed relief term
+        RSE: The residual standard error of the model
+        sd: The standard deviations of the parameter distributions
+        nsamples: The number of ensemble samples
+        batch: The number of samples solved at once
+        probabilities: The probabilities of the quantiles to estimate
+        seed: A seed for the random number generator
+        parallel: True to solve batches of samples in parallel
+        nprocess: The number of parallel processes
+
+    Outputs:
+        Summary: The summary statistics of the volumes. The summarized output has
+            shape (Segments x i60)
+    """
+
+    parameters = {"B": B, "Ci": Ci, "Cb": Cb, "Ct": Ct, "Ca": Ca, "Cr": Cr}
+    variables = {"Bt": Bt, "T": T, "A": A, "R": R}
+    return _volumes(
+        "longterm",
+        i60,
+        "i60",
+        parameters,
+        variables,
+        RSE,
+        sd,
+        nsamples,
+        batch,
+        probabilities,
+        seed,
+        parallel,
+        nprocess,
+    )
+
+
+def _volumes(
+    model: str,
+    I: Any,
+    Iname: str,
+    parameters: dict[str, Any],
+    variables: dict[str, Any],
+    RSE: Any,
+    sd: Any,
+    nsamples: Any,
+    batch: Any,
+    probabilities: Any,
+    seed: Any,
+    parallel: Any,
+    nprocess: Any,
+) -> Summary:
+    "Validates the inputs of a Gartner 2014 ensemble and runs the ensemble"
+
+    # Validate rainfall, parameters, and variables. Require 1 run per parameter
+    I = validate.vector(I, Iname, dtype=real)
+    validate.positive(I, Iname, allow_zero=True, ignore=np.nan)
+    for name, parameter in parameters.items():
+        parameters[name] = validate.scalar(parameter, name, dtype=real).reshape(1)
+
+    # Variables follow the gartner2014 conventions, but ensemble samples replace
+    # parameter runs, so each variable must describe a single run
+    variables, nruns = gartner2014._validate_variables(variables, nruns=1)
+    if nruns != 1:
+        raise ShapeError(
+            "Each variable must have a single run. Note that a vector T is "
+            "interpreted as one value per parameter run. Use a column vector "
+            "(Segments x 1) to provide a T value for each stream segment."
+        )
+    nsegments = max(variable.shape[0] for variable in variables)
+
+    # Validate the residual standard error
+    RSE = validate.scalar(RSE, "RSE", dtype=real)
+    validate.positive(RSE, "RSE", allow_zero=True)
+
+    # Build the sampler and run the ensemble
+    sd = _validate_sd(sd, parameters)
+    sampler = _Volumes(model, I, parameters, sd, variables, float(RSE))
+    shape = (nsegments, I.size)
+    return _run(
+        sampler, shape, nsamples, batch, probabilities, seed, parallel, nprocess
+    )
+
+
+#####
+# Samplers
+#####
+
+
+def _perturb(
+    rng: np.random.Generator,
+    parameters: dict[str, VectorArray],
+    sd: dict[str, float],
+    nsamples: int,
+) -> dict[str, VectorArray]:
+    """Returns parameter samples drawn about their model values. Each output
+    parameter has shape (nsamples x nruns), flattened to a vector"""
+
+    samples = {}
+    for name, values in parameters.items():
+        noise = rng.standard_normal((nsamples, values.size)) * sd[name]
+        samples[name] = (values + noise).reshape(-1)
+    return samples
+
+
+class _Likelihoods:
+    "Draws batches of likelihoods from a Staley 2017 model"
+
+    def __init__(self, R, parameters, sd, variables) -> None:
+        self.R = R
+        self.parameters = parameters
+        self.sd = sd
+        self.variables = variables
+
+    def __call__(self, seed: np.random.SeedSequence, nsamples: int) -> RealArray:
+        "Returns a batch of likelihoods with shape (Samples x Segments x R x Durations)"
+
+        rng = np.random.default_rng(seed)
+        p = _perturb(rng, self.parameters, self.sd, nsamples)
+        T, F, S = self.variables.values()
+        likelihoods = staley2017.likelihood(
+            self.R, p["B"], p["Ct"], T, p["Cf"], F, p["Cs"], S, keepdims=True
+        )
+        likelihoods = likelihoods.reshape(*likelihoods.shape[:2], nsamples, -1)
+        return np.moveaxis(likelihoods, 2, 0)
+
+
+class _Volumes:
+    "Draws batches of volumes from a Gartner 2014 model"
+
+    def __init__(self, model, I, parameters, sd, variables, RSE) -> None:
+        self.model = model
+        self.I = I
+        self.parameters = parameters
+        self.sd = sd
+        self.variables = variables
+        self.RSE = RSE
+
+    def __call__(self, seed: np.random.SeedSequence, nsamples: int) -> RealArray:
+        "Returns a batch of volumes with shape (Samples x Segments x I)"
+
+        # Solve the model for the perturbed parameters. Volumes are (Segments x I x Samples)
+        rng = np.random.default_rng(seed)
+        parameters = _perturb(rng, self.parameters, self.sd, nsamples)
+        solver = getattr(gartner2014, self.model)
+        V, _, _ = solver(self.I, *self.variables, **parameters, CI=None, keepdims=True)
+
+        # Add residual errors to ln(V)
+        if self.RSE > 0:
+            errors = rng.standard_normal(V.shape) * self.RSE
+            V *= np.exp(errors)
+        return np.moveaxis(V, 2, 0)
+
+
+#####
+# Runner
+#####
+
+
+def _run(
+    sampler: Any,
+    shape: shape,
+    nsamples: Any,
+    batch: Any,
+    probabilities: Any,
+    seed: Any,
+    parallel: Any,
+    nprocess: Any,
+) -> Summary:
+    "Solves an ensemble in batches and returns its summary"
+
+    # Validate options and initialize the summary
+    nsamples, batch, nprocess = _validate_options(nsamples, batch, parallel, nprocess)
+    summary = Summary(shape, probabilities)
+
+    # Split the samples into batches, and give each batch an independent seed
+    sizes = [batch] * (nsamples // batch)
+    if nsamples % batch:
+        sizes.append(nsamples % batch)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = zip(seeds, sizes)
+
+    # Run sequentially
+    if nprocess == 1:
+        for seed, size in tasks:
+            summary.update(sampler(seed, size))
+        return summary
+
+    # Or in parallel. Limit the number of batches held in memory
+    spawn = mp.get_context("spawn")
+    with spawn.Pool(nprocess, initializer=_initialize, initargs=(sampler,)) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.apply_async(_sample, task))
+            if len(pending) >= 2 * nprocess:
+                summary.update(pending.popleft().get())
+        while pending:
+            summary.update(pending.popleft().get())
+    return summary
+
+
+def _initialize(sampler: Any) -> None:
+    "Initializes a parallel process with an ensemble sampler"
+    global _sampler
+    _sampler = sampler
+
+
+def _sample(seed: np.random.SeedSequence, nsamples: int) -> RealArray:
+    "Draws a batch of samples in a parallel process"
+    return _sampler(seed, nsamples)
+
+
+#####
+# Validation
+#####
+
+
+def _validate_sd(sd: Any, parameters: dict[str, Any]) -> dict[str, float]:
+    "Checks that parameter standard deviations are valid and returns a dict"
+
+    # Use a scalar for every parameter
+    if not isinstance(sd, dict):
+        sd = validate.scalar(sd, "sd", dtype=real)
+        validate.positive(sd, "sd", allow_zero=True)
+        return {name: float(sd) for name in parameters}
+
+    # Otherwise, check the keys and values of the dict
+    output = {name: 0.0 for name in parameters}
+    for name, value in sd.items():
+        if name not in parameters:
+            allowed = ", ".join(parameters)
+            raise ValueError(
+                f"The sd dict contains an unrecognized key ({name}). "
+                f"Allowed keys are: {allowed}"
+            )
+        value = validate.scalar(value, f"sd['{name}']", dtype=real)
+        validate.positive(value, f"sd['{name}']", allow_zero=True)
+        output[name] = float(value)
+    return output
+
+
+def _validate_probabilities(probabilities: Any) -> VectorArray:
+    "Checks that quantile probabilities are on the open interval from 0 to 1"
+
+    probabilities = validate.vector(probabilities, "probabilities", dtype=real)
+    validate.inrange(probabilities, "probabilities", min=0, max=1)
+    if np.any((probabilities == 0) | (probabilities == 1)):
+        raise ValueError("probabilities cannot include 0 or 1.")
+    return probabilities.astype(float)
+
+
+def _validate_options(
+    nsamples: Any, batch: Any, parallel: Any, nprocess: Any
+) -> tuple[int, int, int]:
+    "Checks that ensemble size and parallelization options are valid"
+
+    names = ["nsamples", "batch"]
+    values = [nsamples, batch]
+    for k, (name, value) in enumerate(zip(names, values)):
+        value = validate.scalar(value, name, dtype=real)
+        validate.positive(value, name)
+        validate.integers(value, name)
+        values[k] = int(value)
+    nsamples, batch = values
+
+    # Only use a process pool when parallelization is requested
+    validate.type(parallel, "parallel", bool, "bool")
+    if parallel:
+        nprocess = validate_nprocess(nprocess)
+    else:
+        nprocess = 1
+    return nsamples, batch, nprocess
+
+
+#####
+# Kernels
+#####
+
+
+@njit(cache=True)
+def _update(samples, probabilities, count, mean, m2, heights, positions, desired):
+    "Updates streaming statistics with a batch of samples (Elements x Samples)"
+
+    nquantiles = probabilities.size
+    for k in range(samples.shape[0]):
+        for s in range(samples.shape[1]):
+            x = samples[k, s]
+            if np.isnan(x):
+                continue
+
+            # Welford update of the mean and sum of squared deviations
+            count[k] += 1
+            n = count[k]
+            delta = x - mean[k]
+            mean[k] += delta / n
+            m2[k] += delta * (x - mean[k])
+
+            # Collect the first 5 samples. Initialize the markers at the 5th
+            if n <= 5:
+                for q in range(nquantiles):
+                    heights[q, k, n - 1] = x
+                if n == 5:
+                    for q in range(nquantiles):
+                        heights[q, k, :] = np.sort(heights[q, k, :])
+                        positions[q, k, :] = np.arange(1.0, 6.0)
+                continue
+
+            # Update the P-square markers of each quantile
+            for q in range(nquantiles):
+                _p2(x, n, heights[q, k], positions[q, k], desired[q])
+
+
+@njit(cache=True)
+def _p2(x, n, heights, positions, desired):
+    """Updates the P-square markers of a quantile with the n-th sample. The
+    desired position of each marker is 1 + (n - 1) times its growth per sample"""
+
+    # Locate the cell containing the sample, extending the extreme markers
+    if x < heights[0]:
+        heights[0] = x
+        cell = 0
+    elif x >= heights[4]:
+        heights[4] = x
+        cell = 3
+    else:
+        cell = 0
+        while x >= heights[cell + 1]:
+            cell += 1
+
+    # Increment the positions of markers above the sample
+    for i in range(cell + 1, 5):
+        positions[i] += 1
+
+    # Adjust the heights of the middle markers as needed
+    for i in range(1, 4):
+        d = 1 + (n - 1) * desired[i] - positions[i]
+        if (d >= 1 and positions[i + 1] - positions[i] > 1) or (
+            d <= -1 and positions[i - 1] - positions[i] < -1
+        ):
+            d = 1.0 if d > 0 else -1.0
+
+            # Try a parabolic prediction, falling back to linear if not monotonic
+            below = positions[i] - positions[i - 1]
+            above = positions[i + 1] - positions[i]
+            height = heights[i] + d / (positions[i + 1] - positions[i - 1]) * (
+                (below + d) * (heights[i + 1] - heights[i]) / above
+                + (above - d) * (heights[i] - heights[i - 1]) / below
+            )
+            if not heights[i - 1] < height < heights[i + 1]:
+                j = i + int(d)
+                height = heights[i] + d * (heights[j] - heights[i]) / (
+                    positions[j] - positions[i]
+                )
+            heights[i] = height
+            positions[i] += d
@@ -17,6 +17,7 @@ User Functions:
 
 Internal:
     _volumes                - Converts lnV to volume, Vmin, and Vmax
+    _validate_out           - Checks that preallocated outputs are valid
     _validate_parameters    - Checks that input parameters are valid
     _validate_variables     - Checks that input variables are valid
 """
@@ -26,15 +27,15 @@ from __future__ import annotations
 import typing
 
 import numpy as np
-from numpy import exp, log, nan, sqrt
-from scipy.stats import norm
+from numpy import exp, log, nan, ndarray, sqrt
 
 import pfdf._validate.core as validate
-from pfdf._utils import clean_dims, real
+from pfdf._utils import chunks, clean_dims, normal, real
+from pfdf._utils.instrument import traced
 from pfdf.errors import ShapeError
 
 if typing.TYPE_CHECKING:
-    from typing import Any
+    from typing import Any, Optional
 
     from pfdf.typing.core import MatrixArray, RealArray, VectorArray
     from pfdf.typing.models import Parameter, Variable, Volume, Volumes
@@ -48,6 +49,7 @@ if typing.TYPE_CHECKING:
 
 
 @np.errstate(divide="ignore")  # Suppress divide-by-zero warning for log(0)
+@traced
 def emergency(
     i15: Variable,
     Bmh: Variable,
@@ -60,6 +62,8 @@ def emergency(
     CI: Parameter | None = 0.95,
     RSE: Parameter = 1.04,
     keepdims: bool = False,
+    dtype: Optional[str | type] = None,
+    out: Optional[tuple[ndarray, ndarray, ndarray]] = None,
 ) -> Volumes:
     """
     Solves the emergency assessment model (Equation 3 from Gartner et al., 2014)
@@ -168,6 +172,19 @@ def emergency(
     Returns arrays with a fixed number of dimensions. The V array will always have 3
     dimensions (segments x i15 x parameter runs), whereas the Vmax and Vmin arrays will
     always have 4 dimensions (segments x i15 x parameter runs x confidence intervals).
+
+    emergency(..., *, dtype)
+    Specifies the floating-point precision of the output arrays. Supported values
+    are "float64" (default) and "float32". Solving in float32 halves the memory and
+    bandwidth used by large ensembles, at the cost of precision.
+
+    emergency(..., *, out)
+    Writes the outputs into a tuple of preallocated (V, Vmin, Vmax) float arrays,
+    rather than allocating new arrays. The arrays must have the 3D and 4D shapes
+    described for keepdims=True, and must all have the same dtype, which sets the
+    precision of the solver unless dtype is also specified. The returned arrays are
+    views of the "out" arrays, with singleton dimensions removed unless
+    keepdims=True.
     ----------
     Inputs:
         i15: Peak 15-minute rainfall intensities in mm/hour.
@@ -181,6 +198,8 @@ def emergency(
         RSE: The residual standard error of the model. Used to compute confidence intervals
         keepdims: True to return arrays with constant numbers of dimensions. False (default)
             to remove singleton dimensions.
+        dtype: The floating-point dtype of the outputs (float32 or float64)
+        out: A tuple of preallocated (V, Vmin, Vmax) output arrays
 
     Outputs:
         numpy array (Segments x i15 x Runs): The predicted debris-flow sediment volumes in m^3
@@ -195,12 +214,16 @@ def emergency(
         i15, "i15", parameters, variables, CI, RSE
     )
 
-    # Solve the model. Compute CIs. Optionally remove trailing singletons
+    # Solve the model at the requested precision. Compute CIs. Optionally remove
+    # trailing singletons
+    out, dtype = _validate_out(out, dtype)
+    i15, B, Ci, Cb, Cr, Bmh, R = chunks.astype(dtype, i15, B, Ci, Cb, Cr, Bmh, R)
     lnV = B + Ci * sqrt(i15) + Cb * log(Bmh) + Cr * sqrt(R)
-    return _volumes(lnV, CI, RSE, keepdims)
+    return _volumes(lnV, CI, RSE, keepdims, out)
 
 
 @np.errstate(divide="ignore")  # Suppress divide-by-zero warning for log(0)
+@traced
 def longterm(
     i60: Variable,
     Bt: Variable,
@@ -217,6 +240,8 @@ def longterm(
     CI: Parameter | None = 0.95,
     RSE: Parameter = 1.25,
     keepdims: bool = False,
+    dtype: Optional[str | type] = None,
+    out: Optional[tuple[ndarray, ndarray, ndarray]] = None,
 ) -> Volumes:
     """
     Solves the long-term model (Equation 2)
@@ -331,6 +356,19 @@ def longterm(
     Returns arrays with a fixed number of dimensions. The V array will always have 3
     dimensions (segments x i60 x parameter runs), whereas the Vmax and Vmin arrays will
     always have 4 dimensions (segments x i60 x parameter runs x confidence intervals).
+
+    longterm(..., *, dtype)
+    Specifies the floating-point precision of the output arrays. Supported values
+    are "float64" (default) and "float32". Solving in float32 halves the memory and
+    bandwidth used by large ensembles, at the cost of precision.
+
+    longterm(..., *, out)
+    Writes the outputs into a tuple of preallocated (V, Vmin, Vmax) float arrays,
+    rather than allocating new arrays. The arrays must have the 3D and 4D shapes
+    described for keepdims=True, and must all have the same dtype, which sets the
+    precision of the solver unless dtype is also specified. The returned arrays are
+    views of the "out" arrays, with singleton dimensions removed unless
+    keepdims=True.
     ----------
     Inputs:
         i60: Peak 60-minute rainfall intensities in mm/hour
@@ -348,6 +386,8 @@ def longterm(
         RSE: The residual standard error of the model. Used to compute confidence intervals
         keepdims: True to return arrays with constant numbers of dimensions. False (default)
             to remove singleton dimensions.
+        dtype: The floating-point dtype of the outputs (float32 or float64)
+        out: A tuple of preallocated (V, Vmin, Vmax) output arrays
 
     Outputs:
         numpy array (Segments x i15 x Runs): The predicted debris-flow sediment volumes in m^3
@@ -362,25 +402,47 @@ def longterm(
         i60, "i60", parameters, variables, CI, RSE
     )
 
-    # Solve model. Compute CIs. Optionally remove singletons
+    # Solve model at the requested precision. Compute CIs. Optionally remove singletons
+    out, dtype = _validate_out(out, dtype)
+    i60, B, Ci, Cb, Ct, Ca, Cr, Bt, T, A, R = chunks.astype(
+        dtype, i60, B, Ci, Cb, Ct, Ca, Cr, Bt, T, A, R
+    )
     lnV = B + Ci * log(i60) + Cb * log(Bt) + Ct * log(T) + Ca * log(A) + Cr * sqrt(R)
-    return _volumes(lnV, CI, RSE, keepdims)
+    return _volumes(lnV, CI, RSE, keepdims, out)
 
 
-def _volumes(lnV: Volume, CI: Parameter, RSE: Parameter, keepdims: bool) -> Volumes:
+def _volumes(
+    lnV: Volume,
+    CI: Parameter,
+    RSE: Parameter,
+    keepdims: bool,
+    out: tuple[ndarray, ndarray, ndarray] | None = None,
+) -> Volumes:
     "Converts ln(V) to expected, min, and max volumes"
 
-    # Compute the percentile multipliers
+    # Compute the percentile multipliers at the precision of lnV
     q = 1 - (1 - CI) / 2
-    X = norm.ppf(q)
+    X = normal.quantile(q)
+    spread = np.asarray(X * RSE).astype(lnV.dtype, copy=False)
+
+    # Allocate or validate the output arrays
+    shapes = (lnV.shape[:-1], np.broadcast_shapes(lnV.shape, spread.shape))
+    shapes = shapes + shapes[-1:]
+    if out is None:
+        V, Vmin, Vmax = [np.empty(shape, lnV.dtype) for shape in shapes]
+    else:
+        names = ["out[0]", "out[1]", "out[2]"]
+        V, Vmin, Vmax = [
+            chunks.array(array, name, shape, lnV.dtype)
+            for array, name, shape in zip(out, names, shapes)
+        ]
 
-    # Compute volume and CI
-    V = exp(lnV)
-    Vmin = exp(lnV - X * RSE)
-    Vmax = exp(lnV + X * RSE)
+    # Compute volume and CI in place
+    exp(lnV[..., 0], out=V)
+    exp(np.subtract(lnV, spread, out=Vmin), out=Vmin)
+    exp(np.add(lnV, spread, out=Vmax), out=Vmax)
 
     # Clean singleton dimensions
-    V = V.reshape(V.shape[:-1])
     V = clean_dims(V, keepdims)
     Vmin = clean_dims(Vmin, keepdims)
     Vmax = clean_dims(Vmax, keepdims)
@@ -411,6 +473,20 @@ def _validate(
     return I, parameters, variables, CI, RSE
 
 
+def _validate_out(out: Any, dtype: Any) -> tuple[tuple | None, np.dtype | None]:
+    """Checks that out is None or a sequence of 3 arrays. Returns out as a tuple
+    and the validated output dtype, which defaults to the dtype of the out arrays"""
+
+    dtype = chunks.dtype(dtype)
+    if out is None:
+        return None, dtype
+    elif not isinstance(out, (tuple, list)) or len(out) != 3:
+        raise TypeError("out must be a tuple of 3 numpy arrays (V, Vmin, Vmax).")
+    elif dtype is None and isinstance(out[0], ndarray):
+        dtype = out[0].dtype
+    return tuple(out), dtype
+
+
 def _validate_intensity(I, Iname):
     "Validates rainfall intensities and reshapes for broadcasting"
 
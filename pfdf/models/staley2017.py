@@ -11,6 +11,13 @@ The module also provides classes to implement the M1-4 models presented in the
 paper. These classes provide methods to return the parameters, and compute the
 variables specific to each model.
 
+The variables for each model are cached on the Segments object, so repeated calls
+with the same Raster objects do not recompute catchment summaries. Cached variables
+are subset when segments are removed from the network. The cache only holds weak
+references to its input Rasters, so it does not keep them alive: a cached variable
+is dropped as soon as one of its input Rasters (or the Raster's current metadata)
+is garbage collected.
+
 CITATION:
 Staley, D. M., Negri, J. A., Kean, J. W., Laber, J. L., Tillery, A. C., &
 Youberg, A. M. (2017). Prediction of spatially explicit rainfall intensity-duration
@@ -32,30 +39,42 @@ Model Classes:
 
 Internal:
     Model               - Abstract base class implementing common functionality for the M1-4 models
+    _solve_likelihood   - Solves the likelihood model for validated, broadcastable arrays
+    _solve_accumulation - Solves the accumulation model for validated, broadcastable arrays
     _validate           - Validates parameters/variables and reshapes for broadcasting
+
+Chunked evaluation:
+    _chunked            - Solves a model into a preallocated output, one block of segments at a time
+    _index              - Returns the broadcasted element of a variable or parameter
+    _likelihood_kernel  - Computes likelihoods for a block of segments
+    _accumulation_kernel - Computes accumulations for a block of segments
 """
 
 from __future__ import annotations
 
 import typing
+import weakref
 from abc import ABC, abstractmethod
+from functools import partial
 from math import nan
 
 import numpy as np
+from numba import njit
+from numpy import ndarray
 
 import pfdf._validate.core as validate
-from pfdf._utils import clean_dims, real
+from pfdf._utils import chunks, clean_dims, real
+from pfdf._utils.instrument import traced
 from pfdf._utils.nodata import NodataMask
 from pfdf.errors import DurationsError, ShapeError
-from pfdf.raster import Raster
-from pfdf.segments import Segments
-from pfdf.segments._validate import raster as validate_raster
 from pfdf.utils import slope
 
 if typing.TYPE_CHECKING:
-    from typing import Any, Optional
+    from typing import Any, Callable, Optional
 
-    from pfdf.typing.core import BooleanMatrix, scalar
+    from pfdf.raster import Raster
+    from pfdf.segments import Segments
+    from pfdf.typing.core import BooleanMatrix, Pathlike, scalar
     from pfdf.typing.models import (
         Accumulations,
         AccumulationVector,
@@ -75,11 +94,15 @@ if typing.TYPE_CHECKING:
 OmitnanDict = dict[str, bool]
 omitnan = bool | OmitnanDict
 
+# Default memory budget for chunked evaluation (MB)
+_MEMORY = 256
+
 #####
 # Generic solvers
 #####
 
 
+@traced
 def accumulation(
     p: Probabilities,
     B: Parameter,
@@ -92,6 +115,10 @@ def accumulation(
     *,
     keepdims: bool = False,
     screen: bool = True,
+    dtype: Optional[str | type] = None,
+    out: Optional[ndarray | Pathlike] = None,
+    overwrite: bool = False,
+    memory: Optional[scalar] = None,
 ) -> Accumulations:
     """
     Computes rainfall accumulations needed for specified debris-flow probability levels
@@ -159,6 +186,31 @@ def accumulation(
     Disables the screening of negative accumulations. When screening is disabled,
     negative accumulations are retained in the output, instead of being replaced
     by nan.
+
+    accumulation(..., *, dtype)
+    Specifies the floating-point precision of the output array. Supported values
+    are "float64" (default) and "float32". Solving in float32 halves the memory and
+    bandwidth used by large ensembles, at the cost of precision. If "out" is a
+    preallocated array, the output precision is the dtype of "out", and dtype must
+    either be None or match that dtype.
+
+    accumulation(..., *, memory)
+    accumulation(..., *, out)
+    accumulation(..., *, out, overwrite=True)
+    Solves the model in chunked evaluation mode, which is intended for large
+    ensembles whose outputs (and temporary arrays) would otherwise exceed memory.
+    In this mode, a compiled kernel writes each accumulation directly into the
+    output array, so no intermediate arrays are allocated. The output is computed
+    in blocks of stream segments, and "memory" sets the maximum size of each block
+    of output in MB (default 256).
+
+    Use "out" to specify the output array. This may be a preallocated float
+    array (including a numpy memmap) with shape (Segments x P-values x Parameter
+    Runs), or the path to a new .npy file. If a path, the output is written to a
+    memory-mapped .npy file, which is flushed to disk after each block, and the
+    returned array is a memmap of the file. Set overwrite=True to allow "out" to
+    replace an existing file. Note that the returned array is a view of "out",
+    with singleton dimensions removed unless keepdims=True.
     ----------
     Inputs:
         p: The design probabilities for which to solve the model
@@ -174,6 +226,12 @@ def accumulation(
             is 1 p-value and 1 parameter run.
         screen: True (default) to replace negative accumulations with NaN. False
             to disable this screening.
+        dtype: The floating-point dtype of the output (float32 or float64)
+        out: A preallocated output array, or the path to a new .npy output file
+        overwrite: True to allow out to replace an existing file. False (default)
+            to prevent overwriting
+        memory: The maximum size of each block of output in MB for chunked
+            evaluation
 
     Outputs:
         numpy 3D array (Segments x P-values x Parameter Runs): The rainfall
@@ -184,20 +242,35 @@ def accumulation(
     p, B, Ct, Cf, Cs, T, F, S = _validate(p, B, Ct, Cf, Cs, T, F, S)
     validate.inrange(p, "p", min=0, max=1, ignore=np.nan)
 
-    # Solve the model
-    numerator = np.log(p / (1 - p)) - B
-    denominator = Ct * T + Cf * F + Cs * S
-    accumulation = numerator / denominator
+    # Optionally use chunked evaluation
+    dtype = chunks.dtype(dtype)
+    if out is not None or memory is not None:
+        accumulation = _chunked(
+            _accumulation_kernel,
+            p,
+            B,
+            Ct,
+            Cf,
+            Cs,
+            T,
+            F,
+            S,
+            dtype,
+            out,
+            overwrite,
+            memory,
+            screen,
+        )
+        return clean_dims(accumulation, keepdims)
 
-    # Optionally screen negative values and remove trailing dimensions
-    if screen:
-        negative = accumulation < 0
-        if np.any(negative):
-            accumulation = accumulation.astype(float)
-            accumulation[negative] = np.nan
+    # Solve the model at the requested precision, optionally screening negative
+    # values. Remove trailing dimensions
+    p, B, Ct, Cf, Cs, T, F, S = chunks.astype(dtype, p, B, Ct, Cf, Cs, T, F, S)
+    accumulation = _solve_accumulation(p, B, Ct, Cf, Cs, T, F, S, screen)
     return clean_dims(accumulation, keepdims)
 
 
+@traced
 def likelihood(
     R: AccumulationVector,
     B: Parameter,
@@ -209,6 +282,10 @@ def likelihood(
     S: Variable,
     *,
     keepdims: bool = False,
+    dtype: Optional[str | type] = None,
+    out: Optional[ndarray | Pathlike] = None,
+    overwrite: bool = False,
+    memory: Optional[scalar] = None,
 ) -> Likelihoods:
     """
     Computes debris-flow likelihood for specified rainfall accumulations
@@ -270,6 +347,31 @@ def likelihood(
     run. This allows use of different values for a variable. An example use
     case could be testing the model using different datasets to derive one or
     more variables.
+
+    likelihood(..., *, dtype)
+    Specifies the floating-point precision of the output array. Supported values
+    are "float64" (default) and "float32". Solving in float32 halves the memory and
+    bandwidth used by large ensembles, at the cost of precision. If "out" is a
+    preallocated array, the output precision is the dtype of "out", and dtype must
+    either be None or match that dtype.
+
+    likelihood(..., *, memory)
+    likelihood(..., *, out)
+    likelihood(..., *, out, overwrite=True)
+    Solves the model in chunked evaluation mode, which is intended for large
+    ensembles whose outputs (and temporary arrays) would otherwise exceed memory.
+    In this mode, a compiled kernel writes each likelihood directly into the output
+    array, so no intermediate arrays are allocated. The output is computed in
+    blocks of stream segments, and "memory" sets the maximum size of each block of
+    output in MB (default 256).
+
+    Use "out" to specify the output array. This may be a preallocated float
+    array (including a numpy memmap) with shape (Segments x R values x Parameter
+    Runs), or the path to a new .npy file. If a path, the output is written to a
+    memory-mapped .npy file, which is flushed to disk after each block, and the
+    returned array is a memmap of the file. Set overwrite=True to allow "out" to
+    replace an existing file. Note that the returned array is a view of "out",
+    with singleton dimensions removed unless keepdims=True.
     ----------
     Inputs:
         R: The rainfall accumulations for which to solve the model
@@ -282,6 +384,12 @@ def likelihood(
         S: The surface properties variable
         keepdims: True to always return a 3D numpy array. If False (default), removes
             dimensions 2 and/or 3 when singleton
+        dtype: The floating-point dtype of the output (float32 or float64)
+        out: A preallocated output array, or the path to a new .npy output file
+        overwrite: True to allow out to replace an existing file. False (default)
+            to prevent overwriting
+        memory: The maximum size of each block of output in MB for chunked
+            evaluation
 
     Outputs:
         numpy 3D array (Segments x R values x Parameter Runs): The estimated likelihoods
@@ -291,12 +399,73 @@ def likelihood(
     R, B, Ct, Cf, Cs, T, F, S = _validate(R, B, Ct, Cf, Cs, T, F, S)
     validate.positive(R, "R", allow_zero=True, ignore=np.nan)
 
-    # Solve the model. Optionally remove singleton dimensions
-    eX = np.exp(B + Ct * T * R + Cf * F * R + Cs * S * R)
-    likelihood = eX / (1 + eX)
+    # Optionally use chunked evaluation
+    dtype = chunks.dtype(dtype)
+    if out is not None or memory is not None:
+        likelihood = _chunked(
+            _likelihood_kernel,
+            R,
+            B,
+            Ct,
+            Cf,
+            Cs,
+            T,
+            F,
+            S,
+            dtype,
+            out,
+            overwrite,
+            memory,
+        )
+        return clean_dims(likelihood, keepdims)
+
+    # Solve the model at the requested precision. Optionally remove singleton dimensions
+    R, B, Ct, Cf, Cs, T, F, S = chunks.astype(dtype, R, B, Ct, Cf, Cs, T, F, S)
+    likelihood = _solve_likelihood(R, B, Ct, Cf, Cs, T, F, S)
     return clean_dims(likelihood, keepdims)
 
 
+def _solve_likelihood(
+    R: ndarray,
+    B: ndarray,
+    Ct: ndarray,
+    Cf: ndarray,
+    Cs: ndarray,
+    T: ndarray,
+    F: ndarray,
+    S: ndarray,
+) -> ndarray:
+    "Solves the likelihood model for validated arrays shaped for broadcasting"
+
+    # Use the logistic form that saturates to 0 or 1 when exp overflows
+    X = B + Ct * T * R + Cf * F * R + Cs * S * R
+    with np.errstate(over="ignore"):
+        return 1 / (1 + np.exp(-X))
+
+
+def _solve_accumulation(
+    p: ndarray,
+    B: ndarray,
+    Ct: ndarray,
+    Cf: ndarray,
+    Cs: ndarray,
+    T: ndarray,
+    F: ndarray,
+    S: ndarray,
+    screen: bool,
+) -> ndarray:
+    "Solves the accumulation model for validated arrays shaped for broadcasting"
+
+    numerator = np.log(p / (1 - p)) - B
+    denominator = Ct * T + Cf * F + Cs * S
+    accumulation = numerator / denominator
+    if screen:
+        negative = accumulation < 0
+        if np.any(negative):
+            accumulation[negative] = np.nan
+    return accumulation
+
+
 def _validate(
     PR: Any, B: Any, Ct: Any, Cf: Any, Cs: Any, T: Any, F: Any, S: Any
 ) -> tuple[Parameter, Parameter, Parameter, Parameter, Variable, Variable, Variable]:
@@ -370,6 +539,92 @@ def _validate(
     return PR, B, Ct, Cf, Cs, T, F, S
 
 
+#####
+# Chunked evaluation
+#####
+
+
+def _chunked(
+    kernel: Callable,
+    PR: ndarray,
+    B: ndarray,
+    Ct: ndarray,
+    Cf: ndarray,
+    Cs: ndarray,
+    T: ndarray,
+    F: ndarray,
+    S: ndarray,
+    dtype: np.dtype | None,
+    out: Any,
+    overwrite: bool,
+    memory: Any,
+    *options: Any,
+) -> ndarray:
+    "Solves a model into a preallocated output, one block of segments at a time"
+
+    # Get the output shape and the blocks of segments
+    nSegments = max(T.shape[0], F.shape[0], S.shape[0])
+    nRuns = max(X.shape[2] for X in (B, Ct, Cf, Cs, T, F, S))
+    shape = (nSegments, PR.size, nRuns)
+    if memory is None:
+        memory = _MEMORY
+    itemsize = 8 if dtype is None else dtype.itemsize
+    blocks = chunks.blocks(nSegments, PR.size * nRuns * itemsize, memory)
+
+    # Get the output array. Compute each block in double precision and flush
+    # memory-mapped outputs
+    output = chunks.output(out, shape, dtype, overwrite)
+    values = np.asarray(output)
+    inputs = [np.asarray(X, dtype=float) for X in (PR, B, Ct, Cf, Cs, T, F, S)]
+    for start, stop in blocks:
+        kernel(*inputs, *options, start, stop, values)
+        chunks.flush(output)
+    return output
+
+
+@njit(cache=True)
+def _index(X, segment, run):
+    "Returns the broadcasted element of a variable or parameter"
+    if X.shape[0] == 1:
+        segment = 0
+    if X.shape[2] == 1:
+        run = 0
+    return X[segment, 0, run]
+
+
+@njit(cache=True, error_model="numpy")
+def _likelihood_kernel(R, B, Ct, Cf, Cs, T, F, S, start, stop, out):
+    "Computes likelihoods for a block of segments without intermediate arrays"
+    for i in range(start, stop):
+        for k in range(out.shape[2]):
+            b = _index(B, 0, k)
+            t = _index(Ct, 0, k) * _index(T, i, k)
+            f = _index(Cf, 0, k) * _index(F, i, k)
+            s = _index(Cs, 0, k) * _index(S, i, k)
+            for j in range(out.shape[1]):
+                r = R[0, j, 0]
+                out[i, j, k] = 1 / (1 + np.exp(-(b + t * r + f * r + s * r)))
+
+
+@njit(cache=True, error_model="numpy")
+def _accumulation_kernel(p, B, Ct, Cf, Cs, T, F, S, screen, start, stop, out):
+    "Computes accumulations for a block of segments without intermediate arrays"
+    logits = np.log(p[0, :, 0] / (1 - p[0, :, 0]))
+    for i in range(start, stop):
+        for k in range(out.shape[2]):
+            b = _index(B, 0, k)
+            denominator = (
+                _index(Ct, 0, k) * _index(T, i, k)
+                + _index(Cf, 0, k) * _index(F, i, k)
+                + _index(Cs, 0, k) * _index(S, i, k)
+            )
+            for j in range(out.shape[1]):
+                accumulation = (logits[j] - b) / denominator
+                if screen and accumulation < 0:
+                    accumulation = np.nan
+                out[i, j, k] = accumulation
+
+
 #####
 # Model classes
 #####
@@ -404,6 +659,8 @@ class Model(ABC):
     Static Methods:
         _validate           - Validates a Segments object and input rasters for calculating variables
         _validate_omitnan   - Validates omitnan options for input rasters
+        _cached             - Returns a cached variable, or computes and caches it
+        _forget             - Drops a cached variable when one of its inputs is deleted
         _terrain_mask       - Locates pixels that are sufficiently burned and steep
     """
 
@@ -489,6 +746,11 @@ class Model(ABC):
     def _validate(segments: Any, rasters: list[Any], names: list[str]) -> list[Raster]:
         "Validates segments object and rasters for calculating variables"
 
+        # Deferred so the likelihood and accumulation solvers do not load the
+        # raster and stream network stack
+        from pfdf.segments import Segments
+        from pfdf.segments._validate import raster as validate_raster
+
         validate.type(segments, "segments", Segments, "pfdf.segments.Segments object")
         for r, raster, name in zip(range(len(rasters)), rasters, names):
             rasters[r] = validate_raster(segments, raster, name)
@@ -527,6 +789,60 @@ class Model(ABC):
         else:
             raise TypeError("omitnan must either be a boolean or a dict.")
 
+    @staticmethod
+    def _cached(
+        segments: Any,
+        compute: Callable,
+        rasters: list[Any],
+        names: list[str],
+        *options: Any,
+    ) -> CatchmentValues:
+        """Returns a variable from the network's cache, or validates the rasters and
+        computes the variable. Variables are only cached when every input is a Raster
+        object. The cache key records the identity of each Raster and of its metadata,
+        which is replaced whenever the Raster's data values change"""
+
+        from pfdf.raster import Raster
+        from pfdf.segments import Segments
+
+        # Only cache Raster inputs, as arrays and files may change without notice
+        validate.type(segments, "segments", Segments, "pfdf.segments.Segments object")
+        key = None
+        if all(isinstance(raster, Raster) for raster in rasters):
+            ids = tuple((id(raster), id(raster._metadata)) for raster in rasters)
+            key = (compute, ids, options)
+            try:
+                hash(key)
+            except TypeError:
+                key = None
+
+        # Use cached values when possible. Otherwise, compute the variable
+        if key is not None and key in segments._variables:
+            values, _ = segments._variables[key]
+            return values.copy()
+        inputs = rasters
+        rasters = Model._validate(segments, list(rasters), names)
+        values = compute(segments, *rasters, *options)
+
+        # Cache weak references to the inputs alongside the values. Deleting an input
+        # drops the entry, so the cache does not keep rasters alive, and the ids in
+        # the key are never reused by a live entry
+        if key is not None:
+            forget = partial(Model._forget, weakref.ref(segments), key)
+            refs = []
+            for raster in inputs:
+                refs.append(weakref.ref(raster, forget))
+                refs.append(weakref.ref(raster._metadata, forget))
+            segments._variables[key] = (values, refs)
+        return values.copy()
+
+    @staticmethod
+    def _forget(segments: weakref.ref, key: tuple, _: weakref.ref) -> None:
+        "Drops a cached variable from a Segments object when one of its inputs is deleted"
+        segments = segments()
+        if segments is not None:
+            segments._variables.pop(key, None)
+
     @staticmethod
     def _terrain_mask(
         burned: Raster, slopes: Raster, threshold_degrees: float
@@ -534,8 +850,11 @@ class Model(ABC):
         "Returns a mask of pixels that are sufficiently burned, and that have"
         "slopes steeper than a threshold"
 
-        # Validate burn mask and convert threshold from degrees to gradient
-        burned = validate.boolean(burned.values, burned.name, ignore=burned.nodata)
+        # Validate burn mask and convert threshold from degrees to gradient. (The
+        # raster package is imported here so that importing the solvers stays light)
+        from pfdf.raster._utils import provenance
+
+        burned = provenance.boolean(burned)
         threshold = slope.from_degrees(threshold_degrees)
 
         # Build the mask. Preserve NoData
@@ -619,10 +938,9 @@ class M1(Model):
         Outputs:
             numpy 1D array: The M1 terrain variable (T)
         """
-        moderate_high, slopes = Model._validate(
-            segments, [moderate_high, slopes], ["moderate_high", "slopes"]
+        return Model._cached(
+            segments, M1._terrain, [moderate_high, slopes], ["moderate_high", "slopes"]
         )
-        return M1._terrain(segments, moderate_high, slopes)
 
     @staticmethod
     def fire(
@@ -645,8 +963,7 @@ class M1(Model):
         Outputs:
             numpy 1D array: The M1 fire variable (F)
         """
-        (dnbr,) = Model._validate(segments, [dnbr], ["dnbr"])
-        return M1._fire(segments, dnbr, omitnan)
+        return Model._cached(segments, M1._fire, [dnbr], ["dnbr"], omitnan)
 
     @staticmethod
     def soil(
@@ -669,8 +986,7 @@ class M1(Model):
         Outputs:
             numpy 1D array: The M1 soil variable (S)
         """
-        (kf_factor,) = Model._validate(segments, [kf_factor], ["kf_factor"])
-        return M1._soil(segments, kf_factor, omitnan)
+        return Model._cached(segments, M1._soil, [kf_factor], ["kf_factor"], omitnan)
 
     @staticmethod
     def variables(
@@ -729,18 +1045,17 @@ class M1(Model):
             numpy 1D array: The soil variable (S) for each stream segment
         """
 
-        # Validate
-        moderate_high, slopes, dnbr, kf_factor = Model._validate(
-            segments,
-            [moderate_high, slopes, dnbr, kf_factor],
-            ["moderate_high", "slopes", "dnbr", "kf_factor"],
-        )
+        # Validate options
         omitnan = Model._validate_omitnan(omitnan, rasters=["dnbr", "kf_factor"])
 
         # Get variables
-        T = M1._terrain(segments, moderate_high, slopes)
-        F = M1._fire(segments, dnbr, omitnan["dnbr"])
-        S = M1._soil(segments, kf_factor, omitnan["kf_factor"])
+        T = Model._cached(
+            segments, M1._terrain, [moderate_high, slopes], ["moderate_high", "slopes"]
+        )
+        F = Model._cached(segments, M1._fire, [dnbr], ["dnbr"], omitnan["dnbr"])
+        S = Model._cached(
+            segments, M1._soil, [kf_factor], ["kf_factor"], omitnan["kf_factor"]
+        )
         return T, F, S
 
 
@@ -785,6 +1100,8 @@ class M2(Model):
     ) -> CatchmentValues:
         "Computes the M2 terrain variable"
 
+        from pfdf.raster import Raster
+
         # Convert slopes to sine-thetas, but preserve nodata
         sine_thetas = slope.to_sine(slopes.values)
         sine_thetas = sine_thetas.astype(float, copy=False)
@@ -840,10 +1157,13 @@ class M2(Model):
         Outputs:
             numpy 1D array: The M2 terrain variable (T)
         """
-        slopes, moderate_high = Model._validate(
-            segments, [slopes, moderate_high], ["slopes", "moderate_high"]
+        return Model._cached(
+            segments,
+            M2._terrain,
+            [slopes, moderate_high],
+            ["slopes", "moderate_high"],
+            omitnan,
         )
-        return M2._terrain(segments, slopes, moderate_high, omitnan)
 
     @staticmethod
     def fire(
@@ -866,8 +1186,7 @@ class M2(Model):
         Outputs:
             numpy 1D array: The M2 fire variable (F)
         """
-        (dnbr,) = Model._validate(segments, [dnbr], ["dnbr"])
-        return M2._fire(segments, dnbr, omitnan)
+        return Model._cached(segments, M2._fire, [dnbr], ["dnbr"], omitnan)
 
     @staticmethod
     def soil(
@@ -890,8 +1209,7 @@ class M2(Model):
         Outputs:
             numpy 1D array: The M2 soil variable (S)
         """
-        (kf_factor,) = Model._validate(segments, [kf_factor], ["kf_factor"])
-        return M2._soil(segments, kf_factor, omitnan)
+        return Model._cached(segments, M2._soil, [kf_factor], ["kf_factor"], omitnan)
 
     @staticmethod
     def variables(
@@ -947,20 +1265,23 @@ class M2(Model):
             numpy 1D array: The soil variable (S) for each stream segment
         """
 
-        # Validate
-        moderate_high, slopes, dnbr, kf_factor = Model._validate(
-            segments,
-            [moderate_high, slopes, dnbr, kf_factor],
-            ["moderate_high", "slopes", "dnbr", "kf_factor"],
-        )
+        # Validate options
         omitnan = Model._validate_omitnan(
             omitnan, rasters=["slopes", "dnbr", "kf_factor"]
         )
 
         # Compute variables
-        T = M2._terrain(segments, slopes, moderate_high, omitnan["slopes"])
-        F = M2._fire(segments, dnbr, omitnan["dnbr"])
-        S = M2._soil(segments, kf_factor, omitnan["kf_factor"])
+        T = Model._cached(
+            segments,
+            M2._terrain,
+            [slopes, moderate_high],
+            ["slopes", "moderate_high"],
+            omitnan["slopes"],
+        )
+        F = Model._cached(segments, M2._fire, [dnbr], ["dnbr"], omitnan["dnbr"])
+        S = Model._cached(
+            segments, M2._soil, [kf_factor], ["kf_factor"], omitnan["kf_factor"]
+        )
         return T, F, S
 
 
@@ -1044,8 +1365,7 @@ class M3(Model):
         Outputs:
             numpy 1D array: The M3 terrain variable (T)
         """
-        (relief,) = Model._validate(segments, [relief], ["relief"])
-        return M3._terrain(segments, relief, relief_per_m)
+        return Model._cached(segments, M3._terrain, [relief], ["relief"], relief_per_m)
 
     @staticmethod
     def fire(segments: Segments, moderate_high: RasterInput) -> CatchmentValues:
@@ -1062,8 +1382,7 @@ class M3(Model):
         Outputs:
             numpy 1D array: The M3 fire variable (F)
         """
-        (moderate_high,) = Model._validate(segments, [moderate_high], ["moderate_high"])
-        return M3._fire(segments, moderate_high)
+        return Model._cached(segments, M3._fire, [moderate_high], ["moderate_high"])
 
     @staticmethod
     def soil(
@@ -1086,10 +1405,9 @@ class M3(Model):
         Outputs:
             numpy 1D array: The M3 soil variable (S)
         """
-        (soil_thickness,) = Model._validate(
-            segments, [soil_thickness], ["soil_thickness"]
+        return Model._cached(
+            segments, M3._soil, [soil_thickness], ["soil_thickness"], omitnan
         )
-        return M3._soil(segments, soil_thickness, omitnan)
 
     @staticmethod
     def variables(
@@ -1148,19 +1466,20 @@ class M3(Model):
             numpy 1D array: The soil variable (S) for each stream segment
         """
 
-        # Validate
-        moderate_high, relief, soil_thickness = Model._validate(
-            segments,
-            [moderate_high, relief, soil_thickness],
-            ["moderate_high", "relief", "soil_thickness"],
-        )
+        # Validate options
         omitnan = Model._validate_omitnan(omitnan, rasters=["soil_thickness"])
         relief_per_m = validate.conversion(relief_per_m, "relief_per_m")
 
         # Get variables
-        T = M3._terrain(segments, relief, relief_per_m)
-        F = M3._fire(segments, moderate_high)
-        S = M3._soil(segments, soil_thickness, omitnan["soil_thickness"])
+        T = Model._cached(segments, M3._terrain, [relief], ["relief"], relief_per_m)
+        F = Model._cached(segments, M3._fire, [moderate_high], ["moderate_high"])
+        S = Model._cached(
+            segments,
+            M3._soil,
+            [soil_thickness],
+            ["soil_thickness"],
+            omitnan["soil_thickness"],
+        )
         return T, F, S
 
 
@@ -1241,10 +1560,9 @@ class M4(Model):
         Outputs:
             numpy 1D array: The M4 terrain variable (T)
         """
-        isburned, slopes = Model._validate(
-            segments, [isburned, slopes], ["isburned", "slopes"]
+        return Model._cached(
+            segments, M4._terrain, [isburned, slopes], ["isburned", "slopes"]
         )
-        return M4._terrain(segments, isburned, slopes)
 
     @staticmethod
     def fire(
@@ -1267,8 +1585,7 @@ class M4(Model):
         Outputs:
             numpy 1D array: The M4 fire variable (F)
         """
-        (dnbr,) = Model._validate(segments, [dnbr], ["dnbr"])
-        return M4._fire(segments, dnbr, omitnan)
+        return Model._cached(segments, M4._fire, [dnbr], ["dnbr"], omitnan)
 
     @staticmethod
     def soil(
@@ -1291,10 +1608,9 @@ class M4(Model):
         Outputs:
             numpy 1D array: The M4 soil variable (S)
         """
-        (soil_thickness,) = Model._validate(
-            segments, [soil_thickness], ["soil_thickness"]
+        return Model._cached(
+            segments, M4._soil, [soil_thickness], ["soil_thickness"], omitnan
         )
-        return M4._soil(segments, soil_thickness, omitnan)
 
     @staticmethod
     def variables(
@@ -1351,16 +1667,19 @@ class M4(Model):
             numpy 1D array: The soil variable (S) for each stream segment
         """
 
-        # Validate segments and rasters
-        isburned, slopes, dnbr, soil_thickness = Model._validate(
-            segments,
-            [isburned, slopes, dnbr, soil_thickness],
-            ["isburned", "slopes", "dnbr", "soil_thickness"],
-        )
+        # Validate options
         omitnan = Model._validate_omitnan(omitnan, rasters=["dnbr", "soil_thickness"])
 
         # Get variables
-        T = M4._terrain(segments, isburned, slopes)
-        F = M4._fire(segments, dnbr, omitnan["dnbr"])
-        S = M4._soil(segments, soil_thickness, omitnan["soil_thickness"])
+        T = Model._cached(
+            segments, M4._terrain, [isburned, slopes], ["isburned", "slopes"]
+        )
+        F = Model._cached(segments, M4._fire, [dnbr], ["dnbr"], omitnan["dnbr"])
+        S = Model._cached(
+            segments,
+            M4._soil,
+            [soil_thickness],
+            ["soil_thickness"],
+            omitnan["soil_thickness"],
+        )
         return T, F, S
@@ -0,0 +1,284 @@
+"""
+table  Builds batched hazard tables from the staley2017, gartner2014, and cannon2010 models
+----------
+This module solves the rainfall thresholds, sediment volumes, and combined hazard
+classes commonly reported by a hazard assessment in a single batched pass. Rather
+than looping over models, rainfall durations, and design rainfalls - and
+re-validating the inputs on every call - the inputs are validated once and stacked
+along the parameter-run dimension of the Staley 2017 models. The results are
+returned as tidy pandas DataFrames with one row per queried combination.
+----------
+User Functions:
+    hazard_table    - Returns tidy rainfall threshold and hazard tables for a set of segments
+
+Internal:
+    _validate_variables - Checks that model variables are valid and stacks them by model
+    _parameters         - Returns Staley 2017 parameters for each model and duration
+    _tidy               - Builds a tidy DataFrame from broadcastable model outputs
+"""
+
+from __future__ import annotations
+
+import typing
+
+import numpy as np
+from pandas import DataFrame
+
+import pfdf._validate.core as validate
+from pfdf._utils import real
+from pfdf._utils.instrument import traced
+from pfdf.errors import ShapeError
+from pfdf.models import cannon2010, gartner2014, staley2017
+from pfdf.utils.intensity import from_accumulation, to_accumulation
+
+if typing.TYPE_CHECKING:
+    from typing import Any, Optional
+
+    from pfdf.typing.core import RealArray, vector
+    from pfdf.typing.models import Variable
+
+    ModelVariables = dict[str, tuple[Variable, Variable, Variable]]
+
+# The supported Staley 2017 models
+_MODELS = {
+    "m1": staley2017.M1,
+    "m2": staley2017.M2,
+    "m3": staley2017.M3,
+    "m4": staley2017.M4,
+}
+
+
+#####
+# User Functions
+#####
+
+
+@traced
+def hazard_table(
+    variables: ModelVariables,
+    Bmh: Variable,
+    R: Variable,
+    *,
+    durations: vector = [15, 30, 60],
+    probabilities: vector = [0.5],
+    i15: vector = [16, 20, 24, 40],
+    ids: Optional[vector] = None,
+    screen: bool = True,
+    p_thresholds: vector = [0.25, 0.5, 0.75],
+    v_thresholds: vector = [1e3, 1e4, 1e5],
+    h_thresholds: vector = [3, 6],
+) -> tuple[DataFrame, DataFrame]:
+    """
+    Returns tidy tables of rainfall thresholds and combined hazard classes
+    ----------
+    hazard_table(variables, Bmh, R)
+    Solves the Staley 2017 rainfall thresholds, Staley 2017 likelihoods, Gartner 2014
+    emergency sediment volumes, and Cannon 2010 combined hazard classes for a set of
+    stream segments. The "variables" input should be a dict whose keys are the names
+    of Staley 2017 models ("M1", "M2", "M3", and/or "M4"), and whose values are
+    the (T, F, S) variables for the model - for example, the output of
+    staley2017.M1.variables. Each variable should be a vector with one element
+    per segment, or a scalar. Bmh is the catchment area burned at moderate or high
+    severity in km^2, and R is the watershed relief in meters. These are used to
+    solve the Gartner 2014 emergency model.
+
+    Returns two pandas DataFrames. The first is a rainfall threshold table with one
+    row per model, rainfall duration, probability level, and segment. Its columns
+    are: model, duration, probability, segment, accumulation (mm/duration), and
+    intensity (mm/hour). Negative accumulations are screened and set to NaN.
+
+    The second is a hazard table with one row per model, 15-minute rainfall
+    intensity, and segment. Its columns are: model, i15, segment, likelihood,
+    volume, and hazard. Likelihoods are solved using the 15-minute parameters of
+    each model, with the rainfall accumulation implied by the i15 intensity.
+    Volumes are the predicted volumes of the Gartner 2014 emergency model with its
+    default parameters, and hazard is the Cannon 2010 combined hazard class.
+
+    Equivalent tables can be built by calling Model.parameters, staley2017.accumulation,
+    utils.intensity.from_accumulation, staley2017.likelihood, gartner2014.emergency,
+    and cannon2010.hazard in a loop. This function validates each input once and
+    solves every model, duration, and rainfall in a single broadcasted pass.
+
+    hazard_table(..., *, durations, probabilities, i15)
+    Specifies the rainfall durations (15, 30, and/or 60 minutes), the probability
+    levels used to solve the rainfall thresholds, and the 15-minute rainfall
+    intensities (mm/hour) used to solve the hazard table. By default, solves
+    thresholds for all 3 durations at a probability of 0.5, and the hazard table
+    for i15 intensities of 16, 20, 24, and 40 mm/hour.
+
+    hazard_table(..., *, ids)
+    Specifies the IDs used to label the segments in the "segment" column - for
+    example, Segments.ids. By default, segments are labeled by their index.
+
+    hazard_table(..., *, screen=False)
+    Does not screen negative rainfall accumulations.
+
+    hazard_table(..., *, p_thresholds, v_thresholds, h_thresholds)
+    Specifies the likelihood, volume, and combined-score thresholds used to
+    classify hazards. See cannon2010.hazard for details.
+    ----------
+    Inputs:
+        variables: A dict mapping Staley 2017 model names to (T, F, S) variables
+        Bmh: Catchment area burned at moderate or high intensity in km^2
+        R: Watershed relief in meters
+        durations: The rainfall durations (in minutes) for the rainfall thresholds
+        probabilities: The probability levels for the rainfall thresholds
+        i15: The peak 15-minute rainfall intensities (mm/hour) for the hazard table
+        ids: Labels for the segments. Defaults to segment indices
+        screen: True (default) to set negative rainfall accumulations to NaN
+        p_thresholds: Likelihood thresholds for the Cannon 2010 classification
+        v_thresholds: Volume thresholds for the Cannon 2010 classification
+        h_thresholds: Combined score thresholds for the Cannon 2010 classification
+
+    Outputs:
+        pandas.DataFrame: The rainfall threshold table
+        pandas.DataFrame: The hazard table
+    """
+
+    # Validate the model variables and design rainfalls
+    models, (T, F, S, Bmh, R) = _validate_variables(variables, Bmh, R)
+    nsegments = T.shape[0]
+    durations = validate.vector(durations, "durations", dtype=real)
+    probabilities = validate.vector(probabilities, "probabilities", dtype=real)
+    validate.inrange(probabilities, "probabilities", min=0, max=1)
+    i15 = validate.vector(i15, "i15", dtype=real)
+    validate.positive(i15, "i15", allow_zero=True)
+
+    # Validate segment IDs
+    if ids is None:
+        ids = np.arange(nsegments)
+    else:
+        ids = validate.vector(ids, "ids", length=nsegments)
+
+    # Validate hazard thresholds
+    Tp = cannon2010._validate_thresholds(p_thresholds, "p_thresholds", range=[0, 1])
+    Tv = cannon2010._validate_thresholds(v_thresholds, "v_thresholds")
+    Th = cannon2010._validate_thresholds(h_thresholds, "h_thresholds", integers=True)
+
+    # Solve the thresholds for every model and duration as a single set of runs.
+    # Runs are ordered by model, and then by duration
+    B, Ct, Cf, Cs = _parameters(models, durations)
+    p = probabilities.reshape(1, -1, 1)
+    Tr, Fr, Sr = [np.repeat(X, durations.size, axis=2) for X in (T, F, S)]
+    accumulation = staley2017._solve_accumulation(p, B, Ct, Cf, Cs, Tr, Fr, Sr, screen)
+    runs = np.tile(durations, len(models))
+    intensity = from_accumulation(accumulation, runs, dim=2)
+
+    # Build the tidy threshold table. Rows are ordered by model, duration,
+    # probability, and then segment
+    names = np.array([model.__name__ for model in models])
+    shape = (nsegments, probabilities.size, len(models), durations.size)
+    thresholds = _tidy(
+        shape,
+        order=(2, 3, 1, 0),
+        model=(names, 2),
+        duration=(durations, 3),
+        probability=(probabilities, 1),
+        segment=(ids, 0),
+        accumulation=(accumulation, None),
+        intensity=(intensity, None),
+    )
+
+    # Solve likelihoods for each i15 using the 15-minute parameters of each model
+    B, Ct, Cf, Cs = _parameters(models, [15])
+    accumulation = to_accumulation(i15, 15).reshape(1, -1, 1)
+    likelihood = staley2017._solve_likelihood(accumulation, B, Ct, Cf, Cs, T, F, S)
+
+    # Solve volumes and the combined hazard classes
+    volume, _, _ = gartner2014.emergency(i15, Bmh, R, CI=None, keepdims=True)
+    hazard = cannon2010._hazard(likelihood, volume, Tp, Tv, Th, None, None)
+
+    # Build the tidy hazard table. Rows are ordered by model, i15, and then segment
+    shape = (nsegments, i15.size, len(models))
+    hazards = _tidy(
+        shape,
+        order=(2, 1, 0),
+        model=(names, 2),
+        i15=(i15, 1),
+        segment=(ids, 0),
+        likelihood=(likelihood, None),
+        volume=(volume, None),
+        hazard=(hazard, None),
+    )
+    return thresholds, hazards
+
+
+#####
+# Internal
+#####
+
+
+def _validate_variables(
+    variables: Any, Bmh: Any, R: Any
+) -> tuple[list[type[staley2017.Model]], list[RealArray]]:
+    """Checks that model variables are valid. Returns the Staley 2017 model classes,
+    and the T, F, S (Segments x 1 x Models), Bmh, and R (Segments) variables"""
+
+    # Parse the Staley 2017 models
+    validate.type(variables, "variables", dict, "dict")
+    if len(variables) == 0:
+        raise ValueError("variables must include at least one Staley 2017 model")
+    models = []
+    for name in variables.keys():
+        name = validate.option(name, "variables key", allowed=list(_MODELS))
+        models.append(_MODELS[name])
+
+    # Collect each variable as a vector
+    collected = {"T": [], "F": [], "S": []}
+    for (name, values), model in zip(variables.items(), models):
+        if len(values) != 3:
+            raise ValueError(
+                f"variables[{name!r}] must be a (T, F, S) tuple of model variables"
+            )
+        for key, value in zip(collected, values):
+            value = validate.vector(
+                value, f"{key} for model {model.__name__}", dtype=real
+            )
+            collected[key].append(value)
+    for name, value in {"Bmh": Bmh, "R": R}.items():
+        value = validate.vector(value, name, dtype=real)
+        validate.positive(value, name, allow_zero=True, ignore=np.nan)
+        collected[name] = [value]
+
+    # All variables must have 1 or nSegments elements
+    sizes = [value.size for values in collected.values() for value in values]
+    nsegments = max(sizes)
+    if any(size not in (1, nsegments) for size in sizes):
+        raise ShapeError(
+            f"Each variable must have either 1 or {nsegments} elements (one per "
+            "segment), but the variables have different numbers of segments."
+        )
+
+    # Stack the Staley variables along the model dimension
+    output = []
+    for values in collected.values():
+        values = [np.broadcast_to(value, (nsegments,)) for value in values]
+        output.append(np.stack(values, axis=-1).reshape(nsegments, 1, -1))
+    output[-2:] = [value.reshape(-1) for value in output[-2:]]
+    return models, output
+
+
+def _parameters(
+    models: list[type[staley2017.Model]], durations: Any
+) -> tuple[RealArray, RealArray, RealArray, RealArray]:
+    "Returns the B, Ct, Cf, Cs parameters of each model and duration as runs"
+    parameters = zip(*[model.parameters(durations) for model in models])
+    return tuple(np.concatenate(values).reshape(1, 1, -1) for values in parameters)
+
+
+def _tidy(shape: tuple[int, ...], order: tuple[int, ...], **columns) -> DataFrame:
+    """Builds a tidy DataFrame. Each column is a (values, axis) tuple. Vectors are
+    placed along the indicated axis of the shape, whereas axis=None broadcasts an
+    array over the shape. Rows follow the order of the transposed axes"""
+
+    data = {}
+    for name, (values, axis) in columns.items():
+        if axis is not None:
+            reshape = [1] * len(shape)
+            reshape[axis] = -1
+            values = values.reshape(reshape)
+        elif values.size == np.prod(shape):
+            values = values.reshape(shape)
+        values = np.broadcast_to(values, shape)
+        data[name] = values.transpose(order).reshape(-1)
+    return DataFrame(data)
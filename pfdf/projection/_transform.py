@@ -606,11 +606,11 @@ class Transform(Locator):
         if crs == self.crs:
             return self.copy()
 
-        # Reproject coordinates of next pixel. Use to compute dx and dy
-        left, top = _crs.reproject(self.crs, crs, self.left, self.top)
-        right = self.left + self.dx()
-        bottom = self.top + self.dy()
-        right, bottom = _crs.reproject(self.crs, crs, right, bottom)
+        # Reproject the corner and the coordinates of the next pixel in a single
+        # call. Use to compute dx and dy
+        xs = (self.left, self.left + self.dx())
+        ys = (self.top, self.top + self.dy())
+        (left, right), (top, bottom) = _crs.reproject(self.crs, crs, xs, ys)
         dx = right - left
         dy = bottom - top
         return Transform(dx, dy, left, top, crs)
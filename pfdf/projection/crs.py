@@ -39,6 +39,7 @@ Units per meter:
 
 Reprojection:
     reproject       - Reprojects XY coordinates from one CRS to another
+    reproject_bounds- Reprojects the edges of bounding boxes from one CRS to another
     utm_zone        - Returns the CRS of the best UTM zone for an XY coordinate
 
 Internal Validation:
@@ -50,18 +51,27 @@ Internal Units:
     _supported_units    - Returns a dict of category units with non-zero conversion factors
     _unit               - Returns the name of an axis unit
     _units_per_m        - Returns the number of axis base units per meter
+
+Internal Cache:
+    _describe           - Returns the cached descriptor of a CRS
+    _parse              - Parses the axis information for a CRS
+    _find_axis          - Searches the axis info of a CRS for the X or Y axis
+    _transformer        - Returns a cached transformer between two CRSs
+    _utm_zones          - Returns the cached areas of use of the WGS 84 UTM zones
+    _utm_crs            - Returns a cached UTM CRS
 """
 
 from __future__ import annotations
 
 import typing
+from functools import lru_cache
+from math import nan
 
 import numpy as np
 import pyproj.exceptions
 from numpy import arcsin, arctan2, cos, sin, sqrt
 from pyproj import CRS, Transformer
 from pyproj._crs import Axis
-from pyproj.aoi import AreaOfInterest
 from pyproj.database import get_units_map, query_utm_crs_info
 
 import pfdf._validate.core as _validate
@@ -73,7 +83,7 @@ from pfdf.utils import units as _units
 if typing.TYPE_CHECKING:
     from typing import Any, Literal, Optional
 
-    from pyproj.database import Unit
+    from pyproj.database import CRSInfo, Unit
 
     from pfdf.typing.core import (
         XY,
@@ -89,6 +99,9 @@ if typing.TYPE_CHECKING:
     SupportedUnits = dict[str, Unit]
     AxisName = Literal["x", "dx", "left", "right", "y", "dy", "top", "bottom"]
 
+    # (axes, whether each axis is angular, error message for unsupported CRS)
+    Descriptor = tuple[dict[XY, Axis | None], dict[XY, bool], str | None]
+
 
 #####
 # Supported Units
@@ -210,18 +223,10 @@ def get_axis(crs: CRSlike, axis: AxisName) -> Axis | None:
     if not isinstance(crs, CRS):
         crs = validate(crs)
 
-    # Determine appropriate axis
+    # Return the cached axis
     axis = _validate_axname(axis)
-    if axis == "x":
-        isaxis = isx
-    else:
-        isaxis = isy
-
-    # Locate the first valid axis
-    axes = crs.axis_info
-    for axis in axes:
-        if isaxis(axis):
-            return axis
+    axes, _, _ = _describe(crs)
+    return axes[axis]
 
 
 #####
@@ -233,7 +238,7 @@ def _validate_axis(crs: CRS, axname: XY) -> None:
     "Checks that an axis exists, and has a supported base unit"
 
     # Axis must exist
-    axis = get_axis(crs, axname)
+    axis = _find_axis(crs, axname)
     if axis is None:
         raise CRSError(f'Could not locate the {axname}-axis for CRS = "{crs.name}"')
 
@@ -275,20 +280,23 @@ def validate(crs: CRSlike | None, strict: bool = False) -> CRS | None:
             raise MissingCRSError("CRS cannot be None")
         return crs
 
-    # Must be convertible to a pyproj CRS
-    try:
-        crs = CRS(crs)
-    except pyproj.exceptions.CRSError as error:
-        raise CRSError(
-            "Unsupported CRS. A valid CRS must be convertible to a pyproj.CRS "
-            "object via the standard API. See the pyproj documentation for examples "
-            "of supported CRS inputs: "
-            "https://pyproj4.github.io/pyproj/stable/api/crs/crs.html#pyproj.crs.CRS.__init__"
-        ) from error
+    # Must be convertible to a pyproj CRS. (CRS objects are immutable, so are
+    # used directly)
+    if not isinstance(crs, CRS):
+        try:
+            crs = CRS(crs)
+        except pyproj.exceptions.CRSError as error:
+            raise CRSError(
+                "Unsupported CRS. A valid CRS must be convertible to a pyproj.CRS "
+                "object via the standard API. See the pyproj documentation for examples "
+                "of supported CRS inputs: "
+                "https://pyproj4.github.io/pyproj/stable/api/crs/crs.html#pyproj.crs.CRS.__init__"
+            ) from error
 
     # Must have supported X and Y axes
-    for axis in ["x", "y"]:
-        _validate_axis(crs, axis)
+    _, _, error = _describe(crs)
+    if error is not None:
+        raise CRSError(error)
     return crs
 
 
@@ -487,14 +495,13 @@ def base_to_units(
     crs, axname, distances, units, y = _validate_conversion(
         crs, axis, distances, units, y
     )
-    axis = get_axis(crs, axname)
-    distances = distances * axis.unit_conversion_factor
+    axes, angular, _ = _describe(crs)
+    distances = distances * axes[axname].unit_conversion_factor
 
     # Convert radians to meters, using haversine when possible
-    if axis.unit_name in supported_angular_units():
+    if angular[axname]:
         if (axname == "x") and (y is not None):
-            yaxis = get_axis(crs, "y")
-            y = y * yaxis.unit_conversion_factor
+            y = y * axes["y"].unit_conversion_factor
             a = cos(y) ** 2 * sin(distances / 2) ** 2
             a[a > 1] = 1
             distances = np.sign(distances) * 2 * arctan2(sqrt(a), sqrt(1 - a))
@@ -542,22 +549,21 @@ def units_to_base(
     crs, axname, distances, units, y = _validate_conversion(
         crs, axis, distances, units, y
     )
-    axis = get_axis(crs, axname)
+    axes, angular, _ = _describe(crs)
     distances = _units.convert(distances, units, "meters")
 
     # If angular, convert to radians. Use haversine when possible
-    if axis.unit_name in supported_angular_units():
+    if angular[axname]:
         distances = distances / _EARTH_RADIUS_M
         if (axname == "x") and (y is not None):
-            yaxis = get_axis(crs, "y")
-            lat = y * yaxis.unit_conversion_factor
+            lat = y * axes["y"].unit_conversion_factor
             cosd = cos(distances)
             sinlat = sin(lat)
             y = arcsin(cosd * sinlat)
             distances = arctan2(sin(distances) * cos(lat), cosd - sinlat * sin(y))
 
     # Convert from standard unit (meters or degrees) to axis unit
-    return distances / axis.unit_conversion_factor
+    return distances / axes[axname].unit_conversion_factor
 
 
 #####
@@ -646,6 +652,12 @@ def units_per_m(
 # Reprojection
 #####
 
+# The number of points added between the corners of each bounding box edge
+_DENSIFY = 21
+
+# WGS 84 longitude-latitude, used to locate UTM zones
+_WGS84 = CRS(4326)
+
 
 def reproject(
     from_crs: CRSlike, to_crs: CRSlike, xs: vector, ys: vector
@@ -674,8 +686,67 @@ def reproject(
     ys = _validate.vector(ys, "ys", dtype=real, length=xs.size)
 
     # Reproject
-    transformer = Transformer.from_crs(from_crs, to_crs, always_xy=True)
-    return transformer.transform(xs, ys)
+    return _transformer(from_crs, to_crs).transform(xs, ys)
+
+
+def reproject_bounds(
+    from_crs: CRSlike,
+    to_crs: CRSlike,
+    lefts: vector,
+    bottoms: vector,
+    rights: vector,
+    tops: vector,
+) -> tuple[VectorArray, VectorArray, VectorArray, VectorArray]:
+    """
+    Converts the edges of bounding boxes from one CRS to another
+    ----------
+    reproject_bounds(from_crs, to_crs, lefts, bottoms, rights, tops)
+    Reprojects the edges of N bounding boxes from one CRS to another. Densifies
+    each edge of each box with 21 intermediate points, and then reprojects all
+    the points in a single transformation. The reprojected edges of each box are
+    the minimum and maximum reprojected coordinates of its points. The output
+    edges of a box are NaN if any of its points are outside the domain of a CRS.
+    Boxes that cross the antimeridian of a geographic CRS are not supported.
+    ----------
+    Inputs:
+        from_crs: The CRS that the bounding boxes are currently in
+        to_crs: The CRS that the bounding boxes should be projected to
+        lefts: The left edges of the bounding boxes
+        bottoms: The bottom edges of the bounding boxes
+        rights: The right edges of the bounding boxes
+        tops: The top edges of the bounding boxes
+
+    Outputs:
+        1D numpy array: The reprojected left edges
+        1D numpy array: The reprojected bottom edges
+        1D numpy array: The reprojected right edges
+        1D numpy array: The reprojected top edges
+    """
+
+    # Validate
+    from_crs = validate(from_crs, strict=True)
+    to_crs = validate(to_crs, strict=True)
+    lefts = _validate.vector(lefts, "lefts", dtype=real)
+    bottoms = _validate.vector(bottoms, "bottoms", dtype=real, length=lefts.size)
+    rights = _validate.vector(rights, "rights", dtype=real, length=lefts.size)
+    tops = _validate.vector(tops, "tops", dtype=real, length=lefts.size)
+
+    # Densify the edges of each box. Each row holds the points of one box
+    steps = np.linspace(0, 1, _DENSIFY + 2)
+    xs = lefts[:, None] + np.outer(rights - lefts, steps)
+    ys = bottoms[:, None] + np.outer(tops - bottoms, steps)
+    left, right = np.broadcast_arrays(lefts[:, None], rights[:, None], xs)[:2]
+    bottom, top = np.broadcast_arrays(bottoms[:, None], tops[:, None], ys)[:2]
+    xs = np.concatenate((xs, xs, left, right), axis=1)
+    ys = np.concatenate((bottom, top, ys, ys), axis=1)
+
+    # Reproject every point at once. Use the extreme points of each box as edges
+    xs, ys = _transformer(from_crs, to_crs).transform(xs, ys)
+    invalid = ~(np.isfinite(xs) & np.isfinite(ys)).all(axis=1)
+    edges = [xs.min(axis=1), ys.min(axis=1), xs.max(axis=1), ys.max(axis=1)]
+    for edge in edges:
+        edge[invalid] = nan
+    return tuple(edges)
 
 
 def utm_zone(crs: CRSlike, x: scalar, y: scalar) -> CRS | None:
@@ -701,13 +772,89 @@ def utm_zone(crs: CRSlike, x: scalar, y: scalar) -> CRS | None:
     y = _validate.scalar(y, "y", dtype=real)
 
     # Convert point to lon-lat
-    transformer = Transformer.from_crs(crs, 4326, always_xy=True)
-    lon, lat = transformer.transform(x, y)
+    lon, lat = _transformer(crs, _WGS84).transform(x, y)
 
-    # Query UTM
-    aoi = AreaOfInterest(lon, lat, lon, lat)
-    zones = query_utm_crs_info("WGS 84", aoi)
-    if len(zones) == 0:
-        return None
+    # Return the first UTM zone whose area of use contains the point
+    for zone in _utm_zones():
+        area = zone.area_of_use
+        if area.west <= lon <= area.east and area.south <= lat <= area.north:
+            return _utm_crs(zone.name)
+    return None
+
+
+#####
+# Internal Cache
+#####
+
+# The maximum number of cached CRS descriptors and transformers
+_CACHE_SIZE = 128
+
+# Cached CRS descriptors, from least to most recently used
+_DESCRIPTORS: dict[tuple[type, str], Descriptor] = {}
+
+
+def _describe(crs: CRS) -> Descriptor:
+    """Returns the cached axis information for a CRS. Parses the CRS if it is not
+    in the cache. CRSs are keyed by their class and definition string, so lookups
+    do not require exporting the CRS to WKT"""
+
+    # Get the descriptor and mark it as the most recently used
+    key = (type(crs), crs.srs)
+    descriptor = _DESCRIPTORS.pop(key, None)
+    if descriptor is None:
+        descriptor = _parse(crs)
+    _DESCRIPTORS[key] = descriptor
+
+    # Remove the least recently used descriptor as needed
+    if len(_DESCRIPTORS) > _CACHE_SIZE:
+        del _DESCRIPTORS[next(iter(_DESCRIPTORS))]
+    return descriptor
+
+
+def _parse(crs: CRS) -> Descriptor:
+    """Returns the X and Y axes of a CRS, whether each axis has angular units,
+    and an error message if the CRS is not supported"""
+
+    axes = {}
+    angular = {}
+    error = None
+    for name in ["x", "y"]:
+        axes[name] = _find_axis(crs, name)
+        angular[name] = (
+            axes[name] is not None and axes[name].unit_name in supported_angular_units()
+        )
+        if error is None:
+            try:
+                _validate_axis(crs, name)
+            except CRSError as failed:
+                error = str(failed)
+    return axes, angular, error
+
+
+def _find_axis(crs: CRS, axis: XY) -> Axis | None:
+    "Returns the first X or Y axis in the axis info of a CRS"
+    if axis == "x":
+        isaxis = isx
     else:
-        return CRS(zones[0].name)
+        isaxis = isy
+    for info in crs.axis_info:
+        if isaxis(info):
+            return info
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _transformer(from_crs: CRS, to_crs: CRS) -> Transformer:
+    "Returns a cached transformer that converts XY coordinates between two CRSs"
+    return Transformer.from_crs(from_crs, to_crs, always_xy=True)
+
+
+@lru_cache(maxsize=1)
+def _utm_zones() -> list[CRSInfo]:
+    "Returns the WGS 84 UTM zones and their areas of use"
+    return query_utm_crs_info("WGS 84")
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _utm_crs(name: str) -> CRS:
+    "Returns a cached UTM CRS"
+    return CRS(name)
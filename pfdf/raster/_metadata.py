@@ -15,6 +15,7 @@ Class:
 from __future__ import annotations
 
 import typing
+from copy import copy
 from math import ceil
 
 import rasterio
@@ -176,6 +177,7 @@ class RasterMetadata:
         _from_file      - Builds metadata for a file-based raster from a path or URL
         _create         - Updates metadata for isbool and ensure_nodata factory options
         _get_locator    - Returns a finalized BoundingBox or Transform
+        _aligned        - True if another metadata object has the same CRS and locator
         _pixel          - Returns a pixel geometry property
         _bound          - Returns a bounding box attribute
     """
@@ -550,6 +552,15 @@ class RasterMetadata:
             RasterMetadata: A new RasterMetadata object with updated metadata fields.
         """
 
+        # Renaming does not change the validated metadata, so copy the current
+        # fields rather than revalidating
+        if all_nones(shape, dtype, nodata, crs, transform, bounds):
+            if name is not None:
+                cvalidate.string(name, "name")
+            metadata = copy(self)
+            metadata._name = self._name if name is None else name
+            return metadata
+
         # Initialize basic fields. Use current value if no update is provided
         kwargs = {
             "shape": shape,
@@ -1886,6 +1897,16 @@ class RasterMetadata:
             locator["crs"] = self.crs
             return class_type.from_dict(locator)
 
+    def _aligned(self, other: RasterMetadata) -> bool:
+        """True if another metadata object has the same CRS and the same stored
+        Transform or BoundingBox. Compares the stored fields directly, so avoids
+        rebuilding the locators"""
+        return (
+            type(self._locator) is type(other._locator)
+            and (self._crs is other._crs or self._crs == other._crs)
+            and (self._locator is other._locator or self._locator == other._locator)
+        )
+
     @property
     def transform(self) -> Transform:
         "Returns the affine Transform"
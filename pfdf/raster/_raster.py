@@ -8,25 +8,27 @@ of the Raster class for additional details).
 ----------
 Class:
     Raster      - Class that manages raster datasets and metadata
+
+Internal:
+    _is_pysheds - True if an input is a pysheds raster, without importing pysheds
 """
 
 from __future__ import annotations
 
+import sys
 import typing
-from math import floor
 from pathlib import Path
 
 import numpy as np
 import rasterio
 import rasterio.features
 import rasterio.transform
-from pysheds.sview import Raster as PyshedsRaster
-from pysheds.sview import ViewFinder
 
 import pfdf._validate.core as cvalidate
 import pfdf.raster._utils.validate as rvalidate
 from pfdf import raster as _raster
-from pfdf._utils import merror, nodata, real, rowcol
+from pfdf._utils import merror, nodata, pixels, real
+from pfdf._utils.instrument import traced
 from pfdf._utils.nodata import NodataMask
 from pfdf.errors import (
     MissingNoDataError,
@@ -41,6 +43,7 @@ if typing.TYPE_CHECKING:
     from typing import Any, Optional
 
     from affine import Affine
+    from pysheds.sview import Raster as PyshedsRaster
 
     from pfdf.projection import CRS, BoundingBox, Transform
     from pfdf.raster import Raster, RasterMetadata
@@ -169,6 +172,7 @@ class Raster:
         _nodata             - NoData value
         _crs                - Coordinate reference system
         _transform          - Affine Transform, stripped of its CRS
+        _validated          - Names of the value checks passed by the data values
 
     Projection Metadata:
         _pixel              - Returns a pixel geometry property
@@ -265,6 +269,7 @@ class Raster:
         # Initialize attributes
         self._values: MatrixArray = None
         self._metadata: RasterMetadata = _raster.RasterMetadata(name=name)
+        self._validated: set[str] = set()
 
         # If no inputs were provided, just return the empty object
         if raster is None:
@@ -285,7 +290,7 @@ class Raster:
             raster = Raster.from_file(raster, name, **kwargs)
         elif isinstance(raster, rasterio.DatasetReader):
             raster = Raster.from_rasterio(raster, name, **kwargs)
-        elif isinstance(raster, PyshedsRaster):
+        elif _is_pysheds(raster):
             raster = Raster.from_pysheds(raster, name, isbool=isbool)
         elif isinstance(raster, np.ndarray):
             kwargs["nodata"] = kwargs.pop("default_nodata")
@@ -339,18 +344,21 @@ class Raster:
         values.setflags(write=False)
         self._values = values
         self._metadata = metadata
+        self._validated = set()
 
     def _copy(self, template: Raster) -> None:
         "Copies the attributes from a template raster to the current raster"
 
         self._values = template._values
         self._metadata = template._metadata
+        self._validated = template._validated
 
     #####
     # File factories
     #####
 
     @staticmethod
+    @traced
     def from_url(
         url: str,
         name: Optional[str] = None,
@@ -448,6 +456,7 @@ class Raster:
         )
 
     @staticmethod
+    @traced
     def from_file(
         path: Pathlike,
         name: Optional[str] = None,
@@ -851,6 +860,7 @@ class Raster:
     #####
 
     @staticmethod
+    @traced
     def from_points(
         path: Pathlike,
         field: Optional[str] = None,
@@ -1036,13 +1046,11 @@ class Raster:
         except Exception as error:
             merror.features(error, "point")
 
-        # Get the GIS coordinates for each point
-        for geometry, value in features:
-            x, y = geometry["coordinates"]
-            row, col = rowcol(metadata.affine, x, y, op=floor)
-            if row < metadata.nrows and col < metadata.ncols:
-                values[row, col] = value
-            values[row, col] = value
+        # Convert the GIS coordinates of the points to pixel indices in one pass
+        coords = [geometry["coordinates"] for geometry, _ in features]
+        coords = np.array(coords, dtype=float).reshape(-1, 2)
+        rows, cols = pixels(metadata.affine, coords[:, 0], coords[:, 1])
+        values[rows, cols] = [value for _, value in features]
 
         # Build the final raster
         return Raster.from_array(
@@ -1050,6 +1058,7 @@ class Raster:
         )
 
     @staticmethod
+    @traced
     def from_polygons(
         path: Pathlike,
         field: Optional[str] = None,
@@ -1344,6 +1353,8 @@ class Raster:
             nodata=nodata,
             casting=casting,
         )
+        if nodata is not None:
+            self._validated = set()
 
     #####
     # Comparisons
@@ -1408,6 +1419,10 @@ class Raster:
                 f"match the shape of the {self.name} {self.shape}."
             )
 
+        # Skip the comparisons if the stored CRS and locator already match
+        if raster._metadata._aligned(self._metadata):
+            return raster
+
         # CRS
         if raster.crs is None:
             raster.override(crs=self.crs)
@@ -1445,6 +1460,7 @@ class Raster:
 
         return str(self.metadata).replace("RasterMetadata", "Raster", 1)
 
+    @traced
     def save(
         self,
         path: Pathlike,
@@ -1575,6 +1591,9 @@ class Raster:
         metadata["nodata"] = nodata
 
         # Initialize viewfinder and build raster
+        from pysheds.sview import Raster as PyshedsRaster
+        from pysheds.sview import ViewFinder
+
         view = ViewFinder(**metadata)
         raster = PyshedsRaster(self.values, view)
 
@@ -1813,6 +1832,7 @@ class Raster:
             copy=False,
         )
 
+    @traced
     def buffer(
         self,
         distance: Optional[scalar] = None,
@@ -1915,6 +1935,7 @@ class Raster:
         values[rows, cols] = self._values
         self._update(values, metadata)
 
+    @traced
     def clip(self, bounds: BoundsInput) -> None:
         """
         Clips a raster to the indicated bounds
@@ -1938,6 +1959,7 @@ class Raster:
         values = clip.values(self.values, metadata, rows, cols)
         self._update(values, metadata)
 
+    @traced
     def reproject(
         self,
         template: Optional[Template] = None,
@@ -2367,3 +2389,10 @@ class Raster:
     def orientation(self) -> int | None:
         "Returns the Cartesian orientation of the bounding box"
         return self.metadata.orientation
+
+
+def _is_pysheds(raster: Any) -> bool:
+    """True if an input is a pysheds.sview.Raster. pysheds is slow to import, so is
+    only checked once loaded - a pysheds raster cannot exist before then"""
+    sview = sys.modules.get("pysheds.sview")
+    return sview is not None and isinstance(raster, sview.Raster)
@@ -7,6 +7,7 @@ Modules:
     factory     - Functions to create Raster and RasterMetadata objects from various sources
     merror      - Functions to supplement memory-related errors
     parse       - Functions to parse spatial metadata options
+    provenance  - Functions that track the value checks passed by raster data arrays
     validate    - Functions to validate user inputs for raster routines
     writeable   - Context manager to set write permissions for numpy arrays
 """
@@ -16,7 +16,6 @@ from __future__ import annotations
 
 import typing
 
-from pysheds.sview import Raster as PyshedsRaster
 from rasterio import DatasetReader
 from rasterio.windows import Window
 
@@ -105,7 +104,10 @@ def window(
 def pysheds(sraster: Any, name: Any) -> RasterMetadata:
     "Validates type, extracts CRS, and builds metadata"
 
-    # Validate type and extract CRS
+    # Validate type and extract CRS. (pysheds is imported on demand, as it is slow
+    # to load and most rasters are not built from pysheds)
+    from pysheds.sview import Raster as PyshedsRaster
+
     cvalidate.type(
         sraster, "input raster", PyshedsRaster, "pysheds.sview.Raster object"
     )
@@ -0,0 +1,115 @@
+"""
+Functions that track the value checks passed by raster data arrays
+----------
+Checking the data values of a raster requires full passes over its data array. This
+module records the value checks that a Raster has passed, so that later routines can
+skip redundant checks. Each Raster holds a set of the names of its passed checks.
+Rasters that share a data array and NoData value (for example, a Raster and the
+object returned by Raster(raster, name)) share the same set, so a check recorded
+for one object applies to all of them. The set is cleared whenever a Raster's data
+values are replaced or its NoData value is overridden.
+
+Routines that produce valid rasters (such as watershed.flow) record the relevant
+checks for their outputs. When fast mode is active (see pfdf.utils.validation),
+every raster is trusted to pass these checks.
+----------
+Checks:
+    FLOW            - Data values are TauDEM-style D8 flow directions
+    BOOLEAN         - Data values are all 0 or 1
+
+Validators:
+    flow            - Checks a raster holds D8 flow directions, unless trusted
+    boolean         - Checks a raster holds 0s and 1s, and returns a boolean array
+
+Utilities:
+    trusted         - True if a raster has passed a check, or fast mode is active
+    record          - Records that a raster passed value checks
+
+Fast mode:
+    enable          - Activates fast mode
+    disable         - Deactivates fast mode
+    fast            - True if fast mode is active
+"""
+
+from __future__ import annotations
+
+import typing
+
+import pfdf._validate.core as validate
+from pfdf._utils.nodata import NodataMask
+
+if typing.TYPE_CHECKING:
+    from pfdf.raster import Raster
+    from pfdf.typing.core import BooleanMatrix
+
+# Check names
+FLOW = "flow"
+BOOLEAN = "boolean"
+
+# The number of active fast mode contexts
+_fast = 0
+
+
+#####
+# Validators
+#####
+
+
+def flow(raster: Raster) -> None:
+    "Checks that a raster holds TauDEM-style D8 flow directions, unless trusted"
+    if not trusted(raster, FLOW):
+        validate.flow(raster.values, raster.name, ignore=raster.nodata)
+        record(raster, FLOW)
+
+
+def boolean(raster: Raster) -> BooleanMatrix:
+    """Checks that a raster's data values are all 0 or 1, unless trusted. Returns
+    a boolean copy of the values in which NoData pixels are False"""
+
+    values = raster.values
+    if not trusted(raster, BOOLEAN):
+        output = validate.boolean(values, raster.name, ignore=raster.nodata)
+        record(raster, BOOLEAN)
+        return output
+
+    output = values.astype(bool, copy=True)
+    if values.dtype != bool:
+        NodataMask(values, raster.nodata).fill(output, False)
+    return output
+
+
+#####
+# Utilities
+#####
+
+
+def trusted(raster: Raster, check: str) -> bool:
+    "True if a raster passed the named check, or fast mode is active"
+    return fast() or check in raster._validated
+
+
+def record(raster: Raster, *checks: str) -> None:
+    "Records that a raster passed the named value checks"
+    raster._validated.update(checks)
+
+
+#####
+# Fast mode
+#####
+
+
+def enable() -> None:
+    "Activates fast mode. Contexts may be nested"
+    global _fast
+    _fast += 1
+
+
+def disable() -> None:
+    "Deactivates the most recent fast mode context"
+    global _fast
+    _fast = max(_fast - 1, 0)
+
+
+def fast() -> bool:
+    "True if fast mode is active"
+    return _fast > 0
@@ -33,6 +33,11 @@ This reduces communication overhead when reusing the pool for multiple groups.
 We pass pfdf.raster.Raster objects, rather than pysheds rasters, because pysheds
 objects do not appear to initialize correctly in parallel Processes (a limitation
 that may relate to picklability).
+
+When terminal outlets are removed from a network, their basins are relabelled
+rather than rebuilt. Each pixel in a removed basin is assigned to the most
+downstream remaining terminal outlet on its flow path, which is found by walking
+the D8 flow directions within the removed basins.
 ----------
 Raster builders:
     build              - Builds a basin raster sequentially or in parallel, as appropriate
@@ -41,6 +46,10 @@ Raster builders:
     group_rasters      - Builds the rasters for a basin group in parallel
     chunk_raster       - Builds the raster for a set of ordered basins sequentially
 
+Relabelling:
+    relabel            - Relabels the basins of removed terminal outlets
+    _relabel           - Numba kernel that walks flow paths to relabel basin pixels
+
 Utilities:
     get_outlets        - Returns the IDs and locations of terminal outlets
     count_outlets      - Counts the number of terminal outlets flowing into each basin
@@ -54,7 +63,7 @@ import multiprocessing as mp
 import typing
 
 import numpy as np
-from pysheds.grid import Grid
+from numba import njit
 
 import pfdf.segments._validate as validate
 from pfdf import watershed
@@ -64,9 +73,20 @@ if typing.TYPE_CHECKING:
     from typing import Optional
 
     from pfdf.raster import Raster
-    from pfdf.typing.core import MatrixArray, VectorArray, scalar, shape2d
+    from pfdf.typing.core import (
+        BooleanMatrix,
+        MatrixArray,
+        VectorArray,
+        scalar,
+        shape2d,
+    )
     from pfdf.typing.segments import Outlets
 
+# Row and column offsets for TauDEM-style D8 flow directions (1 = East,
+# counterclockwise to 8 = Southeast). Index 0 is unused
+_DROWS = np.array([0, 0, -1, -1, -1, 0, 1, 1, 1])
+_DCOLS = np.array([0, 1, 1, 0, -1, -1, -1, 0, 1])
+
 
 #####
 # Raster Builders
@@ -161,7 +181,7 @@ def chunk_raster(
     # Initialize basins raster and setup pysheds
     raster = new_raster(flow.shape)
     fdir = flow.as_pysheds()
-    grid = Grid.from_raster(fdir)
+    grid = watershed._grid(fdir)
 
     # Get catchment mask for each basin. Use to assign pixel values
     with NodataPatch():
@@ -173,6 +193,90 @@ def chunk_raster(
     return raster
 
 
+#####
+# Relabelling
+#####
+
+
+def relabel(
+    basins: MatrixArray,
+    removed: BooleanMatrix,
+    flow: Raster,
+    ids: VectorArray,
+    outlets: Outlets,
+) -> MatrixArray:
+    """Relabels the pixels of removed terminal basins. The removed input marks the
+    pixels of the removed basins, and ids and outlets are the IDs and outlet pixels
+    of the terminal segments in the updated network. Returns a new basin raster"""
+
+    # Limit the walk to the bounding box of the removed basins
+    rows = np.flatnonzero(removed.any(axis=1))
+    cols = np.flatnonzero(removed.any(axis=0))
+    window = (slice(rows[0], rows[-1] + 1), slice(cols[0], cols[-1] + 1))
+
+    # Locate terminal outlets within the removed basins
+    outlets = np.array(outlets, dtype=np.int64).reshape(-1, 2)
+    inside = removed[outlets[:, 0], outlets[:, 1]]
+    ids = np.asarray(ids, dtype=np.int64)[inside]
+    outlets = outlets[inside] - (rows[0], cols[0])
+
+    # Get flow directions. NoData and invalid directions are treated as sinks
+    directions = flow.values[window]
+    directions = np.where(flow.nodata_mask[window], 0, directions)
+    directions = np.nan_to_num(directions).astype(np.int64)
+
+    # Relabel a copy, as copied Segments objects share their basin rasters
+    basins = basins.copy()
+    _relabel(
+        basins[window], removed[window], directions, outlets[:, 0], outlets[:, 1], ids
+    )
+    return basins
+
+
+@njit(cache=True)
+def _relabel(basins, removed, flow, rows, cols, ids):  # pragma: no cover
+    "Walks flow paths in removed basins to assign each pixel its new terminal basin"
+
+    nrows, ncols = basins.shape
+    outlets = np.zeros(basins.shape, np.int64)
+    for k in range(ids.size):
+        outlets[rows[k], cols[k]] = ids[k]
+
+    resolved = np.zeros(basins.shape, np.bool_)
+    path = np.empty(basins.size, np.int64)
+    for row in range(nrows):
+        for col in range(ncols):
+            if not removed[row, col] or resolved[row, col]:
+                continue
+
+            # Walk downstream until the path leaves the removed basins, reaches a
+            # sink, or joins a pixel that was already relabelled
+            label = 0
+            n = 0
+            r, c = row, col
+            while n < path.size:
+                path[n] = r * ncols + c
+                n += 1
+                direction = flow[r, c]
+                if direction < 1 or direction > 8:
+                    break
+                r, c = r + _DROWS[direction], c + _DCOLS[direction]
+                if r < 0 or c < 0 or r >= nrows or c >= ncols or not removed[r, c]:
+                    break
+                elif resolved[r, c]:
+                    label = basins[r, c]
+                    break
+
+            # Assign labels from downstream to upstream. Pixels belong to the most
+            # downstream terminal outlet on their flow path
+            for i in range(n - 1, -1, -1):
+                r, c = path[i] // ncols, path[i] % ncols
+                if label == 0:
+                    label = outlets[r, c]
+                basins[r, c] = label
+                resolved[r, c] = True
+
+
 #####
 # Utilities
 #####
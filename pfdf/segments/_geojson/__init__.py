@@ -1,12 +1,16 @@
 """
 Subpackage to export a stream segment network to geojson
 ----------
-Main Function:
+Main Functions:
     features    - Converts a segment network to geojson
+    columns     - Converts a segment network to geometry and property columns
+    write       - Writes geometry and property columns to file
 
 Submodules:
     _geojson    - Creates geojson FeatureCollections for various feature types
+    _columns    - Creates geometry and property columns for file export
     _reproject  - Reprojects feature geometries to desired CRS
 """
 
+from pfdf.segments._geojson._columns import columns, write
 from pfdf.segments._geojson._geojson import features
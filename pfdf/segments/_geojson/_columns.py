@@ -0,0 +1,185 @@
+"""
+Functions that export a stream segment network as columns
+----------
+The columnar export builds a single array of shapely geometries and one array per
+property field, rather than a GeoJSON Feature per exported feature. This avoids
+most per-feature Python objects when saving large networks to file.
+----------
+Functions:
+    columns         - Returns the geometries and property columns for an export
+    write           - Writes geometries and property columns to a vector feature file
+    _basins         - Returns basin polygons and the property rows of each basin
+    _records        - Writes the columns to file using fiona
+    _geoparquet     - Writes the columns to a GeoParquet file
+"""
+
+from __future__ import annotations
+
+import json
+import typing
+
+import fiona
+import numpy as np
+import rasterio.features
+import shapely
+
+import pfdf._validate.projection as pvalidate
+import pfdf.segments._validate as validate
+from pfdf.segments._geojson import _reproject
+
+if typing.TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Any, Optional
+
+    from pfdf.projection import CRS
+    from pfdf.typing.core import VectorArray
+    from pfdf.typing.segments import ExportType, PropertyDict, PropertySchema
+
+    ShapelyArray = np.ndarray
+
+# The geometry type of each export type
+_GEOMETRIES = {
+    "segments": "LineString",
+    "basins": "Polygon",
+    "outlets": "Point",
+    "segment outlets": "Point",
+}
+
+
+def _basins(segments) -> tuple[ShapelyArray, VectorArray]:
+    "Returns basin polygons and the index of the property row for each basin"
+
+    # Polygonize the basins. Basins are unordered, so locate their IDs
+    basins = segments._locate_basins()
+    mask = basins.astype(bool)
+    basins = rasterio.features.shapes(
+        basins, mask, connectivity=8, transform=segments.transform.affine
+    )
+    geometries, ids = [], []
+    for geometry, id in basins:
+        geometries.append(shapely.geometry.shape(geometry))
+        ids.append(id)
+    array = np.empty(len(geometries), dtype=object)
+    array[:] = geometries
+
+    # Terminal IDs are sorted, so locate the property row of each basin by search
+    rows = np.searchsorted(segments.terminal_ids, np.array(ids, dtype=float))
+    return array, rows
+
+
+def columns(
+    segments, type: Any, properties: Any, crs: Any
+) -> tuple[ExportType, ShapelyArray, PropertyDict, PropertySchema, CRS]:
+    """Returns the export type, an array of shapely geometries, a dict of property
+    columns, the property schema, and the final CRS for an export"""
+
+    # Validate. Get final CRS
+    type, properties, schema = validate.export(segments, properties, type)
+    if crs is None:
+        crs = segments.crs
+    else:
+        crs = pvalidate.crs(crs)
+
+    # Get the geometries. Reorder basin properties to match the basins
+    if type == "basins":
+        geometries, rows = _basins(segments)
+        properties = {field: values[rows] for field, values in properties.items()}
+    else:
+        geometries = np.empty(segments.size, dtype=object)
+        geometries[:] = segments._segments
+        if type == "outlets":
+            geometries = geometries[segments.isterminal()]
+        if "outlets" in type:
+            geometries = shapely.get_point(geometries, -1)
+
+    # Reproject and return
+    geometries = _reproject.shapely_geometries(geometries, segments.crs, crs)
+    return type, geometries, properties, schema, crs
+
+
+def write(
+    path: Path,
+    type: ExportType,
+    geometries: ShapelyArray,
+    properties: PropertyDict,
+    schema: PropertySchema,
+    crs: CRS,
+    driver: Optional[str],
+) -> None:
+    "Writes geometries and property columns to a vector feature file"
+
+    parquet = driver == "Parquet" or (
+        driver is None and path.suffix.lower() == ".parquet"
+    )
+    if parquet:
+        _geoparquet(path, type, geometries, properties, crs)
+    else:
+        _records(path, type, geometries, properties, schema, crs, driver)
+
+
+def _records(
+    path: Path,
+    type: ExportType,
+    geometries: ShapelyArray,
+    properties: PropertyDict,
+    schema: PropertySchema,
+    crs: CRS,
+    driver: Optional[str],
+) -> None:
+    """Writes columns to file using fiona. Converts each property column to
+    built-in values in bulk, and builds fiona records directly"""
+
+    fields = list(properties.keys())
+    values = [column.tolist() for column in properties.values()]
+    rows = zip(*values) if values else ([] for _ in geometries)
+
+    schema = {"geometry": _GEOMETRIES[type], "properties": schema}
+    with fiona.open(path, "w", driver=driver, crs=crs, schema=schema) as file:
+        file.writerecords(
+            fiona.Feature(
+                geometry=fiona.Geometry(**geometry.__geo_interface__),
+                properties=fiona.Properties(**dict(zip(fields, row))),
+            )
+            for geometry, row in zip(geometries, rows)
+        )
+
+
+def _geoparquet(
+    path: Path,
+    type: ExportType,
+    geometries: ShapelyArray,
+    properties: PropertyDict,
+    crs: CRS,
+) -> None:
+    "Writes columns to a GeoParquet file with WKB geometries. Requires pyarrow"
+
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError(
+            "Saving a GeoParquet file requires the pyarrow package. "
+            "Install it using: pip install pyarrow"
+        ) from error
+
+    # Build the table of property and geometry columns
+    wkb = shapely.to_wkb(geometries)
+    columns = {field: values for field, values in properties.items()}
+    columns["geometry"] = pyarrow.array(wkb.tolist(), type=pyarrow.binary())
+    table = pyarrow.table(columns)
+
+    # Add GeoParquet metadata and write
+    metadata = {
+        "version": "1.0.0",
+        "primary_column": "geometry",
+        "columns": {
+            "geometry": {
+                "encoding": "WKB",
+                "geometry_types": [_GEOMETRIES[type]],
+                "crs": crs.to_json_dict(),
+                "bbox": shapely.total_bounds(geometries).tolist(),
+            }
+        },
+    }
+    table = table.replace_schema_metadata({"geo": json.dumps(metadata)})
+    pyarrow.parquet.write_table(table, path)
@@ -51,11 +51,10 @@ def _basins(segments, properties: PropertyConvert, crs: CRS) -> list[Feature]:
     _reproject.geometries(basins, "basins", segments.crs, crs)
 
     # Convert basins to geojson Features. Track basin IDs when determining property
-    # values as basins are unordered
-    ids = segments.terminal_ids
-    for b, (geometry, id) in enumerate(basins):
-        index = np.argwhere(id == ids)
-        index = int(index[0, 0])
+    # values as basins are unordered. (Terminal IDs are sorted)
+    ids = np.array([id for _, id in basins])
+    indices = np.searchsorted(segments.terminal_ids, ids)
+    for b, ((geometry, _), index) in enumerate(zip(basins, indices.tolist())):
         values = _values(properties, index)
         basins[b] = Feature(geometry=geometry, properties=values)
     return basins
@@ -1,18 +1,27 @@
 """
 Functions that reproject feature geometries
 ----------
+Geometries are reprojected in bulk. The coordinates of all lines (or polygon
+rings) are flattened into a pair of coordinate arrays, reprojected using a single
+vectorized transform, and then split back into the original lines.
+----------
 Functions:
     geometries  - Main function to reproject feature geometries in-place
     _basins     - Reprojects basin polygons in-place
     _segments   - Reprojects segment linestrings in-place
     _point      - Reprojects a point and returns the new coordinates
     _line       - Reprojects a line in-place
+    _lines      - Reprojects a collection of lines in-place using a single transform
+    shapely_geometries - Reprojects an array of shapely geometries
 """
 
 from __future__ import annotations
 
 import typing
+from itertools import chain
 
+import numpy as np
+import shapely
 from pyproj import Transformer
 
 if typing.TYPE_CHECKING:
@@ -26,6 +35,7 @@ if typing.TYPE_CHECKING:
     Segments = list[Line]
     Outlets = list[XY]
     Geometries = GeomIDs | Segments | Outlets
+    ShapelyArray = np.ndarray
 
 
 def _point(point: XY, transform: Transformer) -> XY:
@@ -33,23 +43,40 @@ def _point(point: XY, transform: Transformer) -> XY:
     return transform.transform(*point)
 
 
-def _line(line: Line, transform: Transformer) -> Line:
+def _line(line: Line, transform: Transformer) -> None:
     "Reprojects a line geometry in-place"
-    for p, point in enumerate(line):
-        line[p] = _point(point, transform)
+    _lines([line], transform)
+
+
+def _lines(lines: list[Line], transform: Transformer) -> None:
+    "Reprojects a collection of line geometries in-place using a single transform"
+
+    # Flatten the coordinates of every line into x and y arrays
+    sizes = [len(line) for line in lines]
+    npoints = sum(sizes)
+    if npoints == 0:
+        return
+    coords = chain.from_iterable(chain.from_iterable(lines))
+    coords = np.fromiter(coords, dtype=float, count=2 * npoints).reshape(-1, 2)
+
+    # Reproject in bulk and split the points back into the lines
+    x, y = transform.transform(coords[:, 0], coords[:, 1])
+    points = list(zip(x.tolist(), y.tolist()))
+    start = 0
+    for line, size in zip(lines, sizes):
+        line[:] = points[start : start + size]
+        start += size
 
 
 def _basins(basins: GeomIDs, transform: Transformer) -> None:
     "Reprojects basin geometries in-place"
-    for geometry, _ in basins:
-        for ring in geometry["coordinates"]:
-            _line(ring, transform)
+    rings = [ring for geometry, _ in basins for ring in geometry["coordinates"]]
+    _lines(rings, transform)
 
 
 def _segments(lines: list[Line], transform: Transformer) -> None:
     "Reprojects segment geometries in-place"
-    for line in lines:
-        _line(line, transform)
+    _lines(lines, transform)
 
 
 def geometries(
@@ -65,3 +92,18 @@ def geometries(
             _segments(geometries, transform)
         else:
             _line(geometries, transform)
+
+
+def shapely_geometries(
+    geometries: ShapelyArray, from_crs: CRS, to_crs: CRS
+) -> ShapelyArray:
+    "Reprojects an array of shapely geometries using a single vectorized transform"
+
+    if from_crs == to_crs:
+        return geometries
+    transform = Transformer.from_crs(from_crs, to_crs, always_xy=True)
+
+    def reproject(coords):
+        return np.column_stack(transform.transform(coords[:, 0], coords[:, 1]))
+
+    return shapely.transform(geometries, reproject)
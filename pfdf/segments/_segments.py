@@ -14,25 +14,25 @@ from __future__ import annotations
 import typing
 from math import inf, nan
 
-import fiona
 import numpy as np
-from rasterio.transform import rowcol
+import shapely
 
 import pfdf._validate.core as validate
 import pfdf.segments._validate as svalidate
 from pfdf import watershed
-from pfdf._utils import all_nones, real
+from pfdf._utils import all_nones, pixels, real
+from pfdf._utils.instrument import traced
 from pfdf._utils.nodata import NodataMask
-from pfdf.errors import MissingCRSError, MissingTransformError
+from pfdf.errors import MissingCRSError, MissingTransformError, ShapeError
 from pfdf.projection import crs
 from pfdf.raster import Raster
-from pfdf.segments import _basins, _confinement, _geojson, _update
+from pfdf.raster._utils import provenance
+from pfdf.segments import _basins, _confinement, _geojson, _topology, _update
 
 if typing.TYPE_CHECKING:
     from pathlib import Path
     from typing import Literal, Optional
 
-    import shapely
     from geojson import FeatureCollection
 
     from pfdf.projection import CRS, BoundingBox, Transform
@@ -142,6 +142,8 @@ class Segments:
         descendents         - Returns the IDs of downstream segments in a local network
         family              - Returns the IDs of segments in a local network
         isnested            - Indicates whether segments are in a nested network
+        isupstream          - Tests whether segments are upstream of other segments
+        ancestry            - Returns the ancestors or descendents of many segments as CSR arrays
 
     Rasters:
         locate_basins       - Builds and saves the basin raster, optionally in parallel
@@ -191,9 +193,13 @@ class Segments:
         _child                  - The index of each segment's downstream child
         _parents                - The indices of each segment's upstream parents
         _basins                 - Saved nested drainage basin raster values
+        _variables              - Cached model variables for the current network
+        _topology               - Cached topology labels for the current network
 
     Utilities:
         _indices_to_ids         - Converts segment IDs to indices
+        _ids_to_indices         - Locates segment IDs and returns their indices
+        _get_topology           - Returns the (cached) topology labels of the network
         _basin_npixels          - Returns the number of pixels in catchment or terminal outlet basins
         _nbasins                - Returns the number of catchment or terminal outlet basins
         _preallocate            - Initializes an array to hold summary values
@@ -211,15 +217,13 @@ class Segments:
         _values_at_outlets      - Returns the data values at the outlet pixels
         _accumulation_summary   - Computes basin summaries using flow accumulation
         _catchment_summary      - Computes summaries by iterating over basin catchments
-
-    Filtering:
-        _removable              - Locates requested segments on the edges of their local flow networks
     """
 
     #####
     # Dunders
     #####
 
+    @traced
     def __init__(
         self,
         flow: RasterInput,
@@ -279,6 +283,8 @@ class Segments:
         self._child: SegmentValues = None
         self._parents: SegmentParents = None
         self._basins: Optional[MatrixArray] = None
+        self._variables: dict = {}
+        self._topology: Optional[tuple] = None
 
         # Validate and record flow raster
         flow = Raster(flow, "flow directions")
@@ -307,52 +313,40 @@ class Segments:
         self._segments = watershed.network(self.flow, mask, max_length, units)
         self._ids = np.arange(self.size, dtype=int) + 1
 
-        # Initialize attributes - indices, child, parents
-        self._indices = []
+        # Initialize attributes - child, parents
         self._child = np.full(self.size, -1, dtype=int)
         self._parents = np.full((self.size, 2), -1, dtype=int)
 
-        # Initialize variables used to determine connectivity and split points.
-        # (A split point is where a long stream segment was split into 2 pieces)
-        starts = np.empty((self.size, 2), float)
-        outlets = np.empty((self.size, 2), float)
-        split = False
-
-        # Get the spatial coordinates of each segment
-        for s, segment in enumerate(self.segments):
-            coords = np.array(segment.coords)
-            starts[s, :] = coords[0, :]
-            outlets[s, :] = coords[-1, :]
-
-            # Get the pixel indices for each segment. Ensure they are lists
-            # (different rasterio versions may return lists or numpy arrays)
-            rows, cols = rowcol(
-                self.flow.transform.affine, xs=coords[:, 0], ys=coords[:, 1]
-            )
-            rows = np.array(rows).astype(int).tolist()
-            cols = np.array(cols).astype(int).tolist()
-
-            # If the first two indices match, then this is downstream of a split point
-            if rows[0] == rows[1] and cols[0] == cols[1]:
-                split = True
-
-            # If the segment is downstream of a split point, then remove the
-            # first index so that split pixels are assigned to the split segment
-            # that contains the majority of the pixel
-            if split:
-                del rows[0]
-                del cols[0]
-                split = False
-
-            # If the final two indices are identical, then the next segment
-            # is downstream of a split point.
-            if rows[-1] == rows[-2] and cols[-1] == cols[-2]:
-                split = True
-
-            # Record pixel indices. Remove the final coordinate so that junctions
-            # are assigned to the downstream segment.
-            indices = (rows[:-1], cols[:-1])
-            self._indices.append(indices)
+        # Get the spatial coordinates of every segment, and the offsets of each
+        # segment's coordinates in the combined array
+        coords, segment = shapely.get_coordinates(self.segments, return_index=True)
+        counts = np.bincount(segment, minlength=self.size)
+        offsets = np.zeros(self.size + 1, dtype=int)
+        np.cumsum(counts, out=offsets[1:])
+        first, last = offsets[:-1], offsets[1:] - 1
+        starts = coords[first]
+        outlets = coords[last]
+
+        # Get the pixel indices of every coordinate in one pass
+        rows, cols = pixels(self.flow.transform.affine, coords[:, 0], coords[:, 1])
+
+        # Locate split points. (A split point is where a long stream segment was
+        # split into 2 pieces). If the first two indices of a segment match, or the
+        # final two indices of the previous segment match, then the segment is
+        # downstream of a split point
+        split = (rows[first] == rows[first + 1]) & (cols[first] == cols[first + 1])
+        previous = (rows[last] == rows[last - 1]) & (cols[last] == cols[last - 1])
+        split[1:] |= previous[:-1]
+
+        # If a segment is downstream of a split point, remove its first index so
+        # that split pixels are assigned to the split segment that contains the
+        # majority of the pixel. Also remove the final coordinate of each segment
+        # so that junctions are assigned to the downstream segment
+        first = first + split
+        rows, cols = rows.tolist(), cols.tolist()
+        self._indices = [
+            (rows[a:b], cols[a:b]) for a, b in zip(first.tolist(), last.tolist())
+        ]
 
         # Find upstream parents (if any)
         for s, start in enumerate(starts):
@@ -511,6 +505,26 @@ class Segments:
         ids[valid] = self._ids[indices[valid]]
         return ids
 
+    def _ids_to_indices(self, ids: RealArray) -> tuple[VectorArray, BooleanIndices]:
+        """Locates segment IDs in the network. Returns the index of each ID, and
+        whether each ID is in the network. IDs are assigned in increasing order,
+        and filtering preserves their order, so the ID array remains sorted and
+        each ID is located with a binary search"""
+
+        ids = np.asarray(ids)
+        if self.size == 0:
+            return np.zeros(ids.shape, int), np.zeros(ids.shape, bool)
+        indices = np.searchsorted(self._ids, ids)
+        indices = np.minimum(indices, self.size - 1)
+        return indices, self._ids[indices] == ids
+
+    def _get_topology(self) -> tuple:
+        """Returns the topology labels of the network (preorder, preorder positions,
+        subtree sizes, and termini). Labels are computed once per network"""
+        if self._topology is None:
+            self._topology = _topology.build(self._child, self._parents)
+        return self._topology
+
     def _basin_npixels(self, terminal: bool) -> CatchmentValues | TerminalValues:
         "Returns the number of pixels in catchment or terminal outlet basins"
         if terminal:
@@ -605,16 +619,8 @@ class Segments:
             numpy 1D array: The ID of the terminal segment for each queried segment
         """
 
-        # Walk downstream to locate the terminal index for each queried segment
         indices = svalidate.ids(self, ids)
-        termini = []
-        for index in indices:
-            while self._child[index] != -1:
-                index = self._child[index]
-            termini.append(index)
-
-        # Return as a numpy array of IDs
-        termini = np.array(termini).reshape(-1)
+        termini = self._get_topology()[3][indices]
         return self._indices_to_ids(termini)
 
     def outlets(
@@ -871,6 +877,90 @@ class Segments:
         nested_outlets = outlet_ids[outlet_ids != basin_ids]
         return np.isin(termini, nested_outlets)
 
+    def isupstream(self, ids: vector, downstream: vector) -> VectorArray:
+        """
+        Tests whether segments are upstream of other segments
+        ----------
+        self.isupstream(ids, downstream)
+        Tests whether each queried segment is upstream of the paired downstream
+        segment. A segment is upstream if it is an ancestor of the downstream
+        segment within the local drainage network. A segment is not upstream of
+        itself. The two inputs should have the same number of IDs, or one input
+        may be a single ID, which is paired with every ID in the other input.
+        Returns a boolean 1D numpy array with one element per pair of segments.
+
+        This method labels the network once, so each pair is tested in constant
+        time. Use it in place of calls to "ancestors" when testing many segments.
+        ----------
+        Inputs:
+            ids: The IDs of the segments being tested
+            downstream: The IDs of the paired downstream segments
+
+        Outputs:
+            boolean 1D numpy array: Whether each segment is upstream of the paired
+                downstream segment
+        """
+
+        upstream = svalidate.ids(self, ids)
+        downstream = svalidate.ids(self, downstream)
+        if upstream.size != downstream.size and 1 not in (
+            upstream.size,
+            downstream.size,
+        ):
+            raise ShapeError(
+                f"ids and downstream must have the same number of IDs, or one must "
+                f"be a single ID. But ids has {upstream.size} elements, and "
+                f"downstream has {downstream.size} elements."
+            )
+        upstream, downstream = np.broadcast_arrays(upstream, downstream)
+        return _topology.isupstream(self._get_topology(), upstream, downstream)
+
+    def ancestry(
+        self, ids: Optional[vector] = None, *, downstream: bool = False
+    ) -> tuple[VectorArray, VectorArray]:
+        """
+        Returns the ancestors of many segments as compressed arrays
+        ----------
+        self.ancestry()
+        Returns the IDs of the ancestors of every segment in the network in
+        compressed sparse row (CSR) format. Returns two numpy 1D arrays. The first
+        is the offsets array, which has one element more than the number of queried
+        segments. The second holds the ancestor IDs of all the queried segments.
+        The ancestors of the k-th queried segment are:
+            >>> offsets, ancestors = self.ancestry()
+            >>> ancestors[offsets[k]:offsets[k+1]]
+
+        Ancestors of each segment are listed in depth-first order, so the set of
+        IDs matches the "ancestors" method, although the order may differ. The
+        network is labeled once, and then the ancestors of every segment are
+        collected in a single pass.
+
+        self.ancestry(ids)
+        Only returns the ancestors of the queried segments.
+
+        self.ancestry(..., *, downstream=True)
+        Returns descendents, rather than ancestors. Descendents of each segment
+        are listed from upstream to downstream, matching the "descendents" method.
+        ----------
+        Inputs:
+            ids: The IDs of the queried segments. If not set, queries every segment
+                in the network.
+            downstream: True to return descendents. False (default) to return
+                ancestors.
+
+        Outputs:
+            numpy 1D array: The offsets of each queried segment's IDs
+            numpy 1D array: The ancestor (or descendent) IDs of the queried segments
+        """
+
+        indices = svalidate.ids(self, ids)
+        validate.type(downstream, "downstream", bool, "bool")
+        if downstream:
+            offsets, values = _topology.descendents(self._child, indices)
+        else:
+            offsets, values = _topology.ancestors(self._get_topology(), indices)
+        return offsets, self._indices_to_ids(values)
+
     #####
     # Rasters
     #####
@@ -935,6 +1025,7 @@ class Segments:
             raster, nodata=0, crs=self.crs, transform=self.transform, copy=False
         )
 
+    @traced
     def locate_basins(
         self, parallel: bool = False, nprocess: Optional[int] = None
     ) -> None:
@@ -945,9 +1036,9 @@ class Segments:
         Builds the terminal basin raster and saves it internally. The saved
         raster will be used to quickly implement other commands that require it.
         (For example, Segments.raster, Segments.geojson, and Segments.save).
-        Note that the saved raster is deleted if any of the terminal outlets are
-        removed from the Segments object, so it is usually best to call this
-        command *after* filtering the network.
+        If terminal outlets are later removed from the Segments object, the
+        pixels in their basins are relabelled to the remaining terminal outlets
+        downstream of each pixel, so the saved raster does not need to be rebuilt.
 
         self.locate_basins(parallel=True)
         self.locate_basins(parallel=True, nprocess)
@@ -1065,6 +1156,7 @@ class Segments:
             values[k] = self._summarize(identity, raster, indices=outlet)
         return values
 
+    @traced
     def summary(self, statistic: Statistic, values: RasterInput) -> SegmentValues:
         """
         Computes a summary value over stream segment pixels
@@ -1104,6 +1196,7 @@ class Segments:
             summary[i] = self._summarize(statistic, values, pixels)
         return summary
 
+    @traced
     def catchment_summary(
         self,
         statistic: Statistic,
@@ -1165,7 +1258,7 @@ class Segments:
         values = svalidate.raster(self, values, "values raster")
         if mask is not None:
             mask = svalidate.raster(self, mask, "mask")
-            mask = validate.boolean(mask.values, mask.name, ignore=mask.nodata)
+            mask = provenance.boolean(mask)
 
         # Outlet values
         if statistic == "outlet":
@@ -1245,6 +1338,7 @@ class Segments:
     # Earth system variables
     #####
 
+    @traced
     def area(
         self,
         mask: Optional[RasterInput] = None,
@@ -1290,6 +1384,7 @@ class Segments:
             N = self._accumulation(mask=mask, terminal=terminal)
         return N * self.flow.pixel_area(units)
 
+    @traced
     def burn_ratio(
         self, isburned: RasterInput, terminal: bool = False
     ) -> CatchmentValues:
@@ -1315,6 +1410,7 @@ class Segments:
         """
         return self.catchment_ratio(isburned, terminal)
 
+    @traced
     def burned_area(
         self,
         isburned: RasterInput,
@@ -1350,6 +1446,7 @@ class Segments:
         """
         return self.area(isburned, units=units, terminal=terminal)
 
+    @traced
     def catchment_ratio(
         self, mask: RasterInput, terminal: bool = False
     ) -> CatchmentValues:
@@ -1378,6 +1475,7 @@ class Segments:
         npixels = self._basin_npixels(terminal)
         return counts / npixels
 
+    @traced
     def confinement(
         self,
         dem: RasterInput,
@@ -1446,6 +1544,7 @@ class Segments:
         """
         return _confinement.angles(self, dem, neighborhood, dem_per_m)
 
+    @traced
     def developed_area(
         self,
         isdeveloped: RasterInput,
@@ -1481,6 +1580,7 @@ class Segments:
         """
         return self.area(isdeveloped, units=units, terminal=terminal)
 
+    @traced
     def in_mask(self, mask: RasterInput, terminal: bool = False) -> SegmentValues:
         """
         Determines whether segments have pixels within a mask
@@ -1503,12 +1603,13 @@ class Segments:
         """
 
         mask = svalidate.raster(self, mask, "mask")
-        validate.boolean(mask.values, "mask", ignore=mask.nodata)
+        provenance.boolean(mask)
         isin = self.summary("nanmax", mask) == 1
         if terminal:
             isin = isin[self.isterminal()]
         return isin
 
+    @traced
     def in_perimeter(
         self, perimeter: RasterInput, terminal: bool = False
     ) -> SegmentValues:
@@ -1533,6 +1634,7 @@ class Segments:
         """
         return self.in_mask(perimeter, terminal)
 
+    @traced
     def kf_factor(
         self,
         kf_factor: RasterInput,
@@ -1595,6 +1697,7 @@ class Segments:
             terminal,
         )
 
+    @traced
     def length(
         self, *, units: Units = "meters", terminal: bool = False
     ) -> SegmentValues:
@@ -1629,6 +1732,7 @@ class Segments:
             lengths = crs.base_to_units(self.crs, "y", lengths, units)
         return lengths
 
+    @traced
     def scaled_dnbr(
         self,
         dnbr: RasterInput,
@@ -1682,6 +1786,7 @@ class Segments:
         dnbr = self.catchment_summary(method, dnbr, mask, terminal)
         return dnbr / 1000
 
+    @traced
     def scaled_thickness(
         self,
         soil_thickness: RasterInput,
@@ -1743,6 +1848,7 @@ class Segments:
         soil_thickness = self.catchment_summary(method, soil_thickness, mask, terminal)
         return soil_thickness / 100
 
+    @traced
     def sine_theta(
         self,
         sine_thetas,
@@ -1807,6 +1913,7 @@ class Segments:
             method = "mean"
         return self.catchment_summary(method, sine_thetas, mask, terminal)
 
+    @traced
     def slope(
         self, slopes: RasterInput, *, terminal: bool = False, omitnan: bool = False
     ) -> SegmentValues:
@@ -1842,6 +1949,7 @@ class Segments:
             slopes = slopes[self.isterminal()]
         return slopes
 
+    @traced
     def relief(self, relief: RasterInput, terminal: bool = False) -> SegmentValues:
         """
         relief  Returns the vertical relief for each segment
@@ -1867,6 +1975,7 @@ class Segments:
             relief = relief[self.isterminal()]
         return relief
 
+    @traced
     def ruggedness(
         self,
         relief: RasterInput,
@@ -1910,23 +2019,7 @@ class Segments:
     # Filtering
     #####
 
-    @staticmethod
-    def _removable(
-        requested: BooleanIndices,
-        child: SegmentValues,
-        parents: SegmentParents,
-        keep_upstream: bool,
-        keep_downstream: bool,
-    ) -> BooleanIndices:
-        "Returns the indices of requested segments on the edges of their local networks"
-
-        edge = False
-        if not keep_downstream:
-            edge = edge | (child == -1)
-        if not keep_upstream:
-            edge = edge | (parents == -1).all(axis=1)
-        return requested & edge
-
+    @traced
     def continuous(
         self,
         selected: Selection,
@@ -1987,24 +2080,18 @@ class Segments:
         if not remove:
             requested_remove = ~requested_remove
 
-        # Initialize segments actually being removed. Get working copies of
-        # parent-child relationships.
-        final_remove = np.zeros(self.size, bool)
-        child = self._child.copy()
-        parents = self._parents.copy()
-
-        # Iteratively select requested segments on the edges of their local networks.
-        # Update child-parent segments and repeat for new edge segments
-        removable = self._removable(
-            requested_remove, child, parents, keep_upstream, keep_downstream
+        # Peel requested segments from the edges of their local networks. Segments
+        # peel from the downstream end when they and all their descendents are
+        # requested, and from the upstream end when they and all their ancestors
+        # are requested. Both sets are found in a single sweep of the topology
+        final_remove = _topology.removable(
+            self._get_topology(),
+            self._child,
+            self._parents,
+            requested_remove,
+            keep_upstream,
+            keep_downstream,
         )
-        while np.any(removable):
-            final_remove[removable] = True
-            requested_remove[removable] = False
-            _update.family(child, parents, removable)
-            removable = self._removable(
-                requested_remove, child, parents, keep_upstream, keep_downstream
-            )
 
         # Return keep/remove indices as appropriate
         if remove:
@@ -2012,6 +2099,7 @@ class Segments:
         else:
             return ~final_remove
 
+    @traced
     def remove(self, selected: Selection, type: SelectionType = "indices") -> None:
         """
         Remove segments from the network
@@ -2027,9 +2115,11 @@ class Segments:
         In this case, the input should be a list or numpy 1D array whose elements
         are the IDs of the segments that should be removed from the network.
 
-        Note that removing terminal outlet segments can cause any previously located
-        basins to be deleted. As such we recommend calling the "locate_basins"
-        command after this command.
+        Any previously located basins are updated incrementally. If a terminal
+        outlet segment is removed, the pixels in its basin are relabelled to the
+        remaining terminal outlets downstream of each pixel. Model variables
+        cached for the network (see the staley2017 module) are subset to the
+        remaining segments, as removal does not change catchment values.
         ----------
         Inputs:
             selected: The segments that should be removed from the network
@@ -2046,7 +2136,8 @@ class Segments:
         ids = self.ids[keep]
         npixels = self.npixels[keep]
         child, parents = _update.connectivity(self, remove)
-        basins = _update.basins(self, remove)
+        basins = _update.basins(self, remove, child)
+        variables = _update.variables(self._variables, remove)
 
         # Update object
         self._segments = segments
@@ -2056,7 +2147,10 @@ class Segments:
         self._child = child
         self._parents = parents
         self._basins = basins
+        self._variables = variables
+        self._topology = None
 
+    @traced
     def keep(self, selected: Selection, type: SelectionType = "indices") -> None:
         """
         Restricts the network to the indicated segments
@@ -2072,9 +2166,8 @@ class Segments:
         In this case, the input should be a list or numpy 1D array whose elements
         are the IDs of the segments that should be retained in the network.
 
-        Note that discarding terminal outlet segments can cause any previously
-        located basins to be deleted. As such, we recommend calling "locate_basins"
-        after this command.
+        Any previously located basins and cached model variables are updated
+        incrementally, as for the "remove" command.
         ----------
         Inputs:
             selected: The segments that should be retained in the network
@@ -2109,12 +2202,15 @@ class Segments:
         copy._parents = self._parents.copy()
         copy._basins = None
         copy._basins = self._basins
+        copy._variables = {}
+        copy._topology = self._topology
         return copy
 
     #####
     # Export
     #####
 
+    @traced
     def geojson(
         self,
         type: ExportType = "segments",
@@ -2186,6 +2282,7 @@ class Segments:
         """
         return _geojson.features(self, type, properties, crs)[0]
 
+    @traced
     def save(
         self,
         path: Pathlike,
@@ -2269,6 +2366,13 @@ class Segments:
         to summarize the drivers currently supported by fiona, and a complete
         list of driver build requirements is available here:
         https://gdal.org/drivers/vector/index.html
+
+        Columnar formats such as GeoPackage (.gpkg) and FlatGeobuf (.fgb) are
+        recommended for large networks. The network is exported as a single array
+        of geometries and one array per property, so export time scales with the
+        size of the data, rather than the number of features. Paths with a .parquet
+        extension (or driver="Parquet") are saved as GeoParquet, with WKB
+        geometries. Saving GeoParquet requires the optional pyarrow package.
         ----------
         Inputs:
             path: The path to the output file
@@ -2290,26 +2394,12 @@ class Segments:
             Path: The path to the saved file
         """
 
-        # Validate and get features as geojson
+        # Validate and get the geometry and property columns
         path = validate.output_file(path, overwrite)
-        collection, property_schema, crs = _geojson.features(
+        type, geometries, properties, schema, crs = _geojson.columns(
             self, type, properties, crs
         )
 
-        # Build the file schema
-        geometries = {
-            "segments": "LineString",
-            "basins": "Polygon",
-            "outlets": "Point",
-            "segment outlets": "Point",
-        }
-        schema = {
-            "geometry": geometries[type],
-            "properties": property_schema,
-        }
-
         # Write file
-        records = collection["features"]
-        with fiona.open(path, "w", driver=driver, crs=crs, schema=schema) as file:
-            file.writerecords(records)
+        _geojson.write(path, type, geometries, properties, schema, crs, driver)
         return path
@@ -0,0 +1,242 @@
+"""
+Functions that label the topology of a stream segment network
+----------
+Each local drainage network is a tree rooted at its terminal segment, whose
+branches are the parents of each segment. This module labels every tree with a
+single depth-first (Euler tour) traversal. The traversal records the position of
+each segment in a preorder of its tree, and the size of the subtree rooted at the
+segment. The ancestors of a segment are then exactly the segments whose preorder
+positions fall within the segment's subtree interval, so upstream queries become
+interval comparisons, and the ancestors of every segment are contiguous slices
+of the preorder. The preorder also lists every segment before its parents, so a
+single forward or reverse pass over the preorder propagates values down or up
+each tree.
+----------
+Main Function:
+    build           - Labels the topology of a network
+
+Queries:
+    isupstream      - Tests whether segments are upstream of other segments
+    ancestors       - Returns the ancestors of segments as CSR arrays
+    descendents     - Returns the descendents of segments as CSR arrays
+
+Filtering:
+    removable       - Locates segments that can be removed while preserving continuity
+
+Kernels:
+    _euler          - Computes the preorder, subtree sizes, and termini
+    _gather         - Gathers preorder slices into a CSR array
+    _walk           - Gathers the downstream paths of segments into a CSR array
+    _peel           - Sweeps the preorder to locate removable segments
+"""
+
+from __future__ import annotations
+
+import typing
+
+import numpy as np
+from numba import njit
+
+if typing.TYPE_CHECKING:
+    from pfdf.typing.core import BooleanArray, VectorArray
+    from pfdf.typing.segments import BooleanIndices, SegmentParents, SegmentValues
+
+    Topology = tuple[SegmentValues, SegmentValues, SegmentValues, SegmentValues]
+    CSR = tuple[VectorArray, VectorArray]
+
+
+#####
+# Main
+#####
+
+
+def build(child: SegmentValues, parents: SegmentParents) -> Topology:
+    """Labels the topology of a network. Returns the preorder of the segments, the
+    preorder position of each segment, the size of each segment's subtree (including
+    the segment), and the index of each segment's terminal segment"""
+
+    child = np.ascontiguousarray(child, dtype=np.int64)
+    parents = np.ascontiguousarray(parents, dtype=np.int64)
+    return _euler(child, parents)
+
+
+#####
+# Queries
+#####
+
+
+def isupstream(
+    topology: Topology, upstream: VectorArray, downstream: VectorArray
+) -> BooleanArray:
+    "Tests whether segments are ancestors of the paired downstream segments"
+    _, position, size, _ = topology
+    start = position[downstream]
+    x = position[upstream]
+    return (x > start) & (x < start + size[downstream])
+
+
+def ancestors(topology: Topology, indices: VectorArray) -> CSR:
+    """Returns the ancestors of the queried segments as CSR arrays (offsets and
+    indices). Ancestors of each segment are listed in depth-first preorder"""
+    order, position, size, _ = topology
+    counts = size[indices] - 1
+    offsets = np.zeros(indices.size + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    values = _gather(order, position[indices] + 1, offsets)
+    return offsets, values
+
+
+def descendents(child: SegmentValues, indices: VectorArray) -> CSR:
+    """Returns the descendents of the queried segments as CSR arrays (offsets and
+    indices). Descendents of each segment are listed from upstream to downstream"""
+    child = np.ascontiguousarray(child, dtype=np.int64)
+    indices = np.ascontiguousarray(indices, dtype=np.int64)
+    return _walk(child, indices)
+
+
+#####
+# Filtering
+#####
+
+
+def removable(
+    topology: Topology,
+    child: SegmentValues,
+    parents: SegmentParents,
+    requested: BooleanIndices,
+    keep_upstream: bool,
+    keep_downstream: bool,
+) -> BooleanIndices:
+    """Returns the requested segments that can be removed while preserving flow
+    continuity. These are the segments reached by repeatedly removing requested
+    segments from the downstream (outlet) and upstream (headwater) ends of their
+    local networks"""
+
+    child = np.ascontiguousarray(child, dtype=np.int64)
+    parents = np.ascontiguousarray(parents, dtype=np.int64)
+    requested = np.ascontiguousarray(requested, dtype=np.bool_)
+    return _peel(
+        topology[0],
+        child,
+        parents,
+        requested,
+        bool(keep_upstream),
+        bool(keep_downstream),
+    )
+
+
+#####
+# Kernels
+#####
+
+
+@njit(cache=True)
+def _euler(child, parents):  # pragma: no cover
+    "Computes the preorder, preorder positions, subtree sizes, and termini"
+
+    n = child.size
+    order = np.empty(n, np.int64)
+    position = np.empty(n, np.int64)
+    size = np.ones(n, np.int64)
+    terminus = np.empty(n, np.int64)
+    stack = np.empty(n, np.int64)
+
+    # Traverse each tree depth-first from its terminal segment. Parents are pushed
+    # in reverse, so that they are visited in order
+    t = 0
+    for root in range(n):
+        if child[root] != -1:
+            continue
+        stack[0] = root
+        count = 1
+        while count > 0:
+            count -= 1
+            node = stack[count]
+            order[t] = node
+            position[node] = t
+            terminus[node] = root
+            t += 1
+            for k in range(parents.shape[1] - 1, -1, -1):
+                parent = parents[node, k]
+                if parent != -1:
+                    stack[count] = parent
+                    count += 1
+
+    # Accumulate subtree sizes in reverse preorder (parents before children)
+    for i in range(n - 1, -1, -1):
+        node = order[i]
+        downstream = child[node]
+        if downstream != -1:
+            size[downstream] += size[node]
+    return order, position, size, terminus
+
+
+@njit(cache=True)
+def _gather(order, starts, offsets):  # pragma: no cover
+    "Gathers preorder slices into a CSR value array"
+    values = np.empty(offsets[-1], np.int64)
+    for k in range(starts.size):
+        length = offsets[k + 1] - offsets[k]
+        values[offsets[k] : offsets[k + 1]] = order[starts[k] : starts[k] + length]
+    return values
+
+
+@njit(cache=True)
+def _walk(child, indices):  # pragma: no cover
+    "Gathers the downstream path of each queried segment into CSR arrays"
+
+    # Count the descendents of each segment
+    offsets = np.zeros(indices.size + 1, np.int64)
+    for k in range(indices.size):
+        count = 0
+        node = child[indices[k]]
+        while node != -1:
+            count += 1
+            node = child[node]
+        offsets[k + 1] = offsets[k] + count
+
+    # Record the paths
+    values = np.empty(offsets[-1], np.int64)
+    for k in range(indices.size):
+        i = offsets[k]
+        node = child[indices[k]]
+        while node != -1:
+            values[i] = node
+            i += 1
+            node = child[node]
+    return offsets, values
+
+
+@njit(cache=True)
+def _peel(
+    order, child, parents, requested, keep_upstream, keep_downstream
+):  # pragma: no cover
+    "Sweeps the preorder to locate segments peeled from the ends of their networks"
+
+    n = order.size
+    removable = np.zeros(n, np.bool_)
+
+    # A segment peels from the downstream end when it and every descendent are
+    # requested. The preorder visits children before parents
+    if not keep_downstream:
+        for i in range(n):
+            node = order[i]
+            downstream = child[node]
+            removable[node] = requested[node] and (
+                downstream == -1 or removable[downstream]
+            )
+
+    # A segment peels from the upstream end when it and every ancestor are
+    # requested. The reverse preorder visits parents before children
+    if not keep_upstream:
+        upstream = np.zeros(n, np.bool_)
+        for i in range(n - 1, -1, -1):
+            node = order[i]
+            peeled = requested[node]
+            for k in range(parents.shape[1]):
+                parent = parents[node, k]
+                if parent != -1 and not upstream[parent]:
+                    peeled = False
+            upstream[node] = peeled
+            removable[node] = removable[node] or peeled
+    return removable
@@ -1,14 +1,11 @@
 """
 Functions that compute update attributes for a filtered network
 ----------
-In-place updates:
-    family          - Updates parent-child relationships in-place following segment removal
-    indices         - Updates connectivity indices in-place following segment removal
-
-Misc:
+Functions:
     segments        - Computes updated segment linestrings and pixel indices
     connectivity    - Computes updated child and parents
-    basins          - Resets basins if terminal outlets were removed
+    basins          - Relabels basins if terminal outlets were removed
+    variables       - Subsets cached model variables to the retained segments
 """
 
 from __future__ import annotations
@@ -17,10 +14,12 @@ import typing
 
 import numpy as np
 
+from pfdf.segments import _basins
+
 if typing.TYPE_CHECKING:
     import shapely
 
-    from pfdf.typing.core import MatrixArray, RealArray, VectorArray
+    from pfdf.typing.core import MatrixArray
     from pfdf.typing.segments import (
         BooleanIndices,
         NetworkIndices,
@@ -29,50 +28,19 @@ if typing.TYPE_CHECKING:
     )
 
 
-#####
-# In-place
-#####
-
-
-def family(
-    child: SegmentValues, parents: SegmentParents, remove: BooleanIndices
-) -> None:
-    "Updates child-parent relationships in-place after segments are removed"
-
-    indices = np.nonzero(remove)
-    removed = np.isin(child, indices)
-    child[removed] = -1
-    removed = np.isin(parents, indices)
-    parents[removed] = -1
-
-
-def indices(family: RealArray, nremoved: VectorArray) -> None:
-    "Updates connectivity indices in-place after segments are removed"
-
-    adjust = family != -1
-    indices = family[adjust]
-    family[adjust] = indices - nremoved[indices]
-
-
-#####
-# Misc
-#####
-
-
 def segments(
     segments, remove: BooleanIndices
 ) -> tuple[list[shapely.LineString], NetworkIndices]:
     "Computes updated linestrings and pixel indices after segments are removed"
 
-    # Initialize new attributes
-    linestrings = segments.segments
-    indices = segments.indices
-
-    # Delete items from lists
-    (removed,) = np.nonzero(remove)
-    for k in reversed(removed):
-        del linestrings[k]
-        del indices[k]
+    linestrings = [
+        linestring
+        for linestring, removed in zip(segments._segments, remove)
+        if not removed
+    ]
+    indices = [
+        pixels for pixels, removed in zip(segments._indices, remove) if not removed
+    ]
     return linestrings, indices
 
 
@@ -81,34 +49,50 @@ def connectivity(
 ) -> tuple[SegmentValues, SegmentParents]:
     "Computes updated child and parents after segments are removed"
 
-    # Initialize new attributes
-    child = segments._child.copy()
-    parents = segments._parents.copy()
-
-    # Limit arrays to retained segments
+    # Map old indices to new indices. Removed segments (and the -1 placeholder,
+    # which indexes the final element) map to -1
     keep = ~remove
-    child = child[keep]
-    parents = parents[keep]
-
-    # Update connectivity relationships and reindex as necessary
-    family(child, parents, remove)
-    nremoved = np.cumsum(remove)
-    indices(child, nremoved)
-    indices(parents, nremoved)
+    lookup = np.full(segments.size + 1, -1, dtype=segments._child.dtype)
+    lookup[:-1][keep] = np.arange(np.count_nonzero(keep))
+
+    # Limit arrays to retained segments and reindex
+    child = lookup[segments._child[keep]]
+    parents = lookup[segments._parents[keep]]
     return child, parents
 
 
-def basins(segments, remove: BooleanIndices) -> MatrixArray | None:
-    "Resets basins if any terminal basin outlets were removed"
+def basins(
+    segments, remove: BooleanIndices, child: SegmentValues
+) -> MatrixArray | None:
+    """Updates basins after segments are removed. Pixels in the basins of removed
+    terminal outlets are relabelled using the terminal outlets of the updated
+    network. Child should be the updated child of each retained segment"""
 
     # If there aren't any basins, just leave them as None
     if segments._basins is None:
         return None
 
-    # Get the ids of the removed segments. Reset if any of the removed IDs
-    # are in the raster. Otherwise, retain the old raster
-    ids = segments.ids[remove]
-    if np.any(np.isin(ids, segments._basins)):
-        return None
-    else:
+    # Retain the old raster if none of the removed IDs are in the raster
+    ids = segments._ids[remove]
+    removed = np.isin(segments._basins, ids)
+    if not removed.any():
         return segments._basins
+
+    # Otherwise, relabel the removed basins using the new terminal outlets
+    keep = np.flatnonzero(~remove)
+    terminal = keep[child == -1]
+    outlets = [
+        (segments._indices[k][0][-1], segments._indices[k][1][-1]) for k in terminal
+    ]
+    return _basins.relabel(
+        segments._basins, removed, segments._flow, segments._ids[terminal], outlets
+    )
+
+
+def variables(variables: dict, remove: BooleanIndices) -> dict:
+    """Subsets cached model variables to the retained segments. Catchment variables
+    only depend on the flow paths upstream of each segment's outlet, so they do not
+    change when other segments are removed"""
+
+    keep = ~remove
+    return {key: (values[keep], inputs) for key, (values, inputs) in variables.items()}
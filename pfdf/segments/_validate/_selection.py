@@ -2,7 +2,7 @@
 Functions to validate inputs that select segments in a network
 ----------
 Functions:
-    _check_in_network   - Checks the input IDs are in the network
+    _check_in_network   - Checks the input IDs are in the network and returns their indices
     id                  - Checks a scalar ID is valid and returns the linear index
     ids                 - Checks a set of IDs are a valid and returns the linear indices
     selection           - Checks a filtering selection is valid and returns boolean indices
@@ -24,46 +24,39 @@ if typing.TYPE_CHECKING:
     from pfdf.typing.segments import BooleanIndices
 
 
-def _check_in_network(segments, ids: VectorArray, name: str) -> None:
-    "Checks that segment IDs are in the network"
+def _check_in_network(segments, ids: VectorArray, name: str) -> VectorArray:
+    "Checks that segment IDs are in the network. Returns the indices of the IDs"
 
     validate.integers(ids, name)
-    for i, id in enumerate(ids):
-        if id not in segments._ids:
-            if name == "ids":
-                name = f"{name}[{i}]"
-            raise ValueError(
-                f"{name} (value={id}) is not the ID of a segment in the network. "
-                "See the '.ids' property for a list of current segment IDs."
-            )
+    indices, found = segments._ids_to_indices(ids)
+    if not np.all(found):
+        i = int(np.argmin(found))
+        if name == "ids":
+            name = f"{name}[{i}]"
+        raise ValueError(
+            f"{name} (value={ids[i]}) is not the ID of a segment in the network. "
+            "See the '.ids' property for a list of current segment IDs."
+        )
+    return indices
 
 
 def id(segments, id: Any) -> int:
     "Checks that a segment ID is valid and returns index"
     id = validate.scalar(id, "id", dtype=real)
     id = id.reshape(1)
-    _check_in_network(segments, id, "id")
-    index = np.argwhere(segments._ids == id)
-    return int(index[0, 0])
+    index = _check_in_network(segments, id, "id")
+    return int(index[0])
 
 
 def ids(segments, ids: Any) -> VectorArray:
     """Checks that a set of segment IDs are valid and converts to linear
     indices. If no IDs are provided, returns all indices in the network"""
 
-    # Select all indices if unspecified. Otherwise validate
+    # Select all indices if unspecified. Otherwise validate and convert to indices
     if ids is None:
         return np.arange(segments.size)
-
-    # Validate
     ids = validate.vector(ids, "ids", dtype=real)
-    _check_in_network(segments, ids, "ids")
-
-    # Convert IDs to indices
-    indices = np.empty(ids.shape, int)
-    for k, id in enumerate(ids):
-        indices[k] = np.argwhere(id == segments.ids)[0, 0]
-    return indices
+    return _check_in_network(segments, ids, "ids")
 
 
 def selection(segments, selection: Any, type: Any) -> BooleanIndices:
@@ -76,5 +69,7 @@ def selection(segments, selection: Any, type: Any) -> BooleanIndices:
         return validate.boolean(indices, name)
     elif type == "ids":
         ids = validate.vector(selection, name, dtype=real)
-        _check_in_network(segments, ids, name)
-        return np.isin(segments._ids, ids)
+        indices = _check_in_network(segments, ids, name)
+        selected = np.zeros(segments.size, bool)
+        selected[indices] = True
+        return selected
@@ -23,35 +23,54 @@ We recommend using field-verified BARC4-like burn severity data when possible,
 but these maps are not always available. If this is the case, users can use the
 "estimate" function to estimate a BARC4-like burn severity raster from dNBR,
 BARC256, or other burn severity measure.
+
+The "mask_file" and "estimate_file" functions implement the same operations for
+rasters that are too large to load into memory. These functions read a raster
+file in blocks, and write the output GeoTIFF block by block, so that memory use
+depends on the block size, rather than the size of the raster.
 ----------
 User Functions:
     mask                    - Returns a mask of the specified burn severities
     estimate                - Estimates burn severity from dNBR, BARC256, or burn-severity measure
     classification          - Returns a dict with the BARC4 classification scheme
 
+Streaming:
+    mask_file               - Writes a burn severity mask from a raster file, block by block
+    estimate_file           - Writes a burn severity estimate from a raster file, block by block
+
 Internal:
     _validate_descriptions  - Checks that burn severity descriptions are recognized
+    _validate_thresholds    - Checks that burn severity thresholds are valid
+    _classes                - Returns the BARC4 integers of burn severity descriptions
+    _stream                 - Processes a raster file block by block
 """
 
 from __future__ import annotations
 
 import typing
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
 
 import numpy as np
 
 import pfdf._validate.core as validate
 from pfdf._utils import aslist, real
 from pfdf._utils.classify import classify
+from pfdf._utils.instrument import traced
 from pfdf.raster import Raster
 
 if typing.TYPE_CHECKING:
-    from typing import Any
+    from pathlib import Path
+    from typing import Any, Callable
 
-    from pfdf.typing.core import strs, vector
+    from pfdf.typing.core import Pathlike, RealArray, strs, vector
     from pfdf.typing.raster import RasterInput
 
     Thresholds = tuple[float, float, float] | vector
 
+# The width and height of the blocks in streamed output files
+_BLOCK = 512
+
 # The classification scheme used in the module
 _classification = {
     "unburned": 1,
@@ -84,6 +103,7 @@ def classification() -> dict[str, int | list[int]]:
     return _classification
 
 
+@traced
 def mask(severity: RasterInput, descriptions: strs) -> Raster:
     """
     mask  Generates a burn severity mask
@@ -107,18 +127,10 @@ def mask(severity: RasterInput, descriptions: strs) -> Raster:
         Raster: The burn severity mask
     """
 
-    # Validate
-    descriptions = _validate_descriptions(descriptions)
+    # Validate and get the integers of the queried severity levels
+    classes = _classes(descriptions)
     severity = Raster(severity, "burn severity raster")
 
-    # Get the integers of the queried severity levels
-    classes = [
-        aslist(classes)
-        for description, classes in _classification.items()
-        if description in descriptions
-    ]
-    classes = sum(classes, [])  # Concatenates lists, is not summing integers
-
     # Return the severity mask
     mask = np.isin(severity.values, classes)
     return Raster.from_array(
@@ -126,6 +138,7 @@ def mask(severity: RasterInput, descriptions: strs) -> Raster:
     )
 
 
+@traced
 def estimate(raster: RasterInput, thresholds: Thresholds = [125, 250, 500]) -> Raster:
     """
     estimate  Estimates a BARC4-like burn severity raster from dNBR, BARC256, or other burn-severity measure
@@ -167,19 +180,138 @@ def estimate(raster: RasterInput, thresholds: Thresholds = [125, 250, 500]) -> R
     """
 
     # Validate
-    thresholds = validate.vector(thresholds, "thresholds", dtype=real, length=3)
-    validate.defined(thresholds, "thresholds")
-    validate.sorted(thresholds, "thresholds")
+    thresholds = _validate_thresholds(thresholds)
     raster = Raster(raster, "input raster")
 
     # Get the burn severity classes and return as raster
-    severity = classify(raster.values, thresholds, nodata=raster.nodata, nodata_to=0)
-    severity = severity.astype("int8", copy=False)
+    severity = classify(
+        raster.values, thresholds, nodata=raster.nodata, nodata_to=0, dtype="int8"
+    )
     return Raster.from_array(
         severity, nodata=0, crs=raster.crs, transform=raster.transform, copy=False
     )
 
 
+#####
+# Streaming
+#####
+
+
+@traced
+def mask_file(
+    path: Pathlike,
+    output: Pathlike,
+    descriptions: strs,
+    *,
+    band: int = 1,
+    overwrite: bool = False,
+    workers: int = 1,
+) -> Path:
+    """
+    mask_file  Writes a burn severity mask from a raster file, block by block
+    ----------
+    mask_file(path, output, descriptions)
+    Generates a burn severity mask from a BARC4-like burn severity raster file,
+    without loading the full raster into memory. Reads the input file in blocks,
+    locates the pixels in each block that match any of the specified burn severity
+    levels, and writes the mask to a tiled GeoTIFF block by block. Pixels that match
+    one of the burn severities have a value of 1, and all other pixels are 0. The
+    mask is saved as int8 with a NoData value of 0, which matches a mask Raster
+    saved using Raster.save. Returns the path to the saved file.
+
+    The output values are identical to those from the "mask" function. Raises an
+    error if the output file already exists.
+
+    mask_file(..., *, band)
+    Specifies the band of the input file that holds the burn severity data. Uses
+    1-indexing, and defaults to 1.
+
+    mask_file(..., *, overwrite=True)
+    Allows the output to replace an existing file.
+
+    mask_file(..., *, workers)
+    Specifies the number of worker threads used to process blocks. Reading and
+    writing are serialized, but the blocks are processed in parallel. Defaults to
+    1, which processes the blocks in order in the calling thread.
+    ----------
+    Inputs:
+        path: The path to a BARC4-like burn severity raster file
+        output: The path to the output GeoTIFF
+        descriptions: A list of strings indicating the burn severity levels that
+            should be set as True in the mask
+        band: The band of the input file to read. Defaults to 1
+        overwrite: True to allow the output to replace an existing file
+        workers: The number of worker threads used to process blocks
+
+    Outputs:
+        Path: The path to the saved burn severity mask
+    """
+
+    classes = _classes(descriptions)
+
+    def process(values: RealArray, nodata: Any) -> RealArray:
+        return np.isin(values, classes).astype("int8")
+
+    return _stream(path, output, band, overwrite, workers, process)
+
+
+@traced
+def estimate_file(
+    path: Pathlike,
+    output: Pathlike,
+    thresholds: Thresholds = [125, 250, 500],
+    *,
+    band: int = 1,
+    overwrite: bool = False,
+    workers: int = 1,
+) -> Path:
+    """
+    estimate_file  Writes a burn severity estimate from a raster file, block by block
+    ----------
+    estimate_file(path, output)
+    estimate_file(path, output, thresholds)
+    Estimates a BARC4-like burn severity from a raster file, without loading the
+    full raster into memory. Reads the input file in blocks, classifies the burn
+    severity of each block, and writes the estimate to a tiled GeoTIFF block by
+    block. The classification and thresholds are the same as for the "estimate"
+    function, and the output values are identical. NoData values are set to 0, and
+    the estimate is saved as int8 with a NoData value of 0. Returns the path to the
+    saved file. Raises an error if the output file already exists.
+
+    estimate_file(..., *, band)
+    Specifies the band of the input file that holds the data used to classify
+    burn severity. Uses 1-indexing, and defaults to 1.
+
+    estimate_file(..., *, overwrite=True)
+    Allows the output to replace an existing file.
+
+    estimate_file(..., *, workers)
+    Specifies the number of worker threads used to process blocks. Reading and
+    writing are serialized, but the blocks are classified in parallel. Defaults to
+    1, which processes the blocks in order in the calling thread.
+    ----------
+    Inputs:
+        path: The path to a raster file holding the data used to classify burn severity
+        output: The path to the output GeoTIFF
+        thresholds: The 3 thresholds to use to distinguish between burn severity classes
+        band: The band of the input file to read. Defaults to 1
+        overwrite: True to allow the output to replace an existing file
+        workers: The number of worker threads used to process blocks
+
+    Outputs:
+        Path: The path to the saved burn severity estimate
+    """
+
+    thresholds = _validate_thresholds(thresholds)
+
+    def process(values: RealArray, nodata: Any) -> RealArray:
+        return classify(
+            values, thresholds, nodata, nodata_to=0, dtype="int8", parallel=False
+        )
+
+    return _stream(path, output, band, overwrite, workers, process)
+
+
 #####
 # Utilities
 #####
@@ -192,3 +324,83 @@ def _validate_descriptions(descriptions: Any) -> set[str]:
         name = f"descriptions[{d}] ({description})"
         descriptions[d] = validate.option(description, name, allowed)
     return set(descriptions)
+
+
+def _validate_thresholds(thresholds: Any) -> RealArray:
+    "Checks that burn severity thresholds are valid"
+    thresholds = validate.vector(thresholds, "thresholds", dtype=real, length=3)
+    validate.defined(thresholds, "thresholds")
+    validate.sorted(thresholds, "thresholds")
+    return thresholds
+
+
+def _classes(descriptions: Any) -> list[int]:
+    "Returns the BARC4 integers of the queried burn severity descriptions"
+    descriptions = _validate_descriptions(descriptions)
+    classes = [
+        aslist(classes)
+        for description, classes in _classification.items()
+        if description in descriptions
+    ]
+    return sum(classes, [])  # Concatenates lists, is not summing integers
+
+
+def _stream(
+    path: Any,
+    output: Any,
+    band: Any,
+    overwrite: Any,
+    workers: Any,
+    process: Callable[[RealArray, Any], RealArray],
+) -> Path:
+    """Processes a raster file block by block, writing the int8 output blocks to
+    a tiled GeoTIFF with a NoData value of 0. GDAL datasets are not thread-safe,
+    so reads and writes are locked, while blocks are processed concurrently"""
+
+    import rasterio
+
+    # Validate
+    path = validate.input_file(path)
+    output = validate.output_file(output, overwrite)
+    validate.type(band, "band", int, "int")
+    workers = validate.scalar(workers, "workers", dtype=real)
+    validate.positive(workers, "workers")
+    validate.integers(workers, "workers")
+    workers = int(workers)
+
+    # Create the output file with the grid of the input file
+    with rasterio.open(path) as source:
+        nodata = source.nodatavals[band - 1]
+        with rasterio.open(
+            output,
+            "w",
+            driver="GTiff",
+            height=source.height,
+            width=source.width,
+            count=1,
+            dtype="int8",
+            nodata=0,
+            transform=source.transform,
+            crs=source.crs,
+            tiled=True,
+            blockxsize=_BLOCK,
+            blockysize=_BLOCK,
+        ) as file:
+            reading, writing = Lock(), Lock()
+
+            # Read, process, and write each block of the output file
+            def task(window):
+                with reading:
+                    values = source.read(band, window=window)
+                values = process(values, nodata)
+                with writing:
+                    file.write(values, 1, window=window)
+
+            windows = [window for _, window in file.block_windows(1)]
+            if workers == 1:
+                for window in windows:
+                    task(window)
+            else:
+                with ThreadPoolExecutor(workers) as executor:
+                    list(executor.map(task, windows))
+    return output
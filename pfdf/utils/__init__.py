@@ -5,6 +5,8 @@ Modules:
     driver      - Functions and information for working with file format drivers
     intensity   - Functions to convert between rainfall accumulations and intensities
     nodata      - Functions for working with NoData values and masks
+    profiling   - Functions to profile the runtime and memory use of pfdf routines
     slope       - Functions to convert slopes between different units
     units       - Functions to convert distances between different units
+    validation  - Functions to skip redundant validation of raster data values
 """
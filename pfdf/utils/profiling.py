@@ -0,0 +1,230 @@
+"""
+Functions to profile the runtime and memory use of pfdf routines
+----------
+This module records the timings of the major public entry points of pfdf, such
+as Raster.from_file, Raster.reproject, the watershed functions, Segments methods
+and variables, and the hazard model solvers. Profiling is opt-in. Use the
+"profile" context manager to record the calls within a block of code, or set the
+PFDF_PROFILE environment variable to a file path to profile an entire script. When
+profiling is disabled, instrumented routines call the wrapped function directly.
+
+Each recorded call reports its duration, the shapes of any array-like inputs, and
+(optionally) the peak number of bytes allocated during the call. Calls to other
+instrumented routines are nested within the call, so the recorded profile shows
+how time divides between pfdf routines. Profiles can be summarized as a pandas
+DataFrame, or saved as a Chrome trace (JSON), which can be opened in
+chrome://tracing or https://ui.perfetto.dev.
+----------
+Functions:
+    profile     - Context manager that profiles the pfdf routines called in a block
+    enabled     - True if a profile is active
+
+Classes:
+    Profile     - The calls recorded by a profile
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import typing
+from contextlib import contextmanager
+
+import pfdf._validate.core as validate
+from pfdf._utils import instrument
+
+if typing.TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Iterator
+
+    from pandas import DataFrame
+
+    from pfdf.typing.core import Pathlike
+
+
+#####
+# Functions
+#####
+
+
+@contextmanager
+def profile(path: Pathlike = None, *, memory: bool = True) -> Iterator[Profile]:
+    """
+    Profiles the pfdf routines called within a block of code
+    ----------
+    with profile() as output:
+    Records the instrumented pfdf routines called within the block. Returns a
+    Profile object that holds the recorded calls. The Profile is complete when the
+    block exits. Raises an error if another profile is already active.
+
+    with profile(path):
+    Also saves the profile to the indicated path as a Chrome trace when the block
+    exits. Overwrites any existing file.
+
+    with profile(..., *, memory=False):
+    Does not record the bytes allocated by each call. Memory is recorded using the
+    tracemalloc module, which slows down Python-heavy routines, so disable this
+    option to record more accurate timings.
+    ----------
+    Inputs:
+        path: An optional path at which to save a Chrome trace of the profile
+        memory: True (default) to record the bytes allocated by each call. False
+            to only record timings
+
+    Outputs:
+        Profile: The calls recorded within the block
+    """
+
+    validate.type(memory, "memory", bool, "bool")
+    if path is not None:
+        path = validate.output_file(path, overwrite=True)
+
+    output = Profile(memory)
+    instrument.activate(output)
+    try:
+        yield output
+    finally:
+        instrument.deactivate()
+        if path is not None:
+            output.save(path, overwrite=True)
+
+
+def enabled() -> bool:
+    """
+    Returns True if a profile is active
+    ----------
+    enabled()
+    Returns True if a profile is recording pfdf routines. Otherwise, returns False.
+    ----------
+    Outputs:
+        bool: True if a profile is active
+    """
+    return instrument._active is not None
+
+
+#####
+# Profile
+#####
+
+
+class Profile:
+    """
+    Profile  The calls recorded by a pfdf profile
+    ----------
+    Properties:
+        memory      - True if the profile records the bytes allocated by each call
+        events      - A list of dicts describing each recorded call
+
+    Methods:
+        summary     - Returns a DataFrame summarizing the runtime of each routine
+        trace       - Returns the profile as a Chrome trace dict
+        save        - Saves the profile as a Chrome trace JSON file
+    """
+
+    def __init__(self, memory: bool = True) -> None:
+        "Creates an empty profile"
+        self._memory = memory
+        self._stop_tracing = False
+        self._start = time.perf_counter()
+        self._events = []
+
+    @property
+    def memory(self) -> bool:
+        "True if the profile records the bytes allocated by each call"
+        return self._memory
+
+    @property
+    def events(self) -> list[dict]:
+        """A list of dicts describing each recorded call, in order of completion.
+        Includes the name, start (seconds since the profile started), duration
+        (seconds), thread, shapes of array-like inputs, and bytes allocated"""
+        events = []
+        for event in self._events:
+            event = event.copy()
+            event["start"] = event["start"] - self._start
+            events.append(event)
+        return events
+
+    def summary(self) -> DataFrame:
+        """
+        Returns a DataFrame summarizing the runtime of each profiled routine
+        ----------
+        self.summary()
+        Returns a pandas DataFrame with one row per profiled routine, sorted by
+        total runtime. Columns are: calls, total (seconds), mean (seconds), and
+        max (seconds). If the profile records memory, also includes the largest
+        number of bytes allocated by a call (peak_bytes). Note that total runtimes
+        include the runtimes of nested routines.
+        ----------
+        Outputs:
+            pandas.DataFrame: A summary of the runtime of each profiled routine
+        """
+
+        from pandas import DataFrame
+
+        columns = ["name", "duration"] + (["bytes"] if self.memory else [])
+        events = DataFrame(self._events, columns=columns)
+        summary = events.groupby("name")["duration"].agg(
+            calls="count", total="sum", mean="mean", max="max"
+        )
+        if self.memory:
+            summary["peak_bytes"] = events.groupby("name")["bytes"].max()
+        return summary.sort_values("total", ascending=False)
+
+    def trace(self) -> dict:
+        """
+        Returns the profile as a Chrome trace dict
+        ----------
+        self.trace()
+        Returns the profile as a dict in the Chrome trace event format. Each call
+        is a complete ("X") event with microsecond timestamps. Event args record
+        the shapes of array-like inputs and the bytes allocated by the call.
+        ----------
+        Outputs:
+            dict: The profile in the Chrome trace event format
+        """
+
+        pid = os.getpid()
+        events = []
+        for event in self._events:
+            args = {"shapes": [list(shape) for shape in event["shapes"]]}
+            if "bytes" in event:
+                args["bytes"] = event["bytes"]
+            events.append(
+                {
+                    "name": event["name"],
+                    "cat": "pfdf",
+                    "ph": "X",
+                    "ts": (event["start"] - self._start) * 1e6,
+                    "dur": event["duration"] * 1e6,
+                    "pid": pid,
+                    "tid": event["thread"],
+                    "args": args,
+                }
+            )
+        events.sort(key=lambda event: event["ts"])
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save(self, path: Pathlike, *, overwrite: bool = False) -> Path:
+        """
+        Saves the profile as a Chrome trace JSON file
+        ----------
+        self.save(path)
+        self.save(path, *, overwrite=True)
+        Saves the profile to the indicated path as a Chrome trace JSON file. The
+        file can be opened in chrome://tracing or https://ui.perfetto.dev. Raises
+        an error if the file exists, unless overwrite=True. Returns the path to the
+        saved file.
+        ----------
+        Inputs:
+            path: The path to the saved file
+            overwrite: True to allow replacing an existing file
+
+        Outputs:
+            Path: The path to the saved file
+        """
+
+        path = validate.output_file(path, overwrite)
+        path.write_text(json.dumps(self.trace()))
+        return path
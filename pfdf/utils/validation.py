@@ -0,0 +1,70 @@
+"""
+Functions to skip redundant validation of raster data values
+----------
+Many pfdf routines check the data values of their input rasters. For example,
+routines that use flow directions check that the flow raster holds TauDEM-style
+D8 flow directions, and routines that use masks check that the mask holds only
+0s and 1s. Each check requires full passes over the raster's data array.
+
+pfdf records the value checks that each Raster passes, so a raster is only checked
+once. Rasters produced by pfdf routines that are valid by construction - such as
+the output of watershed.flow - are recorded as valid when they are created. The
+record is cleared whenever a Raster's data values are altered, or its NoData value
+is overridden.
+
+For workflows whose inputs are known to be valid, the "fast_mode" context manager
+disables these value checks entirely. Checks of raster metadata (shape, CRS, and
+transform) are still applied in fast mode. Be warned that invalid data values may
+produce unexpected results in fast mode.
+----------
+Functions:
+    fast_mode   - Context manager that skips raster value checks within a block
+    enabled     - True if fast mode is active
+"""
+
+from __future__ import annotations
+
+import typing
+from contextlib import contextmanager
+
+from pfdf.raster._utils import provenance
+
+if typing.TYPE_CHECKING:
+    from typing import Iterator
+
+
+#####
+# Functions
+#####
+
+
+@contextmanager
+def fast_mode() -> Iterator[None]:
+    """
+    Skips raster value checks within a block of code
+    ----------
+    with fast_mode():
+    Skips the checks of raster data values (such as the D8 flow direction and
+    boolean mask checks) for pfdf routines called within the block. Checks of raster
+    metadata are still applied. Fast mode contexts may be nested, and fast mode
+    ends when the outermost block exits.
+    """
+
+    provenance.enable()
+    try:
+        yield
+    finally:
+        provenance.disable()
+
+
+def enabled() -> bool:
+    """
+    Returns True if fast mode is active
+    ----------
+    enabled()
+    Returns True if raster value checks are being skipped. Otherwise, returns False.
+    ----------
+    Outputs:
+        bool: True if fast mode is active
+    """
+    return provenance.fast()
@@ -39,42 +39,52 @@ Functions:
     flow            - Computes D8 flow directions from a conditioned DEM
     slopes          - Computes D8 flow slopes
     relief          - Computes vertical relief to the nearest ridge cell
+    derive          - Computes flow directions, slopes, and relief in a single pass
     accumulation    - Computes basic, weighted, or masked flow accumulation
     catchment       - Returns the catchment mask for a watershed pixel
     network         - Returns the stream segments as a list of shapely.LineString objects
 
 Internal:
+    _validate_georeferencing - Checks that a DEM has a CRS and transform for computing slopes
+    _gradients          - Converts flow slopes to unitless gradients
+    _validate_tiles     - Checks that a tile shape is valid for the conditioning options
+    _priority_flood     - Conditions a DEM using the priority-flood algorithm
+    _grid               - Builds a pysheds Grid, importing pysheds on first use
     _to_pysheds         - Converts a raster to pysheds and returns metadata
     _geojson_to_shapely - Converts a stream network GeoJSON to a list of shapely LineStrings
     _split_segments     - Splits stream network segments longer than a specified length
+    _pieces             - Splits segments into equal-length pieces using array operations
     _split              - Splits a stream segment into pieces shorter than a specified length
 """
 
 from __future__ import annotations
 
 import typing
-from math import ceil, inf, nan
+from itertools import chain
+from math import inf, nan
 
 import numpy as np
-from pysheds.grid import Grid
+import shapely
 from shapely import LineString
-from shapely.ops import substring
 
 import pfdf._validate.core as validate
-from pfdf._utils import all_nones, real
+from pfdf._utils import all_nones, d8, flood, real
+from pfdf._utils.instrument import traced
 from pfdf._utils.nodata import NodataMask
 from pfdf._utils.patches import NodataPatch, RidgePatch
-from pfdf.errors import MissingCRSError, MissingTransformError
+from pfdf.errors import MissingCRSError, MissingTransformError, ShapeError
 from pfdf.projection import crs
 from pfdf.raster import Raster
+from pfdf.raster._utils import provenance
 
 if typing.TYPE_CHECKING:
-    from typing import Any, Optional
+    from typing import Any, Literal, Optional
 
     from geojson.feature import FeatureCollection
+    from pysheds.grid import Grid
     from pysheds.sview import Raster as PyshedsRaster
 
-    from pfdf.typing.core import Units, scalar
+    from pfdf.typing.core import Units, scalar, vector
     from pfdf.typing.raster import RasterInput
 
 
@@ -87,12 +97,15 @@ _FLOW_OPTIONS = {"routing": "d8", "dirmap": (3, 2, 1, 8, 7, 6, 5, 4)}
 #####
 
 
+@traced
 def condition(
     dem: RasterInput,
     *,
     fill_pits: bool = True,
     fill_depressions: bool = True,
     resolve_flats: bool = True,
+    method: Literal["pysheds", "priority-flood"] = "pysheds",
+    tile_shape: Optional[vector] = None,
 ) -> Raster:
     """
     condition  Conditions a DEM to resolve pits, depressions, and/or flats
@@ -115,12 +128,37 @@ def condition(
     Allows you to skip specific steps of the conditioning algorithm. Setting an
     option to False will disable the associated conditioning step. Raises a ValueError
     if you attempt to skip all three steps.
+
+    condition(..., *, method="priority-flood")
+    Conditions the DEM using a compiled priority-flood algorithm (Barnes et al., 2014),
+    rather than the default pysheds algorithms. This method is typically much faster
+    for large DEMs, and requires less memory. The method always fills depressions,
+    which also fills any pits, so raises a ValueError if fill_depressions=False. If
+    resolve_flats=True, uses the epsilon variant of the algorithm, which raises flat
+    cells by the smallest representable increment so that each flat drains towards
+    its outlet. Note that this differs from the pysheds algorithm, which also directs
+    flow on flats away from higher terrain. As in pysheds, the DEM drains into NoData
+    regions that reach the edge of the raster, while enclosed NoData regions are
+    filled (so water may spill across them) and remain NoData in the output.
+
+    condition(..., *, method="priority-flood", tile_shape)
+    Fills depressions one tile at a time, using the tiled priority-flood algorithm of
+    Barnes (2016). This bounds the memory used by the algorithm's queues and labels to
+    the size of a tile, and produces the same result as an untiled fill. Note that
+    this is not an out-of-core method - the full DEM is still held in memory. The tile
+    shape should be the number of rows and columns in each tile, or a single value
+    for square tiles. Tiled conditioning does not support resolving flats, so raises
+    a ValueError if resolve_flats=True.
     ----------
     Inputs:
         dem: A digital elevation model raster
         fill_pits: True (default) to fill pits. False to disable this step
         fill_depressions: True (default) to fill depressions. False to disable this step
         resolve_flats: True (default) to resolve flats. False to disable this step
+        method: "pysheds" (default) to condition the DEM using pysheds. "priority-flood"
+            to use the priority-flood algorithm
+        tile_shape: The (rows, columns) shape of the tiles used to fill depressions
+            with the priority-flood method
 
     Outputs:
         Raster: A conditioned DEM raster
@@ -132,6 +170,13 @@ def condition(
             "You cannot skip all three steps of the conditioning algorithm. "
             "At least one step must be implemented."
         )
+    method = validate.option(method, "method", ["pysheds", "priority-flood"])
+    if tile_shape is not None:
+        tile_shape = _validate_tiles(method, tile_shape, resolve_flats)
+
+    # Use priority-flood if requested
+    if method == "priority-flood":
+        return _priority_flood(dem, fill_depressions, resolve_flats, tile_shape)
 
     # Validate raster. Set all NoData values to -inf (other values can cause
     # edge case issues - NaNs and numeric values can be interpreted as high terrain
@@ -143,7 +188,7 @@ def condition(
     nodatas.fill(dem, -inf)
 
     # Condition DEM
-    grid = Grid.from_raster(dem, nodata=-inf)
+    grid = _grid(dem, nodata=-inf)
     if fill_pits:
         dem = grid.fill_pits(dem, nodata_out=-inf)
     if fill_depressions:
@@ -153,6 +198,7 @@ def condition(
     return Raster.from_array(dem, nodata=-inf, **metadata, copy=False)
 
 
+@traced
 def flow(dem: RasterInput) -> Raster:
     """
     flow  Compute D8 flow directions from a conditioned DEM
@@ -180,13 +226,16 @@ def flow(dem: RasterInput) -> Raster:
     dem, metadata = _to_pysheds(dem)
 
     # Compute flow directions
-    grid = Grid.from_raster(dem, nodata=nan)
+    grid = _grid(dem, nodata=nan)
     with NodataPatch():
         flow = grid.flowdir(dem, flats=0, pits=0, nodata_out=0, **_FLOW_OPTIONS)
     flow = flow.astype("int8")
-    return Raster.from_array(flow, nodata=0, **metadata, copy=False)
+    flow = Raster.from_array(flow, nodata=0, **metadata, copy=False)
+    provenance.record(flow, provenance.FLOW)
+    return flow
 
 
+@traced
 def slopes(
     dem: RasterInput,
     flow: RasterInput,
@@ -216,7 +265,9 @@ def slopes(
     necessary for flow directions directly output by the "watershed.flow" function,
     and disabling the validation can improve runtimes for large rasters. However,
     be warned that this option may produce unexpected results if the flow directions
-    raster contains invalid values.
+    raster contains invalid values. Note that a flow directions raster is only
+    checked once - rasters output by "watershed.flow", or that have already passed
+    the check, are not checked again.
     ----------
     Inputs:
         dem: A digital elevation model raster
@@ -229,39 +280,29 @@ def slopes(
         slopes: The computed D8 flow slopes for the watershed
     """
 
-    # Validate DEM metadata
+    # Validate DEM metadata and conversion factor
     dem = Raster(dem, "dem")
-    if dem.crs is None:
-        raise MissingCRSError(
-            "In order to compute flow slopes, the conditioned DEM must have a CRS."
-        )
-    if dem.transform is None:
-        raise MissingTransformError(
-            "In order to compute flow slopes, the conditioned DEM must have an affine transform."
-        )
-
-    # Validate flow and conversion factor
+    _validate_georeferencing(dem)
     dem_per_m = validate.conversion(dem_per_m, "dem_per_m")
+
+    # Validate flow
     flow = dem.validate(flow, "flow directions")
     if check_flow:
-        validate.flow(flow.values, flow.name, ignore=flow.nodata)
+        provenance.flow(flow)
 
     # Get metadata and convert to pysheds. Compute slopes
     demsheds, metadata = _to_pysheds(dem)
     flow = flow.as_pysheds()
-    grid = Grid.from_raster(flow, nodata=nan)
+    grid = _grid(flow, nodata=nan)
     with NodataPatch():
         slopes = grid.cell_slopes(demsheds, flow, nodata_out=nan, **_FLOW_OPTIONS)
 
     # Ensure slopes are unitless gradients and return raster
-    if dem_per_m is not None:
-        slopes = slopes / dem_per_m
-    if dem.crs_units[1] != "metre":
-        crs_per_m = crs.y_units_per_m(dem.crs)
-        slopes = slopes * crs_per_m
+    slopes = _gradients(slopes, dem, dem_per_m)
     return Raster.from_array(slopes, nodata=nan, **metadata, copy=False)
 
 
+@traced
 def relief(
     dem: RasterInput,
     flow: RasterInput,
@@ -283,7 +324,9 @@ def relief(
     necessary for flow directions directly output by the "watershed.flow" function,
     and disabling the validation can improve runtimes for large rasters. However,
     be warned that this option may produce unexpected results if the flow directions
-    raster contains invalid values.
+    raster contains invalid values. Note that a flow directions raster is only
+    checked once - rasters output by "watershed.flow", or that have already passed
+    the check, are not checked again.
     ----------
     Inputs:
         dem: A digital elevation model raster
@@ -299,7 +342,7 @@ def relief(
     dem = Raster(dem, "dem")
     flow = dem.validate(flow, "flow directions")
     if check_flow:
-        validate.flow(flow.values, flow.name, ignore=flow.nodata)
+        provenance.flow(flow)
 
     # Mark Nodatas in the DEM or flow directions as NaN.
     nodatas = NodataMask(dem.values, dem.nodata)
@@ -311,7 +354,7 @@ def relief(
 
     # Compute vertical drops. Relief is the vertical distance to the ridge cells
     # Preserve NoData pixels (sometimes distance_to_ridge neglects them)
-    grid = Grid.from_raster(flow, nodata=nan)
+    grid = _grid(flow, nodata=nan)
     with RidgePatch():
         with NodataPatch():
             drops = grid.cell_dh(dem, flow, nodata_out=nan, **_FLOW_OPTIONS)
@@ -322,6 +365,64 @@ def relief(
     return Raster.from_array(relief, nodata=nan, **metadata, copy=False)
 
 
+def derive(
+    dem: RasterInput, dem_per_m: Optional[scalar] = None
+) -> tuple[Raster, Raster, Raster]:
+    """
+    derive  Computes flow directions, flow slopes, and vertical relief in one pass
+    ----------
+    derive(dem)
+    derive(dem, dem_per_m)
+    Computes D8 flow directions, flow slopes, and vertical relief from a conditioned
+    DEM, and returns the three rasters. The outputs are the same as those from
+    calling "flow", "slopes", and "relief" in turn. However, this function computes
+    all three quantities in a single compiled traversal of the DEM, which reuses the
+    elevation of each cell's downstream neighbor, rather than converting the rasters
+    to pysheds and traversing the DEM separately for each quantity. This is
+    typically several times faster for large DEMs.
+
+    The DEM must have both a CRS and an affine Transform, and is assumed to be in
+    units of meters. Use the "dem_per_m" to specify a conversion factor (number of
+    DEM units per meter) if this is not the case. As with the other functions in
+    this module, a NoData value of 0 is used if the DEM does not have a NoData value.
+    ----------
+    Inputs:
+        dem: A conditioned digital elevation model raster
+        dem_per_m: A conversion factor from DEM units to meters
+
+    Outputs:
+        Raster: The D8 flow directions for the DEM
+        Raster: The computed D8 flow slopes
+        Raster: The vertical relief of the nearest ridge cell
+    """
+
+    # Validate
+    dem = Raster(dem, "dem")
+    _validate_georeferencing(dem)
+    dem_per_m = validate.conversion(dem_per_m, "dem_per_m")
+
+    # Locate NoData cells. (Matches the pysheds default of 0 for missing NoData)
+    if dem.nodata is None:
+        nodatas = dem.values == 0
+    else:
+        nodatas = dem.nodata_mask
+
+    # Compute the derived rasters. Ensure slopes are unitless gradients
+    affine = dem.transform.affine
+    values = dem.values.astype(float, copy=False)
+    flow, slopes, relief = d8.derive(values, nodatas, abs(affine.a), abs(affine.e))
+    slopes = _gradients(slopes, dem, dem_per_m)
+
+    # Build output rasters
+    metadata = {"transform": dem.transform, "crs": dem.crs}
+    flow = Raster.from_array(flow, nodata=0, **metadata, copy=False)
+    provenance.record(flow, provenance.FLOW)
+    slopes = Raster.from_array(slopes, nodata=nan, **metadata, copy=False)
+    relief = Raster.from_array(relief, nodata=nan, **metadata, copy=False)
+    return flow, slopes, relief
+
+
+@traced
 def accumulation(
     flow: RasterInput,
     weights: Optional[RasterInput] = None,
@@ -374,7 +475,9 @@ def accumulation(
     necessary for flow directions directly output by the "watershed.flow" function,
     and disabling the validation can improve runtimes for large rasters. However,
     be warned that this option may produce unexpected results if the flow directions
-    raster contains invalid values.
+    raster contains invalid values. Note that a flow directions raster is only
+    checked once - rasters output by "watershed.flow", or that have already passed
+    the check, are not checked again.
     ----------
     Inputs:
         flow: A D8 flow direction raster in the TauDEM style
@@ -399,9 +502,9 @@ def accumulation(
         weights = flow.validate(weights, "weights")
     if mask is not None:
         mask = flow.validate(mask, "mask")
-        mask = validate.boolean(mask.values, mask.name, ignore=mask.nodata)
+        mask = provenance.boolean(mask)
     if check_flow:
-        validate.flow(flow.values, flow.name, ignore=flow.nodata)
+        provenance.flow(flow)
 
     # Locate weights NoDatas and optionally NaNs
     nodatas = NodataMask(flow.values, None)
@@ -441,7 +544,7 @@ def accumulation(
     weights = weights.as_pysheds()
 
     # Compute accumulation
-    grid = Grid.from_raster(flow)
+    grid = _grid(flow)
     with NodataPatch():
         accumulation = grid.accumulation(flow, weights, nodata_out=nan, **_FLOW_OPTIONS)
 
@@ -451,6 +554,7 @@ def accumulation(
     return Raster.from_array(accumulation, nodata=nan, **metadata, copy=False)
 
 
+@traced
 def catchment(
     flow: RasterInput, row: scalar, column: scalar, check_flow: bool = True
 ) -> Raster:
@@ -470,7 +574,9 @@ def catchment(
     necessary for flow directions directly output by the "watershed.flow" function,
     and disabling the validation can improve runtimes for large rasters. However,
     be warned that this option may produce unexpected results if the flow directions
-    raster contains invalid values.
+    raster contains invalid values. Note that a flow directions raster is only
+    checked once - rasters output by "watershed.flow", or that have already passed
+    the check, are not checked again.
     ----------
     Inputs:
         flow: D8 flow directions for the DEM (in the TauDEM style)
@@ -492,11 +598,11 @@ def catchment(
     validate.inrange(column, "column", min=0, max=flow.shape[1] - 1)
     flow = Raster(flow, "flow directions")
     if check_flow:
-        validate.flow(flow.values, flow.name, ignore=flow.nodata)
+        provenance.flow(flow)
 
     # Get the catchment mask
     flow, metadata = _to_pysheds(flow)
-    grid = Grid.from_raster(flow)
+    grid = _grid(flow)
     with NodataPatch():
         catchment = grid.catchment(
             fdir=flow, x=column, y=row, xytype="index", **_FLOW_OPTIONS
@@ -504,6 +610,7 @@ def catchment(
     return Raster.from_array(catchment, nodata=False, **metadata, copy=False)
 
 
+@traced
 def network(
     flow: RasterInput,
     mask: RasterInput,
@@ -543,7 +650,9 @@ def network(
     necessary for flow directions directly output by the "watershed.flow" function,
     and disabling the validation can improve runtimes for large rasters. However,
     be warned that this option may produce unexpected results if the flow directions
-    raster contains invalid values.
+    raster contains invalid values. Note that a flow directions raster is only
+    checked once - rasters output by "watershed.flow", or that have already passed
+    the check, are not checked again.
     ----------
     Inputs:
         flow: A TauDEM-style D8 flow direction raster
@@ -583,9 +692,9 @@ def network(
 
     # Validate mask and flow values
     mask = flow.validate(mask, "mask")
-    validate.boolean(mask.values, mask.name, ignore=mask.nodata)
+    provenance.boolean(mask)
     if check_flow:
-        validate.flow(flow.values, flow.name, ignore=flow.nodata)
+        provenance.flow(flow)
 
     # Convert to pysheds
     flow = flow.as_pysheds()
@@ -593,7 +702,7 @@ def network(
 
     # Get the geojson river network. Shift coordinates to pixel centers and
     # convert to shapely linestrings
-    grid = Grid.from_raster(flow)
+    grid = _grid(flow)
     with NodataPatch():
         segments = grid.extract_river_network(flow, mask, **_FLOW_OPTIONS)
     segments = _geojson_to_shapely(flow, segments)
@@ -609,6 +718,92 @@ def network(
 #####
 
 
+def _validate_georeferencing(dem: Raster) -> None:
+    "Checks that a DEM has the CRS and transform needed to compute flow slopes"
+
+    if dem.crs is None:
+        raise MissingCRSError(
+            "In order to compute flow slopes, the conditioned DEM must have a CRS."
+        )
+    if dem.transform is None:
+        raise MissingTransformError(
+            "In order to compute flow slopes, the conditioned DEM must have an affine transform."
+        )
+
+
+def _gradients(slopes: np.ndarray, dem: Raster, dem_per_m: float | None) -> np.ndarray:
+    "Converts flow slopes to unitless gradients"
+
+    if dem_per_m is not None:
+        slopes = slopes / dem_per_m
+    if dem.crs_units[1] != "metre":
+        crs_per_m = crs.y_units_per_m(dem.crs)
+        slopes = slopes * crs_per_m
+    return slopes
+
+
+def _validate_tiles(
+    method: str, tile_shape: Any, resolve_flats: bool
+) -> tuple[int, int]:
+    "Checks that a tile shape is valid for the conditioning options"
+
+    if method != "priority-flood":
+        raise ValueError('You can only use tile_shape when method="priority-flood"')
+    elif resolve_flats:
+        raise ValueError(
+            "Tiled conditioning does not support resolving flats. "
+            "Set resolve_flats=False to use tile_shape."
+        )
+    tile_shape = validate.vector(tile_shape, "tile_shape", dtype=real)
+    if tile_shape.size not in [1, 2]:
+        raise ShapeError(
+            f"tile_shape must have either 1 or 2 elements, but it has "
+            f"{tile_shape.size} elements instead."
+        )
+    validate.positive(tile_shape, "tile_shape")
+    validate.integers(tile_shape, "tile_shape")
+    tile_shape = np.broadcast_to(tile_shape, 2)
+    return int(tile_shape[0]), int(tile_shape[1])
+
+
+def _priority_flood(
+    dem: RasterInput,
+    fill_depressions: bool,
+    resolve_flats: bool,
+    tile_shape: tuple[int, int] | None,
+) -> Raster:
+    "Conditions a DEM using the priority-flood algorithm"
+
+    # Priority-flood always fills depressions
+    if not fill_depressions:
+        raise ValueError(
+            "The priority-flood method always fills depressions, so you cannot "
+            'set fill_depressions=False when method="priority-flood".'
+        )
+
+    # Get a float working copy with NoData set to -inf. The algorithms work in
+    # place on this copy, which becomes the values of the output raster
+    dem = Raster(dem, "dem")
+    values = dem.values.astype(float)
+    NodataMask(dem.values, dem.nodata).fill(values, -inf)
+
+    # Condition the DEM
+    if tile_shape is None:
+        flood.fill(values, resolve_flats)
+    else:
+        flood.fill_tiled(values, *tile_shape)
+    return Raster.from_array(
+        values, nodata=-inf, transform=dem.transform, crs=dem.crs, copy=False
+    )
+
+
+def _grid(raster: PyshedsRaster, **kwargs: Any) -> Grid:
+    "Builds a pysheds Grid. pysheds is imported on first use, as it is slow to load"
+    from pysheds.grid import Grid
+
+    return Grid.from_raster(raster, **kwargs)
+
+
 def _to_pysheds(raster: Raster) -> tuple[PyshedsRaster, dict[str, Any]]:
     "Converts a raster to pysheds and returns a dict of transform and crs metadata"
     metadata = {"transform": raster.transform, "crs": raster.crs}
@@ -622,46 +817,124 @@ def _geojson_to_shapely(
     """Converts a stream network GeoJSON to a list of shapely Linestrings.
     Also shifts linestring coordinates from the top-left corner to pixel centers"""
 
-    # Get the step size for the center shift
-    dx = flow.affine[0] / 2
-    dy = flow.affine[4] / 2
-
-    # Get the initial coordinates for each segment
+    # Get the coordinates of every segment as a single array
     segments = segments["features"]
-    for s, segment in enumerate(segments):
-        coords = segment["geometry"]["coordinates"]
+    coords = [segment["geometry"]["coordinates"] for segment in segments]
+    npoints = [len(segment) for segment in coords]
+    coords = np.array(list(chain.from_iterable(coords)), dtype=float).reshape(-1, 2)
 
-        # Shift coordinates to pixel centers and save as LineStrings
-        coords = [(x + dx, y + dy) for x, y in coords]
-        segments[s] = LineString(coords)
-    return segments
+    # Shift coordinates to pixel centers and build the LineStrings
+    coords += (flow.affine[0] / 2, flow.affine[4] / 2)
+    indices = np.repeat(np.arange(len(npoints)), npoints)
+    return list(shapely.linestrings(coords, indices=indices))
 
 
 def _split_segments(segments: list[LineString], max_length: float) -> list[LineString]:
-    "Splits stream network segments longer than a maximum length"
-    split_segments = []
-    for segment in segments:
-        pieces = _split(segment, max_length)
-        split_segments += pieces
-    return split_segments
+    """Splits stream network segments longer than a maximum length. Each long
+    segment is split into equal-length pieces, and all segments are split at once"""
+
+    # Get the number of pieces for each segment. Only split long segments
+    segments = np.array(segments, dtype=object)
+    lengths = shapely.length(segments)
+    npieces = np.ones(lengths.shape, dtype=int)
+    long = lengths > max_length
+    npieces[long] = np.ceil(lengths[long] / max_length)
+
+    # Short segments are returned as is
+    output = np.empty(npieces.sum(), dtype=object)
+    first = np.cumsum(npieces) - npieces
+    output[first[~long]] = segments[~long]
+    if not np.any(long):
+        return list(output)
+
+    # Get the pieces of the long segments. Each piece of a segment is stored
+    # at the index of its segment's first piece plus the piece number
+    pieces = _pieces(segments[long], lengths[long], npieces[long])
+    piece = np.arange(npieces[long].sum()) - np.repeat(
+        np.cumsum(npieces[long]) - npieces[long], npieces[long]
+    )
+    output[np.repeat(first[long], npieces[long]) + piece] = pieces
+    return list(output)
+
+
+def _pieces(
+    segments: np.ndarray, lengths: np.ndarray, npieces: np.ndarray
+) -> np.ndarray:
+    """Splits segments into the indicated number of equal-length pieces. Each piece
+    consists of its start point, the vertices strictly between its start and end
+    distances, and its end point (as for shapely.ops.substring)"""
+
+    # Get the distance of each piece boundary along its segment, and the boundary
+    # points. Boundaries are ordered by segment, then distance
+    nbounds = npieces + 1
+    bstart = np.cumsum(nbounds) - nbounds
+    bsegment = np.repeat(np.arange(segments.size), nbounds)
+    bounds = np.arange(bsegment.size) - bstart[bsegment]
+    bdistance = bounds * (lengths / npieces)[bsegment]
+    bcoords = shapely.line_interpolate_point(segments[bsegment], bdistance)
+    bcoords = shapely.get_coordinates(bcoords)
+
+    # Get the cumulative distance of each vertex along its segment. Distances are
+    # accumulated from the start of each segment in the same order as substring,
+    # so that vertices on piece boundaries are detected exactly
+    vcoords, vsegment = shapely.get_coordinates(segments, return_index=True)
+    vstart = np.searchsorted(vsegment, np.arange(segments.size))
+    position = np.arange(vsegment.size) - vstart[vsegment]
+    steps = np.zeros(vsegment.size)
+    dx, dy = np.diff(vcoords, axis=0).T
+    steps[1:] = (dx**2 + dy**2) ** 0.5
+    vdistance = np.zeros(vsegment.size)
+    order = np.argsort(position, kind="stable")
+    counts = np.bincount(position)
+    offsets = np.cumsum(counts)
+    for k in range(1, counts.size):
+        vertices = order[offsets[k - 1] : offsets[k]]
+        vdistance[vertices] = vdistance[vertices - 1] + steps[vertices]
+
+    # The final vertex of each segment is never interior to a piece
+    final = np.append(vstart[1:], vsegment.size) - 1
+
+    # Locate the last boundary at or before each vertex by merging the vertices
+    # into the sorted boundaries. (Boundaries precede vertices at equal distances)
+    segment = np.concatenate((bsegment, vsegment))
+    distance = np.concatenate((bdistance, vdistance))
+    isbound = np.concatenate(
+        (np.ones(bsegment.size, bool), np.zeros(vsegment.size, bool))
+    )
+    order = np.lexsort((~isbound, distance, segment))
+    last = np.maximum.accumulate(np.where(isbound[order], order, -1))
+    vertex = ~isbound[order]
+    previous = np.empty(vsegment.size, dtype=int)
+    previous[order[vertex] - bsegment.size] = last[vertex]
+
+    # Vertices are interior to a piece if they follow a boundary in the same segment,
+    # are not on the boundary, and precede the segment's final boundary and vertex
+    piece = previous - bstart[vsegment]
+    interior = (
+        (previous >= 0)
+        & (bsegment[previous] == vsegment)
+        & (bdistance[previous] != vdistance)
+        & (piece < npieces[vsegment])
+    )
+    interior[final] = False
+
+    # Assemble each piece from its start boundary, interior vertices, and end
+    # boundary. Pieces are numbered by segment, then by distance
+    pstart = np.cumsum(npieces) - npieces
+    starts = np.flatnonzero(bounds < npieces[bsegment])
+    pieces = pstart[bsegment[starts]] + bounds[starts]
+    coords = np.concatenate((bcoords[starts], vcoords[interior], bcoords[starts + 1]))
+    indices = np.concatenate(
+        (pieces, pstart[vsegment[interior]] + piece[interior], pieces)
+    )
+    kind = np.repeat([0, 1, 2], [pieces.size, interior.sum(), pieces.size])
+    position = np.concatenate(
+        (np.zeros(pieces.size), np.flatnonzero(interior), np.zeros(pieces.size))
+    )
+    order = np.lexsort((position, kind, indices))
+    return shapely.linestrings(coords[order], indices=indices[order])
 
 
 def _split(segment: LineString, max_length: float) -> list[LineString]:
     "Splits a stream segment into pieces shorter than a maximum length"
-
-    # If under the max length, just return the segment
-    if segment.length <= max_length:
-        return [segment]
-
-    # Determine the length of each substring and initialize list of pieces
-    npieces = ceil(segment.length / max_length)
-    length = segment.length / npieces
-    pieces = [None] * npieces
-
-    # Collect the substrings
-    start = 0
-    for k in range(npieces):
-        end = (k + 1) * length
-        pieces[k] = substring(segment, start, end)
-        start = end
-    return pieces
+    return _split_segments([segment], max_length)
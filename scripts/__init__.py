@@ -2,5 +2,6 @@
 Scripts used to help develop pfdf
 ----------
 Modules:
-    docs    - Functions used to build the docs
+    benchmarks  - Functions that benchmark pfdf routines
+    docs        - Functions used to build the docs
 """
\ No newline at end of file
@@ -0,0 +1,402 @@
+"""
+Developer scripts that benchmark pfdf routines
+----------
+Functions:
+    models      - Benchmarks the hazard model solvers at float64, float32, and with out arrays
+    imports     - Checks the import time and lazy imports of each subpackage against a regression budget
+    classification - Benchmarks threshold classification against the np.digitize path
+    terrain     - Returns a deterministic fractal DEM of a given size
+    pipeline    - Benchmarks the hazard assessment hot paths on fractal DEMs and saves JSON results
+    compare     - Compares two saved pipeline benchmarks
+
+Utilities:
+    _measure    - Returns the best runtime and the peak traced memory of a function call
+    _report     - Prints a table of benchmark results
+    _import_time - Returns the cumulative import time and imported modules of a module in a fresh interpreter
+    _profile    - Returns the output, runtime, and peak traced memory of a single call
+"""
+
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+
+from pfdf import watershed
+from pfdf._utils.classify import classify
+from pfdf._utils.nodata import NodataMask
+from pfdf.models import cannon2010, gartner2014, staley2017
+from pfdf.models.table import hazard_table
+from pfdf.raster import Raster
+from pfdf.segments import Segments
+
+
+def _measure(function, repeat: int = 3) -> tuple[float, float]:
+    "Returns the best runtime (s) and peak traced memory (MB) of a function call"
+
+    function()  # Warm up numba and allocator caches
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1] / 1024**2
+    tracemalloc.stop()
+    return best, peak
+
+
+def _report(title: str, cases: dict) -> None:
+    "Prints a table of benchmark results, relative to the first case"
+
+    print(f"\n{title}")
+    baseline = None
+    for name, function in cases.items():
+        seconds, peak = _measure(function)
+        if baseline is None:
+            baseline = seconds
+        print(
+            f"    {name:<18} {seconds:8.3f} s  {baseline / seconds:5.2f}x  {peak:9.1f} MB"
+        )
+
+
+def models(nsegments: int = 2000, nruns: int = 200, nvalues: int = 10) -> None:
+    "Benchmarks the hazard model solvers at float64, float32, and with out arrays"
+
+    rng = np.random.default_rng(seed=0)
+    print(f"Segments: {nsegments}, Runs: {nruns}, Rainfall values: {nvalues}")
+
+    # Staley 2017 likelihoods and accumulations
+    B = -rng.random(nruns) * 4
+    Ct, Cf, Cs = rng.random((3, nruns))
+    T, F, S = rng.random((3, nsegments))
+    R = np.linspace(2, 40, nvalues)
+    p = np.linspace(0.05, 0.95, nvalues)
+    shape = (nsegments, nvalues, nruns)
+    out64 = np.empty(shape)
+    out32 = np.empty(shape, "float32")
+    args = (B, Ct, T, Cf, F, Cs, S)
+    _report(
+        "staley2017.likelihood",
+        {
+            "float64": lambda: staley2017.likelihood(R, *args),
+            "float32": lambda: staley2017.likelihood(R, *args, dtype="float32"),
+            "out (float64)": lambda: staley2017.likelihood(R, *args, out=out64),
+            "out (float32)": lambda: staley2017.likelihood(R, *args, out=out32),
+        },
+    )
+    _report(
+        "staley2017.accumulation",
+        {
+            "float64": lambda: staley2017.accumulation(p, *args),
+            "float32": lambda: staley2017.accumulation(p, *args, dtype="float32"),
+            "out (float64)": lambda: staley2017.accumulation(p, *args, out=out64),
+            "out (float32)": lambda: staley2017.accumulation(p, *args, out=out32),
+        },
+    )
+
+    # Gartner 2014 volumes
+    i15 = np.linspace(4, 80, nvalues)
+    Bmh, relief = rng.random((2, nsegments)) * [[10], [1000]]
+    CI = [0.9, 0.95]
+    shapes = [(nsegments, nvalues, 1), (nsegments, nvalues, 1, 2)]
+    out = [np.empty(shapes[0]), np.empty(shapes[1]), np.empty(shapes[1])]
+    _report(
+        "gartner2014.emergency",
+        {
+            "float64": lambda: gartner2014.emergency(i15, Bmh, relief, CI=CI),
+            "float32": lambda: gartner2014.emergency(
+                i15, Bmh, relief, CI=CI, dtype="float32"
+            ),
+            "out (float64)": lambda: gartner2014.emergency(
+                i15, Bmh, relief, CI=CI, out=out
+            ),
+        },
+    )
+
+    # Cannon 2010 hazard classes
+    likelihoods = rng.random((nsegments, nvalues * nruns // 10))
+    volumes = rng.random(likelihoods.shape) * 1e6
+    out = np.empty(likelihoods.shape, "float32")
+    _report(
+        "cannon2010.hazard",
+        {
+            "float64": lambda: cannon2010.hazard(likelihoods, volumes),
+            "float32": lambda: cannon2010.hazard(likelihoods, volumes, dtype="float32"),
+            "out (float32)": lambda: cannon2010.hazard(likelihoods, volumes, out=out),
+        },
+    )
+
+
+def classification(npixels: int = 50_000_000) -> None:
+    "Benchmarks threshold classification against the np.digitize path"
+
+    # A dNBR-like raster with some NoData pixels
+    rng = np.random.default_rng(seed=0)
+    dnbr = rng.normal(300, 250, npixels).astype("float32")
+    dnbr[rng.random(npixels) < 0.05] = -9999
+    thresholds = [125, 250, 500]
+    print(f"Pixels: {npixels}")
+
+    def digitize():
+        bins = [-np.inf] + thresholds + [np.inf]
+        classes = np.digitize(dnbr, bins, right=True)
+        classes = NodataMask(dnbr, -9999).fill(classes, 0)
+        return classes.astype("int8", copy=False)
+
+    out = np.empty(npixels, "int8")
+    _report(
+        "severity classes (int8)",
+        {
+            "np.digitize": digitize,
+            "kernel": lambda: classify(dnbr, thresholds, -9999, 0, dtype="int8"),
+            "kernel (out)": lambda: classify(dnbr, thresholds, -9999, 0, out=out),
+        },
+    )
+
+
+#####
+# Hazard assessment pipeline
+#####
+
+# Named DEM sizes (pixels per side) for the pipeline benchmark
+SIZES = {"1k": 1000, "4k": 4000, "10k": 10000}
+
+
+def terrain(
+    size: int, seed: int = 0, resolution: float = 10, relief: float = 1000
+) -> Raster:
+    """Returns a deterministic fractal DEM with size x size pixels. Uses spectral
+    synthesis of 1/f^2 noise (Brownian terrain) on a tilted plane, so that the
+    terrain drains towards the southern edge"""
+
+    # Shape white noise with a 1/f^2 power spectrum
+    rng = np.random.default_rng(seed)
+    noise = rng.standard_normal((size, size), dtype="float32")
+    spectrum = np.fft.rfft2(noise)
+    del noise
+    fy = np.fft.fftfreq(size).astype("float32").reshape(-1, 1)
+    fx = np.fft.rfftfreq(size).astype("float32").reshape(1, -1)
+    frequency = np.hypot(fy, fx)
+    frequency[0, 0] = np.inf
+    spectrum /= frequency**2
+    del frequency
+    values = np.fft.irfft2(spectrum, s=(size, size)).astype("float32", copy=False)
+    del spectrum
+
+    # Scale to the relief and add a north-south tilt
+    values -= values.min()
+    values *= relief / values.max()
+    values += np.linspace(relief, 0, size, dtype="float32").reshape(-1, 1)
+    return Raster.from_array(
+        values,
+        nodata=-9999,
+        crs=26911,
+        transform=(resolution, -resolution, 500000, 4000000),
+        copy=False,
+    )
+
+
+def _profile(function) -> tuple[object, float, float]:
+    """Returns the output, runtime (s), and peak traced memory (MB) of a function.
+    Calls the function twice, as tracing memory slows down pure-Python code. The
+    traced call also warms up numba, so compilation is not timed"""
+
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1] / 1024**2
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    output = function()
+    seconds = time.perf_counter() - start
+    return output, seconds, peak
+
+
+def pipeline(
+    sizes: list[str] = ["1k"],
+    output: str = "benchmarks.json",
+    min_area: int = 250,
+) -> dict:
+    """Benchmarks the hazard assessment hot paths on fractal DEMs of the named sizes
+    (1k, 4k, and/or 10k pixels per side). Records the runtime and peak traced
+    memory of each step, prints a table, and saves the results as JSON. Stream
+    segments drain at least min_area pixels. Returns the results dict"""
+
+    try:
+        release = version("pfdf")
+    except PackageNotFoundError:
+        release = "unknown"
+    results = {
+        "pfdf": release,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "sizes": {},
+    }
+    rng = np.random.default_rng(seed=0)
+
+    for name in sizes:
+        size = SIZES[name]
+        print(f"\nDEM: {name} ({size} x {size} pixels)")
+        steps = {}
+
+        def run(step, function):
+            output, seconds, peak = _profile(function)
+            steps[step] = {"seconds": seconds, "peak_mb": peak}
+            print(f"    {step:<28} {seconds:9.3f} s  {peak:9.1f} MB")
+            return output
+
+        # Watershed analysis
+        dem = terrain(size)
+        conditioned = run("watershed.condition", lambda: watershed.condition(dem))
+        flow = run("watershed.flow", lambda: watershed.flow(conditioned))
+        area = run("watershed.accumulation", lambda: watershed.accumulation(flow))
+
+        # Stream network
+        mask = area.values >= min_area
+        segments = run("Segments.__init__", lambda: Segments(flow, mask))
+        run("Segments.locate_basins", lambda: segments.copy().locate_basins())
+        segments.locate_basins()
+        run(
+            "Segments.catchment_summary",
+            lambda: segments.catchment_summary("mean", dem),
+        )
+        run("Segments.confinement", lambda: segments.confinement(dem, 4))
+        run("Segments.geojson", lambda: segments.geojson())
+        with TemporaryDirectory() as folder:
+            path = Path(folder) / "segments.geojson"
+            run("Segments.save", lambda: segments.save(path, overwrite=True))
+
+        # Hazard models
+        T, F, S = rng.random((3, segments.size))
+        Bmh, relief = rng.random((2, segments.size)) * [[10], [1000]]
+        variables = {"M1": (T, F, S), "M3": (T, F, S)}
+        run("models.hazard_table", lambda: hazard_table(variables, Bmh, relief))
+
+        results["sizes"][name] = {
+            "pixels": size**2,
+            "segments": segments.size,
+            "steps": steps,
+        }
+
+    Path(output).write_text(json.dumps(results, indent=4))
+    print(f"\nSaved results to {output}")
+    return results
+
+
+def compare(baseline: str, current: str = "benchmarks.json") -> None:
+    """Compares two saved pipeline benchmarks. Prints the ratio of baseline to
+    current runtimes (>1 is faster) and peak memory for each shared step"""
+
+    baseline, current = [
+        json.loads(Path(path).read_text()) for path in (baseline, current)
+    ]
+    print(f"Baseline: pfdf {baseline['pfdf']} ({baseline['date']})")
+    print(f"Current:  pfdf {current['pfdf']} ({current['date']})")
+    for name, result in current["sizes"].items():
+        if name not in baseline["sizes"]:
+            continue
+        print(f"\nDEM: {name}")
+        old = baseline["sizes"][name]["steps"]
+        for step, new in result["steps"].items():
+            if step not in old:
+                continue
+            speedup = old[step]["seconds"] / new["seconds"]
+            memory = old[step]["peak_mb"] / max(new["peak_mb"], 1e-6)
+            print(f"    {step:<28} {speedup:6.2f}x time  {memory:6.2f}x memory")
+
+
+#####
+# Import times
+#####
+
+# Import time budgets in seconds. Heavy dependencies (pysheds, scipy) should only
+# load when a routine that needs them is called, so these budgets fail if a
+# subpackage imports them eagerly
+IMPORT_BUDGETS = {
+    "pfdf.data": 0.05,
+    "pfdf.models": 0.05,
+    "pfdf.utils": 0.05,
+    "pfdf.models.cannon2010": 0.75,
+    "pfdf.models.gartner2014": 0.75,
+    "pfdf.models.staley2017": 1.0,
+    "pfdf.projection": 0.75,
+    "pfdf.raster": 1.0,
+    "pfdf.severity": 1.0,
+    "pfdf.segments": 1.5,
+    "pfdf.watershed": 1.5,
+}
+
+# Packages that each module should leave unloaded. Time budgets are loose enough
+# to absorb timing noise, so these catch eager imports that a budget can miss
+IMPORT_EXCLUSIONS = {
+    "pfdf.models.cannon2010": ("pfdf.raster", "fiona", "pysheds", "scipy.stats"),
+    "pfdf.models.gartner2014": ("pfdf.raster", "fiona", "pysheds", "scipy.stats"),
+    "pfdf.models.staley2017": ("pfdf.raster", "fiona", "pysheds", "scipy.stats"),
+}
+
+
+def _import_time(module: str, repeat: int = 3) -> tuple[float, set[str]]:
+    """Returns the best cumulative import time (s) of a module and its parent packages
+    in a fresh interpreter. Also returns the names of the imported modules"""
+
+    best = np.inf
+    modules = set()
+    for _ in range(repeat):
+        command = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+        result = subprocess.run(command, capture_output=True, text=True, check=True)
+
+        # Use the largest cumulative time of any module in the pfdf package tree.
+        # This is the outermost pfdf import, so it includes the parent packages and
+        # does not depend on the order of the lines. Columns are:
+        # self | cumulative | name, and nested names are indented
+        cumulative = 0
+        for line in result.stderr.splitlines():
+            fields = line.split("|")
+            name = fields[-1].strip()
+            if len(fields) != 3 or not fields[1].strip().isdigit():
+                continue
+            modules.add(name)
+            if name == "pfdf" or name.startswith("pfdf."):
+                cumulative = max(cumulative, int(fields[1]))
+        best = min(best, cumulative / 1e6)
+    return best, modules
+
+
+def imports() -> None:
+    "Checks the import time and lazy imports of each subpackage against a regression budget"
+
+    print("Import times (python -X importtime)")
+    failed = []
+    for module, budget in IMPORT_BUDGETS.items():
+        seconds, modules = _import_time(module)
+        loaded = [name for name in IMPORT_EXCLUSIONS.get(module, ()) if name in modules]
+        status = "ok"
+        if seconds > budget:
+            status = "OVER BUDGET"
+            failed.append(module)
+        elif loaded:
+            status = f"LOADS {', '.join(loaded)}"
+            failed.append(module)
+        print(f"    {module:<24} {seconds:7.4f} s  (budget {budget:5.2f} s)  {status}")
+
+    if failed:
+        raise SystemExit(f"Import time budget exceeded for: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    models()
+    classification()
+    imports()
+    pipeline()
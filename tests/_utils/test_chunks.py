@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+
+from pfdf._utils import chunks
+from pfdf.errors import ShapeError
+
+
+class TestDtype:
+    def test_none(_):
+        assert chunks.dtype(None) is None
+
+    @pytest.mark.parametrize("dtype", ("float32", np.float32, np.dtype("float32")))
+    def test_float32(_, dtype):
+        assert chunks.dtype(dtype) == np.float32
+
+    def test_float64(_):
+        assert chunks.dtype(float) == np.float64
+
+    def test_invalid_type(_, assert_contains):
+        with pytest.raises(TypeError) as error:
+            chunks.dtype(5.5)
+        assert_contains(error, "dtype must be a numpy float32 or float64 dtype")
+
+    def test_invalid(_, assert_contains):
+        with pytest.raises(ValueError) as error:
+            chunks.dtype("int32")
+        assert_contains(error, "dtype must be float32 or float64")
+
+
+class TestAstype:
+    def test_none(_):
+        a, b = chunks.astype(None, np.arange(3), np.ones(2, "float32"))
+        assert a.dtype == b.dtype == np.float64
+
+    def test_float32(_):
+        a = np.ones(3, "float32")
+        (output,) = chunks.astype(np.dtype("float32"), a)
+        assert output is a
+
+
+class TestOutput:
+    def test_none(_):
+        output = chunks.output(None, (3, 4, 5), float, False)
+        assert output.shape == (3, 4, 5)
+        assert output.dtype == float
+
+    def test_array(_):
+        out = np.empty((3, 4, 5), dtype="float32")
+        assert chunks.output(out, (3, 4, 5), None, False) is out
+
+    def test_float32(_, tmp_path):
+        output = chunks.output(
+            tmp_path / "output.npy", (3,), np.dtype("float32"), False
+        )
+        assert output.dtype == np.float32
+
+    def test_wrong_dtype(_, assert_contains):
+        out = np.empty(3, "float32")
+        with pytest.raises(TypeError) as error:
+            chunks.output(out, (3,), np.dtype("float64"), False)
+        assert_contains(error, "out must have a float64 dtype")
+
+    def test_file(_, tmp_path):
+        path = tmp_path / "output.npy"
+        output = chunks.output(str(path), (3, 4), float, False)
+        assert isinstance(output, np.memmap)
+        assert output.shape == (3, 4)
+        output[:] = 1
+        chunks.flush(output)
+        assert np.array_equal(np.load(path), np.ones((3, 4)))
+
+    def test_file_exists(_, tmp_path):
+        path = tmp_path / "output.npy"
+        path.write_text("existing")
+        with pytest.raises(FileExistsError):
+            chunks.output(path, (3, 4), float, False)
+        output = chunks.output(path, (3, 4), float, True)
+        assert output.shape == (3, 4)
+
+    def test_bad_extension(_, tmp_path, assert_contains):
+        with pytest.raises(ValueError) as error:
+            chunks.output(tmp_path / "output.tif", (3, 4), float, False)
+        assert_contains(error, '".npy" extension')
+
+    def test_not_array(_, assert_contains):
+        with pytest.raises(TypeError) as error:
+            chunks.output([1, 2, 3], (3,), float, False)
+        assert_contains(error, "out must be a numpy array")
+
+    def test_not_float(_, assert_contains):
+        with pytest.raises(TypeError) as error:
+            chunks.output(np.empty(3, int), (3,), None, False)
+        assert_contains(error, "float32 or float64 dtype")
+
+    def test_array_name(_, assert_contains):
+        with pytest.raises(TypeError) as error:
+            chunks.array([1, 2], "out[0]", (2,), None)
+        assert_contains(error, "out[0] must be a numpy array")
+
+    def test_bad_shape(_, assert_contains):
+        with pytest.raises(ShapeError) as error:
+            chunks.output(np.empty((3, 4)), (4, 3), float, False)
+        assert_contains(error, "out must have shape (4, 3)")
+
+    def test_read_only(_, assert_contains):
+        out = np.empty(3)
+        out.flags.writeable = False
+        with pytest.raises(ValueError) as error:
+            chunks.output(out, (3,), float, False)
+        assert_contains(error, "writeable")
+
+
+class TestBlocks:
+    def test(_):
+        output = chunks.blocks(10, 1024 * 1024, 3)
+        assert output == [(0, 3), (3, 6), (6, 9), (9, 10)]
+
+    def test_single(_):
+        assert chunks.blocks(10, 8, 1) == [(0, 10)]
+
+    def test_min_one_row(_):
+        output = chunks.blocks(3, 1024 * 1024 * 1024, 1)
+        assert output == [(0, 1), (1, 2), (2, 3)]
+
+    def test_empty(_):
+        assert chunks.blocks(0, 8, 1) == []
+
+    def test_invalid(_, assert_contains):
+        with pytest.raises(ValueError) as error:
+            chunks.blocks(10, 8, 0)
+        assert_contains(error, "memory")
+
+
+class TestFlush:
+    def test_array(_):
+        chunks.flush(np.empty(3))
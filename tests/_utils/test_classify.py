@@ -1,6 +1,7 @@
-from math import nan
+from math import inf, nan
 
 import numpy as np
+import pytest
 
 from pfdf._utils.classify import classify
 
@@ -26,3 +27,53 @@ class TestClassify:
         output = classify(a, thresholds, nodata=4, nodata_to=-999)
         expected = np.array([1, 1, 1, -999, 2, 2, 2])
         assert np.array_equal(output, expected)
+
+    def test_dtype(_):
+        a = np.array([1, 2, 3, 4, nan])
+        output = classify(a, [2], nodata_to=0)
+        assert output.dtype == np.uint8
+        assert np.array_equal(output, [1, 1, 2, 2, 0])
+
+        output = classify(a, [2], nodata_to=-999)
+        assert output.dtype == np.int16
+        output = classify(a, [2], dtype="float32")
+        assert output.dtype == np.float32
+        assert np.array_equal(output, [1, 1, 2, 2, nan], equal_nan=True)
+
+    def test_out(_):
+        a = np.array([[1, 2, 3], [4, 5, 6]])
+        out = np.zeros((3, 2), "int8").T
+        output = classify(a, [3], nodata=None, out=out)
+        assert output is out
+        assert np.array_equal(out, [[1, 1, 1], [2, 2, 2]])
+
+    def test_integer_nan(_, assert_contains):
+        with pytest.raises(ValueError) as error:
+            classify([1, 2], [1], dtype="uint8")
+        assert_contains(error, "Cannot classify NoData as NaN")
+
+    def test_boolean(_):
+        output = classify(np.array([True, False]), [0.5], nodata=None)
+        assert np.array_equal(output, [2, 1])
+
+    def test_matches_digitize(_):
+        rng = np.random.default_rng(seed=0)
+        a = rng.normal(scale=500, size=(400, 500))
+        a[rng.random(a.shape) < 0.05] = -1
+        a[0, :3] = [-inf, inf, nan]
+        thresholds = [-100, 0, 100]
+
+        bins = [-inf] + thresholds + [inf]
+        expected = np.digitize(a, bins, right=True).astype(float)
+        expected[a == -1] = 0
+        output = classify(a, thresholds, nodata=-1, nodata_to=0)
+        assert np.array_equal(output, expected)
+
+    def test_serial(_):
+        rng = np.random.default_rng(seed=1)
+        a = rng.normal(scale=500, size=(300, 400))
+        a[rng.random(a.shape) < 0.05] = nan
+        thresholds = [-100, 0, 100]
+        expected = classify(a, thresholds, nodata_to=0, dtype="int8")
+        output = classify(a, thresholds, nodata_to=0, dtype="int8", parallel=False)
+        assert np.array_equal(output, expected)
@@ -0,0 +1,71 @@
+from math import sqrt
+
+import numpy as np
+
+from pfdf._utils import d8
+
+
+class TestDerive:
+    def test(_):
+        dem = np.array(
+            [
+                [9, 9, 9, 9, 9],
+                [9, 8, 7, 6, 9],
+                [9, 7, 5, 4, 9],
+                [9, 6, 3, 1, 9],
+                [9, 9, 9, 9, 0],
+            ],
+            dtype=float,
+        )
+        nodata = np.zeros(dem.shape, bool)
+        flow, slopes, relief = d8.derive(dem, nodata, 1.0, 2.0)
+
+        assert flow.dtype == np.int8
+        assert flow[3, 3] == 8
+        assert flow[1, 1] == 8
+        assert flow[2, 2] == 8
+        assert slopes[3, 3] == 1 / sqrt(5)
+        assert flow[0, 0] == 8
+        assert slopes[0, 0] == 0  # Edge cells have no slope
+        assert slopes[1, 1] == 3 / sqrt(5)
+        assert slopes[2, 2] == 4 / sqrt(5)
+        assert flow[4, 4] == 0
+        assert np.isnan(relief[4, 4])
+
+    def test_nodata(_):
+        dem = np.array(
+            [
+                [5, 5, 5, 5],
+                [5, 4, 1, 5],
+                [5, 3, 2, 5],
+                [5, 5, 5, 5],
+            ],
+            dtype=float,
+        )
+        nodata = np.zeros(dem.shape, bool)
+        nodata[1, 2] = True
+        flow, slopes, relief = d8.derive(dem, nodata, 1.0, 1.0)
+        assert flow[1, 2] == 0
+        assert flow[1, 1] == 8
+        assert np.isnan(relief[1, 2])
+        assert slopes[1, 1] == 2 / sqrt(2)
+
+    def test_relief(_):
+        # A single flow path down the middle column
+        dem = np.array(
+            [
+                [9, 9, 9],
+                [9, 7, 9],
+                [9, 4, 9],
+                [9, 2, 9],
+                [9, 0, 9],
+            ],
+            dtype=float,
+        )
+        nodata = np.zeros(dem.shape, bool)
+        nodata[:, [0, 2]] = True
+        nodata[0, :] = True
+        flow, _, relief = d8.derive(dem, nodata, 1.0, 1.0)
+        assert np.array_equal(flow[1:4, 1], [7, 7, 7])
+        assert np.array_equal(relief[1:4, 1], [0, 2, 4])
+        assert np.isnan(relief[4, 1])
@@ -0,0 +1,233 @@
+from math import inf
+
+import numpy as np
+import pytest
+
+from pfdf import watershed
+from pfdf._utils import flood
+from pfdf.raster import Raster
+
+#####
+# Testing utilities
+#####
+
+
+def random_dem(seed, nodata=True):
+    rng = np.random.default_rng(seed)
+    shape = rng.integers(5, 40, size=2)
+    dem = np.round(rng.random(shape) * 20)
+    if nodata:
+        dem[rng.random(shape) < 0.05] = -inf
+    return dem
+
+
+def pysheds_fill(dem):
+    "Fills a DEM with pysheds. Uses a finite NoData value, as for most real DEMs"
+    dem = np.where(dem == -inf, -999, dem)
+    dem = Raster.from_array(dem, nodata=-999)
+    return watershed.condition(dem, fill_pits=False, resolve_flats=False).values
+
+
+def drains(dem):
+    "True if every valid cell that is not next to NoData or an edge has a lower neighbor"
+    outlets = flood._outlets(dem, dem == -inf)
+    nrows, ncols = dem.shape
+    for row in range(nrows):
+        for col in range(ncols):
+            if dem[row, col] == -inf or outlets[row, col]:
+                continue
+            window = dem[
+                max(row - 1, 0) : row + 2,
+                max(col - 1, 0) : col + 2,
+            ]
+            if not np.any((window > -inf) & (window < dem[row, col])):
+                return False
+    return True
+
+
+#####
+# Tests
+#####
+
+
+class TestDrained:
+    def test(_):
+        dem = np.array(
+            [
+                [1, 1, 1, 1, 1, -inf],
+                [1, -inf, 1, 1, -inf, 1],
+                [1, 1, 1, -inf, 1, 1],
+                [1, 1, 1, 1, 1, 1],
+            ]
+        )
+        expected = np.array(
+            [
+                [0, 0, 0, 0, 0, 1],
+                [0, 0, 0, 0, 1, 0],
+                [0, 0, 0, 1, 0, 0],
+                [0, 0, 0, 0, 0, 0],
+            ]
+        ).astype(bool)
+        assert np.array_equal(flood._drained(dem), expected)
+
+
+class TestOutlets:
+    def test(_):
+        dem = np.array(
+            [
+                [1, 1, 1, 1, 1, 1],
+                [1, 1, 1, 1, 1, 1],
+                [1, -inf, 1, 1, 1, -inf],
+                [1, 1, 1, 1, 1, 1],
+                [1, 1, 1, 1, 1, 1],
+            ]
+        )
+        expected = np.array(
+            [
+                [1, 1, 1, 1, 1, 1],
+                [1, 0, 0, 0, 1, 1],
+                [1, 0, 0, 0, 1, 0],
+                [1, 0, 0, 0, 1, 1],
+                [1, 1, 1, 1, 1, 1],
+            ]
+        ).astype(bool)
+        output = flood._outlets(dem, flood._drained(dem))
+        assert np.array_equal(output, expected)
+
+
+class TestEnclose:
+    def test(_):
+        dem = np.ones((4, 4))
+        dem[0, 0] = -inf
+        dem[2, 2] = -inf
+        enclosed = flood._enclose(dem, flood._drained(dem))
+        assert np.array_equal(np.argwhere(enclosed), [[2, 2]])
+        assert dem[0, 0] == -inf
+        assert dem[2, 2] == np.finfo(float).min
+        flood._restore(dem, enclosed)
+        assert dem[2, 2] == -inf
+
+
+class TestFill:
+    def test_depression(_):
+        dem = np.array(
+            [
+                [3, 3, 3, 3],
+                [3, 2, 1, 3],
+                [3, 1, 2, 2.5],
+                [3, 3, 3, 3],
+            ],
+            dtype=float,
+        )
+        expected = np.array(
+            [
+                [3, 3, 3, 3],
+                [3, 2.5, 2.5, 3],
+                [3, 2.5, 2.5, 2.5],
+                [3, 3, 3, 3],
+            ],
+            dtype=float,
+        )
+        flood.fill(dem, False)
+        assert np.array_equal(dem, expected)
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_matches_pysheds(_, seed):
+        dem = random_dem(seed)
+        valid = dem > -inf
+        expected = pysheds_fill(dem)
+        flood.fill(dem, False)
+        assert np.array_equal(dem[valid], expected[valid])
+        assert np.all(dem[~valid] == -inf)
+
+    def test_drains_to_nodata(_):
+        # Cells drain into NoData on the edge of the DEM, including diagonally
+        dem = np.array([[5, 5, 6], [8, 4, 7], [-inf, 6, 9]])
+        expected = dem.copy()
+        flood.fill(dem, False)
+        assert np.array_equal(dem, expected)
+
+    def test_interior_nodata(_):
+        # Enclosed NoData is flooded, so it does not drain the cells around it
+        dem = np.array(
+            [
+                [9, 9, 9, 9, 9],
+                [9, 4, -inf, 3, 9],
+                [9, 6, 2, 6, 9],
+                [9, 9, 5, 9, 9],
+            ],
+            dtype=float,
+        )
+        expected = np.array(
+            [
+                [9, 9, 9, 9, 9],
+                [9, 5, -inf, 5, 9],
+                [9, 6, 5, 6, 9],
+                [9, 9, 5, 9, 9],
+            ],
+            dtype=float,
+        )
+        assert np.array_equal(pysheds_fill(dem)[dem > -inf], expected[dem > -inf])
+        flood.fill(dem, False)
+        assert np.array_equal(dem, expected)
+
+    @pytest.mark.parametrize("seed", range(10))
+    def test_epsilon(_, seed):
+        dem = random_dem(seed)
+        original = dem.copy()
+        filled = dem.copy()
+        flood.fill(filled, False)
+        flood.fill(dem, True)
+        assert np.all(dem >= filled)
+        assert np.allclose(dem, filled, rtol=1e-10)
+        assert np.array_equal(dem == -inf, original == -inf)
+        assert drains(dem)
+
+
+class TestFillTiled:
+    @pytest.mark.parametrize("seed", range(10))
+    @pytest.mark.parametrize("shape", [(1, 1), (2, 3), (7, 5), (100, 100)])
+    def test_matches_untiled(_, seed, shape):
+        dem = random_dem(seed)
+        expected = dem.copy()
+        flood.fill(expected, False)
+        flood.fill_tiled(dem, *shape)
+        assert np.array_equal(dem, expected)
+
+    def test_spill_across_tiles(_):
+        # Depression in the left tile only drains through the right tile
+        dem = np.array(
+            [
+                [9, 9, 9, 9, 9, 9],
+                [9, 1, 1, 5, 4, 9],
+                [9, 1, 1, 9, 3, 9],
+                [9, 9, 9, 9, 2, 9],
+            ],
+            dtype=float,
+        )
+        expected = dem.copy()
+        expected[1:3, 1:3] = 5
+        flood.fill_tiled(dem, 4, 3)
+        assert np.array_equal(dem, expected)
+
+    @pytest.mark.parametrize("shape", [(4, 4), (2, 3), (9, 9)])
+    def test_isolated_patch(_, shape):
+        # Valid cells surrounded by enclosed NoData fill to the NoData's spill level
+        dem = np.full((9, 9), 5.0)
+        dem[1:8, 1:8] = -inf
+        dem[3:6, 3:6] = [[3, 3, 3], [3, 1, 3], [3, 3, 3]]
+        expected = dem.copy()
+        flood.fill(expected, False)
+        flood.fill_tiled(dem, *shape)
+        assert np.array_equal(dem, expected)
+        assert np.all(dem[3:6, 3:6] == 5)
+        assert np.all(dem[1:3, 1:8] == -inf)
+
+    @pytest.mark.parametrize("shape", [(2, 3), (7, 5)])
+    def test_matches_pysheds(_, shape):
+        dem = random_dem(3)
+        dem[np.random.default_rng(3).random(dem.shape) < 0.2] = -inf
+        valid = dem > -inf
+        expected = pysheds_fill(dem)
+        flood.fill_tiled(dem, *shape)
+        assert np.array_equal(dem[valid], expected[valid])
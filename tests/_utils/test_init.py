@@ -1,7 +1,22 @@
 import numpy as np
 import pytest
-
-from pfdf._utils import all_nones, aslist, astuple, clean_dims, limits, no_nones, real
+import rasterio.transform
+from affine import Affine
+
+from pfdf._utils import (
+    all_nones,
+    aslist,
+    astuple,
+    clean_dims,
+    limits,
+    no_nones,
+    pixel_limits,
+    pixel_windows,
+    pixels,
+    real,
+    rowcol,
+)
+from pfdf.projection import BoundingBox
 
 #####
 # Misc
@@ -82,3 +97,78 @@ class TestLimits:
         assert limits(5, 15, 10) == (5, 10)
         assert limits(5, 8, 10) == (5, 8)
         assert limits(-2, 15, 10) == (0, 10)
+
+
+#####
+# Pixel indices
+#####
+
+
+@pytest.fixture
+def affine():
+    return Affine(10, 0, 100, 0, -10, 500)
+
+
+class TestPixels:
+    def test(_, affine):
+        rows, cols = pixels(affine, [100, 119.9, 155, 99], [500, 490, 421, 501])
+        assert np.array_equal(rows, [0, 1, 7, -1])
+        assert np.array_equal(cols, [0, 1, 5, -1])
+
+    def test_round(_, affine):
+        rows, cols = pixels(affine, [104, 106, 115], [495, 494, 485], op=np.round)
+        assert np.array_equal(rows, [0, 1, 2])
+        assert np.array_equal(cols, [0, 1, 2])
+
+    def test_matches_rasterio(_, affine):
+        rng = np.random.default_rng(0)
+        xs = rng.uniform(-1000, 1000, 500)
+        ys = rng.uniform(-1000, 1000, 500)
+        rows, cols = pixels(affine, xs, ys)
+        expected = rasterio.transform.rowcol(affine, xs, ys)
+        assert np.array_equal(rows, expected[0])
+        assert np.array_equal(cols, expected[1])
+
+    def test_matrix(_, affine):
+        xs = np.array([[100, 155], [119.9, 99]])
+        ys = np.array([[500, 421], [490, 501]])
+        rows, cols = pixels(affine, xs, ys)
+        assert np.array_equal(rows, [[0, 7], [1, -1]])
+        assert np.array_equal(cols, [[0, 5], [1, -1]])
+
+
+class TestRowcol:
+    def test_vector(_, affine):
+        output = rowcol(affine, [100, 155], [500, 421])
+        assert output == ([0, 7], [0, 5])
+        assert isinstance(output[0][0], int)
+
+    def test_scalar(_, affine):
+        row, col = rowcol(affine, 155, 421)
+        assert row == 7
+        assert col == 5
+        assert isinstance(row, int)
+
+
+class TestPixelWindows:
+    def test(_, affine):
+        rows, cols = pixel_windows(
+            affine, [100, 120], [400, 451], [150, 200], [500, 480]
+        )
+        assert np.array_equal(rows, [[0, 10], [2, 5]])
+        assert np.array_equal(cols, [[0, 5], [2, 10]])
+
+    def test_scalar(_, affine):
+        rows, cols = pixel_windows(affine, 100, 400, 150, 500)
+        assert np.array_equal(rows, [[0, 10]])
+        assert np.array_equal(cols, [[0, 5]])
+
+
+class TestPixelLimits:
+    def test(_, affine):
+        bounds = BoundingBox(120, 451, 200, 480)
+        assert pixel_limits(affine, bounds) == ((2, 5), (2, 10))
+
+    def test_inverted(_, affine):
+        bounds = BoundingBox(200, 480, 120, 451)
+        assert pixel_limits(affine, bounds) == ((2, 5), (2, 10))
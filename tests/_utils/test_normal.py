@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from pfdf._utils.normal import quantile
+
+
+class TestQuantile:
+    @pytest.mark.parametrize(
+        "q, expected",
+        (
+            (0.5, 0),
+            (0.975, 1.959963984540054),
+            (0.025, -1.959963984540054),
+            (0.95, 1.6448536269514722),
+            (0.01, -2.3263478740408408),
+            (1e-10, -6.361340902404056),
+        ),
+    )
+    def test_values(_, q, expected):
+        assert np.allclose(quantile(q), expected, rtol=1e-14, atol=1e-14)
+
+    def test_matches_scipy(_):
+        norm = pytest.importorskip("scipy.stats").norm
+        q = np.linspace(1e-6, 1 - 1e-6, 10001)
+        assert np.allclose(quantile(q), norm.ppf(q), rtol=1e-13, atol=1e-13)
+
+    def test_symmetric(_):
+        q = np.array([2**-30, 2**-8, 0.125, 0.375])
+        assert np.array_equal(quantile(q), -quantile(1 - q))
+
+    def test_limits(_):
+        output = quantile([0, 1, np.nan])
+        assert np.array_equal(output, [-np.inf, np.inf, np.nan], equal_nan=True)
+
+    def test_shape(_):
+        assert quantile(0.5).shape == ()
+        assert quantile(np.full((2, 3), 0.9)).shape == (2, 3)
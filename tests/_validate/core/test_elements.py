@@ -2,7 +2,6 @@ import numpy as np
 import pytest
 
 import pfdf._validate.core._elements as validate
-from pfdf._utils.nodata import NodataMask
 
 #####
 # Fixtures
@@ -24,105 +23,118 @@ def mask():
 #####
 
 
-class TestGetData:
-    def test_none(_, array):
-        output, mask = validate._get_data(array, None)
-        assert np.array_equal(output, array)
-        assert isinstance(mask, NodataMask)
-        assert mask.mask is None
-        assert mask.size == array.size
-
-    def test_nodata(_, array):
-        output, mask = validate._get_data(array, 10)
-        expected_mask = array != 10
-        expected = array[expected_mask]
-        assert np.array_equal(output, expected)
-        assert isinstance(mask, NodataMask)
-        assert np.array_equal(mask.mask, expected_mask)
-        assert mask.size == array.size
-
-    def test_multiple_nodata(_, array):
-        output, mask = validate._get_data(array, [None, 10, 11, np.nan])
-        expected_mask = ~np.isin(array, [10, 11])
-        expected = array[expected_mask]
-        assert np.array_equal(output, expected)
-        assert isinstance(mask, NodataMask)
-        assert np.array_equal(mask.mask, expected_mask)
-        assert mask.size == array.size
-
-
-class TestCheckIntegers:
+class TestScan:
     def test_pass(_, array):
-        array = array.astype(float)
-        data, mask = validate._get_data(array, 10)
-        validate._check_integers(data, "", array, mask)
+        failures = validate._scan(
+            array.astype(float), lower=1, upper=50, integers=True, defined=True
+        )
+        assert np.array_equal(failures, [-1] * 6)
 
-    def test_fail(_, array, assert_contains):
+    def test_first_failures(_, array):
         array = array.astype(float)
-        array[0, 1] = 5.5
-        data, mask = validate._get_data(array, 1)
-        print(data)
-        with pytest.raises(ValueError) as error:
-            validate._check_integers(data, "test name", array, mask)
-        assert_contains(error, "test name", "element [0, 1] (value=5.5)")
-
-
-class TestCheckBound:
-    def test_pass(_, array):
-        data, mask = validate._get_data(array, 10)
-        min = np.amin(array)
-        max = np.amax(array)
-        validate._check_bound(data, "", "<", max + 1, array, mask)
-        validate._check_bound(data, "", "<=", max, array, mask)
-        validate._check_bound(data, "", ">=", min, array, mask)
-        validate._check_bound(data, "", ">", min - 1, array, mask)
-
-    def test_fail(_, array, assert_contains):
-        data, mask = validate._get_data(array, 10)
-        min = np.amin(array)
-        max = np.amax(array)
-        name = "test name"
-
-        with pytest.raises(ValueError) as error:
-            validate._check_bound(data, name, "<", max, array, mask)
-        assert_contains(error, name, "less than", f"value={max}")
-
-        with pytest.raises(ValueError) as error:
-            validate._check_bound(data, name, "<=", max - 1, array, mask)
-        assert_contains(error, name, "less than or equal to", f"value={max}")
+        array[1, 0] = 100
+        array[2, 2] = 0.5
+        failures = validate._scan(array, lower=1, upper=50, integers=True)
+        assert np.array_equal(failures, [12, 5, 12, -1, -1, -1])
 
-        with pytest.raises(ValueError) as error:
-            validate._check_bound(data, name, ">=", min + 1, array, mask)
-        assert_contains(error, name, "greater than or equal to", f"value={min}")
-
-        with pytest.raises(ValueError) as error:
-            validate._check_bound(data, name, ">", min, array, mask)
-        assert_contains(error, name, "greater than", f"value={min}")
+    def test_stops_early(_, array):
+        array = array.astype(float)
+        array[1, 0] = 0
+        array[2, 2] = 100
+        failures = validate._scan(array, lower=1, upper=50)
+        assert np.array_equal(failures, [5, -1, -1, -1, -1, -1])
+
+    def test_exclusive(_, array):
+        failures = validate._scan(array, lower=1, exclusive=True)
+        assert failures[validate._LOWER] == 0
+
+    def test_nan(_):
+        array = np.array([1, np.nan, np.inf])
+        failures = validate._scan(array, lower=0, integers=True, defined=True)
+        assert np.array_equal(failures, [1, -1, 1, -1, 1, -1])
+        failures = validate._scan(array, finite=True)
+        assert failures[validate._FINITE] == 1
+
+    def test_ignore(_, array):
+        failures = validate._scan(array, [None, 10, 11, np.nan], upper=9)
+        assert failures[validate._UPPER] == 11
+
+    def test_ignore_nan(_):
+        array = np.array([1, np.nan, 2, 5])
+        failures = validate._scan(array, np.nan, upper=2)
+        assert failures[validate._UPPER] == 3
+
+    def test_no_checks(_, array):
+        failures = validate._scan(array, 10)
+        assert np.array_equal(failures, [-1] * 6)
+
+    def test_output(_):
+        array = np.array([1, 0, -999, 1])
+        output = np.empty(4, bool)
+        validate._scan(array, -999, binary=True, output=output)
+        assert np.array_equal(output, [True, False, False, True])
+
+
+class TestValues:
+    def test_native(_, array):
+        output = validate._values(array)
+        assert output.dtype == array.dtype
+        assert np.array_equal(output, array.reshape(-1))
+
+    def test_bool(_, mask):
+        output = validate._values(mask)
+        assert output.dtype == np.uint8
+        assert np.array_equal(output, mask.reshape(-1))
+
+    def test_object(_):
+        array = np.array([1, np.inf], dtype=object)
+        output = validate._values(array)
+        assert output.dtype == float
+
+
+class TestIgnored:
+    def test_none(_):
+        output, skipnan = validate._ignored(None, np.dtype(int))
+        assert output.size == 0
+        assert skipnan == False
+
+    def test_values(_):
+        output, skipnan = validate._ignored([None, 10, 2.5, np.nan], np.dtype(float))
+        assert np.array_equal(output, [10, 2.5])
+        assert skipnan == True
+
+    def test_unrepresentable(_):
+        output, skipnan = validate._ignored([300, 2.5, -1, 7], np.dtype("uint8"))
+        assert np.array_equal(output, [7])
+        assert output.dtype == np.uint8
+        assert skipnan == False
+
+    def test_large_integer(_):
+        nodata = np.iinfo("uint64").max
+        output, _ = validate._ignored(nodata, np.dtype("uint64"))
+        assert output[0] == nodata
 
 
 class TestCheck:
     def test_passed(_, araster):
-        data, mask = validate._get_data(araster, 4)
-        passed = np.full(data.shape, True)
-        validate._check(passed, "", araster, "", mask)
+        failures = np.full(6, -1)
+        validate._check(failures, validate._BINARY, "", araster, "")
 
     def test_failed(_, araster, assert_contains):
-        data, mask = validate._get_data(araster, 4)
-        passed = np.full(data.shape, True)
-        passed[-1] = False
+        failures = np.full(6, -1)
+        failures[validate._BINARY] = 7
         with pytest.raises(ValueError) as error:
-            validate._check(passed, "test description", araster, "test name", mask)
+            validate._check(
+                failures, validate._BINARY, "test description", araster, "test name"
+            )
         assert_contains(
             error, "test description", "test name", "element [1, 3] (value=8.0)"
         )
 
 
-class TestFirstFailure:
+class TestFailure:
     def test(_, araster):
-        data, mask = validate._get_data(araster, 4)
-        passed = np.full(data.shape, True)
-        passed[-1] = False
-        index, value = validate._first_failure(passed, araster, mask)
+        index, value = validate._failure(araster, 7)
         assert np.array_equal(index, [1, 3])
         assert value == "8.0"
 
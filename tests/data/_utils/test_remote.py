@@ -0,0 +1,109 @@
+import logging
+
+import numpy as np
+import pytest
+import rasterio
+from rasterio.windows import Window
+
+from pfdf.data._utils import remote
+
+
+@pytest.fixture
+def cog(range_server):
+    "Writes a tiled GeoTIFF to the served folder. Returns its URL and size"
+    url, folder, _ = range_server
+    path = folder / "tiled.tif"
+    values = np.arange(1024 * 1024, dtype="float32").reshape(1024, 1024)
+    with rasterio.open(
+        path,
+        "w",
+        driver="GTiff",
+        width=1024,
+        height=1024,
+        count=1,
+        dtype="float32",
+        tiled=True,
+        blockxsize=256,
+        blockysize=256,
+        crs="EPSG:5069",
+        transform=rasterio.transform.from_origin(0, 1024, 1, 1),
+    ) as file:
+        file.write(values, 1)
+    return f"{url}/tiled.tif", path.stat().st_size, values
+
+
+class TestOptions:
+    def test(_):
+        output = remote.options(64)
+        assert output["GDAL_HTTP_MERGE_CONSECUTIVE_RANGES"] == "YES"
+        assert output["GDAL_HTTP_MULTIPLEX"] == "YES"
+        assert output["GDAL_HTTP_VERSION"] == "2TLS"
+        assert output["GDAL_DISABLE_READDIR_ON_OPEN"] == "EMPTY_DIR"
+        assert output["GDAL_CACHEMAX"] == 64
+        assert output["CPL_VSIL_CURL_CACHE_SIZE"] == 64 * 1024 * 1024
+        assert output["VSI_CACHE_SIZE"] == 64 * 1024 * 1024
+
+    def test_small_cache(_):
+        output = remote.options(0.5)
+        assert output["GDAL_CACHEMAX"] == 1
+        assert output["CPL_VSIL_CURL_CACHE_SIZE"] == 512 * 1024
+
+
+class TestRanges:
+    def test_single(_):
+        message = (
+            "CPLE_None in VSICURL: Downloading 0-16383 (http://127.0.0.1:8000/a.tif)..."
+        )
+        assert remote._ranges(message) == [(0, 16383)]
+
+    def test_multiple(_):
+        message = "VSICURL: Downloading 10-19,100-199..."
+        assert remote._ranges(message) == [(10, 19), (100, 199)]
+
+    def test_not_download(_):
+        assert remote._ranges("VSICURL: Download completed") == []
+        assert remote._ranges("GDAL: GDALOpen(a.tif) succeeds as GTiff.") == []
+
+    def test_not_range(_):
+        assert remote._ranges("Downloading http://example.com/a.tif") == []
+
+
+class TestByteCounter:
+    def test(_):
+        counter = remote._ByteCounter()
+        logger = logging.getLogger("test_remote")
+        logger.setLevel(logging.DEBUG)
+        logger.addHandler(counter)
+        try:
+            logger.debug("VSICURL: Downloading 0-99 (http://a.tif)...")
+            logger.debug("VSICURL: Download completed")
+            logger.debug("VSICURL: Downloading 200-299,400-449 ...")
+        finally:
+            logger.removeHandler(counter)
+        assert counter.nbytes == 250
+        assert counter.nrequests == 3
+
+
+class TestEnv:
+    def test_no_count(_):
+        with remote.env(64, count=False) as counter:
+            assert counter is None
+            options = rasterio.env.getenv()
+            assert options["GDAL_HTTP_MERGE_CONSECUTIVE_RANGES"] == "YES"
+            assert "CPL_DEBUG" not in options
+
+    def test_count(_, cog, range_server):
+        url, size, values = cog
+        _, _, sent = range_server
+        logger = logging.getLogger("rasterio")
+        level = logger.level
+
+        with remote.env(64, count=True) as counter:
+            with rasterio.open(url) as file:
+                output = file.read(1, window=Window(300, 300, 100, 100))
+
+        assert np.array_equal(output, values[300:400, 300:400])
+        assert counter.nbytes == sent["nbytes"]
+        assert 0 < counter.nbytes < size / 4
+        assert counter not in logger.handlers
+        assert logger.level == level
@@ -1,4 +1,6 @@
 import json
+from io import BytesIO
+from time import monotonic
 from unittest.mock import patch
 
 import pytest
@@ -205,6 +207,61 @@ class TestDownload:
 #####
 
 
+class TestThrottle:
+    def test_no_rate(_):
+        throttle = _requests._Throttle(None)
+        assert throttle.interval == 0
+        start = monotonic()
+        for _ in range(100):
+            throttle.wait()
+        assert monotonic() - start < 0.1
+
+    def test_rate(_):
+        throttle = _requests._Throttle(50)
+        assert throttle.interval == 1 / 50
+        start = monotonic()
+        for _ in range(6):
+            throttle.wait()
+        assert monotonic() - start >= 5 / 50
+
+
+class TestContents:
+    @staticmethod
+    def get(url, params, timeout):
+        response = Response()
+        response.status_code = 200
+        response.raw = BytesIO(str(params["value"]).encode())
+        return response
+
+    @patch("requests.get", spec=True)
+    def test_serial(self, mock, args):
+        mock.side_effect = self.get
+        url, _, timeout, servers, outages = args
+        params = [{"value": k} for k in range(5)]
+        output = _requests.contents(url, params, timeout, servers, outages)
+        assert output == [b"0", b"1", b"2", b"3", b"4"]
+        assert mock.call_count == 5
+
+    @patch("requests.get", spec=True)
+    def test_concurrent(self, mock, args):
+        mock.side_effect = self.get
+        url, _, timeout, servers, outages = args
+        params = [{"value": k} for k in range(20)]
+        output = _requests.contents(
+            url, params, timeout, servers, outages, workers=4, rate=1000
+        )
+        assert output == [str(k).encode() for k in range(20)]
+        assert mock.call_count == 20
+
+    @patch("requests.get", spec=True)
+    def test_http_error(_, mock, response, args, assert_contains):
+        mock.return_value = response(404)
+        url, _, timeout, servers, outages = args
+        with pytest.raises(HTTPError) as error:
+            _requests.contents(url, [{}, {}], timeout, servers, outages, workers=2)
+        assert_contains(error, "There was a problem connecting with the TNM server")
+
+
 @pytest.mark.web(api="tnm")
 class TestLive:
     @staticmethod
@@ -1,7 +1,10 @@
 import json
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from io import BytesIO
 from pathlib import Path
-from typing import Callable
+from threading import Thread
+from typing import Callable, Iterator
 from zipfile import ZipFile
 
 import pytest
@@ -66,3 +69,50 @@ def zip_response(zip_bytes, response) -> Callable:
         return response(200, content)
 
     return zip_response
+
+
+@pytest.fixture
+def range_server(tmp_path) -> Iterator[tuple[str, Path, dict]]:
+    """Serves tmp_path from a local HTTP server that supports range requests. Yields
+    the base URL, the served folder, and a dict recording the number of bytes sent"""
+
+    sent = {"nbytes": 0}
+
+    class Handler(SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_HEAD(self):
+            size = Path(self.translate_path(self.path)).stat().st_size
+            self.send_response(200)
+            self.send_header("Content-Length", str(size))
+            self.send_header("Accept-Ranges", "bytes")
+            self.end_headers()
+
+        def do_GET(self):
+            data = Path(self.translate_path(self.path)).read_bytes()
+            span = self.headers.get("Range")
+            if span is None:
+                self.send_response(200)
+                start, stop = 0, len(data) - 1
+            else:
+                start, stop = span.split("=")[1].split(",")[0].split("-")
+                start, stop = int(start), min(int(stop), len(data) - 1)
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{stop}/{len(data)}")
+            content = data[start : stop + 1]
+            self.send_header("Content-Length", str(len(content)))
+            self.send_header("Accept-Ranges", "bytes")
+            self.end_headers()
+            sent["nbytes"] += len(content)
+            self.wfile.write(content)
+
+    handler = partial(Handler, directory=str(tmp_path))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}", tmp_path, sent
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -1,8 +1,13 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
 from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
 
+import numpy as np
 import pytest
 
 from pfdf.data.noaa import atlas14
+from pfdf.errors import DataAPIError, ShapeError
 
 
 @pytest.fixture
@@ -10,6 +15,55 @@ def response(response):
     return response(200, b"Here is some content")
 
 
+def pfe_csv(lat, lon):
+    "Returns a mock PFE csv response whose values encode the query coordinate"
+    return (
+        "Point precipitation frequency estimates (millimeters/hour)\n"
+        "NOAA Atlas 14 Volume 8 Version 2\n"
+        f"Latitude: {lat} Degree\n"
+        f"Longitude: {lon} Degree\n"
+        "\n"
+        "\n"
+        "PRECIPITATION FREQUENCY ESTIMATES\n"
+        "by duration for ARI (years):, 1,2\n"
+        f"5-min:, {lat},{lon}\n"
+        "15-min:, 3,4\n"
+        "\n"
+        "Date/time (GMT):  Mon Jan 1 00:00:00 2024\n"
+    )
+
+
+@pytest.fixture
+def server(monkeypatch):
+    "Runs a mock Atlas 14 server. Yields a list that records the query parameters"
+
+    queries = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query)
+            query = {key: value[0] for key, value in query.items()}
+            queries.append(query)
+            content = pfe_csv(query["lat"], query["lon"]).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    monkeypatch.setattr(atlas14, "base_url", lambda: url)
+    try:
+        yield queries
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
 class TestBaseUrl:
     def test(_):
         assert atlas14.base_url() == "https://hdsc.nws.noaa.gov/cgi-bin/hdsc/new"
@@ -186,6 +240,150 @@ class TestDownload:
         )
 
 
+class TestCells:
+    def test_deduplicate(_):
+        lats = np.array([39.0001, 40.5, 39.0002, 39.0001])
+        lons = np.array([-105.0001, -105, -105.0002, -104.5])
+        first, cells = atlas14._cells(lats, lons, True)
+        assert np.array_equal(first, [0, 3, 1])
+        assert np.array_equal(cells, [0, 2, 0, 1])
+
+    def test_unique_coordinates(_):
+        lats = np.array([39.0001, 40.5, 39.0002, 39.0001])
+        lons = np.array([-105.0001, -105, -105.0002, -105.0001])
+        first, cells = atlas14._cells(lats, lons, False)
+        assert np.array_equal(first, [0, 2, 1])
+        assert np.array_equal(cells, [0, 2, 1, 0])
+
+
+class TestParse:
+    def test_single(_):
+        output = atlas14._parse(pfe_csv(39, -105), "upper")
+        assert output.columns.tolist() == ["statistic", "duration", "interval", "value"]
+        assert output["statistic"].tolist() == ["upper"] * 4
+        assert output["duration"].tolist() == ["5-min", "5-min", "15-min", "15-min"]
+        assert output["interval"].tolist() == [1, 2, 1, 2]
+        assert output["interval"].dtype == int
+        assert output["value"].tolist() == [39, -105, 3, 4]
+
+    def test_all(_):
+        text = (
+            "PRECIPITATION FREQUENCY ESTIMATES\n"
+            "by duration for ARI (years):, 1,2\n"
+            "5-min:, 10,20\n"
+            "\n"
+            "UPPER BOUND OF 90% CONFIDENCE INTERVAL\n"
+            "by duration for ARI (years):, 1,2\n"
+            "5-min:, 11,21\n"
+            "\n"
+            "LOWER BOUND OF 90% CONFIDENCE INTERVAL\n"
+            "by duration for ARI (years):, 1,2\n"
+            "5-min:, 9,19\n"
+        )
+        output = atlas14._parse(text, "all")
+        assert (
+            output["statistic"].tolist() == ["mean"] * 2 + ["upper"] * 2 + ["lower"] * 2
+        )
+        assert output["value"].tolist() == [10, 20, 11, 21, 9, 19]
+
+    def test_no_pfes(_, assert_contains):
+        with pytest.raises(DataAPIError) as error:
+            atlas14._parse("Error: point is outside the project area\n", "mean")
+        assert_contains(error, "did not contain any precipitation frequency estimates")
+
+
+class TestRead:
+    def test(_, server):
+        lats = [39.0001, 40.5, 39.0002]
+        lons = [-105.0001, -105, -105.0002]
+        output = atlas14.read(lats, lons, deduplicate=True, workers=2, rate=None)
+
+        assert len(server) == 2
+        assert output.columns.tolist() == [
+            "point",
+            "lat",
+            "lon",
+            "statistic",
+            "duration",
+            "interval",
+            "value",
+        ]
+        assert output["point"].tolist() == [0] * 4 + [1] * 4 + [2] * 4
+        assert output["lat"].tolist() == [39.0001] * 4 + [40.5] * 4 + [39.0002] * 4
+
+        # Points in the same cell share the PFEs of the first point in the cell
+        five = output[output["duration"] == "5-min"]
+        assert five["value"].tolist() == [
+            39.0001,
+            -105.0001,
+            40.5,
+            -105,
+            39.0001,
+            -105.0001,
+        ]
+
+    def test_unique_coordinates(_, server):
+        lats = [39.0001, 40.5, 39.0002, 39.0001]
+        lons = [-105.0001, -105, -105.0002, -105.0001]
+        output = atlas14.read(lats, lons, workers=2, rate=None)
+        assert len(server) == 3
+        five = output[output["duration"] == "5-min"]
+        assert five["value"].tolist() == [
+            39.0001,
+            -105.0001,
+            40.5,
+            -105,
+            39.0002,
+            -105.0002,
+            39.0001,
+            -105.0001,
+        ]
+
+    def test_options(_, server):
+        atlas14.read(
+            [39],
+            [-105],
+            statistic="upper",
+            data="depth",
+            series="ams",
+            units="english",
+        )
+        assert server == [
+            {
+                "lat": "39.0",
+                "lon": "-105.0",
+                "data": "depth",
+                "series": "ams",
+                "units": "english",
+            }
+        ]
+
+    def test_invalid_lons_length(_, assert_contains):
+        with pytest.raises(ShapeError) as error:
+            atlas14.read([39, 40], [-105])
+        assert_contains(error, "lons must have 2 element(s)")
+
+    def test_invalid_lat(_, assert_contains):
+        with pytest.raises(ValueError) as error:
+            atlas14.read([39, 100], [-105, -105])
+        assert_contains(error, "lats must be less than or equal to 90")
+
+    def test_invalid_workers(_, assert_contains):
+        with pytest.raises(ValueError) as error:
+            atlas14.read([39], [-105], workers=1.5)
+        assert_contains(error, "workers must be integers")
+
+    def test_invalid_rate(_, assert_contains):
+        with pytest.raises(ValueError) as error:
+            atlas14.read([39], [-105], rate=0)
+        assert_contains(error, "rate must be greater than 0")
+
+    def test_invalid_deduplicate(_, assert_contains):
+        with pytest.raises(TypeError) as error:
+            atlas14.read([39], [-105], deduplicate=1)
+        assert_contains(error, "deduplicate must be a bool")
+
+
 @pytest.mark.web(api="atlas14")
 class TestLive:
     def test(_, tmp_path):
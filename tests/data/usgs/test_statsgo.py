@@ -2,6 +2,7 @@ from unittest.mock import patch
 
 import numpy as np
 import pytest
+import rasterio
 from pandas import DataFrame
 
 from pfdf.data.usgs import statsgo
@@ -273,6 +274,47 @@ class TestRead:
             statsgo.read("thick", bounds=[1, 2, 3, 4])
         assert_contains(error, "bounds must have a CRS")
 
+    def test_invalid_cache(_, assert_contains):
+        with pytest.raises(ValueError) as error:
+            statsgo.read("thick", bounds=[1, 2, 3, 4, 5069], cache=0)
+        assert_contains(error, "cache must be greater than 0")
+
+    @patch("requests.get", spec=True)
+    def test_windowed(_, get_mock, json_response, item, range_server):
+        # Serve a tiled dataset from a local range-capable server
+        url, folder, sent = range_server
+        values = np.arange(2048 * 2048, dtype="float32").reshape(2048, 2048)
+        raster = Raster.from_array(
+            values, crs=5069, transform=(30, -30, -844800, 1154790), nodata=-1
+        )
+        path = folder / "STATSGO-THICK.tif"
+        with rasterio.open(
+            path,
+            "w",
+            driver="GTiff",
+            width=2048,
+            height=2048,
+            count=1,
+            dtype="float32",
+            nodata=-1,
+            tiled=True,
+            blockxsize=256,
+            blockysize=256,
+            crs=raster.crs,
+            transform=raster.affine,
+        ) as file:
+            file.write(values, 1)
+
+        # Point the catalog item at the local server
+        item["files"][1]["publishedS3Uri"] = f"{url}/STATSGO-THICK.tif"
+        get_mock.return_value = json_response(item)
+
+        bounds = raster[1000:1100, 1000:1100].bounds
+        output, nbytes = statsgo.read("thick", bounds, return_nbytes=True)
+        assert np.array_equal(output.values, values[1000:1100, 1000:1100])
+        assert nbytes == sent["nbytes"]
+        assert 0 < nbytes < path.stat().st_size / 10
+
 
 @pytest.mark.web
 class TestLive:
@@ -5,7 +5,7 @@ test_cannon2010  Unit tests for the cannon2010 module
 import numpy as np
 import pytest
 
-from pfdf.errors import DimensionError
+from pfdf.errors import DimensionError, ShapeError
 from pfdf.models import cannon2010 as c10
 
 #####
@@ -282,3 +282,28 @@ class TestHazard:
         with pytest.raises(ValueError) as error:
             c10.hazard(p, v)
         assert_contains(error, "likelihoods", "volumes", "broadcast")
+
+    def test_float32(_):
+        p = [0.1, 0.3, 0.7, 1]
+        v = [np.nan, 0, 2e3, 2e5]
+        output = c10.hazard(p, v, dtype="float32")
+        assert output.dtype == "float32"
+        assert np.array_equal(output, c10.hazard(p, v), equal_nan=True)
+
+    def test_out(_):
+        p = np.arange(0, 1.1, 0.1).reshape(-1, 1)
+        v = np.array([10e0, 10e2, 10e3, 10e5]).reshape(1, -1)
+        out = np.empty((11, 4), "float32")
+        output = c10.hazard(p, v, out=out)
+        assert output is out
+        assert np.array_equal(out, c10.hazard(p, v))
+
+    def test_invalid_out(_, assert_contains):
+        with pytest.raises(ShapeError) as error:
+            c10.hazard([0.1, 0.3], [10, 20], out=np.empty(3))
+        assert_contains(error, "out must have shape (2,)")
+
+    def test_invalid_dtype(_, assert_contains):
+        with pytest.raises(ValueError) as error:
+            c10.hazard([0.1, 0.3], [10, 20], dtype=int)
+        assert_contains(error, "dtype must be float32 or float64")
@@ -0,0 +1,199 @@
+"""
+test_ensemble  Unit tests for the ensemble module
+"""
+
+import numpy as np
+import pytest
+
+from pfdf.errors import ShapeError
+from pfdf.models import ensemble, gartner2014, staley2017
+
+#####
+# Summary
+#####
+
+
+@pytest.fixture
+def samples():
+    rng = np.random.default_rng(seed=7)
+    return rng.lognormal(mean=1, sigma=0.5, size=(4000, 3, 2))
+
+
+class TestSummary:
+    def test_empty(_):
+        summary = ensemble.Summary((3, 2))
+        assert summary.shape == (3, 2)
+        assert np.array_equal(summary.probabilities, [0.05, 0.5, 0.95])
+        assert np.array_equal(summary.count, np.zeros((3, 2)))
+        assert np.isnan(summary.mean).all()
+        assert summary.quantiles.shape == (3, 2, 3)
+        assert np.isnan(summary.quantiles).all()
+
+    def test_moments(_, samples):
+        summary = ensemble.Summary((3, 2))
+        for batch in np.split(samples, 8):
+            summary.update(batch)
+        assert np.array_equal(summary.count, np.full((3, 2), 4000))
+        assert np.allclose(summary.mean, samples.mean(axis=0))
+        assert np.allclose(summary.variance, samples.var(axis=0, ddof=1))
+        assert np.allclose(summary.std, samples.std(axis=0, ddof=1))
+
+    def test_quantiles(_, samples):
+        summary = ensemble.Summary((3, 2), probabilities=[0.1, 0.5, 0.9])
+        for batch in np.split(samples, 8):
+            summary.update(batch)
+        expected = np.moveaxis(np.quantile(samples, [0.1, 0.5, 0.9], axis=0), 0, -1)
+        assert np.allclose(summary.quantiles, expected, rtol=0.05)
+
+    def test_few_samples(_):
+        samples = np.array([3, 1, 2, 4]).reshape(4, 1)
+        summary = ensemble.Summary((1,), probabilities=[0.5])
+        summary.update(samples)
+        assert summary.quantiles[0, 0] == 2.5
+
+    def test_nan(_):
+        samples = np.array([[1, np.nan], [2, 5], [3, np.nan]])
+        summary = ensemble.Summary((2,))
+        summary.update(samples)
+        assert np.array_equal(summary.count, [3, 1])
+        assert np.array_equal(summary.mean, [2, 5])
+
+    def test_nan_quantiles(_, samples):
+        samples = samples[:, 0, :].copy()
+        samples[::3, 1] = np.nan
+        summary = ensemble.Summary((2,))
+        summary.update(samples)
+        assert summary._desired.shape == (3, 5)
+
+        for k in range(2):
+            valid = samples[~np.isnan(samples[:, k]), k]
+            expected = ensemble.Summary((1,))
+            expected.update(valid.reshape(-1, 1))
+            assert np.array_equal(summary.quantiles[k], expected.quantiles[0])
+
+    def test_invalid_shape(_, assert_contains):
+        summary = ensemble.Summary((3, 2))
+        with pytest.raises(ShapeError) as error:
+            summary.update(np.zeros((5, 2, 3)))
+        assert_contains(error, "samples must have shape (Samples x (3, 2))")
+
+    @pytest.mark.parametrize("probabilities", ([0, 0.5], [0.5, 1]))
+    def test_invalid_probabilities(_, probabilities, assert_contains):
+        with pytest.raises(ValueError) as error:
+            ensemble.Summary((3,), probabilities)
+        assert_contains(error, "probabilities cannot include 0 or 1")
+
+
+#####
+# User Functions
+#####
+
+
+@pytest.fixture
+def staley():
+    return dict(
+        R=[6, 12],
+        T=[0.1, 0.2, 0.3],
+        F=[0.4, 0.5, 0.6],
+        S=[0.2, 0.1, 0.3],
+    )
+
+
+class TestLikelihood:
+    def test_shape(_, staley):
+        output = ensemble.likelihood(staley2017.M1, **staley, sd=0.1, nsamples=50)
+        assert output.shape == (3, 2, 3)
+        assert np.array_equal(output.count, np.full((3, 2, 3), 50))
+
+    def test_no_perturbation(_, staley):
+        output = ensemble.likelihood(
+            staley2017.M1, **staley, sd=0, durations=[15], nsamples=10, batch=3
+        )
+        B, Ct, Cf, Cs = staley2017.M1.parameters(durations=[15])
+        expected = staley2017.likelihood(
+            staley["R"], B, Ct, staley["T"], Cf, staley["F"], Cs, staley["S"]
+        )
+        assert np.allclose(output.mean, expected.reshape(3, 2, 1))
+        assert np.allclose(output.variance, 0)
+
+    def test_seed(_, staley):
+        kwargs = dict(sd=0.2, nsamples=30, batch=7, seed=5)
+        output1 = ensemble.likelihood(staley2017.M2, **staley, **kwargs)
+        output2 = ensemble.likelihood(staley2017.M2, **staley, **kwargs)
+        assert np.array_equal(output1.mean, output2.mean)
+        assert np.array_equal(output1.quantiles, output2.quantiles)
+
+    def test_parallel(_, staley):
+        kwargs = dict(sd=0.2, nsamples=40, batch=10, seed=5)
+        sequential = ensemble.likelihood(staley2017.M3, **staley, **kwargs)
+        parallel = ensemble.likelihood(
+            staley2017.M3, **staley, **kwargs, parallel=True, nprocess=2
+        )
+        assert np.array_equal(sequential.mean, parallel.mean)
+        assert np.array_equal(sequential.quantiles, parallel.quantiles)
+
+    def test_sd_dict(_, staley):
+        output = ensemble.likelihood(
+            staley2017.M4, **staley, sd={"B": 0.5}, nsamples=20, seed=1
+        )
+        assert np.all(output.variance > 0)
+
+    def test_invalid_sd_key(_, staley, assert_contains):
+        with pytest.raises(ValueError) as error:
+            ensemble.likelihood(staley2017.M1, **staley, sd={"invalid": 1})
+        assert_contains(error, "The sd dict contains an unrecognized key (invalid)")
+
+    def test_invalid_model(_, staley, assert_contains):
+        with pytest.raises(TypeError) as error:
+            ensemble.likelihood(gartner2014, **staley, sd=0)
+        assert_contains(error, "model")
+
+
+class TestEmergency:
+    def test_deterministic(_):
+        i15 = [16, 24]
+        Bmh = [0.01, 0.2]
+        R = [100, 400]
+        output = ensemble.emergency(i15, Bmh, R, RSE=0, nsamples=10, batch=4)
+        expected, _, _ = gartner2014.emergency(i15, Bmh, R, CI=None)
+        assert output.shape == (2, 2)
+        assert np.allclose(output.mean, expected)
+        assert np.allclose(output.variance, 0)
+
+    def test_residuals(_):
+        output = ensemble.emergency(
+            [16], [0.1], [200], nsamples=2000, batch=500, seed=3
+        )
+        lnV = np.log(gartner2014.emergency([16], [0.1], [200], CI=None)[0])
+        median = np.exp(lnV).reshape(1, 1)
+        assert np.allclose(output.quantiles[..., 1], median, rtol=0.1)
+
+
+class TestLongterm:
+    def test_deterministic(_):
+        i60 = [10, 20]
+        args = ([0.1, 0.2], 1.5, [0.5, 1.5], [100, 300])
+        output = ensemble.longterm(i60, *args, RSE=0, nsamples=6, batch=4)
+        expected, _, _ = gartner2014.longterm(i60, *args, CI=None)
+        assert output.shape == (2, 2)
+        assert np.allclose(output.mean, expected)
+
+    def test_column_T(_):
+        i60 = [10, 20]
+        T = np.array([1, 2]).reshape(2, 1)
+        args = ([0.1, 0.2], T, [0.5, 1.5], [100, 300])
+        output = ensemble.longterm(i60, *args, RSE=0, nsamples=6, batch=4)
+        expected, _, _ = gartner2014.longterm(i60, *args, CI=None)
+        assert output.shape == (2, 2)
+        assert np.allclose(output.mean, expected)
+
+    def test_vector_T(_, assert_contains):
+        with pytest.raises(ShapeError) as error:
+            ensemble.longterm(10, [0.1, 0.2], [1, 2], [0.5, 1.5], [100, 300])
+        assert_contains(error, "Each variable must have a single run")
+
+    def test_perturbed(_):
+        output = ensemble.longterm(
+            [10], [0.1], [1], [0.5], [100], RSE=0, sd={"B": 0.1}, nsamples=20, seed=2
+        )
+        assert output.variance[0, 0] > 0
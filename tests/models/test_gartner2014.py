@@ -703,6 +703,55 @@ class TestEmergency:
             g14.emergency(i15, Bmh, R, B=B, Ci=Ci, Cb=Cb, Cr=Cr)
         assert_contains(error, "must have either 1 or 2 runs", "R has 3")
 
+    def test_float32(_):
+        i15 = [3, 29, 72]
+        Bmh = [0.01, 1.11, 15.01]
+        R = [93, 572, 2098]
+        expected = g14.emergency(i15, Bmh, R)
+        outputs = g14.emergency(i15, Bmh, R, dtype="float32")
+        for output, value in zip(outputs, expected):
+            assert output.dtype == "float32"
+            assert np.allclose(output, value, rtol=1e-5)
+
+    def test_out(_):
+        i15 = [3, 29, 72]
+        Bmh = [0.01, 1.11, 15.01]
+        R = [93, 572, 2098]
+        CI = [0.9, 0.95]
+        out = (np.empty((3, 3, 1)), np.empty((3, 3, 1, 2)), np.empty((3, 3, 1, 2)))
+        outputs = g14.emergency(i15, Bmh, R, CI=CI, out=out, keepdims=True)
+        expected = g14.emergency(i15, Bmh, R, CI=CI, keepdims=True)
+        for output, array, value in zip(outputs, out, expected):
+            assert output is array
+            assert np.allclose(output, value)
+
+    def test_out_float32(_):
+        out = (np.empty((3, 1, 1), "float32"), np.empty((3, 1, 1, 1), "float32"))
+        out = out + (np.empty((3, 1, 1, 1), "float32"),)
+        outputs = g14.emergency(3, [0.01, 1.11, 15.01], [93, 572, 2098], out=out)
+        expected = g14.emergency(3, [0.01, 1.11, 15.01], [93, 572, 2098])
+        for output, value in zip(outputs, expected):
+            assert output.dtype == "float32"
+            assert np.allclose(output, value, rtol=1e-5)
+
+    def test_invalid_out(_, assert_contains):
+        with pytest.raises(TypeError) as error:
+            g14.emergency(3, 1, 100, out=np.empty((1, 1, 1)))
+        assert_contains(error, "out must be a tuple of 3 numpy arrays")
+
+    def test_invalid_out_shape(_, assert_contains):
+        out = (np.empty((1, 1, 1)), np.empty((1, 1, 1, 2)), np.empty((1, 1, 1, 1)))
+        with pytest.raises(ShapeError) as error:
+            g14.emergency(3, 1, 100, out=out)
+        assert_contains(error, "out[1] must have shape (1, 1, 1, 1)")
+
+    def test_mixed_out_dtype(_, assert_contains):
+        out = (np.empty((1, 1, 1)), np.empty((1, 1, 1, 1), "float32"))
+        out = out + (np.empty((1, 1, 1, 1)),)
+        with pytest.raises(TypeError) as error:
+            g14.emergency(3, 1, 100, out=out)
+        assert_contains(error, "out[1] must have a float64 dtype")
+
 
 class TestLongterm:
     def test_T_scalar(_):
@@ -929,3 +978,28 @@ class TestLongterm:
         with pytest.raises(ShapeError) as error:
             g14.longterm(i60, Bt, T, A, R, B=B, Ci=Ci, Cb=Cb, Ct=Ct, Ca=Ca, Cr=Cr)
         assert_contains(error, "must have either 1 or 2 runs", "T has 3")
+
+    def test_float32(_):
+        i60 = 3
+        Bt = [0.1, 1.5, 16]
+        T = np.array([1, 2, 3]).reshape(3, 1)
+        A = [0.2, 3, 32]
+        R = [93, 572, 2098]
+        expected = g14.longterm(i60, Bt, T, A, R)
+        outputs = g14.longterm(i60, Bt, T, A, R, dtype=np.float32)
+        for output, value in zip(outputs, expected):
+            assert output.dtype == "float32"
+            assert np.allclose(output, value, rtol=1e-5)
+
+    def test_out(_):
+        i60 = 3
+        Bt = [0.1, 1.5, 16]
+        T = np.array([1, 2, 3]).reshape(3, 1)
+        A = [0.2, 3, 32]
+        R = [93, 572, 2098]
+        out = (np.empty((3, 1, 1)), np.empty((3, 1, 1, 1)), np.empty((3, 1, 1, 1)))
+        outputs = g14.longterm(i60, Bt, T, A, R, out=out)
+        expected = g14.longterm(i60, Bt, T, A, R)
+        for output, array, value in zip(outputs, out, expected):
+            assert np.shares_memory(output, array)
+            assert np.allclose(output, value)
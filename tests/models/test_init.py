@@ -0,0 +1,60 @@
+import subprocess
+import sys
+
+import pytest
+
+import pfdf.models
+
+
+def loaded_modules(module):
+    "Returns the modules loaded by importing a module in a fresh interpreter"
+    code = f"import sys, {module}; print(' '.join(sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return result.stdout.split()
+
+
+class TestGetattr:
+    @pytest.mark.parametrize(
+        "name, module",
+        (
+            ("s17", "staley2017"),
+            ("g14", "gartner2014"),
+            ("c10", "cannon2010"),
+            ("staley2017", "staley2017"),
+            ("ensemble", "ensemble"),
+            ("table", "table"),
+        ),
+    )
+    def test_valid(_, name, module):
+        output = getattr(pfdf.models, name)
+        assert output.__name__ == f"pfdf.models.{module}"
+
+    def test_invalid(_, assert_contains):
+        with pytest.raises(AttributeError) as error:
+            pfdf.models.invalid
+        assert_contains(error, "has no attribute 'invalid'")
+
+    def test_dir(_):
+        assert {"s17", "g14", "c10", "table"}.issubset(dir(pfdf.models))
+
+
+class TestLazyImports:
+    def test_package(_):
+        modules = loaded_modules("pfdf.models")
+        assert "pfdf.models.staley2017" not in modules
+        assert "numba" not in modules
+
+    @pytest.mark.parametrize(
+        "module", ("pfdf.models.staley2017", "pfdf.models.gartner2014")
+    )
+    def test_models(_, module):
+        modules = loaded_modules(module)
+        assert "pysheds" not in modules
+        assert "scipy.stats" not in modules
+        assert "pfdf.segments" not in modules
+        assert "pfdf.raster" not in modules
+        assert "pfdf.projection" not in modules
+        assert "fiona" not in modules
+        assert "shapely" not in modules
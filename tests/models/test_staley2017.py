@@ -1,3 +1,5 @@
+import gc
+import weakref
 from math import nan
 
 import numpy as np
@@ -30,6 +32,16 @@ def slopes():
 #####
 
 
+@pytest.fixture
+def ensemble():
+    "Parameters and variables for 50 segments and 4 parameter runs"
+    rng = np.random.default_rng(seed=17)
+    B = -rng.random(4) * 4
+    Ct, Cf, Cs = rng.random((3, 4))
+    T, F, S = rng.random((3, 50))
+    return B, Ct, T, Cf, F, Cs, S
+
+
 class TestValidate:
     def test_valid_1_varcol(_):
         PR = np.ones(4)
@@ -313,6 +325,59 @@ class TestAccumulation:
         )
         assert output == -10
 
+    def test_chunked(_, ensemble):
+        p = [0.2, 0.5, 0.8]
+        expected = s17.accumulation(p, *ensemble)
+        output = s17.accumulation(p, *ensemble, memory=0.0001)
+        assert output.shape == expected.shape
+        assert np.allclose(output, expected, equal_nan=True)
+
+    def test_float32(_, ensemble):
+        p = [0.2, 0.5, 0.8]
+        expected = s17.accumulation(p, *ensemble)
+        output = s17.accumulation(p, *ensemble, dtype="float32")
+        assert output.dtype == "float32"
+        assert np.allclose(output, expected, rtol=1e-5, equal_nan=True)
+
+    def test_chunked_float32(_, ensemble):
+        p = [0.2, 0.5, 0.8]
+        expected = s17.accumulation(p, *ensemble, dtype="float32")
+        output = s17.accumulation(p, *ensemble, dtype="float32", memory=0.0001)
+        assert output.dtype == "float32"
+        assert np.allclose(output, expected, rtol=1e-5, equal_nan=True)
+
+    def test_chunked_noscreen(_):
+        output = s17.accumulation(
+            p=0.5, B=10, Ct=0, T=0, Cf=0, F=0, Cs=1, S=1, screen=False, memory=1
+        )
+        assert output == -10
+
+    @pytest.mark.parametrize("option", ("memory", "out"))
+    def test_chunked_zero_denominator(_, option):
+        z = [0, 0.5, 0]
+        kwargs = {"memory": 1} if option == "memory" else {"out": np.empty((3, 1, 1))}
+        with np.errstate(divide="ignore"):
+            expected = s17.accumulation(0.5, -3.6, 0.3, z, 0.3, z, 0.3, z)
+        output = s17.accumulation(0.5, -3.6, 0.3, z, 0.3, z, 0.3, z, **kwargs)
+        assert np.allclose(expected, [np.inf, 8, np.inf])
+        assert np.allclose(output.reshape(-1), expected)
+
+    def test_out_array(_, ensemble):
+        p = [0.2, 0.5, 0.8]
+        out = np.empty((50, 3, 4))
+        output = s17.accumulation(p, *ensemble, out=out)
+        assert output is out
+        expected = s17.accumulation(p, *ensemble)
+        assert np.allclose(out, expected, equal_nan=True)
+
+    def test_out_file(_, ensemble, tmp_path):
+        p = [0.2, 0.5, 0.8]
+        path = tmp_path / "output.npy"
+        output = s17.accumulation(p, *ensemble, out=path, memory=0.001)
+        assert isinstance(output, np.memmap)
+        expected = s17.accumulation(p, *ensemble)
+        assert np.allclose(np.load(path), expected, equal_nan=True)
+
 
 class TestLikelihood:
     def test_invalid_parameters(_, assert_contains):
@@ -446,6 +511,88 @@ class TestLikelihood:
         output = s17.accumulation(p, B, Ct, T, Cf, F, Cs, S)
         assert np.allclose(output, R)
 
+    def test_chunked(_, ensemble):
+        R = [4, 6, 8, 10]
+        expected = s17.likelihood(R, *ensemble)
+        output = s17.likelihood(R, *ensemble, memory=0.0001)
+        assert output.shape == expected.shape
+        assert np.allclose(output, expected)
+
+    def test_float32(_, ensemble):
+        R = [4, 6, 8, 10]
+        expected = s17.likelihood(R, *ensemble)
+        output = s17.likelihood(R, *ensemble, dtype=np.float32)
+        assert output.dtype == "float32"
+        assert np.allclose(output, expected, atol=1e-6)
+
+    def test_float32_saturates(_):
+        output = s17.likelihood([0, 100], [-3, 20], 1, 1, 1, 1, 1, 1, dtype="float32")
+        expected = s17.likelihood([0, 100], [-3, 20], 1, 1, 1, 1, 1, 1)
+        assert not np.any(np.isnan(output))
+        assert np.allclose(output, expected)
+
+    @pytest.mark.parametrize("dtype", ("float32", "float64"))
+    def test_saturation_matches_paths(_, dtype):
+        args = ([0, 100], [-3, 1000], 1, 1, 1, 1, 1, 1)
+        expected = s17.likelihood(*args, dtype=dtype)
+        chunked = s17.likelihood(*args, dtype=dtype, memory=1)
+        out = s17.likelihood(*args, out=np.empty((1, 2, 2), dtype))
+        assert not np.any(np.isnan(expected))
+        assert np.allclose(expected[1:], 1)
+        assert np.array_equal(chunked, expected)
+        assert np.array_equal(out, expected)
+
+    def test_out_dtype_mismatch(_, ensemble, assert_contains):
+        out = np.empty((50, 1, 4), "float32")
+        with pytest.raises(TypeError) as error:
+            s17.likelihood(4, *ensemble, out=out, dtype="float64")
+        assert_contains(error, "out must have a float64 dtype")
+
+    def test_invalid_dtype(_, ensemble, assert_contains):
+        with pytest.raises(ValueError) as error:
+            s17.likelihood(4, *ensemble, dtype="float16")
+        assert_contains(error, "dtype must be float32 or float64")
+
+    def test_chunked_keepdims(_):
+        output = s17.likelihood(4, 1, 2, 3, 4, 5, 6, 7, memory=1, keepdims=True)
+        expected = s17.likelihood(4, 1, 2, 3, 4, 5, 6, 7, keepdims=True)
+        assert output.shape == (1, 1, 1)
+        assert np.allclose(output, expected)
+
+    def test_out_array(_, ensemble):
+        R = [4, 6, 8, 10]
+        out = np.empty((50, 4, 4), dtype="float32")
+        output = s17.likelihood(R, *ensemble, out=out)
+        assert output is out
+        expected = s17.likelihood(R, *ensemble)
+        assert np.allclose(out, expected)
+
+    def test_out_file(_, ensemble, tmp_path):
+        R = [4, 6, 8, 10]
+        path = tmp_path / "output.npy"
+        output = s17.likelihood(R, *ensemble, out=path)
+        assert isinstance(output, np.memmap)
+        expected = s17.likelihood(R, *ensemble)
+        assert np.allclose(np.load(path), expected)
+
+    def test_out_file_exists(_, ensemble, tmp_path):
+        path = tmp_path / "output.npy"
+        path.write_text("existing")
+        with pytest.raises(FileExistsError):
+            s17.likelihood(4, *ensemble, out=path)
+        output = s17.likelihood(4, *ensemble, out=path, overwrite=True)
+        assert np.allclose(output, s17.likelihood(4, *ensemble))
+
+    def test_invalid_out_shape(_, ensemble, assert_contains):
+        with pytest.raises(ShapeError) as error:
+            s17.likelihood(4, *ensemble, out=np.empty((50, 2, 4)))
+        assert_contains(error, "out must have shape (50, 1, 4)")
+
+    def test_invalid_memory(_, ensemble, assert_contains):
+        with pytest.raises(ValueError) as error:
+            s17.likelihood(4, *ensemble, memory=-1)
+        assert_contains(error, "memory")
+
 
 #####
 # Shared Model Methods
@@ -615,6 +762,107 @@ class TestTerrainMask:
         assert np.array_equal(output, expected)
 
 
+class TestCached:
+    @staticmethod
+    def counter(segments, monkeypatch):
+        calls = []
+        scaled_dnbr = segments.scaled_dnbr
+
+        def counted(*args, **kwargs):
+            calls.append(1)
+            return scaled_dnbr(*args, **kwargs)
+
+        monkeypatch.setattr(segments, "scaled_dnbr", counted)
+        return calls
+
+    def test_cached(_, segments, flow, monkeypatch):
+        calls = TestCached.counter(segments, monkeypatch)
+        output1 = s17.M1.fire(segments, flow)
+        output2 = s17.M1.fire(segments, flow)
+        assert len(calls) == 1
+        assert np.array_equal(output1, output2)
+
+    def test_shared_with_variables(_, segments, flow, slopes, mask, monkeypatch):
+        calls = TestCached.counter(segments, monkeypatch)
+        slopes, mask = Raster(slopes), Raster(mask)
+        T, F, S = s17.M1.variables(segments, mask, slopes, flow, flow)
+        assert np.array_equal(s17.M1.fire(segments, flow), F)
+        assert len(calls) == 1
+
+    def test_options(_, segments, flow, monkeypatch):
+        calls = TestCached.counter(segments, monkeypatch)
+        s17.M1.fire(segments, flow)
+        s17.M1.fire(segments, flow, omitnan=True)
+        assert len(calls) == 2
+
+    def test_returns_copy(_, segments, flow):
+        output = s17.M1.fire(segments, flow)
+        expected = output.copy()
+        output[:] = 0
+        assert np.array_equal(s17.M1.fire(segments, flow), expected)
+
+    def test_array_inputs(_, segments, flow, monkeypatch):
+        calls = TestCached.counter(segments, monkeypatch)
+        values = flow.values.copy()
+        s17.M1.fire(segments, values)
+        s17.M1.fire(segments, values)
+        assert len(calls) == 2
+
+    def test_raster_changed(_, segments, flow, monkeypatch):
+        calls = TestCached.counter(segments, monkeypatch)
+        output1 = s17.M1.fire(segments, flow)
+        flow.set_range(max=5, copy=False)
+        output2 = s17.M1.fire(segments, flow)
+        assert len(calls) == 2
+        assert not np.array_equal(output1, output2)
+
+    def test_remove(_, segments, flow, monkeypatch):
+        calls = TestCached.counter(segments, monkeypatch)
+        s17.M1.fire(segments, flow)
+        expected = s17.M1.fire(segments, flow)[1:]
+        segments.remove([1], "ids")
+        output = s17.M1.fire(segments, flow)
+        assert len(calls) == 1
+        assert output.size == segments.size
+        assert np.array_equal(output, expected, equal_nan=True)
+
+    def test_keep(_, segments, flow, monkeypatch):
+        calls = TestCached.counter(segments, monkeypatch)
+        s17.M1.fire(segments, flow)
+        expected = s17.M1.fire(segments, flow)[:2]
+        segments.keep([1, 2], "ids")
+        output = s17.M1.fire(segments, flow)
+        assert len(calls) == 1
+        assert output.size == 2
+        assert np.array_equal(output, expected, equal_nan=True)
+
+    def test_copy(_, segments, flow):
+        s17.M1.fire(segments, flow)
+        copy = segments.copy()
+        assert copy._variables == {}
+
+    def test_not_retained(_, segments, flow):
+        dnbr = Raster.from_array(flow.values.copy(), spatial=flow.metadata)
+        s17.M1.fire(segments, dnbr)
+        assert len(segments._variables) == 1
+        ref = weakref.ref(dnbr)
+        del dnbr
+        gc.collect()
+        assert ref() is None
+        assert segments._variables == {}
+
+    def test_metadata_replaced(_, segments, flow):
+        s17.M1.fire(segments, flow)
+        flow.set_range(max=5, copy=False)
+        gc.collect()
+        assert segments._variables == {}
+
+    def test_forget_deleted_segments(_, segments):
+        ref = weakref.ref(segments.copy())
+        gc.collect()
+        s17.Model._forget(ref, "key", None)
+
+
 #####
 # Model variables
 #####
@@ -0,0 +1,119 @@
+"""
+test_table  Unit tests for the table module
+"""
+
+import numpy as np
+import pytest
+
+from pfdf.errors import DurationsError, ShapeError
+from pfdf.models import cannon2010, gartner2014, staley2017, table
+from pfdf.utils.intensity import from_accumulation
+
+
+@pytest.fixture
+def variables():
+    return {
+        "M1": ([0.1, 0.2, 0.3], [0.4, 0.5, 0.6], [0.2, 0.1, 0.3]),
+        "m3": ([0.3, 0.2, 0.1], 0.5, [0.1, 0.2, 0.3]),
+    }
+
+
+@pytest.fixture
+def gartner():
+    return [0.1, 0.5, 2], [100, 300, 900]
+
+
+class TestHazardTable:
+    def test_thresholds(_, variables, gartner):
+        p = [0.5, 0.75]
+        thresholds, _ = table.hazard_table(variables, *gartner, probabilities=p)
+        assert list(thresholds.columns) == [
+            "model",
+            "duration",
+            "probability",
+            "segment",
+            "accumulation",
+            "intensity",
+        ]
+        assert len(thresholds) == 2 * 3 * 2 * 3
+
+        for name, model in zip(["M1", "M3"], [staley2017.M1, staley2017.M3]):
+            T, F, S = variables[name if name == "M1" else "m3"]
+            B, Ct, Cf, Cs = model.parameters()
+            R = staley2017.accumulation(p, B, Ct, T, Cf, F, Cs, S)
+            I = from_accumulation(R, [15, 30, 60])
+            rows = thresholds[thresholds.model == name]
+            expected = np.transpose(R, (2, 1, 0)).reshape(-1)
+            assert np.allclose(rows.accumulation, expected, equal_nan=True)
+            expected = np.transpose(I, (2, 1, 0)).reshape(-1)
+            assert np.allclose(rows.intensity, expected, equal_nan=True)
+
+    def test_row_order(_, variables, gartner):
+        thresholds, hazards = table.hazard_table(
+            variables, *gartner, durations=[30, 15], probabilities=[0.5, 0.9]
+        )
+        assert list(thresholds.model[:12]) == ["M1"] * 12
+        assert list(thresholds.duration[:6]) == [30] * 6
+        assert list(thresholds.probability[:6]) == [0.5] * 3 + [0.9] * 3
+        assert list(thresholds.segment[:6]) == [0, 1, 2] * 2
+        assert list(hazards.i15[:6]) == [16] * 3 + [20] * 3
+
+    def test_hazards(_, variables, gartner):
+        i15 = [16, 24, 40]
+        _, hazards = table.hazard_table(variables, *gartner, i15=i15)
+        assert list(hazards.columns) == [
+            "model",
+            "i15",
+            "segment",
+            "likelihood",
+            "volume",
+            "hazard",
+        ]
+        assert len(hazards) == 2 * 3 * 3
+
+        V, _, _ = gartner2014.emergency(i15, *gartner, CI=None)
+        B, Ct, Cf, Cs = staley2017.M1.parameters([15])
+        T, F, S = variables["M1"]
+        p = staley2017.likelihood(np.array(i15) / 4, B, Ct, T, Cf, F, Cs, S)
+        H = cannon2010.hazard(p, V)
+
+        rows = hazards[hazards.model == "M1"]
+        assert np.allclose(rows.likelihood, p.T.reshape(-1))
+        assert np.allclose(rows.volume, V.T.reshape(-1))
+        assert np.array_equal(rows.hazard, H.T.reshape(-1))
+
+    def test_ids(_, variables, gartner):
+        thresholds, hazards = table.hazard_table(variables, *gartner, ids=[5, 7, 9])
+        assert list(thresholds.segment[:3]) == [5, 7, 9]
+        assert list(hazards.segment[:3]) == [5, 7, 9]
+
+    def test_no_screen(_, gartner):
+        variables = {"M1": (-10, 0.5, 0.5)}
+        thresholds, _ = table.hazard_table(variables, *gartner)
+        assert np.isnan(thresholds.accumulation).all()
+        thresholds, _ = table.hazard_table(variables, *gartner, screen=False)
+        assert (thresholds.accumulation < 0).all()
+
+    def test_invalid_model(_, gartner, assert_contains):
+        with pytest.raises(ValueError) as error:
+            table.hazard_table({"M5": (1, 1, 1)}, *gartner)
+        assert_contains(error, "variables key (M5) is not a recognized option")
+
+    def test_invalid_tuple(_, gartner, assert_contains):
+        with pytest.raises(ValueError) as error:
+            table.hazard_table({"M1": (1, 1)}, *gartner)
+        assert_contains(error, "must be a (T, F, S) tuple")
+
+    def test_empty(_, gartner, assert_contains):
+        with pytest.raises(ValueError) as error:
+            table.hazard_table({}, *gartner)
+        assert_contains(error, "at least one Staley 2017 model")
+
+    def test_segments_mismatch(_, variables, assert_contains):
+        with pytest.raises(ShapeError) as error:
+            table.hazard_table(variables, [1, 2], 100)
+        assert_contains(error, "Each variable must have either 1 or 3 elements")
+
+    def test_invalid_duration(_, variables, gartner):
+        with pytest.raises(DurationsError):
+            table.hazard_table(variables, *gartner, durations=[20])
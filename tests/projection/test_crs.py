@@ -4,8 +4,8 @@ import numpy as np
 import pytest
 from pyproj._crs import Axis
 
-from pfdf.errors import CRSError, DimensionError, MissingCRSError
-from pfdf.projection import CRS, crs
+from pfdf.errors import CRSError, DimensionError, MissingCRSError, ShapeError
+from pfdf.projection import CRS, BoundingBox, crs
 
 #####
 # Testing Fixtures
@@ -496,9 +496,113 @@ class TestReproject:
         assert np.allclose(ys, (0.0, 9.019376924314101e-05, 0.001803879619663406))
 
 
+class TestReprojectBounds:
+    def test(_):
+        lefts, bottoms = np.array([0, 1000]), np.array([0, -500])
+        rights, tops = lefts + 200, bottoms + 300
+        output = crs.reproject_bounds(26911, 4326, lefts, bottoms, rights, tops)
+        for k in range(2):
+            box = BoundingBox(lefts[k], bottoms[k], rights[k], tops[k], 26911)
+            expected = box.reproject(4326).bounds
+            assert np.allclose([edge[k] for edge in output], expected)
+
+    def test_scalar(_):
+        output = crs.reproject_bounds(26911, 4326, 0, 0, 200, 300)
+        expected = BoundingBox(0, 0, 200, 300, 26911).reproject(4326).bounds
+        assert all(edge.shape == (1,) for edge in output)
+        assert np.allclose(np.concatenate(output), expected)
+
+    def test_outside_domain(_):
+        output = crs.reproject_bounds(
+            4326, 26911, [-118, -118], [34, 34], [-117, -117], [35, 91]
+        )
+        output = np.stack(output)
+        assert np.isfinite(output[:, 0]).all()
+        assert np.isnan(output[:, 1]).all()
+
+    def test_invalid_length(_, assert_contains):
+        with pytest.raises(ShapeError) as error:
+            crs.reproject_bounds(26911, 4326, [0, 1], [0], [1, 2], [1, 2])
+        assert_contains(error, "bottoms")
+
+
 class TestUtmZone:
     def test(_):
         assert crs.utm_zone(CRS(4326), -121, 35) == CRS(32610)
 
     def test_outside_domain(_):
         assert crs.utm_zone(CRS(4326), -121, 86) is None
+
+    def test_zone_boundary(_):
+        assert crs.utm_zone(CRS(4326), -120, 35) == CRS(32610)
+        assert crs.utm_zone(CRS(4326), -119.99, 35) == CRS(32611)
+
+    def test_projected(_):
+        assert crs.utm_zone(CRS(26911), 500000, 3900000) == CRS(32611)
+
+
+#####
+# Internal Cache
+#####
+
+
+class TestDescribe:
+    def test_cached(_):
+        input = CRS(26911)
+        descriptor = crs._describe(input)
+        assert crs._describe(CRS(26911)) is descriptor
+
+    def test_descriptor(_):
+        axes, angular, error = crs._describe(CRS(4326))
+        assert axes["x"] == crs.get_axis(CRS(4326), "x")
+        assert axes["y"].unit_name == "degree"
+        assert angular == {"x": True, "y": True}
+        assert error is None
+
+    def test_unsupported(_):
+        _, _, error = crs._describe(UnsupportedAxisCRS(26911))
+        assert error is not None
+        assert "unsupported" in error
+
+    def test_subclass(_):
+        assert crs._describe(CRS(26911))[2] is None
+        assert crs._describe(MissingAxisCRS(26911))[2] is not None
+
+    def test_bounded(_, monkeypatch):
+        monkeypatch.setattr(crs, "_DESCRIPTORS", {})
+        monkeypatch.setattr(crs, "_CACHE_SIZE", 2)
+        for epsg in [26910, 26911, 26912]:
+            crs._describe(CRS(epsg))
+        keys = [srs for _, srs in crs._DESCRIPTORS]
+        assert keys == ["EPSG:26911", "EPSG:26912"]
+
+    def test_recently_used(_, monkeypatch):
+        monkeypatch.setattr(crs, "_DESCRIPTORS", {})
+        monkeypatch.setattr(crs, "_CACHE_SIZE", 2)
+        for epsg in [26910, 26911, 26910, 26912]:
+            crs._describe(CRS(epsg))
+        keys = [srs for _, srs in crs._DESCRIPTORS]
+        assert keys == ["EPSG:26910", "EPSG:26912"]
+
+
+class TestTransformer:
+    def test_cached(_):
+        transformer = crs._transformer(CRS(26911), CRS(4326))
+        assert crs._transformer(CRS(26911), CRS(4326)) is transformer
+
+    def test_always_xy(_):
+        lon, lat = crs._transformer(CRS(26911), CRS(4326)).transform(500000, 0)
+        assert np.isclose(lon, -117)
+        assert np.isclose(lat, 0)
+
+
+class TestValidateCached:
+    def test_crs(_):
+        input = CRS(26911)
+        assert crs.validate(input) is input
+
+    def test_repeated_invalid(_, assert_contains):
+        for _ in range(2):
+            with pytest.raises(CRSError) as error:
+                crs.validate(UnsupportedAxisCRS(26911))
+            assert_contains(error, "unsupported")
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from pfdf import watershed
+from pfdf.raster import Raster
+from pfdf.raster._utils import provenance
+
+
+@pytest.fixture
+def flow():
+    values = np.array([[1, 2, 3], [4, 0, 5], [6, 7, 8]], dtype="int8")
+    return Raster.from_array(values, nodata=0)
+
+
+@pytest.fixture
+def mask():
+    values = np.array([[1, 0, 1], [0, 9, 1], [1, 1, 0]], dtype="int8")
+    return Raster.from_array(values, nodata=9)
+
+
+class TestFlow:
+    def test_records(_, flow):
+        assert not flow._validated
+        provenance.flow(flow)
+        assert flow._validated == {provenance.FLOW}
+
+    def test_invalid(_, assert_contains):
+        flow = Raster.from_array(np.full((3, 3), 9), nodata=0, name="test")
+        with pytest.raises(ValueError) as error:
+            provenance.flow(flow)
+        assert_contains(error, "test")
+        assert not flow._validated
+
+    def test_trusted(_):
+        flow = Raster.from_array(np.full((3, 3), 9), nodata=0)
+        provenance.record(flow, provenance.FLOW)
+        provenance.flow(flow)
+
+    def test_watershed_flow(_):
+        dem = np.arange(25, dtype=float).reshape(5, 5)
+        dem = Raster.from_array(dem, nodata=-999)
+        flow = watershed.flow(dem)
+        assert provenance.trusted(flow, provenance.FLOW)
+
+
+class TestBoolean:
+    def test_records(_, mask):
+        output = provenance.boolean(mask)
+        expected = np.array([[1, 0, 1], [0, 0, 1], [1, 1, 0]], bool)
+        assert np.array_equal(output, expected)
+        assert mask._validated == {provenance.BOOLEAN}
+
+    def test_trusted(_, mask):
+        expected = provenance.boolean(mask)
+        output = provenance.boolean(mask)
+        assert np.array_equal(output, expected)
+        assert output is not mask.values
+
+    def test_invalid(_, assert_contains):
+        mask = Raster.from_array(np.full((3, 3), 2), name="test")
+        with pytest.raises(ValueError) as error:
+            provenance.boolean(mask)
+        assert_contains(error, "test")
+        assert not mask._validated
+
+
+class TestRasterFlags:
+    def test_shared(_, flow):
+        copy = Raster(flow, "a new name")
+        provenance.flow(copy)
+        assert provenance.trusted(flow, provenance.FLOW)
+
+    def test_set_range(_, flow):
+        provenance.flow(flow)
+        flow.set_range(max=5)
+        assert not flow._validated
+
+    def test_override_nodata(_, flow):
+        provenance.flow(flow)
+        copy = Raster(flow)
+        copy.override(nodata=1)
+        assert not copy._validated
+        assert flow._validated == {provenance.FLOW}
+
+    def test_override_name(_, flow):
+        provenance.flow(flow)
+        flow.override(name="test")
+        assert flow._validated == {provenance.FLOW}
+
+
+class TestFastMode:
+    def test(_):
+        flow = Raster.from_array(np.full((3, 3), 9), nodata=0)
+        assert not provenance.fast()
+        provenance.enable()
+        try:
+            assert provenance.fast()
+            provenance.flow(flow)
+        finally:
+            provenance.disable()
+        assert not provenance.fast()
+        assert not flow._validated
@@ -630,6 +630,23 @@ class TestUpdate:
             name="Test",
         )
 
+    def test_name_only(_):
+        a = RasterMetadata(
+            (10, 20), dtype="int8", nodata=2, crs=26910, transform=(10, -10, 0, 100)
+        )
+        b = a.update(name="new name")
+        assert b.name == "new name"
+        assert a.name == "raster"
+        assert b == a
+        assert b._crs is a._crs
+        assert b._locator is a._locator
+
+    def test_invalid_name(_, assert_contains):
+        a = RasterMetadata((10, 20))
+        with pytest.raises(TypeError) as error:
+            a.update(name=5)
+        assert_contains(error, "name")
+
     def test_new_crs(_):
         bounds = BoundingBox(0, 0, 200, 100, 26911)
         a = RasterMetadata(
@@ -2108,3 +2125,30 @@ class TestOrientation:
         assert RasterMetadata().orientation is None
         metadata = RasterMetadata((1, 1), bounds=(1, 2, 3, 4))
         assert metadata.orientation == 1
+
+
+class TestAligned:
+    def test_aligned(_):
+        a = RasterMetadata((10, 20), crs=26911, transform=(10, -10, 0, 100))
+        b = RasterMetadata((10, 20), crs=26911, transform=(10, -10, 0, 100))
+        assert a._aligned(b)
+
+    def test_missing(_):
+        a = RasterMetadata((10, 20))
+        b = RasterMetadata((10, 20))
+        assert a._aligned(b)
+
+    def test_different_crs(_):
+        a = RasterMetadata((10, 20), crs=26911, transform=(10, -10, 0, 100))
+        b = RasterMetadata((10, 20), crs=26910, transform=(10, -10, 0, 100))
+        assert not a._aligned(b)
+
+    def test_different_transform(_):
+        a = RasterMetadata((10, 20), crs=26911, transform=(10, -10, 0, 100))
+        b = RasterMetadata((10, 20), crs=26911, transform=(10, -10, 0, 200))
+        assert not a._aligned(b)
+
+    def test_different_locator_type(_):
+        a = RasterMetadata((10, 20), crs=26911, transform=(10, -10, 0, 100))
+        b = RasterMetadata((10, 20), crs=26911, bounds=a.bounds)
+        assert not a._aligned(b)
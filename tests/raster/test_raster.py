@@ -1,4 +1,6 @@
 import os
+import subprocess
+import sys
 from math import isnan, nan
 from pathlib import Path
 from unittest.mock import patch
@@ -114,6 +116,16 @@ class TestInitUser:
         check(output, "test", araster, transform, crs)
         assert output._values is not input
 
+    def test_pysheds_not_imported(_):
+        code = (
+            "import sys, numpy; from pfdf.raster import Raster; "
+            "Raster(numpy.ones((3, 3))); print('pysheds' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == "False"
+
     def test_array(_, araster):
         output = Raster(araster, "test")
         assert isinstance(output, Raster)
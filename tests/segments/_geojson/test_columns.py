@@ -0,0 +1,106 @@
+import fiona
+import numpy as np
+import pytest
+import shapely
+from pyproj import CRS
+
+from pfdf.segments._geojson import _columns, _geojson
+
+
+def assert_matches_features(segments, type, properties, crs):
+    "Checks that columns match the geometries and properties of geojson features"
+
+    outtype, geometries, columns, schema, outcrs = _columns.columns(
+        segments, type, properties, crs
+    )
+    collection, expected_schema, expected_crs = _geojson.features(
+        segments, type, properties, crs
+    )
+    assert outtype == type
+    assert schema == expected_schema
+    assert outcrs == expected_crs
+
+    features = collection["features"]
+    assert geometries.size == len(features)
+    for k, feature in enumerate(features):
+        expected = shapely.geometry.shape(feature["geometry"])
+        assert shapely.equals_exact(geometries[k], expected, tolerance=1e-6)
+        for field, values in columns.items():
+            assert values[k] == feature["properties"][field]
+
+
+class TestColumns:
+    @pytest.mark.parametrize(
+        "type", ("segments", "outlets", "segment outlets", "basins")
+    )
+    def test(_, segments, properties, type):
+        assert_matches_features(segments, type, properties, None)
+
+    @pytest.mark.parametrize("type", ("segments", "basins"))
+    def test_crs(_, segments, properties, type):
+        assert_matches_features(segments, type, properties, CRS(26910))
+
+    def test_no_properties(_, segments):
+        _, geometries, columns, schema, _ = _columns.columns(
+            segments, "segments", None, None
+        )
+        assert geometries.size == segments.size
+        assert columns == {}
+        assert schema == {}
+
+    def test_empty(_, segments):
+        segments.keep(np.zeros(segments.size))
+        _, geometries, _, _, _ = _columns.columns(segments, "segments", None, None)
+        assert geometries.size == 0
+
+
+class TestWrite:
+    @pytest.mark.parametrize("extension", ("gpkg", "fgb", "geojson"))
+    def test(_, segments, properties, tmp_path, extension):
+        path = tmp_path / f"output.{extension}"
+        type, geometries, columns, schema, crs = _columns.columns(
+            segments, "segments", properties, None
+        )
+        _columns.write(path, type, geometries, columns, schema, crs, None)
+        with fiona.open(path) as file:
+            features = list(file)
+        assert len(features) == segments.size
+
+        # FlatGeobuf orders features by its spatial index, so match by ID
+        rows = {id: k for k, id in enumerate(columns["id"])}
+        for feature in features:
+            k = rows[feature.properties["id"]]
+            geometry = shapely.geometry.shape(feature.geometry)
+            assert shapely.equals_exact(geometry, geometries[k])
+            for field, values in columns.items():
+                assert feature.properties[field] == values[k]
+
+    def test_geoparquet(_, segments, properties, tmp_path):
+        pyarrow = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "output.parquet"
+        type, geometries, columns, schema, crs = _columns.columns(
+            segments, "segments", properties, None
+        )
+        _columns.write(path, type, geometries, columns, schema, crs, None)
+        table = pyarrow.read_table(path)
+        assert table.column_names == list(columns) + ["geometry"]
+        saved = shapely.from_wkb(table["geometry"].to_pylist())
+        assert shapely.equals_exact(saved, geometries).all()
+        assert b"geo" in table.schema.metadata
+
+    def test_geoparquet_missing(_, segments, tmp_path, monkeypatch, assert_contains):
+        monkeypatch.setitem(__import__("sys").modules, "pyarrow", None)
+        type, geometries, columns, schema, crs = _columns.columns(
+            segments, "segments", None, None
+        )
+        with pytest.raises(ImportError) as error:
+            _columns.write(
+                tmp_path / "output.parquet",
+                type,
+                geometries,
+                columns,
+                schema,
+                crs,
+                None,
+            )
+        assert_contains(error, "requires the pyarrow package")
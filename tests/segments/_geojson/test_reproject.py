@@ -185,3 +185,27 @@ class TestGeometries:
     def test_segment_outlets(_, line1, line2):
         _reproject.geometries(line1, "segment outlets", CRS(26911), CRS(26910))
         assert np.allclose(line1, line2)
+
+
+class TestLines:
+    def test(_, line1, line2, segments1, segments2, transformer):
+        lines = [line1, [], *segments1]
+        _reproject._lines(lines, transformer)
+        assert lines[1] == []
+        for output, expected in zip(lines[2:], segments2):
+            assert np.allclose(output, expected)
+        assert np.allclose(lines[0], line2)
+        assert all(isinstance(point, tuple) for point in lines[0])
+
+    def test_matches_scalar(_, transformer):
+        rng = np.random.default_rng(seed=0)
+        lines = [rng.uniform(0, 1e5, (size, 2)).tolist() for size in (3, 1, 40, 7)]
+        expected = [[transformer.transform(*point) for point in line] for line in lines]
+        _reproject._lines(lines, transformer)
+        for output, line in zip(lines, expected):
+            assert output == line
+
+    def test_empty(_, transformer):
+        lines = [[], []]
+        _reproject._lines(lines, transformer)
+        assert lines == [[], []]
@@ -230,6 +230,21 @@ def bpixels245():
     return np.array([4, 1, 6])
 
 
+@pytest.fixture
+def basins245():
+    return np.array(
+        [
+            [0, 0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 5, 5, 0, 0],
+            [0, 0, 0, 5, 5, 0, 0],
+            [0, 0, 0, 0, 5, 5, 0],
+            [0, 0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0, 0],
+            [0, 0, 0, 0, 0, 0, 0],
+        ]
+    ).astype("int32")
+
+
 @pytest.fixture
 def child245():
     return np.array([2, 2, -1])
@@ -7,7 +7,12 @@ import numpy as np
 import pytest
 from shapely import LineString
 
-from pfdf.errors import DimensionError, MissingCRSError, MissingTransformError
+from pfdf.errors import (
+    DimensionError,
+    MissingCRSError,
+    MissingTransformError,
+    ShapeError,
+)
 from pfdf.raster import Raster
 from pfdf.segments import Segments
 
@@ -364,6 +369,27 @@ class TestIndicesToIds:
         assert np.array_equal(output, [])
 
 
+class TestIdsToIndices:
+    def test(_, segments):
+        segments.remove([2, 5], "ids")
+        indices, found = segments._ids_to_indices([1, 3, 6, 2, 0, 100])
+        assert np.array_equal(indices[found], [0, 1, 3])
+        assert np.array_equal(found, [True, True, True, False, False, False])
+
+    def test_empty(_, segments):
+        segments.keep(np.zeros(segments.size))
+        indices, found = segments._ids_to_indices([1, 2])
+        assert indices.shape == (2,)
+        assert not found.any()
+
+    def test_matches_scan(_, segments):
+        segments.remove([1, 4], "ids")
+        indices, found = segments._ids_to_indices(segments.ids)
+        assert found.all()
+        expected = [np.argwhere(segments.ids == id)[0, 0] for id in segments.ids]
+        assert np.array_equal(indices, expected)
+
+
 class TestPreallocate:
     def test_all(_, segments):
         output = segments._preallocate()
@@ -590,6 +616,59 @@ class TestIsNested:
         assert np.array_equal(output, [False, True])
 
 
+class TestIsUpstream:
+    def test_pairs(_, segments):
+        output = segments.isupstream([1, 2, 3, 6, 5], [6, 6, 6, 6, 2])
+        assert np.array_equal(output, [True, True, False, False, False])
+
+    def test_broadcast(_, segments):
+        output = segments.isupstream([1, 2, 3, 4, 5, 6], 5)
+        assert np.array_equal(output, [False, True, False, True, False, False])
+        output = segments.isupstream(4, [5, 6, 3])
+        assert np.array_equal(output, [True, True, False])
+
+    def test_invalid_shape(_, segments, assert_contains):
+        with pytest.raises(ShapeError) as error:
+            segments.isupstream([1, 2], [5, 6, 3])
+        assert_contains(error, "ids and downstream must have the same number of IDs")
+
+    def test_invalid_id(_, segments):
+        with pytest.raises(ValueError):
+            segments.isupstream(1, 7)
+
+
+class TestAncestry:
+    def test_all(_, segments):
+        offsets, ids = segments.ancestry()
+        assert np.array_equal(offsets, [0, 0, 0, 0, 0, 2, 6])
+        for k, id in enumerate(segments.ids):
+            output = ids[offsets[k] : offsets[k + 1]]
+            assert sorted(output) == sorted(segments.ancestors(id))
+
+    def test_ids(_, segments):
+        offsets, ids = segments.ancestry([5, 3])
+        assert np.array_equal(offsets, [0, 2, 2])
+        assert np.array_equal(ids, [2, 4])
+
+    def test_downstream(_, segments):
+        offsets, ids = segments.ancestry([2, 6, 1], downstream=True)
+        assert np.array_equal(offsets, [0, 2, 2, 3])
+        assert np.array_equal(ids, [5, 6, 6])
+
+    def test_after_remove(_, segments):
+        segments.ancestry()
+        segments.remove([5], type="ids")
+        offsets, ids = segments.ancestry()
+        assert np.array_equal(offsets, [0, 0, 0, 0, 0, 1])
+        assert np.array_equal(ids, [1])
+        assert np.array_equal(segments.termini(), [6, 2, 3, 4, 6])
+
+    def test_invalid_downstream(_, segments, assert_contains):
+        with pytest.raises(TypeError) as error:
+            segments.ancestry(downstream=1)
+        assert_contains(error, "downstream")
+
+
 #####
 # Rasters
 #####
@@ -1349,74 +1428,6 @@ class TestRuggedness:
 #####
 
 
-class TestRemovable:
-    child = np.array([6, 5, 6, 5, 0, 0, 0, 0, 0, 0]) - 1
-    parents = (
-        np.array(
-            [
-                [2, 4],
-                [1, 5],
-                [0, 0],
-                [0, 0],
-                [0, 0],
-                [0, 0],
-                [2, 4],
-                [1, 5],
-                [2, 0],
-                [0, 5],
-            ]
-        )
-        - 1
-    )
-    requested = np.array([1, 0, 1, 0, 1, 0, 1, 0, 1, 0]).astype(bool)
-
-    def test_keep_neither(self):
-        output = Segments._removable(
-            self.requested,
-            self.child,
-            self.parents,
-            keep_upstream=False,
-            keep_downstream=False,
-        )
-        expected = np.array([0, 0, 1, 0, 1, 0, 1, 0, 1, 0], bool)
-        print(output)
-        print(expected)
-        assert np.array_equal(output, expected)
-
-    def test_keep_down(self):
-        output = Segments._removable(
-            self.requested,
-            self.child,
-            self.parents,
-            keep_upstream=False,
-            keep_downstream=True,
-        )
-        expected = np.array([0, 0, 1, 0, 1, 0, 0, 0, 0, 0], bool)
-        assert np.array_equal(output, expected)
-
-    def test_keep_up(self):
-        output = Segments._removable(
-            self.requested,
-            self.child,
-            self.parents,
-            keep_upstream=True,
-            keep_downstream=False,
-        )
-        expected = np.array([0, 0, 0, 0, 1, 0, 1, 0, 1, 0], bool)
-        assert np.array_equal(output, expected)
-
-    def test_keep_both(self):
-        output = Segments._removable(
-            self.requested,
-            self.child,
-            self.parents,
-            keep_upstream=True,
-            keep_downstream=True,
-        )
-        expected = np.array([0, 0, 0, 0, 0, 0, 0, 0, 0, 0], bool)
-        assert np.array_equal(output, expected)
-
-
 class TestContinuous:
     def test_none(_, segments):
         requested = np.zeros(segments.size, bool)
@@ -1518,6 +1529,7 @@ class TestRemove:
         bpixels245,
         child245,
         parents245,
+        basins245,
     ):
         bsegments.locate_basins()
         bsegments.remove([1, 3, 6], "ids")
@@ -1527,7 +1539,7 @@ class TestRemove:
         assert np.array_equal(bsegments.npixels, bpixels245)
         assert np.array_equal(bsegments._child, child245)
         assert np.array_equal(bsegments._parents, parents245)
-        assert bsegments._basins is None
+        assert np.array_equal(bsegments._basins, basins245)
 
     def test_indices(
         _,
@@ -1538,6 +1550,7 @@ class TestRemove:
         bpixels245,
         child245,
         parents245,
+        basins245,
     ):
         bsegments.locate_basins()
         indices = np.array([1, 0, 1, 0, 0, 1], bool)
@@ -1548,7 +1561,7 @@ class TestRemove:
         assert np.array_equal(bsegments.npixels, bpixels245)
         assert np.array_equal(bsegments._child, child245)
         assert np.array_equal(bsegments._parents, parents245)
-        assert bsegments._basins is None
+        assert np.array_equal(bsegments._basins, basins245)
 
     def test_all(_, bsegments, bflow):
         bsegments.locate_basins()
@@ -1559,7 +1572,7 @@ class TestRemove:
         assert bsegments.npixels.size == 0
         assert bsegments._child.size == 0
         assert bsegments._parents.size == 0
-        assert bsegments._basins is None
+        assert not bsegments._basins.any()
 
 
 class TestKeep:
@@ -1585,6 +1598,7 @@ class TestKeep:
         bpixels245,
         child245,
         parents245,
+        basins245,
     ):
         bsegments.locate_basins()
         bsegments.keep([2, 4, 5], "ids")
@@ -1594,7 +1608,7 @@ class TestKeep:
         assert np.array_equal(bsegments.npixels, bpixels245)
         assert np.array_equal(bsegments._child, child245)
         assert np.array_equal(bsegments._parents, parents245)
-        assert bsegments._basins is None
+        assert np.array_equal(bsegments._basins, basins245)
 
     def test_indices(
         _,
@@ -1605,6 +1619,7 @@ class TestKeep:
         bpixels245,
         child245,
         parents245,
+        basins245,
     ):
         bsegments.locate_basins()
         keep = np.array([0, 1, 0, 1, 1, 0], bool)
@@ -1615,7 +1630,7 @@ class TestKeep:
         assert np.array_equal(bsegments.npixels, bpixels245)
         assert np.array_equal(bsegments._child, child245)
         assert np.array_equal(bsegments._parents, parents245)
-        assert bsegments._basins is None
+        assert np.array_equal(bsegments._basins, basins245)
 
     def test_none(_, bsegments, bflow):
         bsegments.locate_basins()
@@ -1626,7 +1641,7 @@ class TestKeep:
         assert bsegments.npixels.size == 0
         assert bsegments._child.size == 0
         assert bsegments._parents.size == 0
-        assert bsegments._basins is None
+        assert not bsegments._basins.any()
 
 
 class TestCopy:
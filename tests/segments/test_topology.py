@@ -0,0 +1,170 @@
+import numpy as np
+
+from pfdf.segments import _topology
+
+
+def network():
+    # Two trees: 6 <- (1, 5), 5 <- (2, 4), and the isolated segment 3
+    child = np.array([6, 5, 0, 5, 6, 0]) - 1
+    parents = np.array([[0, 0], [0, 0], [0, 0], [0, 0], [2, 4], [1, 5]]) - 1
+    return child, parents
+
+
+def random_network(n, seed):
+    # Each segment drains to a later segment, or is terminal
+    rng = np.random.default_rng(seed)
+    child = np.full(n, -1)
+    parents = np.full((n, n), -1)
+    counts = np.zeros(n, int)
+    for k in range(n - 1):
+        if rng.random() < 0.8:
+            c = rng.integers(k + 1, n)
+            child[k] = c
+            parents[c, counts[c]] = k
+            counts[c] += 1
+    return child, parents[:, : max(counts.max(), 1)]
+
+
+def brute_ancestors(child, index):
+    ancestors = []
+    for k in range(child.size):
+        node = child[k]
+        while node != -1:
+            if node == index:
+                ancestors.append(k)
+                break
+            node = child[node]
+    return ancestors
+
+
+class TestBuild:
+    def test(_):
+        child, parents = network()
+        order, position, size, terminus = _topology.build(child, parents)
+        assert np.array_equal(order, [2, 5, 0, 4, 1, 3])
+        assert np.array_equal(position[order], np.arange(6))
+        assert np.array_equal(size, [1, 1, 1, 1, 3, 5])
+        assert np.array_equal(terminus, [5, 5, 2, 5, 5, 5])
+
+    def test_random(_):
+        child, parents = random_network(200, seed=4)
+        order, position, size, terminus = _topology.build(child, parents)
+        assert np.array_equal(np.sort(order), np.arange(200))
+        for k in range(200):
+            assert size[k] == len(brute_ancestors(child, k)) + 1
+            node = k
+            while child[node] != -1:
+                node = child[node]
+            assert terminus[k] == node
+
+    def test_empty(_):
+        child = np.empty(0, int)
+        parents = np.empty((0, 2), int)
+        order, position, size, terminus = _topology.build(child, parents)
+        assert order.size == position.size == size.size == terminus.size == 0
+
+
+class TestIsUpstream:
+    def test(_):
+        child, parents = network()
+        topology = _topology.build(child, parents)
+        upstream = np.array([0, 1, 4, 5, 2, 3])
+        downstream = np.array([5, 5, 5, 5, 5, 1])
+        output = _topology.isupstream(topology, upstream, downstream)
+        assert np.array_equal(output, [True, True, True, False, False, False])
+
+    def test_random(_):
+        child, parents = random_network(60, seed=7)
+        topology = _topology.build(child, parents)
+        upstream, downstream = np.meshgrid(np.arange(60), np.arange(60))
+        upstream, downstream = upstream.reshape(-1), downstream.reshape(-1)
+        output = _topology.isupstream(topology, upstream, downstream)
+        for x, y, result in zip(upstream, downstream, output):
+            assert result == (x in brute_ancestors(child, y))
+
+
+class TestAncestors:
+    def test(_):
+        child, parents = network()
+        topology = _topology.build(child, parents)
+        offsets, values = _topology.ancestors(topology, np.array([5, 0, 4, 2]))
+        assert np.array_equal(offsets, [0, 4, 4, 6, 6])
+        assert np.array_equal(values, [0, 4, 1, 3, 1, 3])
+
+    def test_random(_):
+        child, parents = random_network(200, seed=2)
+        topology = _topology.build(child, parents)
+        offsets, values = _topology.ancestors(topology, np.arange(200))
+        for k in range(200):
+            output = values[offsets[k] : offsets[k + 1]]
+            assert sorted(output) == brute_ancestors(child, k)
+
+
+class TestDescendents:
+    def test(_):
+        child, _ = network()
+        offsets, values = _topology.descendents(child, np.array([1, 5, 2, 0]))
+        assert np.array_equal(offsets, [0, 2, 2, 2, 3])
+        assert np.array_equal(values, [4, 5, 5])
+
+
+def peel(child, parents, requested, keep_upstream, keep_downstream):
+    # Repeatedly removes requested segments from the edges of their networks
+    child, parents, requested = child.copy(), parents.copy(), requested.copy()
+    removed = np.zeros(child.size, bool)
+    while True:
+        edge = np.zeros(child.size, bool)
+        if not keep_downstream:
+            edge |= child == -1
+        if not keep_upstream:
+            edge |= (parents == -1).all(axis=1)
+        edge &= requested
+        if not edge.any():
+            return removed
+        removed |= edge
+        requested &= ~edge
+        child[np.isin(child, np.flatnonzero(edge))] = -1
+        parents[np.isin(parents, np.flatnonzero(edge))] = -1
+
+
+class TestRemovable:
+    def test(_):
+        child, parents = network()
+        topology = _topology.build(child, parents)
+        requested = np.array([1, 1, 1, 0, 0, 1], bool)
+        output = _topology.removable(topology, child, parents, requested, False, False)
+        assert np.array_equal(output, [1, 1, 1, 0, 0, 1])
+
+    def test_keep_upstream(_):
+        child, parents = network()
+        topology = _topology.build(child, parents)
+        requested = np.array([1, 1, 1, 0, 0, 0], bool)
+        output = _topology.removable(topology, child, parents, requested, True, False)
+        assert np.array_equal(output, [0, 0, 1, 0, 0, 0])
+
+    def test_keep_downstream(_):
+        child, parents = network()
+        topology = _topology.build(child, parents)
+        requested = np.array([1, 1, 1, 0, 0, 1], bool)
+        output = _topology.removable(topology, child, parents, requested, False, True)
+        assert np.array_equal(output, [1, 1, 1, 0, 0, 0])
+
+    def test_random(_):
+        for seed in range(5):
+            child, parents = random_network(300, seed)
+            topology = _topology.build(child, parents)
+            requested = np.random.default_rng(seed).random(300) < 0.7
+            for keep_upstream in [False, True]:
+                for keep_downstream in [False, True]:
+                    output = _topology.removable(
+                        topology,
+                        child,
+                        parents,
+                        requested,
+                        keep_upstream,
+                        keep_downstream,
+                    )
+                    expected = peel(
+                        child, parents, requested, keep_upstream, keep_downstream
+                    )
+                    assert np.array_equal(output, expected)
@@ -11,49 +11,6 @@ class TestSegments:
         assert out2 == indices245
 
 
-class TestFamily:
-    def test(_):
-        child = np.array([1, 2, 3, 4, 5, 6, 7]) - 1
-        parents = np.array([[0, 0], [2, 0], [2, 6], [6, 2], [2, 5], [5, 2], [4, 5]]) - 1
-        remove = np.array([0, 1, 0, 0, 1, 0], bool)
-
-        expected_child = np.array([1, 0, 3, 4, 0, 6, 7]) - 1
-        expected_parents = (
-            np.array([[0, 0], [0, 0], [0, 6], [6, 0], [0, 0], [0, 0], [4, 0]]) - 1
-        )
-        _update.family(child, parents, remove)
-
-        assert np.array_equal(child, expected_child)
-        assert np.array_equal(parents, expected_parents)
-
-
-class TestIndices:
-    def test(_):
-        family = np.array(
-            [
-                [-1, -1],
-                [-1, -1],
-                [1, 4],
-                [4, 6],
-                [7, -1],
-                [-1, 7],
-            ]
-        )
-        nremoved = np.array([1, 1, 2, 2, 2, 3, 3, 3, 3])
-        expected = np.array(
-            [
-                [-1, -1],
-                [-1, -1],
-                [0, 2],
-                [2, 3],
-                [4, -1],
-                [-1, 4],
-            ]
-        )
-        _update.indices(family, nremoved)
-        assert np.array_equal(family, expected)
-
-
 class TestConnectivity:
     def test(_, segments, child245, parents245):
         remove = np.array([1, 0, 1, 0, 0, 1], bool)
@@ -66,7 +23,7 @@ class TestBasins:
     def test_none(_, bsegments):
         assert bsegments._basins is None
         remove = np.array([0, 0, 0, 0, 0, 0], bool)
-        output = _update.basins(bsegments, remove)
+        output = _update.basins(bsegments, remove, None)
         assert output is None
 
     def test_unaltered(_, bsegments, basins):
@@ -75,14 +32,31 @@ class TestBasins:
         assert np.array_equal(original, basins)
 
         remove = np.array([1, 1, 0, 0, 0, 0], bool)
-        output = _update.basins(bsegments, remove)
+        output = _update.basins(bsegments, remove, None)
         assert output is original
 
-    def test_reset(_, bsegments, basins):
+    def test_relabel(_, bsegments, basins):
         bsegments.locate_basins()
-        original = bsegments._basins
-        assert np.array_equal(original, basins)
+        original = bsegments._basins.copy()
 
-        remove = np.array([0, 0, 1, 0, 0, 0], bool)
-        output = _update.basins(bsegments, remove)
-        assert output is None
+        remove = np.array([0, 0, 1, 0, 0, 1], bool)
+        child, _ = _update.connectivity(bsegments, remove)
+        output = _update.basins(bsegments, remove, child)
+        assert np.array_equal(bsegments._basins, original)
+
+        expected = bsegments.copy()
+        expected.remove(remove)
+        expected._basins = None
+        expected.locate_basins()
+        assert np.array_equal(output, expected._basins)
+
+
+class TestVariables:
+    def test(_):
+        variables = {"a": (np.arange(6), [1]), "b": (np.arange(6) * 2, [2])}
+        remove = np.array([1, 0, 1, 0, 0, 1], bool)
+        output = _update.variables(variables, remove)
+        assert list(output) == ["a", "b"]
+        assert np.array_equal(output["a"][0], [1, 3, 4])
+        assert output["a"][1] == [1]
+        assert np.array_equal(output["b"][0], [2, 6, 8])
@@ -147,3 +147,93 @@ class TestEstimate:
         dnbr = Raster.from_array(dnbr, nodata=-1)
         output = severity.estimate(dnbr)
         assert np.array_equal(output.values, estimate_nodata)
+
+
+#####
+# Streaming
+#####
+
+
+@pytest.fixture
+def large_dnbr():
+    rng = np.random.default_rng(seed=3)
+    values = rng.uniform(-200, 1000, size=(50, 40)).astype("float32")
+    values[rng.random(values.shape) < 0.1] = -9999
+    return Raster.from_array(values, nodata=-9999, crs=26911, transform=(10, -10, 0, 0))
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    monkeypatch.setattr(severity, "_BLOCK", 16)
+
+
+class TestMaskFile:
+    @pytest.mark.parametrize("workers", (1, 3))
+    def test(_, tmp_path, rseverity, small_blocks, workers):
+        input = Raster.from_array(rseverity.repeat(10, 0).repeat(10, 1), nodata=-1)
+        input.save(tmp_path / "severity.tif")
+        output = severity.mask_file(
+            tmp_path / "severity.tif",
+            tmp_path / "mask.tif",
+            ["moderate", "high"],
+            workers=workers,
+        )
+        assert output == tmp_path / "mask.tif"
+        saved = Raster(output)
+        expected = severity.mask(input, ["moderate", "high"])
+        assert saved.dtype == "int8"
+        assert saved.nodata == 0
+        assert np.array_equal(saved.values, expected.values)
+
+    def test_invalid_description(_, tmp_path, assert_contains):
+        with pytest.raises(ValueError) as error:
+            severity.mask_file(tmp_path / "a.tif", tmp_path / "b.tif", "invalid")
+        assert_contains(error, "descriptions[0] (invalid)")
+
+
+class TestEstimateFile:
+    @pytest.mark.parametrize("workers", (1, 2))
+    def test(_, tmp_path, large_dnbr, small_blocks, workers):
+        large_dnbr.save(tmp_path / "dnbr.tif")
+        output = severity.estimate_file(
+            tmp_path / "dnbr.tif", tmp_path / "severity.tif", workers=workers
+        )
+        saved = Raster(output)
+        expected = severity.estimate(large_dnbr)
+        assert saved.dtype == "int8"
+        assert saved.nodata == 0
+        assert saved.crs == large_dnbr.crs
+        assert saved.transform == large_dnbr.transform
+        assert np.array_equal(saved.values, expected.values)
+        assert np.any(saved.values == 0)
+
+    def test_thresholds(_, tmp_path, dnbr, thresholds, estimate_thresh):
+        Raster.from_array(dnbr).save(tmp_path / "dnbr.tif")
+        output = severity.estimate_file(
+            tmp_path / "dnbr.tif", tmp_path / "severity.tif", thresholds
+        )
+        assert np.array_equal(Raster(output).values, estimate_thresh)
+
+    def test_band(_, tmp_path, dnbr, estimate):
+        Raster.from_array(dnbr).save(tmp_path / "dnbr.tif")
+        with pytest.raises(IndexError):
+            severity.estimate_file(
+                tmp_path / "dnbr.tif", tmp_path / "severity.tif", band=2
+            )
+
+    def test_overwrite(_, tmp_path, dnbr, estimate):
+        Raster.from_array(dnbr).save(tmp_path / "dnbr.tif")
+        path = tmp_path / "severity.tif"
+        severity.estimate_file(tmp_path / "dnbr.tif", path)
+        with pytest.raises(FileExistsError):
+            severity.estimate_file(tmp_path / "dnbr.tif", path)
+        severity.estimate_file(tmp_path / "dnbr.tif", path, overwrite=True)
+        assert np.array_equal(Raster(path).values, estimate)
+
+    def test_invalid_workers(_, tmp_path, dnbr, assert_contains):
+        Raster.from_array(dnbr).save(tmp_path / "dnbr.tif")
+        with pytest.raises(ValueError) as error:
+            severity.estimate_file(
+                tmp_path / "dnbr.tif", tmp_path / "severity.tif", workers=0
+            )
+        assert_contains(error, "workers")
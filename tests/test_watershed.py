@@ -1,4 +1,4 @@
-from math import inf, sqrt
+from math import ceil, inf, sqrt
 
 import numpy as np
 import pytest
@@ -6,13 +6,15 @@ from geojson import FeatureCollection
 from numpy import isnan, nan
 from pyproj import CRS
 from pysheds.grid import Grid
+from pysheds.sview import Raster as PyshedsRaster
 from shapely import LineString
+from shapely.ops import substring
 
 from pfdf import watershed
 from pfdf._utils.patches import NodataPatch
-from pfdf.errors import MissingCRSError, MissingTransformError
+from pfdf.errors import MissingCRSError, MissingTransformError, ShapeError
 from pfdf.projection import Transform
-from pfdf.raster._raster import PyshedsRaster, Raster
+from pfdf.raster._raster import Raster
 
 #####
 # Testing fixtures
@@ -132,6 +134,28 @@ class TestSplit:
         output = watershed._split(aline, max_length=2)
         assert output == expected
 
+    def test_interpolated(_):
+        aline = LineString([[0, 0], [0, 1], [0, 3], [1, 3]])
+        expected = [
+            LineString([[0, 0], [0, 1], [0, 4 / 3]]),
+            LineString([[0, 4 / 3], [0, 8 / 3]]),
+            LineString([[0, 8 / 3], [0, 3], [1, 3]]),
+        ]
+        output = watershed._split(aline, max_length=1.5)
+        assert output == expected
+
+    def test_matches_substring(_):
+        rng = np.random.default_rng(0)
+        coords = np.cumsum(rng.choice([-10, 0, 10], size=(50, 2)), axis=0)
+        aline = LineString(coords + 0.5)
+        npieces = ceil(aline.length / 7)
+        length = aline.length / npieces
+        expected = [
+            substring(aline, k * length, (k + 1) * length) for k in range(npieces)
+        ]
+        output = watershed._split(aline, max_length=7)
+        assert output == expected
+
 
 def test_split_segments():
     segments = [
@@ -153,6 +177,28 @@ def test_split_segments():
     assert output == expected
 
 
+def test_split_segments_none():
+    assert watershed._split_segments([], max_length=2) == []
+
+
+def test_pieces():
+    segments = np.array(
+        [
+            LineString([[0, 0], [0, 2], [0, 3]]),
+            LineString([[1, 0], [3, 0]]),
+        ]
+    )
+    output = watershed._pieces(segments, np.array([3, 2]), np.array([3, 2]))
+    expected = [
+        LineString([[0, 0], [0, 1]]),
+        LineString([[0, 1], [0, 2]]),
+        LineString([[0, 2], [0, 3]]),
+        LineString([[1, 0], [2, 0]]),
+        LineString([[2, 0], [3, 0]]),
+    ]
+    assert list(output) == expected
+
+
 #####
 # User Functions
 #####
@@ -272,6 +318,118 @@ class TestCondition:
         output = watershed.condition(dem).values
         assert np.array_equal(output, expected)
 
+    def test_invalid_method(_, assert_contains):
+        with pytest.raises(ValueError) as error:
+            watershed.condition(np.ones((3, 3)), method="invalid")
+        assert_contains(error, "method (invalid) is not a recognized option")
+
+    def test_priority_flood(_):
+        dem = np.array(
+            [
+                [0, 0, 0, 0, 0, 0],
+                [0, 3, 3, 3, 3, 0],
+                [0, 3, 2, 2, 3, 0],
+                [0, 3, 2, 2, 3, 0],
+                [0, 3, 3, 3, 3, 0],
+                [0, 0, 0, 0, 0, 0],
+            ]
+        )
+        dem = Raster.from_array(dem, nodata=0, crs=26911, transform=(10, -10, 0, 0))
+        expected = watershed.condition(dem, fill_pits=False, resolve_flats=False)
+        output = watershed.condition(dem, resolve_flats=False, method="priority-flood")
+        assert output == expected
+
+    def test_priority_flood_flats(_):
+        dem = np.array(
+            [
+                [0, 0, 0, 0, 0, 0],
+                [0, 3, 5, 6, 8, 0],
+                [0, 3, 3, 3, 9, 0],
+                [0, 3, 3, 3, 9, 0],
+                [0, 3, 3, 3, 8, 0],
+                [0, 0, 0, 0, 0, 0],
+            ]
+        )
+        dem = Raster.from_array(dem, nodata=0)
+        output = watershed.condition(dem, method="priority-flood")
+        flow = watershed.flow(output).values
+        assert np.all(flow[2:4, 2:4] != 0)
+        assert np.allclose(output.values[1:-1, 1:-1], dem.values[1:-1, 1:-1])
+
+    def test_priority_flood_no_depressions(_, assert_contains):
+        with pytest.raises(ValueError) as error:
+            watershed.condition(
+                np.ones((3, 3)), fill_depressions=False, method="priority-flood"
+            )
+        assert_contains(error, "cannot set fill_depressions=False")
+
+    def test_tiled(_):
+        rng = np.random.default_rng(0)
+        dem = Raster.from_array(np.round(rng.random((30, 40)) * 20), nodata=-999)
+        expected = watershed.condition(dem, fill_pits=False, resolve_flats=False).values
+        output = watershed.condition(
+            dem, resolve_flats=False, method="priority-flood", tile_shape=(7, 9)
+        ).values
+        assert np.array_equal(output, expected)
+
+    @pytest.mark.parametrize("tile_shape", [None, (7, 9)])
+    def test_priority_flood_nodata(_, tile_shape):
+        rng = np.random.default_rng(0)
+        values = np.round(rng.random((30, 40)) * 20)
+        values[rng.random(values.shape) < 0.1] = -999
+        values[10:14, 10:14] = -999
+        dem = Raster.from_array(values, nodata=-999)
+        expected = watershed.condition(
+            dem, fill_pits=False, resolve_flats=False, method="pysheds"
+        ).values
+        output = watershed.condition(
+            dem, resolve_flats=False, method="priority-flood", tile_shape=tile_shape
+        ).values
+        valid = values != -999
+        assert np.array_equal(output[valid], expected[valid])
+        assert np.all(output[~valid] == -inf)
+
+    def test_square_tiles(_):
+        rng = np.random.default_rng(0)
+        dem = Raster.from_array(np.round(rng.random((30, 40)) * 20), nodata=-999)
+        expected = watershed.condition(
+            dem, resolve_flats=False, method="priority-flood", tile_shape=(8, 8)
+        ).values
+        output = watershed.condition(
+            dem, resolve_flats=False, method="priority-flood", tile_shape=8
+        ).values
+        assert np.array_equal(output, expected)
+
+    def test_tiles_pysheds(_, assert_contains):
+        with pytest.raises(ValueError) as error:
+            watershed.condition(np.ones((3, 3)), tile_shape=2)
+        assert_contains(error, 'only use tile_shape when method="priority-flood"')
+
+    def test_tiles_flats(_, assert_contains):
+        with pytest.raises(ValueError) as error:
+            watershed.condition(np.ones((3, 3)), method="priority-flood", tile_shape=2)
+        assert_contains(error, "does not support resolving flats")
+
+    def test_invalid_tiles(_, assert_contains):
+        with pytest.raises(ShapeError) as error:
+            watershed.condition(
+                np.ones((3, 3)),
+                resolve_flats=False,
+                method="priority-flood",
+                tile_shape=[1, 2, 3],
+            )
+        assert_contains(error, "tile_shape must have either 1 or 2 elements")
+
+    def test_negative_tiles(_, assert_contains):
+        with pytest.raises(ValueError) as error:
+            watershed.condition(
+                np.ones((3, 3)),
+                resolve_flats=False,
+                method="priority-flood",
+                tile_shape=-2,
+            )
+        assert_contains(error, "tile_shape")
+
 
 class TestFlow:
     def test(_):
@@ -576,6 +734,79 @@ class TestRelief:
         watershed.relief(dem, flow, check_flow=False)
 
 
+class TestDerive:
+    def test(_):
+        dem = np.array(
+            [
+                [0.0, 0, 0, 0, 0, 0, 0, 0, 0],
+                [0, 470, 480, 490, 500, 490, 480, 470, 0],
+                [0, 599, 600, 650, 700, 650, 600, 599, 0],
+                [0, 750, 900, 940, 950, 940, 900, 750, 0],
+                [0, 800, 990, 998, 999, 998, 990, 800, 0],
+                [0, 751, 901, 941, 951, 941, 901, 751, 0],
+                [0, 599, 600, 650, 700, 650, 600, 599, 0],
+                [0, 470, 480, 490, 500, 490, 480, 470, 0],
+                [0, 0, 0, 0, 0, 0, 0, 0, 0],
+            ]
+        )
+        dem = Raster.from_array(dem, nodata=nan, crs=26911, transform=(10, -10, 0, 0))
+        flow, slopes, relief = watershed.derive(dem)
+
+        expected = watershed.flow(dem)
+        assert flow == expected
+        assert slopes == watershed.slopes(dem, expected)
+        assert relief == watershed.relief(dem, expected)
+        assert flow.dtype == "int8"
+        assert flow.nodata == 0
+        assert isnan(slopes.nodata)
+        assert isnan(relief.nodata)
+        assert relief.crs == CRS(26911)
+        assert relief.transform == Transform(10, -10, 0, 0, 26911)
+
+    def test_random(_):
+        rng = np.random.default_rng(0)
+        values = np.round(rng.random((40, 50)) * 100)
+        values[rng.random(values.shape) < 0.1] = -999
+        dem = Raster.from_array(values, nodata=-999, crs=4326, transform=(1, -1, 0, 0))
+        dem = watershed.condition(dem)
+        flow, slopes, relief = watershed.derive(dem, dem_per_m=2)
+
+        assert flow == watershed.flow(dem)
+        assert np.allclose(
+            slopes.values, watershed.slopes(dem, flow, dem_per_m=2).values
+        )
+        assert np.allclose(
+            relief.values, watershed.relief(dem, flow).values, equal_nan=True
+        )
+
+    def test_no_nodata(_):
+        dem = np.array(
+            [
+                [1, 1, 1, 1, 1],
+                [1, 4, 3, 2, 1],
+                [1, 6, 0, 100, 1],
+                [1, 8, 50, 10, 1],
+                [1, 1, 1, 1, 1],
+            ]
+        )
+        dem = Raster.from_array(dem, crs=26911, transform=(1, -1, 0, 0))
+        flow, _, _ = watershed.derive(dem)
+        assert flow == watershed.flow(dem)
+        assert flow.values[2, 2] == 0
+
+    def test_missing_crs(_, assert_contains):
+        dem = Raster.from_array(np.ones((3, 3)), transform=(1, 1, 0, 0))
+        with pytest.raises(MissingCRSError) as error:
+            watershed.derive(dem)
+        assert_contains(error, "the conditioned DEM must have a CRS")
+
+    def test_missing_transform(_, assert_contains):
+        dem = Raster.from_array(np.ones((3, 3)), crs=26911)
+        with pytest.raises(MissingTransformError) as error:
+            watershed.derive(dem)
+        assert_contains(error, "the conditioned DEM must have an affine transform")
+
+
 class TestAccumulation:
     flow = np.array(
         [
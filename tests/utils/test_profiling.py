@@ -0,0 +1,145 @@
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from pfdf import watershed
+from pfdf._utils import instrument
+from pfdf.models import staley2017
+from pfdf.raster import Raster
+from pfdf.utils import profiling
+
+
+@pytest.fixture
+def dem():
+    values = np.arange(100, dtype=float).reshape(10, 10)
+    return Raster.from_array(values, crs=26911, transform=(10, -10, 0, 0))
+
+
+def solve():
+    return staley2017.likelihood(
+        [6, 12], -3.6, 0.4, np.ones(100), 0.7, np.ones(100), 0.2, np.ones(100)
+    )
+
+
+@instrument.traced
+def child():
+    return np.ones(1000)
+
+
+@instrument.traced
+def parent():
+    "Allocates and frees memory before calling an instrumented child"
+    values = np.ones(1_000_000)
+    del values
+    return child()
+
+
+class TestProfile:
+    def test_disabled(_):
+        assert not profiling.enabled()
+        assert instrument._active is None
+        solve()
+        assert instrument._active is None
+
+    def test_events(_):
+        with profiling.profile() as output:
+            assert profiling.enabled()
+            solve()
+        assert not profiling.enabled()
+        assert len(output.events) == 1
+        event = output.events[0]
+        assert event["name"] == "staley2017.likelihood"
+        assert event["duration"] > 0
+        assert event["start"] >= 0
+        assert event["shapes"] == [(100,), (100,), (100,)]
+        assert event["bytes"] > 0
+
+    def test_nested(_, dem):
+        with profiling.profile() as output:
+            flow = watershed.flow(watershed.condition(dem))
+        names = [event["name"] for event in output.events]
+        assert names == ["watershed.condition", "watershed.flow"]
+        assert flow.shape == dem.shape
+
+    def test_nested_memory(_):
+        with profiling.profile() as output:
+            parent()
+        events = {event["name"]: event for event in output.events}
+        assert events["test_profiling.parent"]["bytes"] >= 8_000_000
+        assert events["test_profiling.child"]["bytes"] < 1_000_000
+
+    def test_methods(_, dem, tmp_path):
+        with profiling.profile(memory=False) as output:
+            dem.save(tmp_path / "dem.tif")
+            Raster.from_file(tmp_path / "dem.tif")
+        names = [event["name"] for event in output.events]
+        assert names == ["Raster.save", "Raster.from_file"]
+        assert "bytes" not in output.events[0]
+
+    def test_error(_):
+        with profiling.profile() as output:
+            with pytest.raises(Exception):
+                staley2017.likelihood("invalid", 1, 1, 1, 1, 1, 1, 1)
+        assert [event["name"] for event in output.events] == ["staley2017.likelihood"]
+
+    def test_summary(_):
+        with profiling.profile() as output:
+            solve()
+            solve()
+        summary = output.summary()
+        assert list(summary.index) == ["staley2017.likelihood"]
+        assert list(summary.columns) == ["calls", "total", "mean", "max", "peak_bytes"]
+        assert summary.loc["staley2017.likelihood", "calls"] == 2
+
+    def test_trace(_, tmp_path):
+        path = tmp_path / "trace.json"
+        with profiling.profile(path):
+            solve()
+        trace = json.loads(path.read_text())
+        assert len(trace["traceEvents"]) == 1
+        event = trace["traceEvents"][0]
+        assert event["name"] == "staley2017.likelihood"
+        assert event["ph"] == "X"
+        assert event["args"]["shapes"] == [[100], [100], [100]]
+
+    def test_save_exists(_, tmp_path):
+        path = tmp_path / "trace.json"
+        path.write_text("")
+        with profiling.profile() as output:
+            solve()
+        with pytest.raises(FileExistsError):
+            output.save(path)
+        output.save(path, overwrite=True)
+        assert "traceEvents" in json.loads(path.read_text())
+
+    def test_already_active(_, assert_contains):
+        with profiling.profile():
+            with pytest.raises(RuntimeError) as error:
+                with profiling.profile():
+                    pass
+            assert_contains(error, "another is active")
+        assert not profiling.enabled()
+
+    def test_invalid_memory(_, assert_contains):
+        with pytest.raises(TypeError) as error:
+            with profiling.profile(memory="invalid"):
+                pass
+        assert_contains(error, "memory")
+
+
+class TestEnvironment:
+    def test(_, tmp_path):
+        path = tmp_path / "trace.json"
+        code = (
+            "from pfdf.models import staley2017\n"
+            "staley2017.likelihood(6, -3.6, 0.4, 1, 0.7, 1, 0.2, 1)\n"
+        )
+        env = os.environ | {"PFDF_PROFILE": str(path)}
+        subprocess.run([sys.executable, "-c", code], env=env, check=True)
+        trace = json.loads(path.read_text())
+        names = [event["name"] for event in trace["traceEvents"]]
+        assert names == ["staley2017.likelihood"]
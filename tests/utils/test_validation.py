@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from pfdf import watershed
+from pfdf.raster import Raster
+from pfdf.utils import validation
+
+
+@pytest.fixture
+def flow():
+    return Raster.from_array(np.full((3, 3), 9, dtype="int8"), nodata=0)
+
+
+class TestFastMode:
+    def test_skips_checks(_, flow):
+        with validation.fast_mode():
+            assert validation.enabled()
+            watershed.accumulation(flow)
+        assert not validation.enabled()
+
+    def test_checks_outside(_, flow):
+        with pytest.raises(ValueError):
+            watershed.accumulation(flow)
+
+    def test_nested(_):
+        with validation.fast_mode():
+            with validation.fast_mode():
+                assert validation.enabled()
+            assert validation.enabled()
+        assert not validation.enabled()
+
+    def test_error(_):
+        with pytest.raises(RuntimeError):
+            with validation.fast_mode():
+                raise RuntimeError
+        assert not validation.enabled()
+
+
+class TestEnabled:
+    def test(_):
+        assert not validation.enabled()